@@ -229,29 +229,22 @@ async def get_all_indicators(
     Returns MA, MACD, RSI, BOLL, and VOL indicators
     """
     try:
-        indicators = {}
-        indicator_types = ["MA", "MACD", "RSI", "BOLL", "VOL"]
-
-        for indicator_type in indicator_types:
-            try:
-                indicator_data, _ = await handler.get_indicators(
-                    exchange=exchange,
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    indicator_type=indicator_type,
-                    force_refresh=force_refresh
-                )
-
-                if indicator_data:
-                    # Convert timestamp to string
-                    if isinstance(indicator_data.get('timestamp'), datetime):
-                        indicator_data['timestamp'] = indicator_data['timestamp'].isoformat()
-
-                    indicators[indicator_type] = indicator_data
-
-            except Exception as e:
-                logger.warning(f"Failed to get {indicator_type} indicator: {e}")
-                # Continue with other indicators
+        try:
+            # Indicators that fail to calculate are left out of the bundle
+            indicators, _ = await handler.get_indicator_bundle(
+                exchange=exchange,
+                symbol=symbol,
+                timeframe=timeframe,
+                force_refresh=force_refresh
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get indicators for {exchange} {symbol} {timeframe}: {e}")
+            indicators = {}
+
+        for indicator_data in indicators.values():
+            # Convert timestamp to string
+            if isinstance(indicator_data.get('timestamp'), datetime):
+                indicator_data['timestamp'] = indicator_data['timestamp'].isoformat()
 
         return AllIndicatorsResponse(
             exchange=exchange,
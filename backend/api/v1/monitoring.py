@@ -79,3 +79,64 @@ async def get_health_summary(
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/cache")
+async def get_cache_metrics():
+    """获取行情数据进程内缓存(L0)统计"""
+    from api.v1 import market
+
+    handler = market._rate_limit_handler
+    if handler is None:
+        return {"initialized": False}
+
+    try:
+        return {"initialized": True, **handler.get_cache_stats()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/http")
+async def get_http_client_metrics():
+    """获取FreqTrade实例HTTP连接池统计"""
+    from api.v1 import system
+
+    if system._ft_manager is None:
+        return {"initialized": False}
+
+    return {"initialized": True, **system._ft_manager.http_client.get_stats()}
+
+
+@router.get("/signal-ingestion")
+async def get_signal_ingestion_metrics():
+    """获取信号写入队列统计（队列深度、批量大小、写入延迟）"""
+    from api.v1 import signals
+
+    if signals._ingestion_service is None:
+        return {"initialized": False}
+
+    return {"initialized": True, **signals._ingestion_service.get_stats()}
+
+
+@router.get("/signal-bus")
+async def get_signal_bus_metrics():
+    """获取信号事件总线统计（当前序号、缓冲区、订阅者、丢弃批次）"""
+    from services.signal_event_bus import signal_event_bus
+
+    return signal_event_bus.get_stats()
+
+
+@router.get("/retention")
+async def get_retention_metrics():
+    """获取分区维护与数据保留统计（各表保留天数、创建/删除的分区、删除行数）"""
+    from services.data_retention_service import data_retention_service
+
+    return data_retention_service.get_stats()
+
+
+@router.get("/snapshot")
+async def get_monitoring_snapshot_metrics():
+    """获取共享监控快照统计（各部分版本、刷新次数、策略表查询次数）"""
+    from services.monitoring_snapshot import monitoring_snapshot
+
+    return monitoring_snapshot.get_stats()
@@ -2,16 +2,16 @@
 Realtime data batch API
 实时数据批量查询接口（用于WebSocket降级时的轮询）
 """
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from typing import Optional
 from datetime import datetime
 import logging
 
 from database import get_db
-from models.strategy import Strategy
 from models.signal import Signal
+from services.monitoring_snapshot import monitoring_snapshot, SNAPSHOT_SECTIONS, etag_matches
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -32,6 +32,8 @@ def get_freqtrade_manager():
 
 @router.get("/batch")
 async def get_realtime_batch(
+    request: Request,
+    response: Response,
     topics: str = Query(
         ...,
         description="逗号分隔的主题列表，可选: monitoring,strategies,signals,capacity"
@@ -60,6 +62,9 @@ async def get_realtime_batch(
     - `/api/v1/realtime/batch?topics=signals&last_signal_id=150`
     - `/api/v1/realtime/batch?topics=monitoring,strategies,signals,capacity`
 
+    **缓存**: monitoring/strategies/capacity 来自共享监控快照，每个主题带 version；
+    不含 signals 时响应带 ETag，携带 If-None-Match 且数据未变化时返回 304
+
     **返回格式**:
     ```json
     {
@@ -87,78 +92,32 @@ async def get_realtime_batch(
                 detail=f"Invalid topics: {', '.join(invalid_topics)}. Valid topics: {', '.join(valid_topics)}"
             )
 
-        result = {}
+        # 监控/策略/容量从共享快照读取（由 MonitoringService 定期刷新），
+        # 快照过期时（监控服务未运行）才在此刷新
+        snapshot_topics = [t for t in topic_list if t in SNAPSHOT_SECTIONS]
+        await monitoring_snapshot.ensure(snapshot_topics, db=db, monitoring_service=monitoring, ft_manager=ft_manager)
 
-        # 1. 监控数据
-        if 'monitoring' in topic_list:
-            try:
-                system_metrics = monitoring.get_system_metrics()
-                result['monitoring'] = {
-                    'system': system_metrics,
-                    'timestamp': datetime.now().isoformat()
-                }
-            except Exception as e:
-                logger.error(f"Failed to get monitoring data: {e}")
-                result['monitoring'] = {
-                    'error': str(e),
-                    'timestamp': datetime.now().isoformat()
-                }
+        # 不含 signals 时，快照版本未变化则返回 304
+        if 'signals' not in topic_list:
+            etag = monitoring_snapshot.etag(snapshot_topics)
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            response.headers["ETag"] = etag
 
-        # 2. 策略状态
-        if 'strategies' in topic_list:
-            try:
-                # 统计查询
-                total_query = await db.execute(select(func.count(Strategy.id)))
-                total = total_query.scalar() or 0
-
-                running_query = await db.execute(
-                    select(func.count(Strategy.id)).where(Strategy.status == 'running')
-                )
-                running = running_query.scalar() or 0
-
-                stopped_query = await db.execute(
-                    select(func.count(Strategy.id)).where(Strategy.status == 'stopped')
-                )
-                stopped = stopped_query.scalar() or 0
-
-                error_query = await db.execute(
-                    select(func.count(Strategy.id)).where(Strategy.status == 'error')
-                )
-                error = error_query.scalar() or 0
-
-                # 获取运行中的策略详情
-                strategies_query = await db.execute(
-                    select(Strategy)
-                    .where(Strategy.status == 'running')
-                    .order_by(Strategy.id)
-                )
-                running_strategies = strategies_query.scalars().all()
-
-                result['strategies'] = {
-                    'total': total,
-                    'running': running,
-                    'stopped': stopped,
-                    'error': error,
-                    'strategies': [
-                        {
-                            'id': s.id,
-                            'name': s.name,
-                            'status': s.status,
-                            'is_active': s.is_active,
-                            'port': s.port,
-                            'process_id': s.process_id,
-                            'started_at': s.started_at.isoformat() if s.started_at else None
-                        }
-                        for s in running_strategies
-                    ],
-                    'timestamp': datetime.now().isoformat()
-                }
-            except Exception as e:
-                logger.error(f"Failed to get strategies data: {e}")
-                result['strategies'] = {
-                    'error': str(e),
+        result = {}
+        for topic in snapshot_topics:
+            entry = monitoring_snapshot.get(topic)
+            if entry is None:
+                result[topic] = {
+                    'error': f'{topic} snapshot not available',
                     'timestamp': datetime.now().isoformat()
                 }
+                continue
+            result[topic] = {
+                **entry['data'],
+                'version': entry['version'],
+                'timestamp': entry['updated_at']
+            }
 
         # 3. 信号数据（支持增量查询）
         if 'signals' in topic_list:
@@ -199,32 +158,6 @@ async def get_realtime_batch(
                     'timestamp': datetime.now().isoformat()
                 }
 
-        # 4. 容量数据
-        if 'capacity' in topic_list:
-            try:
-                if ft_manager:
-                    used_ports = len(ft_manager.strategy_ports)
-                    total_ports = ft_manager.max_port - ft_manager.base_port + 1
-
-                    result['capacity'] = {
-                        'used_ports': used_ports,
-                        'total_ports': total_ports,
-                        'available_ports': total_ports - used_ports,
-                        'usage_percent': round(used_ports / total_ports * 100, 2) if total_ports > 0 else 0,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                else:
-                    result['capacity'] = {
-                        'error': 'FreqTrade manager not available',
-                        'timestamp': datetime.now().isoformat()
-                    }
-            except Exception as e:
-                logger.error(f"Failed to get capacity data: {e}")
-                result['capacity'] = {
-                    'error': str(e),
-                    'timestamp': datetime.now().isoformat()
-                }
-
         return {
             'success': True,
             'data': result,
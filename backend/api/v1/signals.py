@@ -4,24 +4,57 @@ Signals API endpoints
 """
 from fastapi import APIRouter, HTTPException, Depends, Path
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc
-from typing import Optional
+from sqlalchemy import select, and_, desc, func, case, cast, extract, literal_column, text, tuple_, Integer
+from typing import Optional, Tuple
 from datetime import datetime, timedelta
+import base64
 import logging
 
+from config import settings
 from database import get_db
 from models.signal import Signal
-from models.strategy import Strategy
+from models.signal_rollup import SignalRollup
 from services.websocket_service import ws_service
+from services.signal_ingestion_service import SignalIngestionService
+from services.strategy_metadata_cache import strategy_metadata_cache
+from services.signal_rollup_service import signal_rollup_service, truncate_time, ceil_time
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Write-behind ingestion pipeline (injected during startup)
+_ingestion_service: Optional[SignalIngestionService] = None
+
+# 列表接口返回的列（不加载 indicators / signal_metadata）
+SIGNAL_LIST_COLUMNS = [
+    Signal.id,
+    Signal.strategy_id,
+    Signal.pair,
+    Signal.action,
+    Signal.signal_strength,
+    Signal.strength_level,
+    Signal.current_rate,
+    Signal.profit_ratio,
+    Signal.created_at
+]
+
+# 列表总数统计方式
+SIGNAL_TOTAL_MODES = ("exact", "estimate", "none")
+
+# 趋势分组字段
+TREND_GROUP_COLUMNS = {
+    "all": None,
+    "pair": "pair",
+    "strategy": "strategy_id"
+}
+
 
 @router.get("/")
 async def list_signals(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    total_mode: str = "estimate",
     strategy_id: Optional[int] = None,
     pair: Optional[str] = None,
     action: Optional[str] = None,
@@ -29,9 +62,19 @@ async def list_signals(
     hours: Optional[int] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """获取信号列表"""
+    """获取信号列表
+
+    按 (created_at, id) 倒序分页：传入上一页返回的 next_cursor 即可翻到下一页（不受页深影响）；
+    未传 cursor 时仍支持 skip 偏移分页。
+    total_mode: exact 精确计数 / estimate 估算（超过上限或无过滤条件时为估算值） / none 不计数
+    """
     try:
-        query = select(Signal)
+        if total_mode not in SIGNAL_TOTAL_MODES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid total_mode, expected one of: {', '.join(SIGNAL_TOTAL_MODES)}"
+            )
+        limit = max(1, min(limit, settings.SIGNAL_LIST_MAX_LIMIT))
 
         # 过滤条件
         conditions = []
@@ -47,19 +90,33 @@ async def list_signals(
             cutoff_time = datetime.now() - timedelta(hours=hours)
             conditions.append(Signal.created_at >= cutoff_time)
 
-        if conditions:
-            query = query.where(and_(*conditions))
+        # 只查询列表返回的列，不加载 indicators / signal_metadata 等JSON列
+        query = select(*SIGNAL_LIST_COLUMNS)
+        page_conditions = list(conditions)
+        if cursor:
+            cursor_created_at, cursor_id = _decode_cursor(cursor)
+            page_conditions.append(tuple_(Signal.created_at, Signal.id) < (cursor_created_at, cursor_id))
+        if page_conditions:
+            query = query.where(and_(*page_conditions))
+
+        # 排序和分页（多取一行判断是否还有下一页）
+        query = query.order_by(desc(Signal.created_at), desc(Signal.id)).limit(limit + 1)
+        if not cursor and skip:
+            query = query.offset(skip)
 
-        # 分页和排序
-        query = query.offset(skip).limit(limit).order_by(desc(Signal.created_at))
+        rows = (await db.execute(query)).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
 
-        result = await db.execute(query)
-        signals = result.scalars().all()
+        total, total_is_estimate = await _count_signals(db, conditions, total_mode)
 
         return {
-            "total": len(signals),
-            "skip": skip,
+            "total": total,
+            "total_is_estimate": total_is_estimate,
+            "skip": 0 if cursor else skip,
             "limit": limit,
+            "has_more": has_more,
+            "next_cursor": _encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None,
             "signals": [
                 {
                     "id": s.id,
@@ -72,14 +129,72 @@ async def list_signals(
                     "profit_ratio": s.profit_ratio,
                     "created_at": s.created_at.isoformat() if s.created_at else None
                 }
-                for s in signals
+                for s in rows
             ]
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to list signals: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _encode_cursor(created_at: datetime, signal_id: int) -> str:
+    """将 (created_at, id) 编码为不透明的分页游标"""
+    raw = f"{created_at.isoformat()}|{signal_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """解析分页游标，格式错误返回400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, signal_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(signal_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def _count_signals(db: AsyncSession, conditions: list, total_mode: str) -> Tuple[Optional[int], bool]:
+    """统计信号总数
+
+    estimate 模式：无过滤条件时读取 PostgreSQL 表统计信息（reltuples，含各分区），
+    有过滤条件时最多计数 SIGNAL_LIST_COUNT_CAP 行，达到上限即返回下限估算值。
+
+    Returns:
+        (总数, 是否为估算值)
+    """
+    if total_mode == "none":
+        return None, False
+
+    if total_mode == "estimate":
+        if not conditions and db.bind.dialect.name == "postgresql":
+            # 分区表的统计信息在各分区上，汇总父表及其分区的 reltuples
+            estimate = await db.scalar(
+                text(
+                    "SELECT sum(reltuples) FILTER (WHERE reltuples > 0) FROM pg_class "
+                    "WHERE oid = to_regclass(:table_name) "
+                    "OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:table_name))"
+                ),
+                {"table_name": Signal.__tablename__}
+            )
+            # 从未 ANALYZE 的表 reltuples 为 -1 或 0，回退为计数
+            if estimate and estimate > 0:
+                return int(estimate), True
+
+        cap = settings.SIGNAL_LIST_COUNT_CAP
+        capped = select(literal_column("1")).select_from(Signal)
+        if conditions:
+            capped = capped.where(and_(*conditions))
+        total = await db.scalar(select(func.count()).select_from(capped.limit(cap).subquery()))
+        return total, total >= cap
+
+    query = select(func.count()).select_from(Signal)
+    if conditions:
+        query = query.where(and_(*conditions))
+    return await db.scalar(query), False
+
+
 @router.get("/{signal_id}")
 async def get_signal(
     signal_id: int,
@@ -131,18 +246,21 @@ async def receive_freqtrade_signal(
 ):
     """接收FreqTrade策略信号（Webhook）"""
     try:
-        # 验证策略存在
-        result = await db.execute(
-            select(Strategy).where(Strategy.id == strategy_id)
-        )
-        strategy = result.scalar_one_or_none()
+        # 验证策略存在（从策略元数据缓存读取，命中时无数据库查询）
+        strategy = await strategy_metadata_cache.get(strategy_id, db)
 
         if not strategy:
             raise HTTPException(status_code=404, detail="Strategy not found")
 
+        # 入队前校验必填字段：写后模式下信号已确认接收，坏数据不能留到批量写库时才失败
+        try:
+            signal_strength = _parse_signal_strength(signal_data)
+            _validate_signal_data(signal_data)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
         # 计算信号强度等级
-        signal_strength = signal_data.get("indicators", {}).get("signal_strength", 0.5)
-        thresholds = strategy.signal_thresholds
+        thresholds = strategy["signal_thresholds"]
 
         if signal_strength >= thresholds.get("strong", 0.8):
             strength_level = "strong"
@@ -153,29 +271,29 @@ async def receive_freqtrade_signal(
         else:
             strength_level = "ignore"
 
+        signal_values = _build_signal_values(strategy_id, signal_data, signal_strength, strength_level)
+
+        # 写后模式：入队后立即返回，由后台批量写库并推送
+        if _ingestion_service and _ingestion_service.is_running:
+            if not _ingestion_service.submit(signal_values, strategy["name"]):
+                logger.warning(f"Signal queue full, rejecting signal from strategy {strategy_id}")
+                raise HTTPException(status_code=503, detail="Signal queue full, retry later")
+
+            return {
+                "status": "accepted",
+                "signal_id": None,
+                "strength_level": strength_level
+            }
+
         # 创建信号记录
-        signal = Signal(
-            strategy_id=strategy_id,
-            pair=signal_data.get("pair"),
-            action=signal_data.get("action", "hold"),
-            signal_strength=signal_strength,
-            strength_level=strength_level,
-            current_rate=signal_data.get("current_rate"),
-            entry_price=signal_data.get("entry_price"),
-            exit_price=signal_data.get("exit_price"),
-            profit_ratio=signal_data.get("profit_ratio"),
-            profit_abs=signal_data.get("profit_abs"),
-            trade_duration=signal_data.get("trade_duration"),
-            indicators=signal_data.get("indicators"),
-            metadata=signal_data.get("metadata"),
-            freqtrade_trade_id=signal_data.get("trade_id"),
-            open_date=datetime.fromisoformat(signal_data["open_date"]) if signal_data.get("open_date") else None,
-            close_date=datetime.fromisoformat(signal_data["close_date"]) if signal_data.get("close_date") else None
-        )
+        signal = Signal(**signal_values)
 
         db.add(signal)
-        await db.commit()
+        await db.flush()
         await db.refresh(signal)
+        if settings.SIGNAL_ROLLUPS_ENABLED:
+            await signal_rollup_service.apply(db, [dict(signal_values, created_at=signal.created_at)])
+        await db.commit()
 
         logger.info(f"Received signal {signal.id} from strategy {strategy_id}: {signal.pair} {signal.action}")
 
@@ -183,7 +301,7 @@ async def receive_freqtrade_signal(
         await ws_service.push_new_signal({
             "id": signal.id,
             "strategy_id": signal.strategy_id,
-            "strategy_name": strategy.name,
+            "strategy_name": strategy["name"],
             "pair": signal.pair,
             "action": signal.action,
             "signal_strength": signal.signal_strength,
@@ -209,42 +327,127 @@ async def receive_freqtrade_signal(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _parse_signal_strength(signal_data: Optional[dict]) -> float:
+    """
+    读取信号强度（indicators.signal_strength，默认0.5）
+
+    Raises:
+        ValueError: 信号数据或强度格式错误
+    """
+    if not isinstance(signal_data, dict):
+        raise ValueError("Signal payload must be a JSON object")
+    indicators = signal_data.get("indicators") or {}
+    if not isinstance(indicators, dict):
+        raise ValueError("indicators must be an object")
+    try:
+        return float(indicators.get("signal_strength", 0.5))
+    except (TypeError, ValueError):
+        raise ValueError("indicators.signal_strength must be a number")
+
+
+def _validate_signal_data(signal_data: dict):
+    """
+    校验Signal必填列（pair、current_rate、action）和日期格式
+
+    Raises:
+        ValueError: 缺少必填字段或格式错误
+    """
+    pair = signal_data.get("pair")
+    if not isinstance(pair, str) or not pair or len(pair) > 20:
+        raise ValueError("pair is required (string, at most 20 characters)")
+
+    action = signal_data.get("action", "hold")
+    if not isinstance(action, str) or not action or len(action) > 10:
+        raise ValueError("action must be a string of at most 10 characters")
+
+    current_rate = signal_data.get("current_rate")
+    try:
+        if current_rate is None or isinstance(current_rate, bool):
+            raise TypeError
+        float(current_rate)
+    except (TypeError, ValueError):
+        raise ValueError("current_rate is required and must be a number")
+
+    for field in ("open_date", "close_date"):
+        value = signal_data.get(field)
+        if value:
+            try:
+                datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{field} must be an ISO 8601 datetime")
+
+
+def _build_signal_values(
+    strategy_id: int,
+    signal_data: dict,
+    signal_strength: float,
+    strength_level: str
+) -> dict:
+    """将Webhook数据转换为Signal列值"""
+    return {
+        "strategy_id": strategy_id,
+        "pair": signal_data.get("pair"),
+        "action": signal_data.get("action", "hold"),
+        "signal_strength": signal_strength,
+        "strength_level": strength_level,
+        "current_rate": float(signal_data["current_rate"]),
+        "entry_price": signal_data.get("entry_price"),
+        "exit_price": signal_data.get("exit_price"),
+        "profit_ratio": signal_data.get("profit_ratio"),
+        "profit_abs": signal_data.get("profit_abs"),
+        "trade_duration": signal_data.get("trade_duration"),
+        "indicators": signal_data.get("indicators"),
+        "signal_metadata": signal_data.get("metadata"),
+        "freqtrade_trade_id": signal_data.get("trade_id"),
+        "open_date": datetime.fromisoformat(signal_data["open_date"]) if signal_data.get("open_date") else None,
+        "close_date": datetime.fromisoformat(signal_data["close_date"]) if signal_data.get("close_date") else None
+    }
+
+
 @router.get("/statistics/summary")
 async def get_signals_statistics(
     strategy_id: Optional[int] = None,
     hours: int = 24,
+    use_rollups: bool = True,
     db: AsyncSession = Depends(get_db)
 ):
-    """获取信号统计"""
+    """获取信号统计（默认读取分钟/小时汇总表）"""
     try:
         cutoff_time = datetime.now() - timedelta(hours=hours)
 
-        query = select(Signal).where(Signal.created_at >= cutoff_time)
-        if strategy_id:
-            query = query.where(Signal.strategy_id == strategy_id)
+        if use_rollups and settings.SIGNAL_ROLLUPS_ENABLED:
+            return _summary_from_rollups(
+                await signal_rollup_service.summarize(db, cutoff_time, strategy_id),
+                hours,
+                strategy_id
+            )
 
-        result = await db.execute(query)
-        signals = result.scalars().all()
+        conditions = [Signal.created_at >= cutoff_time]
+        if strategy_id:
+            conditions.append(Signal.strategy_id == strategy_id)
 
-        total_signals = len(signals)
-        buy_signals = len([s for s in signals if s.action == "buy"])
-        sell_signals = len([s for s in signals if s.action == "sell"])
-        strong_signals = len([s for s in signals if s.strength_level == "strong"])
-        medium_signals = len([s for s in signals if s.strength_level == "medium"])
-        weak_signals = len([s for s in signals if s.strength_level == "weak"])
+        # 在数据库端聚合，只返回一行统计结果
+        query = select(
+            func.count().label("total"),
+            _count_where(Signal.action == "buy").label("buy"),
+            _count_where(Signal.action == "sell").label("sell"),
+            _count_where(Signal.strength_level == "strong").label("strong"),
+            _count_where(Signal.strength_level == "medium").label("medium"),
+            _count_where(Signal.strength_level == "weak").label("weak"),
+            func.avg(Signal.signal_strength).label("avg_strength")
+        ).where(and_(*conditions))
 
-        # 计算平均信号强度
-        avg_strength = sum([s.signal_strength for s in signals]) / total_signals if total_signals > 0 else 0
+        row = (await db.execute(query)).one()
 
         return {
             "period_hours": hours,
-            "total_signals": total_signals,
-            "buy_signals": buy_signals,
-            "sell_signals": sell_signals,
-            "strong_signals": strong_signals,
-            "medium_signals": medium_signals,
-            "weak_signals": weak_signals,
-            "average_strength": round(avg_strength, 3),
+            "total_signals": row.total or 0,
+            "buy_signals": row.buy or 0,
+            "sell_signals": row.sell or 0,
+            "strong_signals": row.strong or 0,
+            "medium_signals": row.medium or 0,
+            "weak_signals": row.weak or 0,
+            "average_strength": round(float(row.avg_strength or 0), 3),
             "strategy_id": strategy_id
         }
     except Exception as e:
@@ -257,20 +460,25 @@ async def get_signals_trend(
     hours: int = 24,
     group_by: str = "all",
     strategy_id: Optional[int] = None,
+    max_series: int = 20,
+    use_rollups: bool = True,
     db: AsyncSession = Depends(get_db)
 ):
-    """获取信号趋势数据"""
-    try:
-        cutoff_time = datetime.now() - timedelta(hours=hours)
+    """获取信号趋势数据
 
-        query = select(Signal).where(Signal.created_at >= cutoff_time)
-        if strategy_id:
-            query = query.where(Signal.strategy_id == strategy_id)
-
-        query = query.order_by(Signal.created_at)
+    group_by=pair / strategy 时额外返回按货币对/策略拆分的序列（按信号总数取前 max_series 个）。
+    起始时间对齐到整分钟（超过24小时对齐到整点），以便直接读取分钟/小时汇总表。
+    """
+    try:
+        if group_by not in TREND_GROUP_COLUMNS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid group_by. Must be one of: {', '.join(TREND_GROUP_COLUMNS)}"
+            )
 
-        result = await db.execute(query)
-        signals = result.scalars().all()
+        now = datetime.now()
+        granularity = "minute" if hours <= 24 else "hour"
+        cutoff_time = truncate_time(now - timedelta(hours=hours), granularity)
 
         # 确定时间间隔
         if hours <= 24:
@@ -280,69 +488,132 @@ async def get_signals_trend(
         else:
             interval_minutes = 360  # 6小时间隔
 
-        # 生成时间点
-        data_points = []
-        current_time = cutoff_time
-        end_time = datetime.now()
+        bucket_count = int((now - cutoff_time).total_seconds() // (interval_minutes * 60)) + 1
+        group_name = TREND_GROUP_COLUMNS[group_by]
 
-        while current_time <= end_time:
-            next_time = current_time + timedelta(minutes=interval_minutes)
+        # 汇总表覆盖起点之前的时间段读取原始信号，之后读取汇总表（对汇总行的计数求和）
+        rollup_from = None
+        if use_rollups and settings.SIGNAL_ROLLUPS_ENABLED:
+            rollup_from = await signal_rollup_service.rollup_start(db, cutoff_time)
+            if rollup_from is not None:
+                rollup_from = ceil_time(rollup_from, granularity)
 
-            # 筛选该时间段内的信号
-            period_signals = [
-                s for s in signals
-                if current_time <= s.created_at < next_time
-            ]
-
-            # 按分组统计
-            if group_by == "all":
-                strong = len([s for s in period_signals if s.strength_level == "strong"])
-                medium = len([s for s in period_signals if s.strength_level == "medium"])
-                weak = len([s for s in period_signals if s.strength_level == "weak"])
-
-                data_points.append({
-                    "timestamp": current_time.isoformat(),
-                    "strong_signals": strong,
-                    "medium_signals": medium,
-                    "weak_signals": weak,
-                    "total_signals": len(period_signals)
-                })
-            elif group_by == "pair":
-                # 按货币对分组（这里简化为总体，可以扩展）
-                strong = len([s for s in period_signals if s.strength_level == "strong"])
-                medium = len([s for s in period_signals if s.strength_level == "medium"])
-                weak = len([s for s in period_signals if s.strength_level == "weak"])
-
-                data_points.append({
-                    "timestamp": current_time.isoformat(),
-                    "strong_signals": strong,
-                    "medium_signals": medium,
-                    "weak_signals": weak,
-                    "total_signals": len(period_signals)
-                })
-            elif group_by == "strategy":
-                # 按策略分组（这里简化为总体，可以扩展）
-                strong = len([s for s in period_signals if s.strength_level == "strong"])
-                medium = len([s for s in period_signals if s.strength_level == "medium"])
-                weak = len([s for s in period_signals if s.strength_level == "weak"])
-
-                data_points.append({
-                    "timestamp": current_time.isoformat(),
-                    "strong_signals": strong,
-                    "medium_signals": medium,
-                    "weak_signals": weak,
-                    "total_signals": len(period_signals)
-                })
-
-            current_time = next_time
-
-        return {
+        if rollup_from is None:
+            sources = [(Signal, Signal.created_at, func.count(), [Signal.created_at >= cutoff_time])]
+        else:
+            sources = [(
+                SignalRollup, SignalRollup.bucket_start, func.sum(SignalRollup.signal_count),
+                [SignalRollup.granularity == granularity, SignalRollup.bucket_start >= rollup_from]
+            )]
+            if rollup_from > cutoff_time:
+                sources.append((
+                    Signal, Signal.created_at, func.count(),
+                    [Signal.created_at >= cutoff_time, Signal.created_at < rollup_from]
+                ))
+
+        rows = []
+        for source, time_column, count, conditions in sources:
+            bucket = _time_bucket(db, time_column, cutoff_time, interval_minutes * 60).label("bucket")
+            columns = [bucket, source.strength_level, count.label("count")]
+            if group_name is not None:
+                columns.insert(1, getattr(source, group_name).label("group_key"))
+
+            if strategy_id:
+                conditions.append(source.strategy_id == strategy_id)
+            query = select(*columns).where(and_(*conditions)).group_by(*columns[:-1])
+            rows.extend((await db.execute(query)).all())
+
+        # 按时间桶填充（无信号的时间段计为0）
+        totals = _empty_trend_points(cutoff_time, interval_minutes, bucket_count)
+        series: dict = {}
+        for row in rows:
+            index = int(row.bucket)
+            if not 0 <= index < bucket_count:
+                continue
+            _add_trend_count(totals[index], row.strength_level, row.count)
+            if group_name is not None:
+                if row.group_key not in series:
+                    series[row.group_key] = _empty_trend_points(cutoff_time, interval_minutes, bucket_count)
+                _add_trend_count(series[row.group_key][index], row.strength_level, row.count)
+
+        response = {
             "period_hours": hours,
             "group_by": group_by,
             "interval_minutes": interval_minutes,
-            "data_points": data_points
+            "data_points": totals
         }
+
+        if group_name is not None:
+            ranked = sorted(
+                series.items(),
+                key=lambda item: sum(p["total_signals"] for p in item[1]),
+                reverse=True
+            )
+            response["series"] = [
+                {"key": key, "data_points": points}
+                for key, points in ranked[:max_series]
+            ]
+            response["total_series"] = len(series)
+
+        return response
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get signal trend: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+
+def _summary_from_rollups(rows: list, hours: int, strategy_id: Optional[int]) -> dict:
+    """由汇总表的(action, strength_level, count, strength_sum)行生成统计结果"""
+    total = sum(count for _, _, count, _ in rows)
+    strength_sum = sum(value for _, _, _, value in rows)
+
+    def count_of(index: int, value: str) -> int:
+        return sum(row[2] for row in rows if row[index] == value)
+
+    return {
+        "period_hours": hours,
+        "total_signals": total,
+        "buy_signals": count_of(0, "buy"),
+        "sell_signals": count_of(0, "sell"),
+        "strong_signals": count_of(1, "strong"),
+        "medium_signals": count_of(1, "medium"),
+        "weak_signals": count_of(1, "weak"),
+        "average_strength": round(strength_sum / total, 3) if total else 0,
+        "strategy_id": strategy_id
+    }
+
+
+def _count_where(condition):
+    """条件计数（SUM(CASE WHEN ...)，兼容PostgreSQL和SQLite）"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _time_bucket(db: AsyncSession, column, start_time: datetime, interval_seconds: int):
+    """时间桶序号：(created_at - start_time) // interval，在数据库端计算"""
+    # 常量内联为字面量：绑定参数会使SELECT与GROUP BY中的表达式在PostgreSQL看来不相同
+    start_epoch = literal_column(str(int(start_time.timestamp())))
+    interval = literal_column(str(int(interval_seconds)))
+    if db.bind.dialect.name == "sqlite":
+        epoch = cast(func.strftime("%s", column), Integer)
+        return (epoch - start_epoch) / interval  # SQLite整数除法即向下取整
+    return func.floor((extract("epoch", column) - start_epoch) / interval)
+
+
+def _empty_trend_points(start_time: datetime, interval_minutes: int, bucket_count: int) -> list:
+    return [
+        {
+            "timestamp": (start_time + timedelta(minutes=interval_minutes * i)).isoformat(),
+            "strong_signals": 0,
+            "medium_signals": 0,
+            "weak_signals": 0,
+            "total_signals": 0
+        }
+        for i in range(bucket_count)
+    ]
+
+
+def _add_trend_count(point: dict, strength_level: str, count: int):
+    if strength_level in ("strong", "medium", "weak"):
+        point[f"{strength_level}_signals"] += count
+    point["total_signals"] += count
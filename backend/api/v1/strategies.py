@@ -6,18 +6,22 @@ from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import logging
 import ast
+import re
 import tempfile
 from pathlib import Path
 import asyncio
 
+from config import settings
 from database import get_db
 from models.strategy import Strategy
 from models.user import User
 from core.freqtrade_manager import FreqTradeGatewayManager
 from services.websocket_service import ws_service
+from services.strategy_metadata_cache import strategy_metadata_cache
+from services.strategy_state_store import strategy_state_store
 from services.log_monitor_service import log_monitor_service
 from services.heartbeat_monitor_service import heartbeat_monitor
 from api.v1.auth import get_current_active_user
@@ -42,6 +46,10 @@ class StrategyUpdateRequest(BaseModel):
     proxy_id: Optional[int] = None
 
 
+class BulkStrategyRequest(BaseModel):
+    strategy_ids: List[int] = Field(..., min_length=1)
+
+
 def get_ft_manager():
     """Get FreqTrade manager instance"""
     if _ft_manager is None:
@@ -219,6 +227,8 @@ async def create_strategy(
         db.add(strategy)
         await db.commit()
         await db.refresh(strategy)
+        strategy_metadata_cache.put(strategy)
+        strategy_state_store.mark_dirty(strategy.id)
 
         logger.info(f"Created strategy {strategy.id}: {strategy.name} for user {current_user.username}")
 
@@ -234,7 +244,7 @@ async def create_strategy(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def _start_strategy_background(strategy_id: int, strategy_config: dict, ft_manager: FreqTradeGatewayManager):
+async def _start_strategy_background(strategy_id: int, strategy_config: dict, ft_manager: FreqTradeGatewayManager) -> bool:
     """
     后台任务：执行策略启动
 
@@ -243,6 +253,9 @@ async def _start_strategy_background(strategy_id: int, strategy_config: dict, ft
     2. 根据结果更新数据库状态
     3. 推送WebSocket消息通知前端
     4. 启动日志监控服务
+
+    Returns:
+        bool: 是否启动成功（供批量启动汇总结果）
     """
     from database.session import SessionLocal
     from datetime import datetime
@@ -262,7 +275,7 @@ async def _start_strategy_background(strategy_id: int, strategy_config: dict, ft
 
             if not strategy:
                 logger.error(f"[BG Task] Strategy {strategy_id} not found in database after starting attempt")
-                return
+                return False
 
             if success:
                 # ✅ 启动成功：更新为running状态
@@ -272,6 +285,8 @@ async def _start_strategy_background(strategy_id: int, strategy_config: dict, ft
                 strategy.process_id = ft_manager.strategy_processes.get(strategy_id).pid if strategy_id in ft_manager.strategy_processes else None
 
                 await db.commit()
+                strategy_metadata_cache.invalidate(strategy_id)
+                strategy_state_store.mark_dirty(strategy_id)
 
                 logger.info(
                     f"[BG Task] ✅ Strategy {strategy_id} started successfully "
@@ -304,10 +319,13 @@ async def _start_strategy_background(strategy_id: int, strategy_config: dict, ft
                         "started_at": strategy.started_at.isoformat() if strategy.started_at else None
                     }
                 )
+                return True
             else:
                 # ❌ 启动失败：恢复为stopped
                 strategy.status = "stopped"
                 await db.commit()
+                strategy_metadata_cache.invalidate(strategy_id)
+                strategy_state_store.mark_dirty(strategy_id)
 
                 logger.error(f"[BG Task] ❌ Failed to start strategy {strategy_id}: create_strategy returned False")
 
@@ -321,6 +339,7 @@ async def _start_strategy_background(strategy_id: int, strategy_config: dict, ft
                         "error_type": "startup_failure"
                     }
                 )
+                return False
 
         except Exception as e:
             error_message = str(e)
@@ -338,6 +357,8 @@ async def _start_strategy_background(strategy_id: int, strategy_config: dict, ft
                 if strategy:
                     strategy.status = "stopped"
                     await db.commit()
+                    strategy_metadata_cache.invalidate(strategy_id)
+                    strategy_state_store.mark_dirty(strategy_id)
 
                     # 推送详细的错误信息
                     await ws_service.push_strategy_status(
@@ -355,6 +376,7 @@ async def _start_strategy_background(strategy_id: int, strategy_config: dict, ft
                     logger.info(f"[BG Task] Strategy {strategy_id} status reset to 'stopped'")
             except Exception as inner_e:
                 logger.error(f"[BG Task] Failed to recover strategy {strategy_id} status: {inner_e}")
+            return False
 
 
 def _analyze_startup_error(error_message: str, strategy_config: dict) -> dict:
@@ -446,6 +468,144 @@ def _analyze_startup_error(error_message: str, strategy_config: dict) -> dict:
     }
 
 
+def _build_strategy_config(strategy: Strategy) -> dict:
+    """根据策略记录生成FreqTrade启动配置"""
+    return {
+        "id": strategy.id,
+        "name": strategy.name,
+        "strategy_class": strategy.strategy_class,
+        "version": strategy.version,
+        "exchange": strategy.exchange,
+        "timeframe": strategy.timeframe,
+        "pair_whitelist": strategy.pair_whitelist,
+        "pair_blacklist": strategy.pair_blacklist,
+        "dry_run": strategy.dry_run,
+        "dry_run_wallet": strategy.dry_run_wallet,
+        "stake_amount": strategy.stake_amount,
+        "max_open_trades": strategy.max_open_trades,
+        "proxy_id": strategy.proxy_id
+    }
+
+
+async def _mark_bulk_strategies(db: AsyncSession, strategy_ids: List[int], skip_statuses: tuple, new_status: str):
+    """
+    批量操作前标记策略状态
+
+    Returns:
+        (待处理的策略列表, 跳过的策略, 不存在的策略ID)
+    """
+    result = await db.execute(select(Strategy).where(Strategy.id.in_(strategy_ids)))
+    found = {strategy.id: strategy for strategy in result.scalars().all()}
+
+    pending, skipped = [], []
+    for strategy_id in dict.fromkeys(strategy_ids):
+        strategy = found.get(strategy_id)
+        if strategy is None:
+            continue
+        if strategy.status in skip_statuses:
+            skipped.append({"id": strategy.id, "status": strategy.status})
+            continue
+        strategy.status = new_status
+        pending.append(strategy)
+
+    await db.commit()
+    for strategy in pending:
+        strategy_metadata_cache.invalidate(strategy.id)
+        strategy_state_store.mark_dirty(strategy.id)
+
+    not_found = [strategy_id for strategy_id in strategy_ids if strategy_id not in found]
+    return pending, skipped, not_found
+
+
+@router.post("/bulk/start", status_code=202)
+async def bulk_start_strategies(
+    request: BulkStrategyRequest,
+    db: AsyncSession = Depends(get_db),
+    ft_manager: FreqTradeGatewayManager = Depends(get_ft_manager)
+):
+    """
+    批量启动策略 - 异步模式，立即返回操作ID
+
+    有界并发、按交易所交错分波启动，进度通过WebSocket（strategies主题，
+    event_type=strategy_bulk_progress）推送，结果可通过 GET /bulk/{operation_id} 查询
+    """
+    try:
+        pending, skipped, not_found = await _mark_bulk_strategies(
+            db, request.strategy_ids, ("running", "starting"), "starting"
+        )
+        configs = [_build_strategy_config(strategy) for strategy in pending]
+
+        operation_id = ft_manager.orchestrator.submit(
+            "start",
+            configs,
+            lambda config: _start_strategy_background(config["id"], config, ft_manager)
+        )
+
+        logger.info(f"Bulk start of {len(configs)} strategies accepted (operation {operation_id})")
+
+        return {
+            "operation_id": operation_id,
+            "kind": "start",
+            "total": len(configs),
+            "skipped": skipped,
+            "not_found": not_found
+        }
+
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Failed to accept bulk start request: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/bulk/stop", status_code=202)
+async def bulk_stop_strategies(
+    request: BulkStrategyRequest,
+    db: AsyncSession = Depends(get_db),
+    ft_manager: FreqTradeGatewayManager = Depends(get_ft_manager)
+):
+    """批量停止策略 - 异步模式，立即返回操作ID"""
+    try:
+        pending, skipped, not_found = await _mark_bulk_strategies(
+            db, request.strategy_ids, ("stopped", "stopping"), "stopping"
+        )
+        items = [{"id": strategy.id, "name": strategy.name, "exchange": strategy.exchange} for strategy in pending]
+
+        operation_id = ft_manager.orchestrator.submit(
+            "stop",
+            items,
+            lambda item: _stop_strategy_background(item["id"], ft_manager),
+            stagger=False,
+            concurrency=settings.STRATEGY_BULK_MAX_CONCURRENCY
+        )
+
+        logger.info(f"Bulk stop of {len(items)} strategies accepted (operation {operation_id})")
+
+        return {
+            "operation_id": operation_id,
+            "kind": "stop",
+            "total": len(items),
+            "skipped": skipped,
+            "not_found": not_found
+        }
+
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Failed to accept bulk stop request: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/bulk/{operation_id}")
+async def get_bulk_operation(
+    operation_id: str,
+    ft_manager: FreqTradeGatewayManager = Depends(get_ft_manager)
+):
+    """获取批量操作进度与每个策略的结果"""
+    operation = ft_manager.orchestrator.get_operation(operation_id)
+    if operation is None:
+        raise HTTPException(status_code=404, detail="Bulk operation not found")
+    return operation
+
+
 @router.post("/{strategy_id}/start", status_code=202)
 async def start_strategy(
     strategy_id: int,
@@ -472,6 +632,8 @@ async def start_strategy(
         # 立即设置状态为"正在启动"
         strategy.status = "starting"
         await db.commit()
+        strategy_metadata_cache.invalidate(strategy_id)
+        strategy_state_store.mark_dirty(strategy_id)
 
         # 推送"正在启动"状态到WebSocket订阅客户端
         await ws_service.push_strategy_status(
@@ -484,21 +646,7 @@ async def start_strategy(
         )
 
         # 准备策略配置
-        strategy_config = {
-            "id": strategy.id,
-            "name": strategy.name,
-            "strategy_class": strategy.strategy_class,
-            "version": strategy.version,
-            "exchange": strategy.exchange,
-            "timeframe": strategy.timeframe,
-            "pair_whitelist": strategy.pair_whitelist,
-            "pair_blacklist": strategy.pair_blacklist,
-            "dry_run": strategy.dry_run,
-            "dry_run_wallet": strategy.dry_run_wallet,
-            "stake_amount": strategy.stake_amount,
-            "max_open_trades": strategy.max_open_trades,
-            "proxy_id": strategy.proxy_id
-        }
+        strategy_config = _build_strategy_config(strategy)
 
         # 启动后台任务执行实际启动操作
         asyncio.create_task(_start_strategy_background(strategy_id, strategy_config, ft_manager))
@@ -521,8 +669,8 @@ async def start_strategy(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def _stop_strategy_background(strategy_id: int, ft_manager: FreqTradeGatewayManager):
-    """后台任务：执行策略停止"""
+async def _stop_strategy_background(strategy_id: int, ft_manager: FreqTradeGatewayManager) -> bool:
+    """后台任务：执行策略停止，返回是否停止成功"""
     from database.session import SessionLocal
     from datetime import datetime
 
@@ -539,7 +687,7 @@ async def _stop_strategy_background(strategy_id: int, ft_manager: FreqTradeGatew
 
             if not strategy:
                 logger.error(f"Strategy {strategy_id} not found after stopping")
-                return
+                return False
 
             if success:
                 # 停止日志监控
@@ -559,6 +707,8 @@ async def _stop_strategy_background(strategy_id: int, ft_manager: FreqTradeGatew
                 strategy.process_id = None
 
                 await db.commit()
+                strategy_metadata_cache.invalidate(strategy_id)
+                strategy_state_store.mark_dirty(strategy_id)
 
                 logger.info(f"Background task: Strategy {strategy_id} stopped successfully")
 
@@ -571,10 +721,13 @@ async def _stop_strategy_background(strategy_id: int, ft_manager: FreqTradeGatew
                         "stopped_at": strategy.stopped_at.isoformat() if strategy.stopped_at else None
                     }
                 )
+                return True
             else:
                 # 停止失败，恢复为running
                 strategy.status = "running"
                 await db.commit()
+                strategy_metadata_cache.invalidate(strategy_id)
+                strategy_state_store.mark_dirty(strategy_id)
 
                 logger.error(f"Background task: Failed to stop strategy {strategy_id}")
 
@@ -587,6 +740,7 @@ async def _stop_strategy_background(strategy_id: int, ft_manager: FreqTradeGatew
                         "error": "Failed to stop FreqTrade instance"
                     }
                 )
+                return False
         except Exception as e:
             logger.error(f"Background task error for stopping strategy {strategy_id}: {e}", exc_info=True)
             # 尝试恢复状态
@@ -598,6 +752,8 @@ async def _stop_strategy_background(strategy_id: int, ft_manager: FreqTradeGatew
                 if strategy:
                     strategy.status = "running"
                     await db.commit()
+                    strategy_metadata_cache.invalidate(strategy_id)
+                    strategy_state_store.mark_dirty(strategy_id)
 
                     await ws_service.push_strategy_status(
                         strategy_id=strategy.id,
@@ -609,6 +765,7 @@ async def _stop_strategy_background(strategy_id: int, ft_manager: FreqTradeGatew
                     )
             except Exception as inner_e:
                 logger.error(f"Failed to recover strategy {strategy_id} status: {inner_e}")
+            return False
 
 
 @router.post("/{strategy_id}/stop", status_code=202)
@@ -637,6 +794,8 @@ async def stop_strategy(
         # 立即设置状态为"正在停止"
         strategy.status = "stopping"
         await db.commit()
+        strategy_metadata_cache.invalidate(strategy_id)
+        strategy_state_store.mark_dirty(strategy_id)
 
         # 推送"正在停止"状态到WebSocket订阅客户端
         await ws_service.push_strategy_status(
@@ -697,6 +856,8 @@ async def restart_strategy(
             strategy.port = None
             strategy.process_id = None
             await db.commit()
+            strategy_metadata_cache.invalidate(strategy_id)
+            strategy_state_store.mark_dirty(strategy_id)
 
             # 等待一小段时间确保进程完全停止
             import asyncio
@@ -731,6 +892,8 @@ async def restart_strategy(
         strategy.started_at = datetime.now()
 
         await db.commit()
+        strategy_metadata_cache.invalidate(strategy_id)
+        strategy_state_store.mark_dirty(strategy_id)
 
         # 重新获取策略以获取更新后的port和process_id
         await db.refresh(strategy)
@@ -766,16 +929,52 @@ async def restart_strategy(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+_LOG_LINE_PATTERN = re.compile(
+    r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - ([\w\.]+) - (\w+) - (.+)'
+)
+
+
+def _parse_log_lines(log_lines: List[str]) -> List[dict]:
+    """解析FreqTrade日志格式，无法解析的行作为原始内容"""
+    parsed_logs = []
+    for line in log_lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        match = _LOG_LINE_PATTERN.match(line)
+        if match:
+            timestamp_str, logger_name, level, message = match.groups()
+            parsed_logs.append({
+                "timestamp": timestamp_str,
+                "logger": logger_name,
+                "level": level,
+                "message": message,
+                "raw": line
+            })
+        else:
+            parsed_logs.append({
+                "timestamp": "",
+                "logger": "unknown",
+                "level": "INFO",
+                "message": line,
+                "raw": line
+            })
+    return parsed_logs
+
+
 @router.get("/{strategy_id}/logs")
 async def get_strategy_logs(
     strategy_id: int,
     lines: int = 100,
+    source: str = "log",
     db: AsyncSession = Depends(get_db)
 ):
     """获取策略运行日志（结构化）
 
     Parameters:
     - lines: 返回最后N行日志，默认100行
+    - source: log (FreqTrade日志文件，默认) 或 output (进程stdout/stderr最近输出，含日志初始化前的异常)
 
     返回格式：
     {
@@ -802,6 +1001,18 @@ async def get_strategy_logs(
         if not strategy:
             raise HTTPException(status_code=404, detail="Strategy not found")
 
+        # 进程stdout/stderr输出（内存缓冲）
+        if source == "output":
+            ft_manager = get_ft_manager()
+            logs = _parse_log_lines(ft_manager.process_output.tail(strategy_id, lines))
+            return {
+                "strategy_id": strategy_id,
+                "strategy_name": strategy.name,
+                "source": "output",
+                "logs": logs,
+                "total_returned": len(logs)
+            }
+
         # 使用日志监控服务获取结构化日志
         if log_monitor_service:
             logger.debug(f"Using log_monitor_service for strategy {strategy_id}")
@@ -817,7 +1028,6 @@ async def get_strategy_logs(
             # 降级方案：直接读取文件并解析
             logger.debug(f"Using fallback method for strategy {strategy_id} logs")
             from pathlib import Path
-            import re
 
             log_path = Path(__file__).parent.parent.parent / "logs" / "freqtrade" / f"strategy_{strategy_id}.log"
 
@@ -835,36 +1045,7 @@ async def get_strategy_logs(
                 all_lines = f.readlines()
                 log_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
 
-            # 解析日志格式
-            log_pattern = re.compile(
-                r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - ([\w\.]+) - (\w+) - (.+)'
-            )
-
-            parsed_logs = []
-            for line in log_lines:
-                line = line.strip()
-                if not line:
-                    continue
-
-                match = log_pattern.match(line)
-                if match:
-                    timestamp_str, logger_name, level, message = match.groups()
-                    parsed_logs.append({
-                        "timestamp": timestamp_str,
-                        "logger": logger_name,
-                        "level": level,
-                        "message": message,
-                        "raw": line
-                    })
-                else:
-                    # 无法解析的行，作为原始内容
-                    parsed_logs.append({
-                        "timestamp": "",
-                        "logger": "unknown",
-                        "level": "INFO",
-                        "message": line,
-                        "raw": line
-                    })
+            parsed_logs = _parse_log_lines(log_lines)
 
             return {
                 "strategy_id": strategy_id,
@@ -956,6 +1137,8 @@ async def update_strategy(
         strategy.updated_at = datetime.now(timezone.utc)
 
         await db.commit()
+        strategy_metadata_cache.invalidate(strategy_id)
+        strategy_state_store.mark_dirty(strategy_id)
 
         logger.info(f"Updated strategy {strategy_id}: {', '.join(updated_fields)}")
 
@@ -1005,6 +1188,8 @@ async def delete_strategy(
         strategy.status = "stopped"
 
         await db.commit()
+        strategy_metadata_cache.invalidate(strategy_id)
+        strategy_state_store.mark_dirty(strategy_id)
 
         logger.info(f"Deleted strategy {strategy_id}: {strategy.name}")
 
@@ -1,10 +1,12 @@
 # backend/api/v1/system.py
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from typing import Optional
 from core.freqtrade_manager import FreqTradeGatewayManager
 from core.api_gateway import FreqTradeAPIGateway
 from core.config_manager import config_manager
 from services.monitoring_service import MonitoringService
+from services.strategy_metadata_cache import strategy_metadata_cache
+from services.monitoring_snapshot import monitoring_snapshot, etag_matches
 
 router = APIRouter()
 
@@ -38,9 +40,11 @@ def get_monitoring_service() -> MonitoringService:
 
 @router.get("/capacity")
 async def get_system_capacity(
+    request: Request,
+    response: Response,
     ft_manager: FreqTradeGatewayManager = Depends(get_ft_manager)
 ):
-    """获取系统容量信息
+    """获取系统容量信息（来自共享监控快照，支持 ETag/304）
 
     Returns:
         {
@@ -54,8 +58,13 @@ async def get_system_capacity(
         }
     """
     try:
-        capacity_info = ft_manager.get_capacity_info()
-        return capacity_info
+        await monitoring_snapshot.ensure(["capacity"], ft_manager=ft_manager)
+        etag = monitoring_snapshot.etag(["capacity"])
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
+        return monitoring_snapshot.get("capacity")["data"]["info"]
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -271,9 +280,11 @@ async def reload_config(
 
 @router.get("/health")
 async def system_health_check(
+    request: Request,
+    response: Response,
     monitoring: MonitoringService = Depends(get_monitoring_service)
 ):
-    """系统健康检查
+    """系统健康检查（来自共享监控快照，支持 ETag/304）
 
     Returns:
         {
@@ -284,14 +295,19 @@ async def system_health_check(
         }
     """
     try:
-        # 获取监控服务的健康状态
-        health_status = monitoring.get_health_status()
+        await monitoring_snapshot.ensure(["monitoring"], monitoring_service=monitoring)
+        etag = monitoring_snapshot.etag(["monitoring"])
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
 
-        # 获取系统指标
-        system_metrics = monitoring.get_system_metrics()
+        response.headers["ETag"] = etag
+        snapshot = monitoring_snapshot.get("monitoring")
+        health_status = snapshot["data"]["health"]
+        system_metrics = snapshot["data"]["system"]
 
         return {
             **health_status,
+            "timestamp": snapshot["updated_at"],
             "metrics": {
                 "cpu_percent": system_metrics.get("cpu", {}).get("percent", 0),
                 "memory_percent": system_metrics.get("memory", {}).get("percent", 0),
@@ -307,6 +323,23 @@ async def system_health_check(
         }
 
 
+@router.get("/cache/strategy-metadata")
+async def get_strategy_metadata_cache_stats():
+    """获取策略元数据缓存统计
+
+    Returns:
+        {
+            "loaded": true,
+            "entries": 120,
+            "hits": 5000,
+            "misses": 3,
+            "hit_rate": 99.94,
+            ...
+        }
+    """
+    return strategy_metadata_cache.get_stats()
+
+
 @router.get("/statistics")
 async def get_system_statistics(
     ft_manager: FreqTradeGatewayManager = Depends(get_ft_manager),
@@ -20,6 +20,10 @@ from datetime import datetime
 import uuid
 
 from app.websocket.manager import manager
+from app.websocket.monitoring_broadcaster import MonitoringBroadcaster
+from services.signal_event_bus import signal_event_bus
+from services.strategy_state_store import strategy_state_store
+from services.monitoring_snapshot import monitoring_snapshot
 from models.user import User
 from database import get_db
 from config import settings
@@ -106,6 +110,16 @@ async def websocket_endpoint(
         "endpoint": "strategies|signals|monitoring",
         "data": {}
     }
+    {
+        "type": "replay",
+        "topic": "signals",
+        "epoch": "3f2a9c1b7d4e",
+        "after_seq": 1024
+    }
+    {
+        "type": "resync",
+        "topic": "strategies"
+    }
 
     服务器 -> 客户端:
     {
@@ -128,6 +142,24 @@ async def websocket_endpoint(
         "data": {...},
         "timestamp": "2025-10-14T10:30:00"
     }
+    {
+        "type": "data",
+        "topic": "signals",
+        "data": {"signals": [{..., "seq": 1025}], "epoch": "3f2a9c1b7d4e", "first_seq": 1025, "last_seq": 1025},
+        "timestamp": "2025-10-14T10:30:00"
+    }
+    {
+        "type": "data",
+        "topic": "strategies",
+        "data": {"kind": "snapshot", "version": 41, "strategies": [...], "total": 999, "running": 12, ...},
+        "timestamp": "2025-10-14T10:30:00"
+    }
+    {
+        "type": "data",
+        "topic": "strategies",
+        "data": {"kind": "delta", "version": 42, "base_version": 41, "changed": [...], "removed": [7], ...},
+        "timestamp": "2025-10-14T10:30:00"
+    }
     {
         "type": "error",
         "message": "Error message",
@@ -195,14 +227,28 @@ async def websocket_endpoint(
                         if topic:
                             # manager.subscribe 会自动创建动态主题
                             manager.subscribe(client_id, topic)
-                            await manager.send_personal_message(
-                                {
-                                    "type": "subscribed",
-                                    "topic": topic,
-                                    "timestamp": datetime.now().isoformat()
-                                },
-                                client_id
-                            )
+                            subscribed = {
+                                "type": "subscribed",
+                                "topic": topic,
+                                "timestamp": datetime.now().isoformat()
+                            }
+                            if topic == "signals":
+                                # 当前序号，客户端据此检测后续推送是否缺失
+                                subscribed["epoch"] = signal_event_bus.epoch
+                                subscribed["last_seq"] = signal_event_bus.last_seq
+                            await manager.send_personal_message(subscribed, client_id)
+                            if topic == "strategies" and strategy_state_store.loaded:
+                                # 先发送完整快照，之后的推送均为基于该版本的增量
+                                await manager.send_personal_message(
+                                    MonitoringBroadcaster.build_strategies_message(strategy_state_store.snapshot()),
+                                    client_id
+                                )
+                            if topic == "monitoring" and monitoring_snapshot.get("monitoring"):
+                                # 监控数据只在变化时推送，订阅时先发送当前快照
+                                await manager.send_personal_message(
+                                    MonitoringBroadcaster.build_monitoring_message(monitoring_snapshot.get("monitoring")),
+                                    client_id
+                                )
                             logger.info(f"Client {client_id} subscribed to {topic}")
                         else:
                             await manager.send_personal_message(
@@ -228,6 +274,29 @@ async def websocket_endpoint(
                         )
                         logger.info(f"Client {client_id} unsubscribed from {topic}")
 
+                    elif message_type == "replay":
+                        # 补发缓冲区中序号大于 after_seq 的信号（检测到序号缺失或重连后使用）
+                        after_seq = int(message.get("after_seq") or 0)
+                        if message.get("epoch") not in (None, signal_event_bus.epoch):
+                            after_seq = 0
+                        events, complete = signal_event_bus.replay(after_seq)
+                        await manager.send_personal_message(
+                            MonitoringBroadcaster.build_signals_message(events, replay=True, complete=complete),
+                            client_id
+                        )
+                        logger.debug(f"Replayed {len(events)} signals after seq {after_seq} to {client_id}")
+
+                    elif message_type == "resync":
+                        # 重新发送策略状态快照（客户端检测到增量版本不连续时使用）
+                        topic = message.get("topic") or "strategies"
+                        if topic != "strategies":
+                            raise ValueError(f"Resync is not supported for topic {topic}")
+                        await manager.send_personal_message(
+                            MonitoringBroadcaster.build_strategies_message(strategy_state_store.snapshot()),
+                            client_id
+                        )
+                        logger.debug(f"Resynced strategies v{strategy_state_store.version} to {client_id}")
+
                     elif message_type == "pong":
                         # 心跳响应
                         manager.update_heartbeat(client_id)
@@ -4,19 +4,118 @@ WebSocket Connection Manager
 
 功能：
 - 管理WebSocket连接
-- 广播消息
+- 广播消息（每条消息只序列化一次，写入各客户端的发送队列，由独立写任务并发发送）
+- 慢客户端处理（丢弃最旧 / 合并快照 / 断开）
 - 心跳检测
 - 断线处理
 """
-from typing import Dict, Set
+from typing import Dict, Set, Optional, Any
+from collections import deque
 from fastapi import WebSocket
 import asyncio
 import logging
 import json
 from datetime import datetime
 
+from config import settings
+
 logger = logging.getLogger(__name__)
 
+# 慢客户端策略
+SLOW_CLIENT_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+# 快照类主题：新消息完整替代旧消息，coalesce 策略下只保留最新一条待发送消息
+# （strategies 推送增量，不能合并；缺失时客户端按版本号请求 resync）
+COALESCE_TOPICS = {"monitoring", "capacity"}
+
+
+def serialize_message(message: dict) -> str:
+    """序列化消息（与 WebSocket.send_json 相同的格式）"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class ClientSendQueue:
+    """
+    单个客户端的有界发送队列
+
+    广播只把已序列化的消息放入队列，由该连接的写任务依次发送，
+    慢客户端不会阻塞其他客户端。
+    """
+
+    def __init__(self, client_id: str, websocket: WebSocket, max_size: int, policy: str, send_timeout: float):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.max_size = max_size
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.pending: deque = deque()  # [topic, text]
+        self.wakeup = asyncio.Event()
+        self.closed = False
+        self.writer_task: Optional[asyncio.Task] = None
+
+        # 统计
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def put(self, text: str, topic: Optional[str] = None) -> bool:
+        """
+        放入待发送消息（不等待发送）
+
+        Returns:
+            False 表示客户端积压已超过上限且策略为 disconnect
+        """
+        if self.closed:
+            return True
+
+        if self.policy == "coalesce" and topic in COALESCE_TOPICS:
+            for entry in self.pending:
+                if entry[0] == topic:
+                    entry[1] = text
+                    self.coalesced += 1
+                    return True
+
+        if len(self.pending) >= self.max_size:
+            if self.policy == "disconnect":
+                return False
+            self.pending.popleft()
+            self.dropped += 1
+
+        self.pending.append([topic, text])
+        self.wakeup.set()
+        return True
+
+    async def run(self, on_error):
+        """写任务：依次发送队列中的消息，发送失败或超时时回调 on_error"""
+        try:
+            while not self.closed:
+                if not self.pending:
+                    self.wakeup.clear()
+                    await self.wakeup.wait()
+                    continue
+
+                _, text = self.pending.popleft()
+                try:
+                    # asyncio.timeout 不会为每次发送额外创建 Task
+                    async with asyncio.timeout(self.send_timeout):
+                        await self.websocket.send_text(text)
+                    self.sent += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error sending message to {self.client_id}: {e}")
+                    on_error(self.client_id)
+                    return
+        except asyncio.CancelledError:
+            pass
+
+    def close(self):
+        """停止写任务并丢弃未发送的消息"""
+        self.closed = True
+        self.pending.clear()
+        if self.writer_task and self.writer_task is not asyncio.current_task():
+            self.writer_task.cancel()
+
 
 class ConnectionManager:
     """WebSocket连接管理器"""
@@ -47,11 +146,31 @@ class ConnectionManager:
         # 心跳检测任务
         self.heartbeat_task = None
 
+        # 每个客户端的发送队列：{client_id: ClientSendQueue}
+        self.send_queues: Dict[str, ClientSendQueue] = {}
+        self.queue_size = settings.WS_CLIENT_QUEUE_SIZE
+        self.slow_client_policy = settings.WS_SLOW_CLIENT_POLICY
+        self.send_timeout = settings.WS_SEND_TIMEOUT_SECONDS
+        if self.slow_client_policy not in SLOW_CLIENT_POLICIES:
+            logger.warning(f"Unknown WS_SLOW_CLIENT_POLICY '{self.slow_client_policy}', using coalesce")
+            self.slow_client_policy = "coalesce"
+
+        # 广播统计
+        self.broadcasts = 0
+        self.slow_client_disconnects = 0
+        self.dropped_from_closed = 0
+
     async def connect(self, websocket: WebSocket, client_id: str):
-        """接受WebSocket连接"""
+        """接受WebSocket连接，并启动该连接的写任务"""
         await websocket.accept()
         self.active_connections[client_id] = websocket
         self.heartbeat_status[client_id] = datetime.now()
+
+        send_queue = ClientSendQueue(
+            client_id, websocket, self.queue_size, self.slow_client_policy, self.send_timeout
+        )
+        send_queue.writer_task = asyncio.create_task(send_queue.run(self.disconnect))
+        self.send_queues[client_id] = send_queue
         logger.info(f"Client {client_id} connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, client_id: str):
@@ -59,6 +178,11 @@ class ConnectionManager:
         if client_id in self.active_connections:
             del self.active_connections[client_id]
 
+        send_queue = self.send_queues.pop(client_id, None)
+        if send_queue:
+            self.dropped_from_closed += len(send_queue.pending)
+            send_queue.close()
+
         if client_id in self.heartbeat_status:
             del self.heartbeat_status[client_id]
 
@@ -102,43 +226,55 @@ class ConnectionManager:
                 logger.info(f"Removed empty dynamic topic: {topic}")
 
     async def send_personal_message(self, message: dict, client_id: str):
-        """发送个人消息"""
-        if client_id in self.active_connections:
-            try:
-                websocket = self.active_connections[client_id]
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending message to {client_id}: {e}")
-                self.disconnect(client_id)
+        """发送个人消息（进入该客户端的发送队列，与广播消息保持顺序）"""
+        self._enqueue(client_id, serialize_message(message))
 
     async def broadcast(self, message: dict, topic: str = None):
         """
         广播消息
 
+        消息只序列化一次，放入每个接收者的发送队列后立即返回，
+        实际发送由各连接的写任务并发完成。
+
         Args:
             message: 消息内容
             topic: 主题（如果指定，只发送给订阅该主题的客户端）
         """
         # 确定接收者
         if topic and topic in self.subscriptions:
-            recipients = self.subscriptions[topic]
+            recipients = list(self.subscriptions[topic])
         else:
-            recipients = self.active_connections.keys()
+            recipients = list(self.active_connections.keys())
 
-        # 发送消息
-        disconnected_clients = []
-        for client_id in recipients:
-            if client_id in self.active_connections:
-                try:
-                    websocket = self.active_connections[client_id]
-                    await websocket.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to {client_id}: {e}")
-                    disconnected_clients.append(client_id)
+        if not recipients:
+            return
 
-        # 清理断开的连接
-        for client_id in disconnected_clients:
+        self.broadcasts += 1
+        text = serialize_message(message)
+        for client_id in recipients:
+            self._enqueue(client_id, text, topic)
+
+    def _enqueue(self, client_id: str, text: str, topic: Optional[str] = None):
+        """放入客户端发送队列，积压超限且策略为 disconnect 时断开该客户端"""
+        send_queue = self.send_queues.get(client_id)
+        if send_queue is None:
+            return
+
+        if not send_queue.put(text, topic):
+            logger.warning(
+                f"Client {client_id} fell behind ({len(send_queue.pending)} pending messages), disconnecting"
+            )
+            self.slow_client_disconnects += 1
+            websocket = send_queue.websocket
             self.disconnect(client_id)
+            asyncio.create_task(self._close_quietly(websocket))
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket):
+        try:
+            await websocket.close(code=1008)
+        except Exception:
+            pass
 
     def update_heartbeat(self, client_id: str):
         """更新心跳时间"""
@@ -204,7 +340,23 @@ class ConnectionManager:
             "subscriptions": {
                 topic: len(clients)
                 for topic, clients in self.subscriptions.items()
-            }
+            },
+            "fanout": self.get_fanout_stats()
+        }
+
+    def get_fanout_stats(self) -> Dict[str, Any]:
+        """获取发送队列统计"""
+        queues = list(self.send_queues.values())
+        return {
+            "policy": self.slow_client_policy,
+            "queue_size": self.queue_size,
+            "broadcasts": self.broadcasts,
+            "pending_messages": sum(len(q.pending) for q in queues),
+            "max_pending": max((len(q.pending) for q in queues), default=0),
+            "sent": sum(q.sent for q in queues),
+            "dropped": sum(q.dropped for q in queues),
+            "coalesced": sum(q.coalesced for q in queues),
+            "slow_client_disconnects": self.slow_client_disconnects
         }
 
 
@@ -12,14 +12,13 @@ import asyncio
 import logging
 from datetime import datetime
 from typing import Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.websocket.manager import manager
 from services.monitoring_service import MonitoringService
 from database.session import SessionLocal
-from models.signal import Signal
-from models.strategy import Strategy
+from services.signal_event_bus import signal_event_bus
+from services.strategy_state_store import strategy_state_store
+from services.monitoring_snapshot import monitoring_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -42,10 +41,12 @@ class MonitoringBroadcaster:
         self.intervals = {
             "monitoring": 5,      # 系统监控数据 - 每5秒
             "strategies": 10,     # 策略状态 - 每10秒
-            "signals": 3,         # 新信号 - 每3秒
             "capacity": 60,       # 容量趋势 - 每60秒
         }
 
+        # 新信号由事件总线实时推送，单条消息最多合并的信号数
+        self.max_signals_per_message = 500
+
     async def start(self):
         """启动广播服务"""
         if self.running:
@@ -97,31 +98,19 @@ class MonitoringBroadcaster:
         logger.info("Monitoring broadcaster stopped")
 
     async def _broadcast_monitoring_data(self):
-        """广播系统监控数据"""
+        """广播系统监控数据（来自共享监控快照，版本未变化时不推送）"""
         interval = self.intervals["monitoring"]
+        last_version = None
 
         while self.running:
             try:
-                # 获取系统指标
-                system_metrics = self.monitoring_service.get_system_metrics()
-
-                if system_metrics:
-                    # 获取健康状态
-                    health_status = self.monitoring_service.get_health_status()
-
-                    # 构建消息
-                    message = {
-                        "type": "data",
-                        "topic": "monitoring",
-                        "data": {
-                            "system": system_metrics,
-                            "health": health_status
-                        },
-                        "timestamp": datetime.now().isoformat()
-                    }
+                await monitoring_snapshot.ensure(["monitoring"], monitoring_service=self.monitoring_service)
+                snapshot = monitoring_snapshot.get("monitoring")
 
+                if snapshot and snapshot["data"]["system"] and snapshot["version"] != last_version:
                     # 广播给订阅monitoring主题的客户端
-                    await manager.broadcast(message, topic="monitoring")
+                    await manager.broadcast(self.build_monitoring_message(snapshot), topic="monitoring")
+                    last_version = snapshot["version"]
 
                     logger.debug(f"Broadcasted monitoring data to {len(manager.subscriptions['monitoring'])} clients")
 
@@ -130,126 +119,130 @@ class MonitoringBroadcaster:
 
             await asyncio.sleep(interval)
 
+    @staticmethod
+    def build_monitoring_message(snapshot: dict) -> dict:
+        """
+        构建系统监控推送消息
+
+        Args:
+            snapshot: monitoring_snapshot.get("monitoring") 的结果
+        """
+        return {
+            "type": "data",
+            "topic": "monitoring",
+            "data": {
+                "system": snapshot["data"]["system"],
+                "health": snapshot["data"]["health"],
+                "version": snapshot["version"]
+            },
+            "timestamp": snapshot["updated_at"]
+        }
+
     async def _broadcast_strategies_status(self):
-        """广播策略状态"""
+        """
+        广播策略状态
+
+        策略状态保存在内存状态表中，每个周期只重新加载被标记变更的策略，
+        并只推送状态或监控指标有变化的策略（带版本号的增量）；
+        客户端订阅或请求 resync 时单独发送完整快照。
+        """
         interval = self.intervals["strategies"]
 
         while self.running:
             try:
-                # 获取策略指标
-                strategy_metrics = self.monitoring_service.get_strategy_metrics()
-
-                # 从数据库获取策略列表
+                first_load = not strategy_state_store.loaded
                 async with SessionLocal() as session:
-                    result = await session.execute(select(Strategy))
-                    strategies = result.scalars().all()
-
-                    strategies_data = []
-                    for strategy in strategies:
-                        # 合并数据库信息和监控指标
-                        strategy_data = {
-                            "id": strategy.id,
-                            "name": strategy.name,
-                            "status": strategy.status,
-                            "description": strategy.description,
-                            "strategy_class": strategy.strategy_class,
-                            "exchange": strategy.exchange,
-                            "timeframe": strategy.timeframe,
-                            "is_active": strategy.is_active,
-                            "port": strategy.port,
-                            "created_at": strategy.created_at.isoformat() if strategy.created_at else None,
-                            "started_at": strategy.started_at.isoformat() if strategy.started_at else None,
-                        }
-
-                        # 添加监控指标
-                        if strategy.id in strategy_metrics:
-                            strategy_data["metrics"] = strategy_metrics[strategy.id]
-
-                        strategies_data.append(strategy_data)
-
-                # 构建消息
-                message = {
-                    "type": "data",
-                    "topic": "strategies",
-                    "data": {
-                        "strategies": strategies_data,
-                        "total": len(strategies_data),
-                        "running": sum(1 for s in strategies_data if s["status"] == "running"),
-                        "stopped": sum(1 for s in strategies_data if s["status"] == "stopped"),
-                        "error": sum(1 for s in strategies_data if s["status"] == "error")
-                    },
-                    "timestamp": datetime.now().isoformat()
-                }
-
-                # 广播给订阅strategies主题的客户端
-                await manager.broadcast(message, topic="strategies")
-
-                logger.debug(f"Broadcasted strategies status to {len(manager.subscriptions['strategies'])} clients")
+                    delta = await strategy_state_store.refresh(
+                        session, self.monitoring_service.get_strategy_metrics()
+                    )
+
+                if first_load:
+                    # 状态表加载前订阅的客户端还没有快照
+                    message = self.build_strategies_message(strategy_state_store.snapshot())
+                elif delta:
+                    message = self.build_strategies_message(delta)
+                else:
+                    message = None
+
+                if message:
+                    await manager.broadcast(message, topic="strategies")
+                    logger.debug(
+                        f"Broadcasted strategies {message['data']['kind']} v{message['data']['version']} "
+                        f"to {len(manager.subscriptions['strategies'])} clients"
+                    )
 
             except Exception as e:
                 logger.error(f"Error broadcasting strategies status: {e}", exc_info=True)
 
             await asyncio.sleep(interval)
 
+    @staticmethod
+    def build_strategies_message(data: dict) -> dict:
+        """
+        构建策略状态推送消息
+
+        Args:
+            data: 策略状态快照 (kind=snapshot) 或增量 (kind=delta)
+        """
+        return {
+            "type": "data",
+            "topic": "strategies",
+            "data": data,
+            "timestamp": datetime.now().isoformat()
+        }
+
     async def _broadcast_new_signals(self):
-        """广播新信号"""
-        interval = self.intervals["signals"]
-        last_signal_id = 0
+        """广播新信号（订阅信号事件总线，每条信号只推送一次，附带序号供客户端检测缺失）"""
+        queue = signal_event_bus.subscribe()
 
-        while self.running:
-            try:
-                async with SessionLocal() as session:
-                    # 获取最新的信号（ID大于last_signal_id）
-                    result = await session.execute(
-                        select(Signal)
-                        .where(Signal.id > last_signal_id)
-                        .order_by(Signal.id.desc())
-                        .limit(10)
+        try:
+            while self.running:
+                try:
+                    events = await queue.get()
+                    # 合并已积压的批次，减少推送消息数
+                    while not queue.empty() and len(events) < self.max_signals_per_message:
+                        events = events + queue.get_nowait()
+
+                    await manager.broadcast(self.build_signals_message(events), topic="signals")
+                    logger.debug(
+                        f"Broadcasted signals {events[0]['seq']}-{events[-1]['seq']} "
+                        f"to {len(manager.subscriptions['signals'])} clients"
                     )
-                    new_signals = result.scalars().all()
-
-                    if new_signals:
-                        # 更新last_signal_id
-                        last_signal_id = max(signal.id for signal in new_signals)
-
-                        # 构建信号数据
-                        signals_data = []
-                        for signal in reversed(new_signals):  # 按时间正序
-                            signals_data.append({
-                                "id": signal.id,
-                                "strategy_id": signal.strategy_id,
-                                "pair": signal.pair,
-                                "action": signal.action,
-                                "current_rate": float(signal.current_rate) if signal.current_rate else None,
-                                "amount": float(signal.amount) if signal.amount else None,
-                                "stake_amount": float(signal.stake_amount) if signal.stake_amount else None,
-                                "profit_ratio": float(signal.profit_ratio) if signal.profit_ratio else None,
-                                "signal_strength": signal.signal_strength,
-                                "indicators": signal.indicators,
-                                "message": signal.message,
-                                "created_at": signal.created_at.isoformat() if signal.created_at else None
-                            })
-
-                        # 构建消息
-                        message = {
-                            "type": "data",
-                            "topic": "signals",
-                            "data": {
-                                "signals": signals_data,
-                                "count": len(signals_data)
-                            },
-                            "timestamp": datetime.now().isoformat()
-                        }
-
-                        # 广播给订阅signals主题的客户端
-                        await manager.broadcast(message, topic="signals")
-
-                        logger.info(f"Broadcasted {len(signals_data)} new signals to {len(manager.subscriptions['signals'])} clients")
 
-            except Exception as e:
-                logger.error(f"Error broadcasting new signals: {e}", exc_info=True)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error broadcasting new signals: {e}", exc_info=True)
+        finally:
+            signal_event_bus.unsubscribe(queue)
 
-            await asyncio.sleep(interval)
+    @staticmethod
+    def build_signals_message(events: list, replay: bool = False, complete: bool = True) -> dict:
+        """
+        构建信号推送消息
+
+        Args:
+            events: 带序号(seq)的信号列表
+            replay: 是否为补发消息
+            complete: 补发时缓冲区是否覆盖了请求的全部序号
+        """
+        data = {
+            "signals": events,
+            "count": len(events),
+            "epoch": signal_event_bus.epoch,
+            "first_seq": events[0]["seq"] if events else None,
+            "last_seq": events[-1]["seq"] if events else signal_event_bus.last_seq
+        }
+        if replay:
+            data["replay"] = True
+            data["complete"] = complete
+
+        return {
+            "type": "data",
+            "topic": "signals",
+            "data": data,
+            "timestamp": datetime.now().isoformat()
+        }
 
     async def _broadcast_capacity_data(self):
         """广播容量数据"""
@@ -345,7 +338,10 @@ class MonitoringBroadcaster:
         return {
             "running": self.running,
             "active_tasks": len(self.broadcast_tasks),
-            "websocket_stats": manager.get_stats()
+            "websocket_stats": manager.get_stats(),
+            "signal_bus": signal_event_bus.get_stats(),
+            "strategy_state": strategy_state_store.get_stats(),
+            "monitoring_snapshot": monitoring_snapshot.get_stats()
         }
 
 
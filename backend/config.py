@@ -42,11 +42,27 @@ class Settings(BaseSettings):
     FREQTRADE_BASE_PORT: int = 8081
     FREQTRADE_MAX_PORT: int = 9080
     MAX_CONCURRENT_STRATEGIES: int = 999
+    FREQTRADE_HTTP_POOL_LIMIT: int = 200  # 访问FreqTrade实例的HTTP连接池总连接数
+    FREQTRADE_HTTP_POOL_LIMIT_PER_HOST: int = 4  # 每个实例端口的最大连接数
+    FREQTRADE_HTTP_KEEPALIVE_SECONDS: float = 30.0  # 空闲连接保持时间
+    FREQTRADE_OUTPUT_MODE: str = "buffer"  # 实例stdout/stderr处理: buffer (仅保留最近输出于内存环形缓冲) 或 file (同时写入轮转文件)
+    FREQTRADE_OUTPUT_BUFFER_LINES: int = 500  # 每个策略保留的最近输出行数
+    FREQTRADE_OUTPUT_BUFFER_BYTES: int = 65536  # 每个策略输出缓冲的内存上限（字节）
+    FREQTRADE_OUTPUT_FILE_MAX_BYTES: int = 10485760  # file模式下单个输出文件大小上限，超过后轮转
+    FREQTRADE_OUTPUT_FILE_BACKUPS: int = 3  # file模式下保留的轮转文件数
+    PROCESS_REGISTRY_RECONCILE_SECONDS: int = 600  # 进程表与全量进程扫描核对的间隔（秒）；平时按已登记的PID和端口校验，不扫描全部进程
 
     # Strategy Recovery
     AUTO_RECOVER_STRATEGIES: bool = True  # 启动时自动恢复运行中的策略
     RECOVERY_TIMEOUT: int = 300  # 策略恢复超时时间（秒）
     MAX_RECOVERY_RETRIES: int = 2  # 单个策略最大重试次数
+    STRATEGY_BULK_MAX_CONCURRENCY: int = 16  # 批量启动/停止/恢复时最多同时处理的策略数
+    STRATEGY_BULK_STARTS_PER_CPU: float = 2.0  # 每个CPU核心允许同时启动的策略数（与上限、内存余量取最小值）
+    STRATEGY_START_MEMORY_MB: int = 300  # 单个策略启动预估内存，按可用内存限制并发数
+    STRATEGY_BULK_MAX_CPU_PERCENT: float = 90.0  # CPU使用率超过该值时暂缓启动新策略
+    STRATEGY_BULK_MAX_MEMORY_PERCENT: float = 90.0  # 内存使用率超过该值时暂缓启动新策略
+    STRATEGY_START_WAVE_SIZE: int = 8  # 每波启动的策略数（按交易所交错，避免同时 load_markets）
+    STRATEGY_START_WAVE_INTERVAL_SECONDS: float = 5.0  # 启动波次间隔
 
     # Notification Services
     TELEGRAM_BOT_TOKEN: Optional[str] = None
@@ -61,8 +77,46 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     SMTP_FROM: Optional[str] = None
 
+    # Market Data
+    INDICATOR_BACKEND: str = "streaming"  # streaming (incremental), numpy (vectorized) or ta
+    INDICATOR_USE_NUMBA: bool = True  # numpy后端可选numba JIT加速（需安装numba）
+    CACHE_CODEC: str = "binary"  # Redis行情缓存编码: binary (列式二进制) 或 json
+    CACHE_CODEC_COMPRESS: bool = False  # binary编码是否zlib压缩
+    L0_CACHE_MAX_ENTRIES: int = 512  # 进程内L0缓存条目上限（0为禁用）
+    L0_CACHE_TTL_SECONDS: float = 5.0  # 进程内L0缓存最长存活时间
+    CACHE_STALE_WHILE_REVALIDATE_SECONDS: int = 0  # 缓存过期后继续返回旧值并后台刷新的时长（0为禁用）
+
+    # Signal Ingestion
+    SIGNAL_WRITE_BEHIND_ENABLED: bool = True  # Webhook信号先入队，后台批量写库
+    SIGNAL_BATCH_MAX_ROWS: int = 500  # 每批最多写入行数
+    SIGNAL_BATCH_FLUSH_MS: int = 50  # 批量写入间隔（毫秒）
+    SIGNAL_QUEUE_MAX_SIZE: int = 10000  # 队列上限，满时Webhook返回503
+    SIGNAL_ROLLUPS_ENABLED: bool = True  # 维护分钟/小时信号汇总表，统计接口优先读取汇总表
+    SIGNAL_LIST_MAX_LIMIT: int = 1000  # 信号列表单页最大行数
+    SIGNAL_LIST_COUNT_CAP: int = 10000  # 估算模式下最多计数的行数，超过即返回估算值
+    SIGNAL_EVENT_BUS_BACKEND: str = "memory"  # 新信号事件总线: memory (单进程) 或 redis (多worker共享序号)
+    SIGNAL_EVENT_BUFFER_SIZE: int = 10000  # 保留最近N条信号事件，供客户端按序号补发
+    SIGNAL_EVENT_SUBSCRIBER_QUEUE_SIZE: int = 1000  # 每个订阅者最多积压的批次数
+
+    # Data Retention
+    DATA_RETENTION_ENABLED: bool = True  # 定期清理过期数据（分区表直接删除过期分区）
+    DATA_RETENTION_INTERVAL_SECONDS: int = 3600  # 清理检查间隔
+    PARTITION_PREMAKE_COUNT: int = 3  # 提前创建的未来分区数
+    SIGNAL_RETENTION_DAYS: int = 30  # 信号保留天数（0为永久保留）
+    SIGNAL_ROLLUP_RETENTION_DAYS: int = 30  # 信号汇总表保留天数，更早的统计读取原始信号
+    KLINE_RETENTION_DAYS: int = 365  # K线保留天数
+    INDICATOR_RETENTION_DAYS: int = 90  # 技术指标保留天数
+    HEARTBEAT_HISTORY_RETENTION_DAYS: int = 7  # 心跳历史保留天数
+
+    # WebSocket Fan-out
+    WS_CLIENT_QUEUE_SIZE: int = 256  # 每个客户端最多积压的待发送消息数
+    WS_SLOW_CLIENT_POLICY: str = "coalesce"  # 积压超限时: drop_oldest 丢弃最旧 / coalesce 合并快照主题 / disconnect 断开
+    WS_SEND_TIMEOUT_SECONDS: float = 10.0  # 单条消息发送超时，超时断开客户端
+    STRATEGY_STATE_FULL_RELOAD_SECONDS: int = 300  # strategies 主题的策略状态全量重新加载间隔（其余时间只加载变更的策略）
+
     # Monitoring
     MONITORING_INTERVAL: int = 30
+    MONITORING_SNAPSHOT_INTERVAL_SECONDS: int = 5  # 监控快照（系统指标/策略统计/容量）刷新间隔，供广播与轮询接口共用
     CAPACITY_ALERT_THRESHOLD: float = 80.0
 
     class Config:
@@ -11,6 +11,8 @@ import logging
 from typing import Dict, Optional
 from pathlib import Path
 
+from core.http_client import PooledHttpClient
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +24,8 @@ class FreqTradeAPIGateway:
         self.app = FastAPI(title="FreqTrade API Gateway")
         self.routes_config: Dict[str, dict] = {}  # strategy_id -> upstream_config
         self.routes_file = Path("/app/gateway_routes.json")
+        self.http_client = PooledHttpClient()  # 共享连接池，按上游端口复用keep-alive连接
+        self.app.add_event_handler("shutdown", self.http_client.close)
         self.setup_routes()
 
     def setup_routes(self):
@@ -74,22 +78,21 @@ class FreqTradeAPIGateway:
                 body = await request.body()
 
             # 5. 转发请求到FreqTrade实例
-            async with aiohttp.ClientSession() as session:
-                async with session.request(
-                    method=request.method,
-                    url=target_url,
-                    headers=dict(request.headers),
-                    data=body,
-                    params=dict(request.query_params),
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    # 6. 返回响应
-                    response_data = await response.text()
-                    return JSONResponse(
-                        content=json.loads(response_data) if response_data else {},
-                        status_code=response.status,
-                        headers=dict(response.headers)
-                    )
+            async with self.http_client.request(
+                request.method,
+                target_url,
+                timeout=30,
+                headers=dict(request.headers),
+                data=body,
+                params=dict(request.query_params)
+            ) as response:
+                # 6. 返回响应
+                response_data = await response.text()
+                return JSONResponse(
+                    content=json.loads(response_data) if response_data else {},
+                    status_code=response.status,
+                    headers=dict(response.headers)
+                )
 
         except aiohttp.ClientError as e:
             logger.error(f"Upstream connection error for strategy {strategy_id}: {e}")
@@ -111,24 +114,20 @@ class FreqTradeAPIGateway:
             try:
                 # 并行获取所有策略状态
                 upstream_url = config["upstream"]
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        f"{upstream_url}/api/v1/status",
-                        timeout=aiohttp.ClientTimeout(total=10)
-                    ) as response:
-                        if response.status == 200:
-                            status_data = await response.json()
-                            all_status[strategy_id] = {
-                                "status": "healthy",
-                                "data": status_data,
-                                "upstream": upstream_url
-                            }
-                        else:
-                            all_status[strategy_id] = {
-                                "status": "error",
-                                "error": f"HTTP {response.status}",
-                                "upstream": upstream_url
-                            }
+                async with self.http_client.get(f"{upstream_url}/api/v1/status", timeout=10) as response:
+                    if response.status == 200:
+                        status_data = await response.json()
+                        all_status[strategy_id] = {
+                            "status": "healthy",
+                            "data": status_data,
+                            "upstream": upstream_url
+                        }
+                    else:
+                        all_status[strategy_id] = {
+                            "status": "error",
+                            "error": f"HTTP {response.status}",
+                            "upstream": upstream_url
+                        }
             except Exception as e:
                 all_status[strategy_id] = {
                     "status": "unreachable",
@@ -152,13 +151,9 @@ class FreqTradeAPIGateway:
         for strategy_id, config in self.routes_config.items():
             try:
                 upstream_url = config["health_check"]
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        upstream_url,
-                        timeout=aiohttp.ClientTimeout(total=5)
-                    ) as response:
-                        if response.status == 200:
-                            healthy_count += 1
+                async with self.http_client.get(upstream_url, timeout=5) as response:
+                    if response.status == 200:
+                        healthy_count += 1
             except:
                 pass
 
@@ -170,7 +165,8 @@ class FreqTradeAPIGateway:
             "healthy_strategies": healthy_count,
             "total_strategies": total_count,
             "gateway_port": self.gateway_port,
-            "routes_loaded": len(self.routes_config)
+            "routes_loaded": len(self.routes_config),
+            "http_client": self.http_client.get_stats()
         }
 
     async def _reload_routes_config(self):
@@ -2,16 +2,23 @@
 FreqTrade Gateway Manager - Multi-Instance Mode
 Manages multiple FreqTrade strategy instances with intelligent port allocation
 """
-import subprocess
 import psutil
 import json
 import os
-import aiohttp
 import asyncio
 from typing import Dict, List, Optional
 import logging
 from pathlib import Path
 
+from config import settings
+from core.http_client import PooledHttpClient
+from core.process_output import ProcessOutputStore
+from core.process_registry import ProcessRegistry
+from core.process_supervisor import (
+    ManagedProcess, ExternalProcess, ProcessExitWatcher, start_process, stop_process, stop_pid
+)
+from core.strategy_orchestrator import StrategyBulkOrchestrator
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,7 +26,7 @@ class FreqTradeGatewayManager:
     """FreqTrade网关管理器 - 反向代理模式"""
 
     def __init__(self):
-        self.strategy_processes: Dict[int, subprocess.Popen] = {}
+        self.strategy_processes: Dict[int, ManagedProcess] = {}  # 包括同步阶段注册的 ExternalProcess
         self.strategy_ports: Dict[int, int] = {}  # strategy_id -> port
         self.freqtrade_version = "2025.8"
         self.gateway_port = 8080  # 统一网关端口
@@ -33,6 +40,12 @@ class FreqTradeGatewayManager:
         self.strategies_path = project_root / "user_data" / "strategies"
         self.logs_path = project_root / "logs" / "freqtrade"
         self.port_pool = set(range(self.base_port, self.max_port + 1))  # 可用端口池
+        self.http_client = PooledHttpClient()  # 共享连接池，访问各实例API
+        self.process_output = ProcessOutputStore(logs_path=self.logs_path)  # 持续读取实例stdout/stderr，避免管道写满阻塞
+        self.orchestrator = StrategyBulkOrchestrator()  # 批量启动/停止/恢复（有界并发、分波启动）
+        self.exit_watcher = ProcessExitWatcher()  # 进程意外退出时立即通知（替代轮询检测）
+        self.exit_watcher.add_listener(self._on_process_exit)  # 最先执行：先释放进程和端口
+        self.process_registry = ProcessRegistry(self.base_config_path / "processes.json")  # 策略进程表（持久化，按PID/端口校验，避免全量扫描）
 
         # Ensure directories exist
         try:
@@ -45,7 +58,13 @@ class FreqTradeGatewayManager:
             logger.warning("FreqTrade manager will operate with reduced functionality")
 
     async def create_strategy(self, strategy_config: dict, db = None) -> bool:
-        """创建并启动新策略"""
+        """
+        创建并启动新策略
+
+        Args:
+            strategy_config: 策略配置
+            db: 数据库session（用于查询代理）
+        """
         strategy_id = strategy_config["id"]
 
         try:
@@ -67,12 +86,16 @@ class FreqTradeGatewayManager:
             logger.info(f"Started FreqTrade process for strategy {strategy_id} (PID: {process.pid})")
 
             # 4. 等待API就绪（传入process对象以检查进程存活性）
-            await self._wait_for_api_ready(port, process)
+            await self._wait_for_api_ready(port, process, strategy_id=strategy_id)
             logger.info(f"FreqTrade API ready for strategy {strategy_id}")
 
             # 5. 保存进程和端口信息
             self.strategy_processes[strategy_id] = process
             self.strategy_ports[strategy_id] = port
+            self.exit_watcher.watch(strategy_id, process)
+            self.process_registry.register(
+                strategy_id, process.pid, port, config_file, str(self.logs_path / f"strategy_{strategy_id}.log")
+            )
 
             # 6. 更新API Gateway路由
             await self._update_gateway_routes()
@@ -94,6 +117,8 @@ class FreqTradeGatewayManager:
 
             logger.info(f"Stopping strategy {strategy_id}")
             process = self.strategy_processes[strategy_id]
+            # 主动停止不属于意外退出，不再通知
+            self.exit_watcher.unwatch(strategy_id)
             port = self.strategy_ports.get(strategy_id)
 
             # 1. 通过API优雅停止
@@ -105,6 +130,7 @@ class FreqTradeGatewayManager:
 
             # 3. 清理资源
             del self.strategy_processes[strategy_id]
+            self.process_registry.unregister(strategy_id)
             if strategy_id in self.strategy_ports:
                 # 释放端口回端口池
                 released_port = self.strategy_ports[strategy_id]
@@ -123,27 +149,42 @@ class FreqTradeGatewayManager:
             return False
 
     async def stop_all_strategies(self) -> Dict[int, bool]:
-        """停止所有运行中的策略"""
-        results = {}
+        """停止所有运行中的策略（有界并发）"""
         strategy_ids = list(self.strategy_processes.keys())
 
         logger.info(f"Stopping {len(strategy_ids)} strategies...")
 
-        for strategy_id in strategy_ids:
-            results[strategy_id] = await self.stop_strategy(strategy_id)
+        summary = await self.orchestrator.run(
+            "stop",
+            [{"id": strategy_id} for strategy_id in strategy_ids],
+            lambda item: self.stop_strategy(item["id"]),
+            stagger=False,
+            concurrency=settings.STRATEGY_BULK_MAX_CONCURRENCY
+        )
+        results = {r["strategy_id"]: r["status"] == "succeeded" for r in summary["results"]}
+        # 批量操作结束后立即落盘进程表（关闭时不等待延迟保存）
+        await self.process_registry.flush()
 
         # 验证端口池状态
         logger.info(f"Port pool status: {len(self.port_pool)}/{self.max_strategies} ports available")
 
         return results
 
-    async def restart_strategy(self, strategy_id: int, db=None) -> bool:
-        """重启指定策略"""
+    async def restart_strategy(self, strategy_id: int, db=None, require_running: bool = True) -> bool:
+        """
+        重启指定策略
+
+        Args:
+            strategy_id: 策略ID
+            db: 数据库session
+            require_running: 策略未在运行时是否拒绝重启（进程已退出后的自动重启传False，直接重新启动）
+        """
         try:
             logger.info(f"Restarting strategy {strategy_id}")
 
             # 1. 检查策略是否在运行
-            if strategy_id not in self.strategy_processes:
+            is_running = strategy_id in self.strategy_processes
+            if not is_running and require_running:
                 logger.warning(f"Strategy {strategy_id} is not running, cannot restart")
                 return False
 
@@ -196,13 +237,14 @@ class FreqTradeGatewayManager:
                 }
 
             # 3. 停止策略
-            stop_success = await self.stop_strategy(strategy_id)
-            if not stop_success:
-                logger.error(f"Failed to stop strategy {strategy_id} before restart")
-                return False
+            if is_running:
+                stop_success = await self.stop_strategy(strategy_id)
+                if not stop_success:
+                    logger.error(f"Failed to stop strategy {strategy_id} before restart")
+                    return False
 
-            # 4. 等待一小段时间，确保资源完全释放
-            await asyncio.sleep(2)
+                # 4. 等待一小段时间，确保资源完全释放
+                await asyncio.sleep(2)
 
             # 5. 重新启动策略
             start_success = await self.create_strategy(strategy_config, db)
@@ -310,7 +352,10 @@ class FreqTradeGatewayManager:
         # 4. 获取进程资源使用情况
         try:
             proc = psutil.Process(process.pid)
-            cpu_percent = proc.cpu_percent(interval=1)
+            # 采样1秒CPU使用率（用 asyncio.sleep 代替 interval=1，避免阻塞事件循环）
+            proc.cpu_percent(interval=None)
+            await asyncio.sleep(1)
+            cpu_percent = proc.cpu_percent(interval=None)
             memory_mb = proc.memory_info().rss / 1024 / 1024
 
             return {
@@ -374,12 +419,8 @@ class FreqTradeGatewayManager:
         """检查FreqTrade API健康状态"""
         try:
             api_url = f"http://127.0.0.1:{port}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{api_url}/api/v1/ping",
-                    timeout=aiohttp.ClientTimeout(total=timeout)
-                ) as response:
-                    return response.status == 200
+            async with self.http_client.get(f"{api_url}/api/v1/ping", timeout=timeout) as response:
+                return response.status == 200
         except:
             return False
 
@@ -489,7 +530,7 @@ class FreqTradeGatewayManager:
 
         return str(config_file)
 
-    async def _start_freqtrade_process(self, config_file: str, strategy_id: int) -> subprocess.Popen:
+    async def _start_freqtrade_process(self, config_file: str, strategy_id: int) -> ManagedProcess:
         """启动FreqTrade进程"""
         log_file = self.logs_path / f"strategy_{strategy_id}.log"
 
@@ -518,17 +559,19 @@ class FreqTradeGatewayManager:
                 env['https_proxy'] = proxies['https']
             logger.info(f"Starting FreqTrade with proxy: {proxies}")
 
-        process = subprocess.Popen(
+        # 异步创建子进程（独立会话），由事件循环回收，启停都不阻塞事件循环
+        # stderr合并到stdout，由 process_output 持续读取（写入有界缓冲/轮转文件）
+        process = await start_process(
             cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
             env=env,
-            preexec_fn=os.setsid if os.name != 'nt' else None
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT
         )
+        self.process_output.attach(strategy_id, process.stdout)
 
         return process
 
-    async def _wait_for_api_ready(self, port: int, process: subprocess.Popen, timeout: int = 30):
+    async def _wait_for_api_ready(self, port: int, process: ManagedProcess, timeout: int = 30, strategy_id: Optional[int] = None):
         """
         等待FreqTrade API就绪
 
@@ -536,6 +579,7 @@ class FreqTradeGatewayManager:
             port: API端口
             process: FreqTrade进程对象
             timeout: 超时时间（秒），默认30秒
+            strategy_id: 策略ID（进程退出时从输出缓冲读取错误信息）
 
         Raises:
             Exception: 如果进程退出或API超时未响应
@@ -549,13 +593,14 @@ class FreqTradeGatewayManager:
                 # 进程已退出
                 exit_code = process.returncode
 
-                # 读取stderr获取错误信息
+                # 从输出缓冲读取错误信息（等待剩余输出读完）
                 stderr_output = ""
                 try:
-                    if process.stderr:
-                        stderr_output = process.stderr.read().decode('utf-8', errors='ignore')
+                    if strategy_id is not None:
+                        await self.process_output.wait_closed(strategy_id, timeout=5)
+                        stderr_output = "\n".join(self.process_output.tail(strategy_id))
                 except Exception as e:
-                    logger.warning(f"Failed to read stderr: {e}")
+                    logger.warning(f"Failed to read process output: {e}")
 
                 # 提取关键错误信息
                 error_summary = "Unknown error"
@@ -580,14 +625,10 @@ class FreqTradeGatewayManager:
 
             # 2️⃣ 检查API是否响应
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        f"{api_url}/api/v1/ping",
-                        timeout=aiohttp.ClientTimeout(total=5)
-                    ) as response:
-                        if response.status == 200:
-                            logger.info(f"✅ FreqTrade API on port {port} is ready (PID: {process.pid})")
-                            return True
+                async with self.http_client.get(f"{api_url}/api/v1/ping", timeout=5) as response:
+                    if response.status == 200:
+                        logger.info(f"✅ FreqTrade API on port {port} is ready (PID: {process.pid})")
+                        return True
             except Exception as e:
                 logger.debug(f"API not ready yet (port {port}): {e}")
 
@@ -632,31 +673,38 @@ class FreqTradeGatewayManager:
         """通过API优雅停止"""
         try:
             api_url = f"http://127.0.0.1:{port}"
-            async with aiohttp.ClientSession() as session:
-                await session.post(
-                    f"{api_url}/api/v1/stop",
-                    timeout=aiohttp.ClientTimeout(total=30)
-                )
+            async with self.http_client.post(f"{api_url}/api/v1/stop", timeout=30):
                 logger.debug(f"Sent stop signal to FreqTrade on port {port}")
         except:
             pass  # 忽略错误，将通过强制停止处理
 
-    async def _force_stop_process(self, process: subprocess.Popen):
-        """强制停止进程"""
+    async def _force_stop_process(self, process: ManagedProcess, timeout: float = 30):
+        """强制停止进程（先SIGTERM，超时后SIGKILL，等待期间不阻塞事件循环）"""
         try:
-            if process.poll() is None:
-                process.terminate()
-                try:
-                    process.wait(timeout=30)
-                except subprocess.TimeoutExpired:
-                    logger.warning("Process did not terminate gracefully, killing...")
-                    process.kill()
-                    process.wait()
+            await stop_process(process, timeout=timeout)
         except Exception as e:
             logger.error(f"Error stopping process: {e}")
 
+    async def _on_process_exit(self, strategy_id: int, pid: int, returncode: Optional[int]):
+        """进程意外退出：立即释放进程记录和端口，并移除网关路由"""
+        process = self.strategy_processes.get(strategy_id)
+        if process is None or process.pid != pid:
+            # 已被重新启动或已清理
+            return
+
+        del self.strategy_processes[strategy_id]
+        self.process_registry.unregister(strategy_id)
+        if strategy_id in self.strategy_ports:
+            released_port = self.strategy_ports.pop(strategy_id)
+            self.port_pool.add(released_port)
+            logger.info(f"Strategy {strategy_id} exited (code {returncode}), released port {released_port}")
+
+        await self._update_gateway_routes()
+
     async def _cleanup_failed_strategy(self, strategy_id: int):
         """清理失败的策略"""
+        self.exit_watcher.unwatch(strategy_id)
+        self.process_registry.unregister(strategy_id)
         if strategy_id in self.strategy_processes:
             await self._force_stop_process(self.strategy_processes[strategy_id])
             del self.strategy_processes[strategy_id]
@@ -735,6 +783,9 @@ class FreqTradeGatewayManager:
         """
         启动时恢复数据库中状态为running的策略
 
+        由 orchestrator 有界并发、按交易所分波启动；每个启动使用独立的数据库session，
+        旧进程按进程表查找（不扫描系统进程），恢复失败的策略最后一次性重置为stopped。
+
         Args:
             db: 数据库session
             max_retries: 单个策略最大重试次数
@@ -744,6 +795,7 @@ class FreqTradeGatewayManager:
         """
         from sqlalchemy import select, update
         from models.strategy import Strategy
+        from database.session import SessionLocal
 
         logger.info("Starting strategy recovery process...")
 
@@ -768,97 +820,95 @@ class FreqTradeGatewayManager:
                 logger.info("No running strategies to recover")
                 return results
 
-            # 2. 逐个尝试恢复策略
+            pending = []
             for strategy in running_strategies:
-                strategy_id = strategy.id
-
                 # ⭐ 跳过已经在 manager 中运行的策略（通过同步阶段注册的）
-                if strategy_id in self.strategy_processes:
-                    logger.info(f"Strategy {strategy_id} already running in manager (registered by sync), skipping recovery")
+                if strategy.id in self.strategy_processes:
+                    logger.info(f"Strategy {strategy.id} already running in manager (registered by sync), skipping recovery")
                     results["recovered"] += 1
                     results["details"].append({
-                        "strategy_id": strategy_id,
+                        "strategy_id": strategy.id,
                         "name": strategy.name,
                         "status": "already_running",
                         "retries": 0
                     })
                     continue
 
-                logger.info(f"Attempting to recover strategy {strategy_id}: {strategy.name}")
+                pending.append({
+                    "id": strategy.id,
+                    "name": strategy.name,
+                    "strategy_class": strategy.strategy_class,
+                    "exchange": strategy.exchange,
+                    "timeframe": strategy.timeframe,
+                    "pair_whitelist": strategy.pair_whitelist,
+                    "pair_blacklist": strategy.pair_blacklist,
+                    "dry_run": strategy.dry_run,
+                    "dry_run_wallet": strategy.dry_run_wallet,
+                    "stake_amount": strategy.stake_amount,
+                    "max_open_trades": strategy.max_open_trades,
+                    "proxy_id": strategy.proxy_id
+                })
 
-                retry_count = 0
-                recovered = False
+            if not pending:
+                return results
 
-                while retry_count < max_retries and not recovered:
-                    try:
-                        # 准备策略配置
-                        strategy_config = {
-                            "id": strategy.id,
-                            "name": strategy.name,
-                            "strategy_class": strategy.strategy_class,
-                            "exchange": strategy.exchange,
-                            "timeframe": strategy.timeframe,
-                            "pair_whitelist": strategy.pair_whitelist,
-                            "pair_blacklist": strategy.pair_blacklist,
-                            "dry_run": strategy.dry_run,
-                            "dry_run_wallet": strategy.dry_run_wallet,
-                            "stake_amount": strategy.stake_amount,
-                            "max_open_trades": strategy.max_open_trades,
-                            "proxy_id": strategy.proxy_id
-                        }
-
-                        # 尝试创建策略
-                        success = await self.create_strategy(strategy_config, db)
-
-                        if success:
-                            logger.info(f"✅ Successfully recovered strategy {strategy_id}")
-                            results["recovered"] += 1
-                            results["details"].append({
-                                "strategy_id": strategy_id,
-                                "name": strategy.name,
-                                "status": "recovered",
-                                "retries": retry_count
-                            })
-                            recovered = True
-                        else:
-                            retry_count += 1
-                            if retry_count < max_retries:
-                                logger.warning(f"Failed to recover strategy {strategy_id}, retry {retry_count}/{max_retries}")
-                                await asyncio.sleep(2)  # 重试前等待
+            async def recover(strategy_config: dict) -> bool:
+                # AsyncSession 不能并发使用，每个启动单独打开session
+                async with SessionLocal() as session:
+                    return await self.create_strategy(strategy_config, session)
 
-                    except Exception as e:
-                        retry_count += 1
-                        logger.error(f"Error recovering strategy {strategy_id} (attempt {retry_count}/{max_retries}): {e}")
-                        if retry_count < max_retries:
-                            await asyncio.sleep(2)
-
-                # 3. 如果所有重试都失败，重置状态为stopped
-                if not recovered:
-                    logger.warning(f"❌ Failed to recover strategy {strategy_id} after {max_retries} attempts, resetting to 'stopped'")
-                    try:
-                        stmt = update(Strategy).where(
-                            Strategy.id == strategy_id
-                        ).values(status='stopped')
-                        await db.execute(stmt)
-                        await db.commit()
+            # 3. 并发恢复（有界并发、按交易所交错分波启动、失败重试）
+            summary = await self.orchestrator.run("recover", pending, recover, max_retries=max_retries)
 
-                        results["failed"] += 1
-                        results["reset"] += 1
+            failed = []
+            for item in summary["results"]:
+                if item["status"] == "succeeded":
+                    logger.info(f"✅ Successfully recovered strategy {item['strategy_id']}")
+                    results["recovered"] += 1
+                    results["details"].append({
+                        "strategy_id": item["strategy_id"],
+                        "name": item["name"],
+                        "status": "recovered",
+                        "retries": item["attempts"] - 1
+                    })
+                else:
+                    failed.append(item)
+
+            # 4. 所有重试都失败的策略一次性重置为stopped
+            if failed:
+                failed_ids = [item["strategy_id"] for item in failed]
+                logger.warning(f"❌ Failed to recover strategies {failed_ids} after {max_retries} attempts, resetting to 'stopped'")
+                try:
+                    stmt = update(Strategy).where(
+                        Strategy.id.in_(failed_ids)
+                    ).values(status='stopped')
+                    await db.execute(stmt)
+                    await db.commit()
+
+                    results["failed"] += len(failed)
+                    results["reset"] += len(failed)
+                    for item in failed:
                         results["details"].append({
-                            "strategy_id": strategy_id,
-                            "name": strategy.name,
+                            "strategy_id": item["strategy_id"],
+                            "name": item["name"],
                             "status": "failed_and_reset",
-                            "retries": max_retries
+                            "retries": item["attempts"],
+                            "error": item["error"]
                         })
-                    except Exception as e:
-                        logger.error(f"Failed to reset strategy {strategy_id} status: {e}")
+                except Exception as e:
+                    logger.error(f"Failed to reset strategy statuses {failed_ids}: {e}")
+
+            results["operation_id"] = summary["operation_id"]
+            results["concurrency"] = summary["concurrency"]
+            results["duration_seconds"] = summary["duration_seconds"]
 
-            # 4. 日志摘要
+            # 5. 日志摘要
             logger.info("="*50)
             logger.info("Strategy Recovery Summary:")
             logger.info(f"  Total strategies found: {results['total_found']}")
             logger.info(f"  Successfully recovered: {results['recovered']}")
             logger.info(f"  Failed and reset: {results['failed']}")
+            logger.info(f"  Duration: {summary['duration_seconds']}s (concurrency {summary['concurrency']})")
             logger.info("="*50)
 
             return results
@@ -898,9 +948,28 @@ class FreqTradeGatewayManager:
             await db.rollback()
             return 0
 
+    async def list_freqtrade_processes(self, force_scan: bool = False) -> List[Dict]:
+        """
+        列出运行中的 FreqTrade 进程
+
+        平时从进程表读取（只校验已登记的PID和端口）；距上次核对超过
+        PROCESS_REGISTRY_RECONCILE_SECONDS 或 force_scan 时做一次全量扫描
+        （在线程中执行，不阻塞事件循环）并把结果合并进进程表（扫描期间登记/注销的策略以进程表为准）。
+
+        Returns:
+            List[Dict]: 与 scan_freqtrade_processes 相同格式的进程信息列表
+        """
+        if force_scan or self.process_registry.needs_reconcile():
+            since = self.process_registry.generation
+            processes = await asyncio.to_thread(self.scan_freqtrade_processes)
+            self.process_registry.reconcile(processes, since=since)
+            return processes
+        return self.process_registry.processes()
+
     def scan_freqtrade_processes(self) -> List[Dict]:
         """
-        扫描系统中所有运行的 FreqTrade 进程
+        扫描系统中所有运行的 FreqTrade 进程（遍历全部进程，开销大；
+        日常查询使用 list_freqtrade_processes）
 
         Returns:
             List[Dict]: 进程信息列表，每个元素包含:
@@ -987,7 +1056,7 @@ class FreqTradeGatewayManager:
         同步数据库状态与实际运行的进程状态
 
         这个方法会：
-        1. 扫描所有实际运行的 FreqTrade 进程
+        1. 列出所有实际运行的 FreqTrade 进程（进程表，必要时全量扫描核对）
         2. 对比数据库中的状态
         3. 清理僵尸进程（运行但没有API端口）
         4. 更新数据库状态以匹配实际情况
@@ -1019,8 +1088,8 @@ class FreqTradeGatewayManager:
         }
 
         try:
-            # 1. 扫描所有 FreqTrade 进程
-            running_processes = self.scan_freqtrade_processes()
+            # 1. 列出所有 FreqTrade 进程
+            running_processes = await self.list_freqtrade_processes()
             results["scanned_processes"] = len(running_processes)
             logger.info(f"Found {len(running_processes)} FreqTrade processes running on system")
 
@@ -1057,9 +1126,8 @@ class FreqTradeGatewayManager:
 
                     try:
                         # 杀死僵尸进程
-                        proc = psutil.Process(pid)
-                        proc.terminate()
-                        proc.wait(timeout=10)
+                        if not await stop_pid(pid, timeout=10):
+                            raise Exception("process still running after SIGKILL")
                         logger.info(f"✅ Killed zombie process PID={pid} for strategy {strategy_id}")
                         results["killed_zombies"] += 1
                         results["details"].append({
@@ -1085,24 +1153,13 @@ class FreqTradeGatewayManager:
                     if api_ok:
                         # 注册到 manager
                         try:
-                            # 创建 Popen 对象的替代品（因为我们没有实际的Popen对象）
-                            # 我们需要修改 manager 的数据结构来存储这些信息
-                            class ExternalProcess:
-                                def __init__(self, pid):
-                                    self.pid = pid
-                                    self._proc = psutil.Process(pid)
-
-                                def poll(self):
-                                    try:
-                                        if self._proc.is_running():
-                                            return None  # Still running
-                                        return self._proc.returncode if hasattr(self._proc, 'returncode') else 0
-                                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                                        return -1  # Process dead
-
-                            # 注册到 manager
+                            # 注册到 manager（不是本进程启动的子进程，使用 ExternalProcess）
                             self.strategy_processes[strategy_id] = ExternalProcess(pid)
                             self.strategy_ports[strategy_id] = port
+                            self.exit_watcher.watch(strategy_id, self.strategy_processes[strategy_id])
+                            self.process_registry.register(
+                                strategy_id, pid, port, proc_info['config_file'], proc_info['log_file']
+                            )
 
                             # 从端口池中移除该端口
                             if port in self.port_pool:
@@ -1141,9 +1198,8 @@ class FreqTradeGatewayManager:
                         results["zombie_processes"] += 1
                         # 杀死不健康的孤儿进程
                         try:
-                            proc = psutil.Process(pid)
-                            proc.terminate()
-                            proc.wait(timeout=10)
+                            if not await stop_pid(pid, timeout=10):
+                                raise Exception("process still running after SIGKILL")
                             logger.info(f"✅ Killed unhealthy orphan process PID={pid}")
                             results["killed_zombies"] += 1
                         except Exception as e:
@@ -1164,21 +1220,12 @@ class FreqTradeGatewayManager:
 
                         # 注册到 manager（如果还没有）
                         if needs_registration:
-                            class ExternalProcess:
-                                def __init__(self, pid):
-                                    self.pid = pid
-                                    self._proc = psutil.Process(pid)
-
-                                def poll(self):
-                                    try:
-                                        if self._proc.is_running():
-                                            return None  # Still running
-                                        return self._proc.returncode if hasattr(self._proc, 'returncode') else 0
-                                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                                        return -1  # Process dead
-
                             self.strategy_processes[strategy_id] = ExternalProcess(pid)
                             self.strategy_ports[strategy_id] = port
+                            self.exit_watcher.watch(strategy_id, self.strategy_processes[strategy_id])
+                            self.process_registry.register(
+                                strategy_id, pid, port, proc_info['config_file'], proc_info['log_file']
+                            )
 
                             # 从端口池中移除该端口
                             if port in self.port_pool:
@@ -1218,6 +1265,8 @@ class FreqTradeGatewayManager:
                     await db.commit()
 
                     # 从 manager 中清理
+                    self.exit_watcher.unwatch(strategy_id)
+                    self.process_registry.unregister(strategy_id)
                     if strategy_id in self.strategy_processes:
                         del self.strategy_processes[strategy_id]
                     if strategy_id in self.strategy_ports:
@@ -1253,7 +1302,7 @@ class FreqTradeGatewayManager:
             results["errors"].append(f"Critical error: {e}")
             return results
 
-    async def _cleanup_old_strategy_processes(self, strategy_id: int):
+    async def _cleanup_old_strategy_processes(self, strategy_id: int, all_processes: Optional[List[Dict]] = None):
         """
         清理指定策略的所有旧进程
 
@@ -1261,24 +1310,17 @@ class FreqTradeGatewayManager:
 
         Args:
             strategy_id: 策略ID
+            all_processes: 已扫描的FreqTrade进程列表（为None时按进程表查找该策略的进程，不扫描系统）
         """
         try:
             # 1. 从 manager 中清理（如果存在）
+            self.exit_watcher.unwatch(strategy_id)
             if strategy_id in self.strategy_processes:
                 logger.info(f"Cleaning up strategy {strategy_id} from manager")
                 old_process = self.strategy_processes[strategy_id]
 
                 # 尝试优雅停止
-                try:
-                    if old_process.poll() is None:  # Process still running
-                        old_process.terminate()
-                        try:
-                            old_process.wait(timeout=5)
-                        except:
-                            old_process.kill()
-                            old_process.wait()
-                except Exception as e:
-                    logger.warning(f"Error stopping old process from manager: {e}")
+                await self._force_stop_process(old_process, timeout=5)
 
                 del self.strategy_processes[strategy_id]
 
@@ -1289,30 +1331,25 @@ class FreqTradeGatewayManager:
                 logger.info(f"Released port {port} back to pool")
                 del self.strategy_ports[strategy_id]
 
-            # 3. 扫描系统中该策略的所有进程并清理
-            all_processes = self.scan_freqtrade_processes()
-            strategy_processes = [p for p in all_processes if p['strategy_id'] == strategy_id]
+            # 3. 查找该策略的所有旧进程并清理
+            if all_processes is None:
+                registered = self.process_registry.lookup(strategy_id)
+                strategy_processes = [registered] if registered else []
+            else:
+                strategy_processes = [p for p in all_processes if p['strategy_id'] == strategy_id]
 
             if strategy_processes:
                 logger.warning(f"Found {len(strategy_processes)} orphan processes for strategy {strategy_id}, cleaning up...")
                 for proc_info in strategy_processes:
                     pid = proc_info['pid']
                     try:
-                        proc = psutil.Process(pid)
-                        proc.terminate()
-                        proc.wait(timeout=5)
-                        logger.info(f"✅ Killed orphan process PID={pid} for strategy {strategy_id}")
-                    except psutil.TimeoutExpired:
-                        try:
-                            proc.kill()
-                            proc.wait()
-                            logger.info(f"✅ Force killed orphan process PID={pid} for strategy {strategy_id}")
-                        except Exception as e:
-                            logger.error(f"Failed to kill orphan process PID={pid}: {e}")
-                    except psutil.NoSuchProcess:
-                        logger.debug(f"Process PID={pid} already terminated")
+                        if await stop_pid(pid, timeout=5):
+                            logger.info(f"✅ Killed orphan process PID={pid} for strategy {strategy_id}")
+                        else:
+                            logger.error(f"Failed to kill orphan process PID={pid}")
                     except Exception as e:
                         logger.error(f"Error cleaning up process PID={pid}: {e}")
+                self.process_registry.unregister(strategy_id)
 
             logger.info(f"✅ Old processes cleanup completed for strategy {strategy_id}")
 
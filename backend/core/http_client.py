@@ -0,0 +1,145 @@
+"""
+Pooled HTTP Client
+Long-lived aiohttp session shared by the FreqTrade manager and API gateway
+"""
+from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
+from collections import deque
+import asyncio
+import time
+import logging
+import aiohttp
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PooledHttpClient:
+    """
+    Connection-pooled HTTP client for FreqTrade instances
+
+    One ClientSession (and TCPConnector) is created lazily and reused, so
+    requests to the same upstream port reuse keep-alive connections instead
+    of opening a new TCP connection per call.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+        latency_window: int = 1000
+    ):
+        self.limit = limit if limit is not None else settings.FREQTRADE_HTTP_POOL_LIMIT
+        self.limit_per_host = (
+            limit_per_host if limit_per_host is not None else settings.FREQTRADE_HTTP_POOL_LIMIT_PER_HOST
+        )
+        self.keepalive_timeout = (
+            keepalive_timeout if keepalive_timeout is not None else settings.FREQTRADE_HTTP_KEEPALIVE_SECONDS
+        )
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = asyncio.Lock()
+
+        # Statistics
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.sessions_created = 0
+        self._latencies: deque = deque(maxlen=latency_window)
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use or after close"""
+        if self._session is not None and not self._session.closed:
+            return self._session
+
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout
+                )
+                self._session = aiohttp.ClientSession(connector=connector)
+                self.sessions_created += 1
+                logger.info(
+                    f"Created pooled HTTP session (limit={self.limit}, "
+                    f"limit_per_host={self.limit_per_host}, keepalive={self.keepalive_timeout}s)"
+                )
+            return self._session
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, timeout: float = 30, **kwargs):
+        """
+        Send a request through the pool
+
+        Usage:
+            async with client.request("GET", url, timeout=5) as response:
+                data = await response.json()
+        """
+        session = await self.get_session()
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        started = time.perf_counter()
+        try:
+            async with session.request(
+                method,
+                url,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                **kwargs
+            ) as response:
+                yield response
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._latencies.append(time.perf_counter() - started)
+
+    def get(self, url: str, timeout: float = 30, **kwargs):
+        """Send a GET request (async context manager)"""
+        return self.request("GET", url, timeout=timeout, **kwargs)
+
+    def post(self, url: str, timeout: float = 30, **kwargs):
+        """Send a POST request (async context manager)"""
+        return self.request("POST", url, timeout=timeout, **kwargs)
+
+    async def close(self):
+        """Close the shared session and its pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage and request latency statistics"""
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            index = min(len(latencies) - 1, int(round(p / 100 * (len(latencies) - 1))))
+            return round(latencies[index] * 1000, 2)
+
+        connector = self._session.connector if self._session is not None and not self._session.closed else None
+        return {
+            "pool": {
+                "open": connector is not None,
+                "limit": self.limit,
+                "limit_per_host": self.limit_per_host,
+                "keepalive_timeout": self.keepalive_timeout,
+                "sessions_created": self.sessions_created
+            },
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "latency_ms": {
+                "samples": len(latencies),
+                "avg": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+                "p50": percentile(50),
+                "p95": percentile(95),
+                "p99": percentile(99)
+            }
+        }
@@ -0,0 +1,191 @@
+"""
+Process Output Capture
+Drains FreqTrade stdout/stderr so a chatty instance never blocks on a full pipe
+"""
+from typing import Dict, List, Optional, Any
+from collections import deque
+from pathlib import Path
+import asyncio
+import logging
+from logging.handlers import RotatingFileHandler
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the pipe per call
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class OutputRingBuffer:
+    """Last lines of a process's output, capped by line count and total size (characters)"""
+
+    def __init__(self, max_lines: int = 500, max_bytes: int = 64 * 1024, max_line_bytes: int = 4096):
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.max_line_bytes = max_line_bytes
+        self._lines: deque = deque()
+        self.bytes = 0
+        self.total_lines = 0
+        self.dropped_lines = 0
+
+    def append(self, line: str):
+        if len(line) > self.max_line_bytes:
+            line = line[:self.max_line_bytes] + "...[truncated]"
+        self._lines.append(line)
+        self.bytes += len(line)
+        self.total_lines += 1
+        while self._lines and (len(self._lines) > self.max_lines or self.bytes > self.max_bytes):
+            self.bytes -= len(self._lines.popleft())
+            self.dropped_lines += 1
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def tail(self, lines: Optional[int] = None) -> List[str]:
+        if lines is None or lines >= len(self._lines):
+            return list(self._lines)
+        return list(self._lines)[-lines:] if lines > 0 else []
+
+
+class ProcessOutputDrain:
+    """
+    Reads one process's output stream until EOF
+
+    Every line goes into a bounded ring buffer; in "file" mode it is also
+    appended to a size-rotated file.
+    """
+
+    def __init__(
+        self,
+        stream: asyncio.StreamReader,
+        buffer: OutputRingBuffer,
+        file_handler: Optional[RotatingFileHandler] = None
+    ):
+        self.stream = stream
+        self.buffer = buffer
+        self.file_handler = file_handler
+        self.bytes_read = 0
+        self.task = asyncio.create_task(self._drain())
+
+    async def _drain(self):
+        pending = b""
+        try:
+            while True:
+                chunk = await self.stream.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.bytes_read += len(chunk)
+                *lines, pending = (pending + chunk).split(b"\n")
+                # Never hold more than one line's worth of an unterminated line
+                if len(pending) > self.buffer.max_line_bytes:
+                    lines.append(pending)
+                    pending = b""
+                self._write(lines)
+            if pending:
+                self._write([pending])
+        except Exception as e:
+            logger.error(f"Error draining process output: {e}")
+        finally:
+            if self.file_handler is not None:
+                self.file_handler.close()
+
+    def _write(self, lines: List[bytes]):
+        for raw in lines:
+            line = raw.decode("utf-8", errors="replace").rstrip("\r")
+            self.buffer.append(line)
+            if self.file_handler is not None:
+                self.file_handler.emit(logging.makeLogRecord({"msg": line}))
+
+    async def wait_closed(self, timeout: float = 5.0) -> bool:
+        """Wait until the stream reached EOF (the process exited and closed it)"""
+        try:
+            await asyncio.wait_for(asyncio.shield(self.task), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def cancel(self):
+        self.task.cancel()
+
+
+class ProcessOutputStore:
+    """
+    Output of every strategy process
+
+    ``attach`` starts draining a process's combined stdout/stderr. The
+    buffer survives the process so the last output is still available
+    for failure diagnostics and the logs API until the next start.
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        logs_path: Optional[Path] = None,
+        max_lines: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ):
+        self.mode = mode or settings.FREQTRADE_OUTPUT_MODE
+        self.logs_path = logs_path
+        self.max_lines = max_lines if max_lines is not None else settings.FREQTRADE_OUTPUT_BUFFER_LINES
+        self.max_bytes = max_bytes if max_bytes is not None else settings.FREQTRADE_OUTPUT_BUFFER_BYTES
+        self.buffers: Dict[int, OutputRingBuffer] = {}
+        self.drains: Dict[int, ProcessOutputDrain] = {}
+
+    def output_file(self, strategy_id: int) -> Optional[Path]:
+        if self.mode != "file" or self.logs_path is None:
+            return None
+        return self.logs_path / f"strategy_{strategy_id}.out"
+
+    def attach(self, strategy_id: int, stream: Optional[asyncio.StreamReader]) -> Optional[ProcessOutputDrain]:
+        """Start draining a new process's output (replaces the previous process's buffer)"""
+        self.detach(strategy_id)
+        if stream is None:
+            return None
+
+        buffer = OutputRingBuffer(self.max_lines, self.max_bytes)
+        self.buffers[strategy_id] = buffer
+
+        file_handler = None
+        output_file = self.output_file(strategy_id)
+        if output_file is not None:
+            try:
+                file_handler = RotatingFileHandler(
+                    output_file,
+                    maxBytes=settings.FREQTRADE_OUTPUT_FILE_MAX_BYTES,
+                    backupCount=settings.FREQTRADE_OUTPUT_FILE_BACKUPS,
+                    encoding="utf-8"
+                )
+                file_handler.setFormatter(logging.Formatter("%(message)s"))
+            except Exception as e:
+                logger.error(f"Failed to open output file {output_file}: {e}")
+
+        drain = ProcessOutputDrain(stream, buffer, file_handler)
+        self.drains[strategy_id] = drain
+        return drain
+
+    def detach(self, strategy_id: int):
+        """Stop draining (the buffer is dropped)"""
+        drain = self.drains.pop(strategy_id, None)
+        if drain is not None and not drain.task.done():
+            drain.cancel()
+        self.buffers.pop(strategy_id, None)
+
+    async def wait_closed(self, strategy_id: int, timeout: float = 5.0) -> bool:
+        drain = self.drains.get(strategy_id)
+        return drain is None or await drain.wait_closed(timeout)
+
+    def tail(self, strategy_id: int, lines: Optional[int] = None) -> List[str]:
+        """Last lines of a strategy process's output"""
+        buffer = self.buffers.get(strategy_id)
+        return buffer.tail(lines) if buffer else []
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "strategies": len(self.buffers),
+            "buffered_bytes": sum(b.bytes for b in self.buffers.values()),
+            "buffered_lines": sum(len(b) for b in self.buffers.values()),
+            "dropped_lines": sum(b.dropped_lines for b in self.buffers.values()),
+            "active_drains": sum(1 for d in self.drains.values() if not d.task.done())
+        }
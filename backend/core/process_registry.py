@@ -0,0 +1,296 @@
+"""
+Process Registry
+Indexed table of FreqTrade processes (strategy_id -> pid, port, start time)
+"""
+from typing import Dict, List, Optional, Any
+from pathlib import Path
+import asyncio
+import json
+import os
+import time
+import logging
+import psutil
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Start times read at different moments may differ by clock-tick rounding
+START_TIME_TOLERANCE = 1.0
+
+# Changes within this window are written to disk together
+SAVE_DELAY = 0.5
+
+
+def process_start_time(pid: int) -> Optional[float]:
+    """Start time of a live (non-zombie) process, or None if it is gone"""
+    try:
+        proc = psutil.Process(pid)
+        if proc.status() == psutil.STATUS_ZOMBIE:
+            return None
+        return proc.create_time()
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return None
+
+
+def listening_port(pid: int, port: Optional[int] = None) -> Optional[int]:
+    """
+    Local port the process listens on (``port`` if given and listening)
+
+    Only the sockets of this one process are inspected.
+    """
+    try:
+        for conn in psutil.Process(pid).connections(kind='inet'):
+            if conn.status == 'LISTEN' and conn.laddr.ip == '127.0.0.1':
+                if port is None or conn.laddr.port == port:
+                    return conn.laddr.port
+    except (psutil.AccessDenied, psutil.NoSuchProcess, psutil.ZombieProcess):
+        pass
+    return None
+
+
+class ProcessRegistry:
+    """
+    Known FreqTrade processes, persisted to disk
+
+    Processes are registered when started (or adopted by the status sync)
+    and removed when stopped, so finding a strategy's process is a lookup
+    plus a check of that single pid: it must still exist with the recorded
+    start time (a reused pid has a different one) and, for health, listen
+    on the recorded port. The file survives backend restarts; a full
+    process scan is only needed to reconcile every
+    PROCESS_REGISTRY_RECONCILE_SECONDS (processes started outside the
+    manager, a lost file).
+
+    Every register/unregister bumps ``generation``; a reconciliation
+    leaves alone strategies changed after the generation its scan started
+    at, since the scan may predate them.
+
+    Changes only mark the table dirty; inside the event loop the file is
+    written once per SAVE_DELAY in a worker thread (``flush`` writes it
+    at once, e.g. on shutdown), so a bulk start or stop of N strategies
+    does not rewrite it N times on the loop.
+    """
+
+    def __init__(self, path: Optional[Path] = None, reconcile_interval: Optional[float] = None):
+        self.path = path
+        self.reconcile_interval = (
+            reconcile_interval if reconcile_interval is not None
+            else settings.PROCESS_REGISTRY_RECONCILE_SECONDS
+        )
+        self.entries: Dict[int, Dict[str, Any]] = {}
+        self.last_reconciled_at: Optional[float] = None
+        self.generation = 0
+        self._changed_at: Dict[int, int] = {}
+        self.lookups = 0
+        self.reconciliations = 0
+        self.saves = 0
+        self._dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+        self._load()
+
+    def register(
+        self,
+        strategy_id: int,
+        pid: int,
+        port: Optional[int],
+        config_file: Optional[str] = None,
+        log_file: Optional[str] = None
+    ) -> bool:
+        """Record a strategy's running process (returns False if it is already gone)"""
+        start_time = process_start_time(pid)
+        if start_time is None:
+            self.unregister(strategy_id)
+            return False
+
+        self._touch(strategy_id)
+        self.entries[strategy_id] = {
+            "strategy_id": strategy_id,
+            "pid": pid,
+            "port": port,
+            "start_time": start_time,
+            "config_file": config_file,
+            "log_file": log_file
+        }
+        self._mark_dirty()
+        return True
+
+    def unregister(self, strategy_id: int):
+        self._touch(strategy_id)
+        if self.entries.pop(strategy_id, None) is not None:
+            self._mark_dirty()
+
+    def lookup(self, strategy_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Validated process of a strategy, in ``scan_freqtrade_processes`` format
+
+        Returns:
+            Process info (pid, strategy_id, config_file, log_file, port,
+            is_healthy), or None if nothing is registered or the process is
+            gone (its entry is dropped)
+        """
+        self.lookups += 1
+        entry = self.entries.get(strategy_id)
+        if entry is None:
+            return None
+
+        if not self._is_alive(entry):
+            logger.info(f"Registered process {entry['pid']} of strategy {strategy_id} is gone")
+            self.unregister(strategy_id)
+            return None
+
+        port = listening_port(entry["pid"], entry["port"]) if entry["port"] else None
+        return {
+            "pid": entry["pid"],
+            "strategy_id": strategy_id,
+            "config_file": entry["config_file"],
+            "log_file": entry["log_file"],
+            "port": port,
+            "is_healthy": port is not None
+        }
+
+    def processes(self) -> List[Dict[str, Any]]:
+        """All registered processes that are still running, validated"""
+        return [p for p in (self.lookup(sid) for sid in list(self.entries)) if p is not None]
+
+    def needs_reconcile(self) -> bool:
+        if self.last_reconciled_at is None:
+            return True
+        return time.time() - self.last_reconciled_at >= self.reconcile_interval
+
+    def reconcile(self, scanned: List[Dict[str, Any]], since: Optional[int] = None) -> Dict[str, int]:
+        """
+        Merge the result of a full process scan into the table
+
+        Registered processes that are still alive stay; scanned processes
+        are added or replace the entry of their strategy, except for
+        strategies registered or unregistered after ``since``.
+
+        Args:
+            scanned: Output of ``scan_freqtrade_processes``; with several
+                processes for one strategy, a healthy one is recorded
+            since: ``generation`` read before the scan started (None
+                trusts the scan for every strategy)
+
+        Returns:
+            Counts of added, removed and changed entries
+        """
+        chosen: Dict[int, Dict[str, Any]] = {}
+        for proc_info in scanned:
+            current = chosen.get(proc_info["strategy_id"])
+            if current is None or (proc_info["is_healthy"] and not current["is_healthy"]):
+                chosen[proc_info["strategy_id"]] = proc_info
+
+        # Entries whose process is gone are dropped; the scan may have missed
+        # or predated the others
+        entries = {sid: entry for sid, entry in self.entries.items() if self._is_alive(entry)}
+        for strategy_id, proc_info in chosen.items():
+            if since is not None and self._changed_at.get(strategy_id, 0) > since:
+                continue
+            start_time = process_start_time(proc_info["pid"])
+            if start_time is None:
+                continue
+            entries[strategy_id] = {
+                "strategy_id": strategy_id,
+                "pid": proc_info["pid"],
+                "port": proc_info["port"],
+                "start_time": start_time,
+                "config_file": proc_info.get("config_file"),
+                "log_file": proc_info.get("log_file")
+            }
+
+        stats = {
+            "added": len(entries.keys() - self.entries.keys()),
+            "removed": len(self.entries.keys() - entries.keys()),
+            "changed": sum(
+                1 for sid in entries.keys() & self.entries.keys()
+                if (entries[sid]["pid"], entries[sid]["port"]) != (self.entries[sid]["pid"], self.entries[sid]["port"])
+            )
+        }
+        if any(stats.values()):
+            logger.info(f"Process registry reconciled with full scan: {stats}")
+
+        self.entries = entries
+        self.last_reconciled_at = time.time()
+        self.reconciliations += 1
+        self._mark_dirty()
+        return stats
+
+    async def flush(self):
+        """Write pending changes now, without blocking the event loop"""
+        if self._save_task is not None and self._save_task is not asyncio.current_task():
+            self._save_task.cancel()
+        self._save_task = None
+        async with self._save_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            await asyncio.to_thread(self._save, self._serialize())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.entries),
+            "lookups": self.lookups,
+            "reconciliations": self.reconciliations,
+            "saves": self.saves,
+            "last_reconciled_at": self.last_reconciled_at
+        }
+
+    def _touch(self, strategy_id: int):
+        self.generation += 1
+        self._changed_at[strategy_id] = self.generation
+
+    @staticmethod
+    def _is_alive(entry: Dict[str, Any]) -> bool:
+        """The entry's pid still runs the process it recorded (same start time)"""
+        start_time = process_start_time(entry["pid"])
+        return start_time is not None and abs(start_time - entry["start_time"]) <= START_TIME_TOLERANCE
+
+    def _load(self):
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+            self.entries = {int(sid): entry for sid, entry in data.get("processes", {}).items()}
+            self.last_reconciled_at = data.get("last_reconciled_at")
+            logger.info(f"Loaded {len(self.entries)} registered processes from {self.path}")
+        except Exception as e:
+            # Unreadable file: start empty, the next reconciliation rebuilds it
+            logger.error(f"Failed to load process registry {self.path}: {e}")
+            self.entries = {}
+            self.last_reconciled_at = None
+
+    def _mark_dirty(self):
+        """Schedule a delayed save (saves at once when no event loop is running)"""
+        if self.path is None:
+            return
+        self._dirty = True
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._dirty = False
+            self._save(self._serialize())
+            return
+        if self._save_task is None:
+            self._save_task = asyncio.create_task(self._save_later())
+
+    async def _save_later(self):
+        await asyncio.sleep(SAVE_DELAY)
+        await self.flush()
+
+    def _serialize(self) -> str:
+        """Snapshot of the table, taken on the caller's thread"""
+        return json.dumps({
+            "last_reconciled_at": self.last_reconciled_at,
+            "processes": self.entries
+        })
+
+    def _save(self, data: str):
+        try:
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(data)
+            os.replace(tmp_path, self.path)
+            self.saves += 1
+        except Exception as e:
+            logger.error(f"Failed to save process registry {self.path}: {e}")
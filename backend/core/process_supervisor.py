@@ -0,0 +1,287 @@
+"""
+Process Supervisor
+Non-blocking start, stop and wait for FreqTrade processes, and exit notifications
+"""
+from typing import Dict, List, Optional, Callable, Awaitable
+import asyncio
+import os
+import sys
+import signal
+import logging
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+class ManagedProcess:
+    """
+    Child process started by this manager
+
+    Wraps ``asyncio.subprocess.Process`` with the ``Popen`` methods the rest
+    of the code uses (``pid``, ``poll``, ``terminate``, ``kill``), and an
+    awaitable ``wait`` with a timeout. The event loop reaps the child, so
+    waiting never blocks it.
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self._process = process
+        self.pid = process.pid
+        self.stdout = process.stdout
+        self.stderr = process.stderr
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self._process.returncode
+
+    def poll(self) -> Optional[int]:
+        """Exit code, or None while the process is running"""
+        return self._process.returncode
+
+    def terminate(self):
+        self._signal(signal.SIGTERM)
+
+    def kill(self):
+        self._signal(signal.SIGKILL)
+
+    def _signal(self, sig: int):
+        if self._process.returncode is not None:
+            return
+        try:
+            self._process.send_signal(sig)
+        except ProcessLookupError:
+            pass
+
+    async def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        """
+        Wait for the process to exit
+
+        Returns:
+            Exit code, or None if it is still running after ``timeout`` seconds
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                return await self._process.wait()
+        except TimeoutError:
+            return None
+
+
+class ExternalProcess:
+    """
+    Process not started by this manager (found by a process scan)
+
+    It is not our child, so its exit cannot be reaped; on Linux ``wait``
+    watches a pidfd (readable once the process exits), elsewhere it polls
+    every POLL_INTERVAL seconds. Neither blocks the event loop.
+    """
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.returncode: Optional[int] = None
+        self._proc = psutil.Process(pid)
+
+    def poll(self) -> Optional[int]:
+        """Exit code (0 if unknown, -1 if inaccessible), or None while running"""
+        if self.returncode is not None:
+            return self.returncode
+        try:
+            if self._proc.is_running() and self._proc.status() != psutil.STATUS_ZOMBIE:
+                return None
+            self.returncode = 0
+        except psutil.NoSuchProcess:
+            self.returncode = 0
+        except psutil.AccessDenied:
+            self.returncode = -1
+        return self.returncode
+
+    def terminate(self):
+        self._signal(signal.SIGTERM)
+
+    def kill(self):
+        self._signal(signal.SIGKILL)
+
+    def _signal(self, sig: int):
+        if self.poll() is not None:
+            return
+        try:
+            self._proc.send_signal(sig)
+        except psutil.NoSuchProcess:
+            pass
+
+    async def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        """
+        Wait for the process to exit
+
+        Returns:
+            Exit code, or None if it is still running after ``timeout`` seconds
+        """
+        pidfd = self._open_pidfd()
+        if pidfd is not None:
+            return await self._wait_pidfd(pidfd, timeout)
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while self.poll() is None:
+            if deadline is not None and loop.time() >= deadline:
+                return None
+            await asyncio.sleep(self.POLL_INTERVAL)
+        return self.returncode
+
+    def _open_pidfd(self) -> Optional[int]:
+        if not hasattr(os, "pidfd_open"):
+            return None
+        try:
+            return os.pidfd_open(self.pid)
+        except OSError:
+            # Already gone (ESRCH) or pidfd unsupported by the kernel
+            return None
+
+    async def _wait_pidfd(self, pidfd: int, timeout: Optional[float]) -> Optional[int]:
+        loop = asyncio.get_running_loop()
+        exited = loop.create_future()
+        loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+        try:
+            # The pidfd was opened after the first check, so re-check before waiting
+            if self.poll() is None:
+                async with asyncio.timeout(timeout):
+                    await exited
+        except TimeoutError:
+            return None
+        finally:
+            loop.remove_reader(pidfd)
+            os.close(pidfd)
+        return self.poll()
+
+
+def install_child_watcher() -> bool:
+    """
+    Reap children through pidfds instead of one waiter thread per child
+
+    Python 3.12+ already does this; on 3.11 the default watcher starts a
+    thread per process. Call once from the running event loop.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+        return False
+    try:
+        watcher = asyncio.PidfdChildWatcher()
+        asyncio.set_child_watcher(watcher)
+        watcher.attach_loop(asyncio.get_running_loop())
+        return True
+    except Exception as e:
+        # e.g. uvloop, which reaps children itself
+        logger.info(f"Keeping default child watcher: {e}")
+        return False
+
+
+# Called with (strategy_id, pid, returncode) when a watched process exits
+ExitListener = Callable[[int, int, Optional[int]], Awaitable[None]]
+
+
+class ProcessExitWatcher:
+    """
+    Reports processes that exit on their own
+
+    Each watched process has one task awaiting its exit (child watcher for
+    our children, pidfd for external processes), so listeners hear about a
+    crash within milliseconds instead of at the next polling sweep.
+    Processes are unwatched before a deliberate stop, so only unexpected
+    exits are reported.
+    """
+
+    def __init__(self):
+        self.listeners: List[ExitListener] = []
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self.exits_reported = 0
+
+    def add_listener(self, listener: ExitListener):
+        """Listeners run in registration order for each exit"""
+        self.listeners.append(listener)
+
+    def watch(self, strategy_id: int, process):
+        """Start watching a strategy's process (replaces a previous watch)"""
+        self.unwatch(strategy_id)
+        self._tasks[strategy_id] = asyncio.create_task(self._watch(strategy_id, process))
+
+    def unwatch(self, strategy_id: int):
+        """Stop watching, e.g. before stopping the process deliberately"""
+        task = self._tasks.pop(strategy_id, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+    def is_watched(self, strategy_id: int) -> bool:
+        return strategy_id in self._tasks
+
+    async def close(self):
+        for strategy_id in list(self._tasks):
+            self.unwatch(strategy_id)
+
+    async def _watch(self, strategy_id: int, process):
+        returncode = await process.wait()
+        # Removed before the listeners run, so a listener may watch a restarted process
+        self._tasks.pop(strategy_id, None)
+        await self.report_exit(strategy_id, process.pid, returncode)
+
+    async def report_exit(self, strategy_id: int, pid: int, returncode: Optional[int]):
+        """Run the listeners for an exit, also used for exits found outside a watch"""
+        self.exits_reported += 1
+        logger.warning(f"Strategy {strategy_id} process {pid} exited unexpectedly with code {returncode}")
+
+        for listener in list(self.listeners):
+            try:
+                await listener(strategy_id, pid, returncode)
+            except Exception as e:
+                logger.error(f"Process exit listener failed for strategy {strategy_id}: {e}", exc_info=True)
+
+
+async def start_process(cmd: List[str], env: Optional[Dict[str, str]] = None, **kwargs) -> ManagedProcess:
+    """
+    Start a process in its own session without blocking the event loop
+
+    Args:
+        cmd: Program and arguments
+        env: Environment variables
+        **kwargs: Passed to ``asyncio.create_subprocess_exec`` (stdout, stderr, ...)
+    """
+    process = await asyncio.create_subprocess_exec(*cmd, env=env, start_new_session=True, **kwargs)
+    return ManagedProcess(process)
+
+
+async def stop_process(process, timeout: float = 30.0, kill_timeout: float = 5.0) -> Optional[int]:
+    """
+    Terminate a process, killing it if it is still running after ``timeout``
+
+    Args:
+        process: ManagedProcess or ExternalProcess
+        timeout: Seconds to wait after SIGTERM
+        kill_timeout: Seconds to wait after SIGKILL
+
+    Returns:
+        Exit code, or None if the process could not be stopped
+    """
+    if process.poll() is not None:
+        return process.poll()
+
+    process.terminate()
+    returncode = await process.wait(timeout)
+    if returncode is None:
+        logger.warning(f"Process {process.pid} did not terminate within {timeout}s, killing...")
+        process.kill()
+        returncode = await process.wait(kill_timeout)
+        if returncode is None:
+            logger.error(f"Process {process.pid} did not exit after SIGKILL")
+    return returncode
+
+
+async def stop_pid(pid: int, timeout: float = 10.0, kill_timeout: float = 5.0) -> bool:
+    """
+    Stop a process by PID (terminate, then kill after ``timeout``)
+
+    Returns:
+        True if the process is gone
+    """
+    try:
+        process = ExternalProcess(pid)
+    except psutil.NoSuchProcess:
+        return True
+    return await stop_process(process, timeout, kill_timeout) is not None
@@ -2,7 +2,7 @@
 Redis Client for Token Caching and Session Management
 """
 import redis.asyncio as aioredis
-from typing import Optional
+from typing import Optional, Union
 from config import settings
 import logging
 
@@ -14,6 +14,8 @@ class RedisClient:
 
     def __init__(self):
         self.redis: Optional[aioredis.Redis] = None
+        # Connection without response decoding, for binary cache payloads
+        self.redis_bytes: Optional[aioredis.Redis] = None
 
     async def connect(self):
         """Initialize Redis connection"""
@@ -32,6 +34,15 @@ class RedisClient:
                 socket_keepalive=True
             )
 
+            self.redis_bytes = await aioredis.from_url(
+                redis_url,
+                password=settings.REDIS_PASSWORD,
+                decode_responses=False,
+                max_connections=50,
+                socket_connect_timeout=5,
+                socket_keepalive=True
+            )
+
             # Test connection
             await self.redis.ping()
             logger.info("✅ Redis connected successfully")
@@ -40,12 +51,15 @@ class RedisClient:
             logger.error(f"❌ Redis connection failed: {e}")
             # Don't fail the application, just log the error
             self.redis = None
+            self.redis_bytes = None
 
     async def disconnect(self):
         """Close Redis connection"""
         if self.redis:
             await self.redis.close()
             logger.info("Redis connection closed")
+        if self.redis_bytes:
+            await self.redis_bytes.close()
 
     async def get(self, key: str) -> Optional[str]:
         """Get value from Redis"""
@@ -60,7 +74,7 @@ class RedisClient:
     async def set(
         self,
         key: str,
-        value: str,
+        value: Union[str, bytes],
         expire_seconds: Optional[int] = None
     ) -> bool:
         """Set value in Redis with optional expiration"""
@@ -76,6 +90,57 @@ class RedisClient:
             logger.error(f"Redis SET error: {e}")
             return False
 
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get raw (undecoded) value from Redis"""
+        if not self.redis_bytes:
+            return None
+        try:
+            return await self.redis_bytes.get(key)
+        except Exception as e:
+            logger.error(f"Redis GET error: {e}")
+            return None
+
+    async def mget_bytes(self, keys: list) -> list:
+        """Get multiple raw (undecoded) values from Redis in one round trip"""
+        if not self.redis_bytes or not keys:
+            return [None] * len(keys)
+        try:
+            return await self.redis_bytes.mget(keys)
+        except Exception as e:
+            logger.error(f"Redis MGET error: {e}")
+            return [None] * len(keys)
+
+    async def mget(self, keys: list) -> list:
+        """Get multiple values from Redis in one round trip"""
+        if not self.redis or not keys:
+            return [None] * len(keys)
+        try:
+            return await self.redis.mget(keys)
+        except Exception as e:
+            logger.error(f"Redis MGET error: {e}")
+            return [None] * len(keys)
+
+    async def set_many(
+        self,
+        items: dict,
+        expire_seconds: Optional[int] = None
+    ) -> bool:
+        """Set multiple values with optional expiration in one pipeline"""
+        if not self.redis or not items:
+            return False
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    if expire_seconds:
+                        pipe.setex(key, expire_seconds, value)
+                    else:
+                        pipe.set(key, value)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis pipeline SET error: {e}")
+            return False
+
     async def delete(self, key: str) -> bool:
         """Delete key from Redis"""
         if not self.redis:
@@ -0,0 +1,277 @@
+"""
+Strategy Bulk Orchestrator
+Bounded-concurrency, staggered start/stop of many strategies with progress reporting
+"""
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime
+import asyncio
+import time
+import uuid
+import logging
+import psutil
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Per-strategy action (True on success) and progress callback signatures
+BulkAction = Callable[[Dict[str, Any]], Awaitable[bool]]
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def interleave_by_exchange(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Order items round-robin across exchanges
+
+    Consecutive starts then hit different exchanges, so a wave does not send
+    every instance's ``load_markets`` to the same exchange at once.
+    """
+    groups: Dict[str, deque] = OrderedDict()
+    for item in items:
+        groups.setdefault(item.get("exchange") or "", deque()).append(item)
+
+    ordered = []
+    while groups:
+        for exchange in list(groups):
+            ordered.append(groups[exchange].popleft())
+            if not groups[exchange]:
+                del groups[exchange]
+    return ordered
+
+
+class StrategyBulkOrchestrator:
+    """
+    Runs a start/stop action over many strategies
+
+    At most ``concurrency`` actions run at once (by default derived from the
+    configured limit, CPU count and free memory). Starts are launched in
+    waves of STRATEGY_START_WAVE_SIZE every STRATEGY_START_WAVE_INTERVAL_SECONDS,
+    ordered round-robin by exchange, and each start waits while CPU or memory
+    usage is above the configured ceiling. Failed actions are retried;
+    progress is reported through ``progress_callback`` and the per-strategy
+    results are kept for the last operations.
+    """
+
+    # Seconds between progress callbacks (the final one is always sent)
+    PROGRESS_INTERVAL = 1.0
+    # Seconds between retries of a failed action
+    RETRY_DELAY = 2.0
+    # Longest wait for CPU/memory headroom before starting anyway
+    HEADROOM_MAX_WAIT = 60.0
+    # Finished operations kept for get_operation
+    MAX_OPERATIONS = 20
+
+    def __init__(self, progress_callback: Optional[ProgressCallback] = None):
+        self.progress_callback = progress_callback
+        self.operations: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Background operations started by submit (kept referenced until done)
+        self._tasks = set()
+
+    def compute_concurrency(self) -> int:
+        """Concurrent start limit from settings, CPU count and available memory"""
+        cpu_limit = int((psutil.cpu_count() or 1) * settings.STRATEGY_BULK_STARTS_PER_CPU)
+        available_mb = psutil.virtual_memory().available / (1024 * 1024)
+        memory_limit = int(available_mb / settings.STRATEGY_START_MEMORY_MB)
+        return max(1, min(settings.STRATEGY_BULK_MAX_CONCURRENCY, cpu_limit, memory_limit))
+
+    async def run(
+        self,
+        kind: str,
+        items: List[Dict[str, Any]],
+        action: BulkAction,
+        max_retries: int = 1,
+        stagger: bool = True,
+        concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Run ``action`` for every item and wait for all of them
+
+        Args:
+            kind: Operation name (recover, start, stop)
+            items: Dicts with at least id, name and exchange
+            action: Coroutine returning True on success
+            max_retries: Attempts per strategy
+            stagger: Launch in waves ordered by exchange and wait for headroom (starts)
+            concurrency: Concurrent actions (default compute_concurrency())
+
+        Returns:
+            Summary with counts and one result per strategy
+        """
+        operation = self._new_operation(kind, len(items), concurrency or self.compute_concurrency())
+        await self._execute(operation, items, action, max_retries, stagger)
+        return self.get_operation(operation["operation_id"])
+
+    def submit(
+        self,
+        kind: str,
+        items: List[Dict[str, Any]],
+        action: BulkAction,
+        max_retries: int = 1,
+        stagger: bool = True,
+        concurrency: Optional[int] = None
+    ) -> str:
+        """
+        Start ``run`` in the background
+
+        Returns:
+            Operation ID for get_operation (registered before returning)
+        """
+        operation = self._new_operation(kind, len(items), concurrency or self.compute_concurrency())
+        task = asyncio.create_task(self._execute(operation, items, action, max_retries, stagger))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return operation["operation_id"]
+
+    async def _execute(
+        self,
+        operation: Dict[str, Any],
+        items: List[Dict[str, Any]],
+        action: BulkAction,
+        max_retries: int,
+        stagger: bool
+    ):
+        kind = operation["kind"]
+        logger.info(
+            f"Bulk {kind} of {len(items)} strategies started "
+            f"(operation {operation['operation_id']}, concurrency {operation['concurrency']})"
+        )
+
+        semaphore = asyncio.Semaphore(operation["concurrency"])
+        wave_size = settings.STRATEGY_START_WAVE_SIZE or operation["concurrency"]
+        ordered = interleave_by_exchange(items) if stagger else list(items)
+        tasks = []
+        for index, item in enumerate(ordered):
+            if stagger and index and index % wave_size == 0:
+                await asyncio.sleep(settings.STRATEGY_START_WAVE_INTERVAL_SECONDS)
+            tasks.append(asyncio.create_task(
+                self._run_item(operation, item, action, semaphore, max_retries, stagger)
+            ))
+        await asyncio.gather(*tasks)
+
+        operation["state"] = "completed"
+        operation["finished_at"] = datetime.now().isoformat()
+        operation["duration_seconds"] = round(time.monotonic() - operation["_started"], 2)
+        await self._report_progress(operation, force=True)
+
+        logger.info(
+            f"Bulk {kind} finished in {operation['duration_seconds']}s: "
+            f"{operation['succeeded']} succeeded, {operation['failed']} failed"
+        )
+
+    async def _run_item(
+        self,
+        operation: Dict[str, Any],
+        item: Dict[str, Any],
+        action: BulkAction,
+        semaphore: asyncio.Semaphore,
+        max_retries: int,
+        stagger: bool
+    ):
+        async with semaphore:
+            if stagger:
+                await self._wait_for_headroom()
+
+            operation["running"] += 1
+            started = time.monotonic()
+            attempts = 0
+            success = False
+            error = None
+            while attempts < max(1, max_retries) and not success:
+                attempts += 1
+                try:
+                    success = bool(await action(item))
+                    error = None if success else "action returned False"
+                except Exception as e:
+                    error = str(e)
+                    logger.error(f"Bulk {operation['kind']} of strategy {item['id']} failed (attempt {attempts}): {e}")
+                if not success and attempts < max_retries:
+                    await asyncio.sleep(self.RETRY_DELAY)
+            operation["running"] -= 1
+
+        operation["succeeded" if success else "failed"] += 1
+        operation["results"].append({
+            "strategy_id": item["id"],
+            "name": item.get("name"),
+            "exchange": item.get("exchange"),
+            "status": "succeeded" if success else "failed",
+            "attempts": attempts,
+            "duration_ms": round((time.monotonic() - started) * 1000, 1),
+            "error": error
+        })
+        await self._report_progress(operation)
+
+    async def _wait_for_headroom(self):
+        """Wait while CPU or memory usage is above the configured ceiling"""
+        waited = 0.0
+        while waited < self.HEADROOM_MAX_WAIT:
+            memory_percent = psutil.virtual_memory().percent
+            cpu_percent = psutil.cpu_percent(interval=None)
+            if (memory_percent < settings.STRATEGY_BULK_MAX_MEMORY_PERCENT
+                    and cpu_percent < settings.STRATEGY_BULK_MAX_CPU_PERCENT):
+                return
+            if waited == 0:
+                logger.warning(
+                    f"Waiting for headroom before starting strategy (CPU {cpu_percent}%, memory {memory_percent}%)"
+                )
+            await asyncio.sleep(1.0)
+            waited += 1.0
+        logger.warning(f"No CPU/memory headroom after {self.HEADROOM_MAX_WAIT}s, starting anyway")
+
+    async def _report_progress(self, operation: Dict[str, Any], force: bool = False):
+        if self.progress_callback is None:
+            return
+        now = time.monotonic()
+        if not force and now - operation["_last_progress"] < self.PROGRESS_INTERVAL:
+            return
+        operation["_last_progress"] = now
+        try:
+            await self.progress_callback(self._public(operation, include_results=False))
+        except Exception as e:
+            logger.error(f"Failed to report bulk operation progress: {e}")
+
+    def _new_operation(self, kind: str, total: int, concurrency: int) -> Dict[str, Any]:
+        operation = {
+            "operation_id": uuid.uuid4().hex[:12],
+            "kind": kind,
+            "state": "running",
+            "total": total,
+            "succeeded": 0,
+            "failed": 0,
+            "running": 0,
+            "concurrency": concurrency,
+            "started_at": datetime.now().isoformat(),
+            "finished_at": None,
+            "duration_seconds": None,
+            "results": [],
+            "_started": time.monotonic(),
+            "_last_progress": 0.0
+        }
+        self.operations[operation["operation_id"]] = operation
+        while len(self.operations) > self.MAX_OPERATIONS:
+            self.operations.popitem(last=False)
+        return operation
+
+    def get_operation(self, operation_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        """Get an operation's progress (and per-strategy results)"""
+        operation = self.operations.get(operation_id)
+        if operation is None:
+            return None
+        return self._public(operation, include_results)
+
+    def list_operations(self) -> List[Dict[str, Any]]:
+        """Recent operations, newest first, without per-strategy results"""
+        return [self._public(operation, include_results=False) for operation in reversed(self.operations.values())]
+
+    @staticmethod
+    def _public(operation: Dict[str, Any], include_results: bool) -> Dict[str, Any]:
+        data = {key: value for key, value in operation.items() if not key.startswith("_") and key != "results"}
+        data["completed"] = operation["succeeded"] + operation["failed"]
+        if include_results:
+            data["results"] = sorted(operation["results"], key=lambda r: r["strategy_id"])
+            failures = defaultdict(int)
+            for result in operation["results"]:
+                if result["error"]:
+                    failures[result["error"]] += 1
+            data["failure_reasons"] = dict(failures)
+        return data
@@ -13,6 +13,7 @@ from database.session import engine, Base, get_db, SessionLocal
 from api.v1 import system, strategies, signals, auth, monitoring, notifications, websocket, proxies, settings as settings_api
 from api.v1 import market, config as config_api, health, notify, realtime, heartbeat
 from core.freqtrade_manager import FreqTradeGatewayManager
+from core.process_supervisor import install_child_watcher
 from services.monitoring_service import MonitoringService
 from services.notification_service import NotificationService
 from services.notifyhub.core import notify_hub
@@ -29,6 +30,12 @@ from services.system_config_service import SystemConfigService
 from services.log_monitor_service import LogMonitorService
 import services.log_monitor_service as log_monitor_module
 from services.heartbeat_monitor_service import StrategyHeartbeatMonitor
+from services.signal_ingestion_service import SignalIngestionService
+from services.strategy_metadata_cache import strategy_metadata_cache
+from services.data_retention_service import data_retention_service
+from services.signal_rollup_service import signal_rollup_service
+from services.signal_event_bus import signal_event_bus
+from services.websocket_service import ws_service
 import services.heartbeat_monitor_service as heartbeat_monitor_module
 from pathlib import Path
 
@@ -50,6 +57,7 @@ rate_limit_handler: RateLimitHandler = None
 market_data_scheduler: MarketDataScheduler = None
 log_monitor_service_instance: LogMonitorService = None
 heartbeat_monitor_instance: StrategyHeartbeatMonitor = None
+signal_ingestion_service: SignalIngestionService = None
 
 
 @asynccontextmanager
@@ -69,12 +77,37 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to create database tables: {e}")
 
+    # Create current/upcoming time partitions before any writes (PostgreSQL partitioned tables only)
+    try:
+        async with SessionLocal() as db:
+            created = await data_retention_service.ensure_partitions(db)
+        if created:
+            logger.info(f"Created {created} time partitions")
+    except Exception as e:
+        logger.error(f"Failed to create time partitions: {e}", exc_info=True)
+
+    # 汇总表覆盖起点：首次启用时记录为下一个整点，之前的历史在回填前读取原始信号
+    try:
+        async with SessionLocal() as db:
+            if settings.SIGNAL_ROLLUPS_ENABLED:
+                await signal_rollup_service.ensure_coverage(db)
+            else:
+                # 停用期间汇总表不再维护，重新启用时从头记录覆盖起点
+                await signal_rollup_service.reset_coverage(db)
+    except Exception as e:
+        logger.error(f"Failed to initialize signal rollup coverage: {e}", exc_info=True)
+
     # Initialize FreqTrade manager
     try:
+        # 子进程退出通过pidfd通知（Python 3.11默认每个子进程一个等待线程）
+        if install_child_watcher():
+            logger.info("Using pidfd child watcher")
         freqtrade_manager = FreqTradeGatewayManager()
         # 将manager注入到strategies和system模块
         strategies._ft_manager = freqtrade_manager
         system._ft_manager = freqtrade_manager
+        # 批量启动/停止/恢复进度通过WebSocket推送
+        freqtrade_manager.orchestrator.progress_callback = ws_service.push_bulk_operation_progress
         logger.info("FreqTrade Gateway Manager initialized")
     except Exception as e:
         logger.error(f"Failed to initialize FreqTrade manager: {e}")
@@ -208,6 +241,13 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Failed to reset strategy statuses: {e}", exc_info=True)
 
+    # 加载策略元数据缓存（Webhook信号分级无需查询数据库）
+    try:
+        async with SessionLocal() as db:
+            await strategy_metadata_cache.load_all(db)
+    except Exception as e:
+        logger.error(f"Failed to load strategy metadata cache: {e}")
+
     # 扫描所有正在运行的策略并启动日志监控和心跳监控
     if (log_monitor_service_instance or heartbeat_monitor_instance) and freqtrade_manager:
         try:
@@ -259,6 +299,11 @@ async def lifespan(app: FastAPI):
         await monitoring_service.start()
         # 将服务注入到system模块
         system._monitoring_service = monitoring_service
+        if freqtrade_manager:
+            # 进程意外退出时立即处理：先标记error，再按心跳配置自动重启
+            freqtrade_manager.exit_watcher.add_listener(monitoring_service.handle_process_exit)
+            if heartbeat_monitor_instance:
+                freqtrade_manager.exit_watcher.add_listener(heartbeat_monitor_instance.handle_process_exit)
         logger.info("Monitoring service initialized")
     except Exception as e:
         logger.error(f"Failed to initialize monitoring service: {e}")
@@ -273,6 +318,23 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to initialize notification service: {e}")
 
+    # Initialize signal ingestion pipeline (write-behind batching for webhooks)
+    global signal_ingestion_service
+    if settings.SIGNAL_WRITE_BEHIND_ENABLED:
+        try:
+            signal_ingestion_service = SignalIngestionService(
+                SessionLocal,
+                max_batch_size=settings.SIGNAL_BATCH_MAX_ROWS,
+                flush_interval_ms=settings.SIGNAL_BATCH_FLUSH_MS,
+                max_queue_size=settings.SIGNAL_QUEUE_MAX_SIZE,
+                rollups_enabled=settings.SIGNAL_ROLLUPS_ENABLED
+            )
+            await signal_ingestion_service.start()
+            signals._ingestion_service = signal_ingestion_service
+            logger.info("✅ Signal ingestion service initialized")
+        except Exception as e:
+            logger.error(f"Failed to initialize signal ingestion service: {e}")
+
     # Initialize NotifyHub
     try:
         await notify_hub.start()
@@ -301,6 +363,13 @@ async def lifespan(app: FastAPI):
         logger.warning(f"⚠️ Redis initialization failed: {e}")
         logger.warning("Token caching will be disabled")
 
+    # Share new-signal events across workers through Redis pub/sub
+    if settings.SIGNAL_EVENT_BUS_BACKEND == "redis":
+        if redis_client.is_connected():
+            await signal_event_bus.start(redis_client.redis)
+        else:
+            logger.warning("Redis unavailable, signal event bus delivers in-process only")
+
     # Initialize Token Cache service
     try:
         if redis_client.is_connected():
@@ -433,6 +502,17 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Failed to stop monitoring service: {e}")
 
+    # Flush queued signals
+    if signal_ingestion_service:
+        try:
+            await signal_ingestion_service.stop()
+            logger.info("Signal ingestion service stopped")
+        except Exception as e:
+            logger.error(f"Failed to stop signal ingestion service: {e}")
+
+    # Stop signal event bus (Redis listener)
+    await signal_event_bus.stop()
+
     # Stop notification service
     if notification_service:
         try:
@@ -451,11 +531,18 @@ async def lifespan(app: FastAPI):
     # Stop all running strategies
     if freqtrade_manager:
         try:
+            # 关闭期间的进程退出不再触发状态更新和自动重启
+            await freqtrade_manager.exit_watcher.close()
             await freqtrade_manager.stop_all_strategies()
             logger.info("All strategies stopped")
         except Exception as e:
             logger.error(f"Failed to stop strategies: {e}")
 
+        try:
+            await freqtrade_manager.http_client.close()
+        except Exception as e:
+            logger.error(f"Failed to close FreqTrade HTTP client: {e}")
+
     # Close Redis connection
     try:
         await redis_client.disconnect()
@@ -490,6 +577,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 
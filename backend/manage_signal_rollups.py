@@ -0,0 +1,77 @@
+"""
+信号汇总表维护
+Backfill signal rollups from raw signals and check their consistency
+
+用法:
+    python manage_signal_rollups.py backfill --hours 720
+    python manage_signal_rollups.py check --hours 24 --granularity minute
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from database.session import SessionLocal
+from services.signal_rollup_service import signal_rollup_service, ROLLUP_GRANULARITIES
+
+
+async def backfill(hours: int):
+    """从原始信号表重建最近 N 小时的汇总数据（时间桶按UTC划分）"""
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(hours=hours)
+    async with SessionLocal() as db:
+        try:
+            written = await signal_rollup_service.backfill(db, start, end)
+        except Exception as e:
+            print(f"✗ 回填失败: {e}")
+            await db.rollback()
+            raise
+
+    print(f"✓ 回填完成: {start:%Y-%m-%d %H:%M} - {end:%Y-%m-%d %H:%M} UTC")
+    for granularity, count in written.items():
+        print(f"  - {granularity}: {count} 行")
+    async with SessionLocal() as db:
+        covered_from = await signal_rollup_service.get_coverage(db)
+    if covered_from is not None:
+        print(f"  汇总表覆盖起点: {covered_from:%Y-%m-%d %H:%M} UTC (之前的时间段统计读取原始信号)")
+
+
+async def check(hours: int, granularity: str):
+    """对比汇总表与原始信号表，返回是否一致"""
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(hours=hours)
+    async with SessionLocal() as db:
+        report = await signal_rollup_service.check_consistency(db, start, end, granularity)
+
+    print(f"检查 {report['checked_buckets']} 个 {granularity} 时间桶: {report['start']} - {report['end']}")
+    if report["consistent"]:
+        print("✓ 汇总表与原始信号一致")
+        return True
+
+    print(f"✗ 发现 {report['mismatch_count']} 处不一致:")
+    for mismatch in report["mismatches"]:
+        print(
+            f"  - {mismatch['bucket_start']} strategy={mismatch['strategy_id']} {mismatch['pair']} "
+            f"{mismatch['action']}/{mismatch['strength_level']}: "
+            f"raw={mismatch['raw_count']} rollup={mismatch['rollup_count']}"
+        )
+    print("提示: 运行 backfill 重建对应时间范围")
+    return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="信号汇总表维护")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backfill_parser = subparsers.add_parser("backfill", help="从原始信号重建汇总表")
+    backfill_parser.add_argument("--hours", type=int, default=24 * 30, help="回填最近N小时 (默认720)")
+
+    check_parser = subparsers.add_parser("check", help="检查汇总表与原始信号是否一致")
+    check_parser.add_argument("--hours", type=int, default=24, help="检查最近N小时 (默认24)")
+    check_parser.add_argument("--granularity", choices=list(ROLLUP_GRANULARITIES), default="minute")
+
+    args = parser.parse_args()
+    if args.command == "backfill":
+        asyncio.run(backfill(args.hours))
+    else:
+        consistent = asyncio.run(check(args.hours, args.granularity))
+        raise SystemExit(0 if consistent else 1)
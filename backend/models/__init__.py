@@ -3,6 +3,7 @@
 from .user import User
 from .strategy import Strategy
 from .signal import Signal
+from .signal_rollup import SignalRollup, SignalRollupCoverage
 from .notification import NotificationChannelConfig, NotificationFrequencyLimit, NotificationTimeRule, NotificationHistory
 from .proxy import Proxy
 from .user_settings import UserSettings
@@ -15,6 +16,8 @@ __all__ = [
     "User",
     "Strategy",
     "Signal",
+    "SignalRollup",
+    "SignalRollupCoverage",
     "NotificationChannelConfig",
     "NotificationFrequencyLimit",
     "NotificationTimeRule",
@@ -51,6 +51,7 @@ class Signal(Base):
         Index('idx_strategy_pair_created', 'strategy_id', 'pair', 'created_at'),
         Index('idx_pair_action_created', 'pair', 'action', 'created_at'),
         Index('idx_strength_created', 'strength_level', 'created_at'),
+        Index('idx_created_id', 'created_at', 'id'),  # Keyset pagination (created_at, id)
     )
 
     def __repr__(self):
@@ -0,0 +1,54 @@
+"""
+Signal rollup model
+"""
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from database.session import Base
+
+
+class SignalRollup(Base):
+    """Pre-aggregated signal counts per time bucket (minute/hour)"""
+    __tablename__ = "signal_rollups"
+
+    id = Column(Integer, primary_key=True)
+
+    # Bucket
+    granularity = Column(String(10), nullable=False)  # minute, hour
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+
+    # Dimensions
+    strategy_id = Column(Integer, nullable=False)
+    pair = Column(String(20), nullable=False)
+    action = Column(String(10), nullable=False)
+    strength_level = Column(String(10), nullable=False)
+
+    # Measures
+    signal_count = Column(Integer, nullable=False, default=0)
+    strength_sum = Column(Float, nullable=False, default=0.0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('granularity', 'bucket_start', 'strategy_id', 'pair', 'action', 'strength_level',
+                         name='uix_signal_rollup'),
+        Index('idx_signal_rollup_bucket', 'granularity', 'bucket_start'),
+        Index('idx_signal_rollup_strategy_bucket', 'granularity', 'strategy_id', 'bucket_start'),
+    )
+
+    def __repr__(self):
+        return (
+            f"<SignalRollup({self.granularity} {self.bucket_start} strategy={self.strategy_id} "
+            f"{self.pair} {self.action} {self.strength_level} count={self.signal_count})>"
+        )
+
+
+class SignalRollupCoverage(Base):
+    """Start of the range the rollups are complete for (single row, stored in UTC)"""
+    __tablename__ = "signal_rollup_coverage"
+
+    id = Column(Integer, primary_key=True, default=1)
+    covered_from = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<SignalRollupCoverage(covered_from={self.covered_from})>"
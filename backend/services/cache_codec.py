@@ -0,0 +1,175 @@
+"""
+Cache Codec Service
+Encodes K-line and indicator payloads for Redis (JSON or columnar binary)
+"""
+from typing import Dict, List, Any, Optional, Union
+from datetime import datetime
+import json
+import struct
+import zlib
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Binary payload layout:
+#   magic (4 bytes) | flags (1 byte) | body (optionally zlib-compressed)
+# K-line body:     uint32 n | int64[n] timestamps | float64[n] x 5 (open, high, low, close, volume)
+# Indicator body:  uint32 header_len | JSON header | float64 arrays listed in header["arrays"]
+KLINE_MAGIC = b"BWK1"
+INDICATOR_MAGIC = b"BWI1"
+FLAG_ZLIB = 0x01
+
+
+class JsonCacheCodec:
+    """JSON codec (original format, human-readable)"""
+
+    name = "json"
+    binary = False
+
+    def encode_klines(self, data: List[List]) -> str:
+        return json.dumps(data)
+
+    def decode_klines(self, raw: Union[str, bytes]) -> List[List]:
+        if isinstance(raw, bytes) and raw[:4] == KLINE_MAGIC:
+            return BinaryCacheCodec().decode_klines(raw)
+        return json.loads(raw)
+
+    def encode_indicator(self, data: Dict[str, Any]) -> str:
+        return json.dumps(_serializable_indicator(data))
+
+    def decode_indicator(self, raw: Union[str, bytes]) -> Dict[str, Any]:
+        if isinstance(raw, bytes) and raw[:4] == INDICATOR_MAGIC:
+            return BinaryCacheCodec().decode_indicator(raw)
+        return _with_values_alias(json.loads(raw))
+
+
+class BinaryCacheCodec:
+    """
+    Columnar binary codec
+
+    Packs K-line columns and indicator series as little-endian int64/float64
+    arrays, optionally zlib-compressed. Decoding also accepts JSON payloads
+    written by JsonCacheCodec, so both formats can coexist in Redis.
+    """
+
+    name = "binary"
+    binary = True
+
+    def __init__(self, compress: bool = False, compress_level: int = 1):
+        self.compress = compress
+        self.compress_level = compress_level
+
+    def encode_klines(self, data: List[List]) -> bytes:
+        n = len(data)
+        if n:
+            columns = list(zip(*data))
+            body = b"".join([
+                struct.pack("<I", n),
+                np.asarray(columns[0], dtype="<i8").tobytes(),
+                np.asarray(columns[1:6], dtype="<f8").tobytes()
+            ])
+        else:
+            body = struct.pack("<I", 0)
+        return self._wrap(KLINE_MAGIC, body)
+
+    def decode_klines(self, raw: Union[str, bytes]) -> List[List]:
+        if not _is_binary(raw, KLINE_MAGIC):
+            return json.loads(raw)
+
+        body = self._unwrap(raw)
+        (n,) = struct.unpack_from("<I", body, 0)
+        timestamps = np.frombuffer(body, dtype="<i8", count=n, offset=4).tolist()
+        values = np.frombuffer(body, dtype="<f8", count=5 * n, offset=4 + 8 * n).reshape(5, n).tolist()
+        return [list(row) for row in zip(timestamps, *values)]
+
+    def encode_indicator(self, data: Dict[str, Any]) -> bytes:
+        data = _serializable_indicator(data)
+        indicator_values = data.get("indicator_values") or {}
+
+        scalars: Dict[str, Any] = {}
+        arrays: List[List[Any]] = []
+        chunks: List[bytes] = []
+        for key, value in indicator_values.items():
+            if isinstance(value, list) and all(_is_number(v) for v in value):
+                arrays.append([key, len(value)])
+                chunks.append(np.asarray(value, dtype="<f8").tobytes())
+            else:
+                scalars[key] = value
+
+        header = {k: v for k, v in data.items() if k not in ("indicator_values", "values")}
+        header["scalars"] = scalars
+        header["arrays"] = arrays
+        header_bytes = json.dumps(header).encode("utf-8")
+
+        body = struct.pack("<I", len(header_bytes)) + header_bytes + b"".join(chunks)
+        return self._wrap(INDICATOR_MAGIC, body)
+
+    def decode_indicator(self, raw: Union[str, bytes]) -> Dict[str, Any]:
+        if not _is_binary(raw, INDICATOR_MAGIC):
+            return _with_values_alias(json.loads(raw))
+
+        body = self._unwrap(raw)
+        (header_len,) = struct.unpack_from("<I", body, 0)
+        header = json.loads(body[4:4 + header_len])
+
+        values: Dict[str, Any] = {}
+        offset = 4 + header_len
+        for key, length in header.pop("arrays"):
+            values[key] = np.frombuffer(body, dtype="<f8", count=length, offset=offset).tolist()
+            offset += 8 * length
+        values.update(header.pop("scalars"))
+
+        header["indicator_values"] = values
+        return _with_values_alias(header)
+
+    def _wrap(self, magic: bytes, body: bytes) -> bytes:
+        if self.compress:
+            return magic + bytes([FLAG_ZLIB]) + zlib.compress(body, self.compress_level)
+        return magic + b"\x00" + body
+
+    @staticmethod
+    def _unwrap(raw: bytes) -> bytes:
+        body = raw[5:]
+        if raw[4] & FLAG_ZLIB:
+            body = zlib.decompress(body)
+        return body
+
+
+def _is_binary(raw: Union[str, bytes], magic: bytes) -> bool:
+    return isinstance(raw, (bytes, bytearray)) and raw[:4] == magic
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _serializable_indicator(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy indicator data with the timestamp converted for serialization"""
+    data_copy = data.copy()
+    if isinstance(data_copy.get("timestamp"), datetime):
+        data_copy["timestamp"] = data_copy["timestamp"].isoformat()
+    return data_copy
+
+
+def _with_values_alias(data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """确保兼容性：如果没有values字段，从indicator_values复制"""
+    if data and "indicator_values" in data and "values" not in data:
+        data["values"] = data["indicator_values"]
+    return data
+
+
+def get_cache_codec(name: str = "json", compress: bool = False):
+    """
+    Factory function for cache codecs
+
+    Args:
+        name: "json" or "binary"
+        compress: zlib-compress binary payloads
+
+    Returns:
+        Cache codec instance
+    """
+    if name == "binary":
+        return BinaryCacheCodec(compress=compress)
+    return JsonCacheCodec()
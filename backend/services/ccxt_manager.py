@@ -34,6 +34,16 @@ class CCXTManager:
         "1d": "1d",
     }
 
+    # Timeframe duration in milliseconds
+    TIMEFRAME_MS = {
+        "1m": 60_000,
+        "5m": 300_000,
+        "15m": 900_000,
+        "1h": 3_600_000,
+        "4h": 14_400_000,
+        "1d": 86_400_000,
+    }
+
     def __init__(self, db: AsyncSession):
         self.db = db
         self.exchanges: Dict[str, ccxt.Exchange] = {}
@@ -165,6 +175,74 @@ class CCXTManager:
             logger.error(f"Failed to fetch OHLCV from {exchange_name}: {e}")
             raise
 
+    async def fetch_ohlcv_since(
+        self,
+        exchange_name: str,
+        symbol: str,
+        timeframe: str,
+        since: int,
+        limit: int = 200,
+        max_pages: int = 5
+    ) -> List[List]:
+        """
+        Fetch only the OHLCV candles at or after a known high-water mark
+
+        The candle at ``since`` is included because it may still have been
+        open when it was last stored. Pages forward (up to ``max_pages``) when
+        the gap is larger than one request.
+
+        Args:
+            exchange_name: Exchange name
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            since: Timestamp in milliseconds of the last stored candle
+            limit: Maximum candles per request
+            max_pages: Maximum number of requests
+
+        Returns:
+            List of OHLCV data with timestamp >= since, oldest first
+        """
+        candles: Dict[int, List] = {}
+        cursor = since
+
+        for _ in range(max_pages):
+            page = await self.fetch_ohlcv(
+                exchange_name=exchange_name,
+                symbol=symbol,
+                timeframe=timeframe,
+                limit=limit,
+                since=cursor
+            )
+            new_last = cursor
+            for candle in page:
+                if candle[0] >= since:
+                    candles[candle[0]] = candle
+                    new_last = max(new_last, candle[0])
+
+            # A short page (or no progress) means we reached the live candle
+            if len(page) < limit or new_last <= cursor:
+                break
+            cursor = new_last + 1
+
+        return [candles[ts] for ts in sorted(candles)]
+
+    def timeframe_to_ms(self, timeframe: str) -> int:
+        """
+        Get timeframe duration in milliseconds
+
+        Args:
+            timeframe: Timeframe string
+
+        Returns:
+            Duration in milliseconds
+
+        Raises:
+            ValueError: If timeframe is not supported
+        """
+        if timeframe not in self.TIMEFRAME_MS:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+        return self.TIMEFRAME_MS[timeframe]
+
     async def fetch_ticker(
         self,
         exchange_name: str,
@@ -0,0 +1,260 @@
+"""
+Data Retention Service
+Time-partition maintenance and retention for signals, rollups, klines, indicators and heartbeat history
+"""
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import re
+import time
+import logging
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Time-series tables: partition key, partition width and retention setting
+# (must match the PARTITION BY RANGE definitions in sql/init.sql; signal_rollups
+# is not partitioned and is always pruned with batched DELETEs)
+RETENTION_TABLES = {
+    "signals": {"column": "created_at", "interval": "day", "setting": "SIGNAL_RETENTION_DAYS"},
+    "signal_rollups": {"column": "bucket_start", "interval": "day", "setting": "SIGNAL_ROLLUP_RETENTION_DAYS"},
+    "klines": {"column": "timestamp", "interval": "month", "setting": "KLINE_RETENTION_DAYS"},
+    "technical_indicators": {"column": "timestamp", "interval": "month", "setting": "INDICATOR_RETENTION_DAYS"},
+    "strategy_heartbeat_history": {
+        "column": "heartbeat_time", "interval": "day", "setting": "HEARTBEAT_HISTORY_RETENTION_DAYS"
+    }
+}
+
+PARTITION_NAME_FORMATS = {
+    "day": "%Y%m%d",
+    "month": "%Y%m"
+}
+
+# Upper bound of a range partition as printed by pg_get_expr(relpartbound)
+PARTITION_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+
+def period_start(value: datetime, interval: str) -> datetime:
+    """Start of the day/month partition containing ``value``"""
+    value = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "month":
+        value = value.replace(day=1)
+    return value
+
+
+def next_period(value: datetime, interval: str) -> datetime:
+    """Start of the partition after the one starting at ``value``"""
+    if interval == "month":
+        return (value.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return value + timedelta(days=1)
+
+
+class DataRetentionService:
+    """
+    Partition maintenance and retention
+
+    On PostgreSQL tables partitioned by time range, ``run_once`` creates the
+    upcoming partitions and drops whole partitions that are entirely older
+    than the retention window. Unpartitioned tables (SQLite, or PostgreSQL
+    before the partitioning migration) fall back to batched DELETEs.
+    """
+
+    # Rows per DELETE when a table is not partitioned
+    DELETE_BATCH_SIZE = 5000
+
+    def __init__(self, tables: Optional[Dict[str, Dict[str, str]]] = None):
+        self.tables = tables or RETENTION_TABLES
+
+        # Statistics
+        self.runs = 0
+        self.partitions_created = 0
+        self.partitions_dropped = 0
+        self.rows_deleted = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_run_ms = 0.0
+        self.last_result: Dict[str, Any] = {}
+
+    def get_retention_days(self, table: str) -> int:
+        """Configured retention for a table in days (0 keeps data forever)"""
+        return int(getattr(settings, self.tables[table]["setting"], 0) or 0)
+
+    async def run_once(self, db: AsyncSession, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Ensure upcoming partitions exist and remove expired data for every table
+
+        Returns:
+            Per-table result (mode, created/dropped partitions or deleted rows)
+        """
+        started = time.perf_counter()
+        now = now or datetime.now(timezone.utc)
+        result = {}
+
+        for table, spec in self.tables.items():
+            try:
+                result[table] = await self._maintain_table(db, table, spec, now)
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Retention failed for {table}: {e}", exc_info=True)
+                result[table] = {"error": str(e)}
+
+        self.runs += 1
+        self.last_run_at = now
+        self.last_run_ms = (time.perf_counter() - started) * 1000
+        self.last_result = result
+        return result
+
+    async def ensure_partitions(self, db: AsyncSession, now: Optional[datetime] = None) -> int:
+        """
+        Create the current and upcoming partitions of every partitioned table
+
+        Called on startup so writes never land in the default partition.
+
+        Returns:
+            Number of partitions created
+        """
+        now = now or datetime.now(timezone.utc)
+        created = 0
+        for table, spec in self.tables.items():
+            if await self.is_partitioned(db, table):
+                created += len(await self._create_partitions(db, table, spec["interval"], now))
+        return created
+
+    async def is_partitioned(self, db: AsyncSession, table: str) -> bool:
+        """Whether ``table`` is a PostgreSQL partitioned table"""
+        if db.bind.dialect.name != "postgresql":
+            return False
+        # relkind is a "char", which asyncpg returns as bytes unless cast
+        relkind = await db.scalar(
+            text("SELECT relkind::text FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": table}
+        )
+        return relkind == "p"
+
+    async def list_partitions(self, db: AsyncSession, table: str) -> List[Tuple[str, Optional[datetime]]]:
+        """
+        List partitions of a table
+
+        Returns:
+            (partition name, exclusive upper bound) pairs; the bound is None for the DEFAULT partition
+        """
+        result = await db.execute(
+            text(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:table_name) ORDER BY c.relname"
+            ),
+            {"table_name": table}
+        )
+        partitions = []
+        for name, bound in result.all():
+            match = PARTITION_UPPER_BOUND.search(bound or "")
+            upper = datetime.fromisoformat(match.group(1)) if match else None
+            if upper is not None and upper.tzinfo is None:
+                upper = upper.replace(tzinfo=timezone.utc)
+            partitions.append((name, upper))
+        return partitions
+
+    async def _maintain_table(
+        self,
+        db: AsyncSession,
+        table: str,
+        spec: Dict[str, str],
+        now: datetime
+    ) -> Dict[str, Any]:
+        retention_days = self.get_retention_days(table)
+        cutoff = now - timedelta(days=retention_days) if retention_days > 0 else None
+
+        if await self.is_partitioned(db, table):
+            created = await self._create_partitions(db, table, spec["interval"], now)
+            dropped = await self._drop_expired_partitions(db, table, cutoff) if cutoff else []
+            return {"mode": "partitions", "created": created, "dropped": dropped}
+
+        deleted = await self._delete_expired_rows(db, table, spec["column"], cutoff) if cutoff else 0
+        return {"mode": "delete", "deleted": deleted}
+
+    async def _create_partitions(self, db: AsyncSession, table: str, interval: str, now: datetime) -> List[str]:
+        """Create partitions from the current period through PARTITION_PREMAKE_COUNT periods ahead"""
+        created = []
+        start = period_start(now.astimezone(timezone.utc), interval)
+        for _ in range(settings.PARTITION_PREMAKE_COUNT + 1):
+            end = next_period(start, interval)
+            name = f"{table}_p{start.strftime(PARTITION_NAME_FORMATS[interval])}"
+            exists = await db.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+            if not exists:
+                try:
+                    await db.execute(text(
+                        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                    ))
+                    await db.commit()
+                    created.append(name)
+                    self.partitions_created += 1
+                    logger.info(f"Created partition {name}")
+                except Exception as e:
+                    # Usually rows for this range already sit in the DEFAULT partition
+                    await db.rollback()
+                    logger.warning(f"Failed to create partition {name}: {e}")
+            start = end
+        return created
+
+    async def _drop_expired_partitions(self, db: AsyncSession, table: str, cutoff: datetime) -> List[str]:
+        """Drop partitions whose whole range is older than ``cutoff``"""
+        dropped = []
+        for name, upper in await self.list_partitions(db, table):
+            if upper is None or upper > cutoff:
+                continue
+            await db.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+            await db.commit()
+            dropped.append(name)
+            self.partitions_dropped += 1
+            logger.info(f"Dropped expired partition {name} (before {upper.isoformat()})")
+        return dropped
+
+    async def _delete_expired_rows(self, db: AsyncSession, table: str, column: str, cutoff: datetime) -> int:
+        """Delete rows older than ``cutoff`` in batches (one commit per batch)"""
+        if db.bind.dialect.name == "sqlite":
+            # SQLite stores naive local timestamps
+            cutoff = cutoff.astimezone().replace(tzinfo=None)
+
+        deleted = 0
+        statement = text(
+            f'DELETE FROM "{table}" WHERE id IN '
+            f'(SELECT id FROM "{table}" WHERE "{column}" < :cutoff LIMIT :batch_size)'
+        )
+        while True:
+            result = await db.execute(statement, {"cutoff": cutoff, "batch_size": self.DELETE_BATCH_SIZE})
+            await db.commit()
+            deleted += result.rowcount or 0
+            if (result.rowcount or 0) < self.DELETE_BATCH_SIZE:
+                break
+
+        if deleted:
+            self.rows_deleted += deleted
+            logger.info(f"Deleted {deleted} rows from {table} older than {cutoff}")
+        return deleted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get retention statistics"""
+        return {
+            "tables": {
+                table: {
+                    "column": spec["column"],
+                    "interval": spec["interval"],
+                    "retention_days": self.get_retention_days(table)
+                }
+                for table, spec in self.tables.items()
+            },
+            "runs": self.runs,
+            "partitions_created": self.partitions_created,
+            "partitions_dropped": self.partitions_dropped,
+            "rows_deleted": self.rows_deleted,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_run_ms": round(self.last_run_ms, 2),
+            "last_result": self.last_result
+        }
+
+
+# Global data retention service instance
+data_retention_service = DataRetentionService()
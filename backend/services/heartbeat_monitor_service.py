@@ -11,12 +11,13 @@ from typing import Dict, Optional, List
 from pathlib import Path
 import logging
 
-from sqlalchemy import select, and_, desc
+from sqlalchemy import select, and_, desc, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.heartbeat import StrategyHeartbeatConfig, StrategyHeartbeatHistory, StrategyRestartHistory
 from models.strategy import Strategy
 from database.session import SessionLocal
+from services.strategy_state_store import strategy_state_store
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +49,18 @@ class HeartbeatStatus:
 class StrategyHeartbeatMonitor:
     """策略心跳监控服务"""
 
+    # 进程退出触发的自动重启冷却时间（秒），防止启动即崩溃的策略反复重启
+    RESTART_COOLDOWN_SECONDS = 60
+
+    # 允许自动重启的数据库状态（用户已停止或正在启停的策略不自动重启）
+    RESTARTABLE_STATUSES = ("running", "error")
+
+    # 重启原因 -> 通知文案
+    RESTART_REASON_LABELS = {
+        "heartbeat_timeout": "心跳超时",
+        "process_exit": "进程退出"
+    }
+
     # 心跳日志正则表达式
     # 格式: 2025-11-04 21:19:01,013 - freqtrade.worker - INFO - Bot heartbeat. PID=872423, version='2025.9.1', state='RUNNING'
     HEARTBEAT_PATTERN = re.compile(
@@ -361,18 +374,61 @@ class StrategyHeartbeatMonitor:
         if status.auto_restart:
             await self._attempt_restart(strategy_id, status)
 
-    async def _attempt_restart(self, strategy_id: int, status: HeartbeatStatus):
-        """尝试重启策略"""
+    async def handle_process_exit(self, strategy_id: int, pid: int, returncode: Optional[int]):
+        """
+        策略进程意外退出（由进程退出监听立即触发，无需等待心跳超时）
+
+        Args:
+            strategy_id: 策略ID
+            pid: 退出进程的PID
+            returncode: 退出码
+        """
+        status = self.heartbeat_status.get(strategy_id)
+        if not status or not status.auto_restart:
+            return
+
+        if status.last_restart_time:
+            since_restart = (datetime.now(timezone.utc) - status.last_restart_time).total_seconds()
+            if since_restart < self.RESTART_COOLDOWN_SECONDS:
+                logger.warning(
+                    f"Strategy {strategy_id} exited {since_restart:.0f}s after last restart, "
+                    f"skipping auto restart (cooldown {self.RESTART_COOLDOWN_SECONDS}s)"
+                )
+                return
+
+        status.last_pid = pid
+        status.is_abnormal = True
+        await self._attempt_restart(strategy_id, status, reason="process_exit")
+
+    async def _attempt_restart(self, strategy_id: int, status: HeartbeatStatus, reason: str = "heartbeat_timeout"):
+        """
+        尝试重启策略
+
+        Args:
+            strategy_id: 策略ID
+            status: 心跳状态
+            reason: 重启原因（heartbeat_timeout / process_exit）
+        """
+        reason_label = self.RESTART_REASON_LABELS.get(reason, reason)
         try:
-            logger.info(f"Attempting to restart strategy {strategy_id} (auto_restart enabled)")
+            db_status = await self._get_strategy_status(strategy_id)
+            if db_status not in self.RESTARTABLE_STATUSES:
+                logger.info(f"Strategy {strategy_id} is {db_status}, skipping auto restart (reason: {reason})")
+                return
+
+            logger.info(f"Attempting to restart strategy {strategy_id} (auto_restart enabled, reason: {reason})")
 
             previous_pid = status.last_pid
-            success = await self.strategy_manager.restart_strategy(strategy_id)
+            # 仅进程已退出时直接重新启动；心跳超时要求管理器仍在运行该策略
+            success = await self.strategy_manager.restart_strategy(
+                strategy_id, require_running=reason != "process_exit"
+            )
 
             if success:
                 # 重置心跳状态
                 status.last_restart_time = datetime.now(timezone.utc)
                 status.restart_count += 1
+                await self._mark_strategy_restarted(strategy_id, status.last_restart_time)
 
                 # 获取新的PID（需要一点时间让进程启动）
                 await asyncio.sleep(2)
@@ -382,7 +438,7 @@ class StrategyHeartbeatMonitor:
                 # 记录重启历史
                 await self._save_restart_history(
                     strategy_id=strategy_id,
-                    restart_reason="heartbeat_timeout",
+                    restart_reason=reason,
                     restart_time=status.last_restart_time,
                     restart_success=True,
                     error_message=None,
@@ -397,7 +453,7 @@ class StrategyHeartbeatMonitor:
                     user_id=1,
                     title=f"✅ 策略已自动重启",
                     message=(
-                        f"策略 #{strategy_id} 因心跳超时已自动重启\n"
+                        f"策略 #{strategy_id} 因{reason_label}已自动重启\n"
                         f"重启次数: {status.restart_count}\n"
                         f"重启时间: {status.last_restart_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
                         f"前进程PID: {previous_pid}\n"
@@ -407,6 +463,7 @@ class StrategyHeartbeatMonitor:
                     priority="P1",
                     metadata={
                         "strategy_id": strategy_id,
+                        "restart_reason": reason,
                         "restart_count": status.restart_count,
                         "previous_pid": previous_pid,
                         "new_pid": new_pid
@@ -419,7 +476,7 @@ class StrategyHeartbeatMonitor:
                 # 记录重启失败
                 await self._save_restart_history(
                     strategy_id=strategy_id,
-                    restart_reason="heartbeat_timeout",
+                    restart_reason=reason,
                     restart_time=datetime.now(timezone.utc),
                     restart_success=False,
                     error_message="Restart command failed",
@@ -444,7 +501,7 @@ class StrategyHeartbeatMonitor:
             # 记录异常
             await self._save_restart_history(
                 strategy_id=strategy_id,
-                restart_reason="heartbeat_timeout",
+                restart_reason=reason,
                 restart_time=datetime.now(timezone.utc),
                 restart_success=False,
                 error_message=str(e),
@@ -452,6 +509,33 @@ class StrategyHeartbeatMonitor:
                 new_pid=None
             )
 
+    async def _get_strategy_status(self, strategy_id: int) -> Optional[str]:
+        """数据库中的策略状态（查询失败时返回None）"""
+        try:
+            async with SessionLocal() as db:
+                return await db.scalar(select(Strategy.status).where(Strategy.id == strategy_id))
+        except Exception as e:
+            logger.error(f"Failed to get status of strategy {strategy_id}: {e}")
+            return None
+
+    async def _mark_strategy_restarted(self, strategy_id: int, started_at: datetime):
+        """重启成功后同步数据库中的运行状态、端口和PID"""
+        try:
+            process = self.strategy_manager.strategy_processes.get(strategy_id)
+            async with SessionLocal() as db:
+                await db.execute(
+                    update(Strategy).where(Strategy.id == strategy_id).values(
+                        status="running",
+                        port=self.strategy_manager.strategy_ports.get(strategy_id),
+                        process_id=process.pid if process else None,
+                        started_at=started_at
+                    )
+                )
+                await db.commit()
+            strategy_state_store.mark_dirty(strategy_id)
+        except Exception as e:
+            logger.error(f"Failed to update status of restarted strategy {strategy_id}: {e}")
+
     async def _handle_heartbeat_recovered(self, strategy_id: int, status: HeartbeatStatus):
         """处理心跳恢复正常"""
         status.is_abnormal = False
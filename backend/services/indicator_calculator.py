@@ -314,6 +314,39 @@ class IndicatorCalculator:
             logger.error(f"Failed to calculate all indicators: {e}")
             raise
 
+    def calculate_indicators(
+        self,
+        ohlcv_data: List[List],
+        indicator_types: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Calculate several indicators with default parameters
+
+        Args:
+            ohlcv_data: OHLCV data
+            indicator_types: Indicator types (MA, MACD, RSI, BOLL, VOL)
+
+        Returns:
+            Dictionary of {indicator_type: result}
+
+        Raises:
+            ValueError: If an indicator type is not supported
+        """
+        calculators = {
+            "MA": self.calculate_ma,
+            "MACD": self.calculate_macd,
+            "RSI": self.calculate_rsi,
+            "BOLL": self.calculate_bollinger_bands,
+            "VOL": self.calculate_volume,
+        }
+
+        results = {}
+        for indicator_type in indicator_types:
+            if indicator_type not in calculators:
+                raise ValueError(f"Unsupported indicator type: {indicator_type}")
+            results[indicator_type] = calculators[indicator_type](ohlcv_data)
+        return results
+
     def _ohlcv_to_dataframe(self, ohlcv_data: List[List]) -> pd.DataFrame:
         """
         Convert OHLCV data to pandas DataFrame
@@ -354,11 +387,23 @@ class IndicatorCalculator:
             return datetime.now()
 
 
-def get_indicator_calculator() -> IndicatorCalculator:
+def get_indicator_calculator(backend: str = "ta", use_numba: bool = True):
     """
-    Factory function for IndicatorCalculator
+    Factory function for indicator calculators
+
+    Args:
+        backend: "ta" (pandas + ta library) or "numpy" (vectorized NumPy)
+        use_numba: JIT-compile recursive indicators when numba is installed
 
     Returns:
-        IndicatorCalculator instance
+        IndicatorCalculator or NumpyIndicatorCalculator instance
+
+    Raises:
+        ValueError: If the backend is not supported
     """
-    return IndicatorCalculator()
+    if backend == "numpy":
+        from services.numpy_indicator_calculator import NumpyIndicatorCalculator
+        return NumpyIndicatorCalculator(use_numba=use_numba)
+    if backend == "ta":
+        return IndicatorCalculator()
+    raise ValueError(f"Unsupported indicator backend: {backend}")
@@ -2,12 +2,13 @@
 Market Data Scheduler Service
 Schedules periodic market data updates using APScheduler
 """
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
 import asyncio
 import logging
+import time
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from services.rate_limit_handler import RateLimitHandler
 from services.system_config_service import SystemConfigService
@@ -55,6 +56,13 @@ class MarketDataScheduler:
         self.symbols = ["BTC/USDT"]
         self.timeframes = ["1m", "5m", "15m", "1h", "4h", "1d"]
         self.indicator_types = ["MA", "MACD", "RSI", "BOLL", "VOL"]
+        self.max_concurrent_per_exchange = 4
+
+        # Per-exchange concurrency limits (created lazily)
+        self._exchange_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        # Statistics of the most recent update cycle per job
+        self.last_cycle_stats: Dict[str, Dict] = {}
 
     async def initialize(self):
         """Initialize scheduler with configuration from database"""
@@ -66,6 +74,8 @@ class MarketDataScheduler:
             self.update_interval_seconds = config.get("update_interval_seconds", 60)
             self.default_exchange = config.get("default_exchange", "binance")
             self.enabled_exchanges = config.get("enabled_exchanges", ["binance"])
+            self.max_concurrent_per_exchange = config.get("max_concurrent_per_exchange", 4)
+            self._exchange_semaphores = {}
 
             # Load preload symbols and timeframes
             self.symbols = config.get("preload_symbols", ["BTC/USDT"])
@@ -75,6 +85,7 @@ class MarketDataScheduler:
                 f"Scheduler initialized: mode={self.update_mode}, "
                 f"interval={self.update_interval_seconds}s, "
                 f"exchange={self.default_exchange}, "
+                f"concurrency={self.max_concurrent_per_exchange}/exchange, "
                 f"symbols={self.symbols}, "
                 f"timeframes={self.timeframes}"
             )
@@ -133,7 +144,9 @@ class MarketDataScheduler:
             trigger=trigger,
             id="market_data_update_all",
             name="Update all market data",
-            replace_existing=True
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
         )
 
         logger.info(
@@ -156,7 +169,9 @@ class MarketDataScheduler:
                 args=[timeframe],
                 id=f"market_data_update_{timeframe}",
                 name=f"Update {timeframe} market data",
-                replace_existing=True
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True
             )
 
             logger.info(f"Scheduled {timeframe} updates: every {interval_seconds}s")
@@ -165,101 +180,157 @@ class MarketDataScheduler:
         """Update market data for all symbols and timeframes"""
         logger.debug("Starting market data update (all timeframes)")
 
-        success_count = 0
-        failure_count = 0
-
-        # Process updates sequentially to avoid database session conflicts
-        # This ensures only one database operation at a time
-        for symbol in self.symbols:
-            for timeframe in self.timeframes:
-                try:
-                    result = await self._update_symbol_timeframe(symbol, timeframe)
-                    if result:
-                        success_count += 1
-                    else:
-                        failure_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to update {symbol} {timeframe}: {e}")
-                    failure_count += 1
+        series = [
+            (symbol, timeframe)
+            for symbol in self.symbols
+            for timeframe in self.timeframes
+        ]
+        stats = await self._run_update_cycle("all", series)
 
         logger.info(
             f"Market data update completed: "
-            f"{success_count} success, {failure_count} failed"
+            f"{stats['success']} success, {stats['failed']} failed "
+            f"in {stats['wall_time_seconds']:.2f}s"
         )
 
     async def _update_timeframe_data(self, timeframe: str):
         """Update market data for specific timeframe"""
         logger.debug(f"Starting market data update ({timeframe})")
 
-        success_count = 0
-        failure_count = 0
-
-        # Process updates sequentially to avoid database session conflicts
-        for symbol in self.symbols:
-            try:
-                result = await self._update_symbol_timeframe(symbol, timeframe)
-                if result:
-                    success_count += 1
-                else:
-                    failure_count += 1
-            except Exception as e:
-                logger.error(f"Failed to update {symbol} {timeframe}: {e}")
-                failure_count += 1
+        series = [(symbol, timeframe) for symbol in self.symbols]
+        stats = await self._run_update_cycle(timeframe, series)
 
         logger.debug(
             f"Market data update completed ({timeframe}): "
-            f"{success_count} success, {failure_count} failed"
+            f"{stats['success']} success, {stats['failed']} failed "
+            f"in {stats['wall_time_seconds']:.2f}s"
+        )
+
+    async def _run_update_cycle(
+        self,
+        cycle_name: str,
+        series: List[Tuple[str, str]]
+    ) -> Dict:
+        """
+        Update a set of (symbol, timeframe) series concurrently
+
+        Each series runs in its own task with its own database session; the
+        number of in-flight tasks per exchange is bounded by a semaphore so
+        wall time scales with the number of exchanges, not series.
+
+        Args:
+            cycle_name: Job name used for statistics ("all" or a timeframe)
+            series: List of (symbol, timeframe) tuples
+
+        Returns:
+            Cycle statistics dictionary
+        """
+        started_at = datetime.now()
+        start = time.perf_counter()
+
+        results = await asyncio.gather(
+            *[
+                self._update_series_bounded(self.default_exchange, symbol, timeframe)
+                for symbol, timeframe in series
+            ],
+            return_exceptions=True
         )
 
-    async def _update_symbol_timeframe(self, symbol: str, timeframe: str) -> bool:
+        failed = 0
+        for (symbol, timeframe), result in zip(series, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to update {symbol} {timeframe}: {result}")
+                failed += 1
+            elif not result:
+                failed += 1
+
+        stats = {
+            "started_at": started_at.isoformat(),
+            "series": len(series),
+            "success": len(series) - failed,
+            "failed": failed,
+            "wall_time_seconds": round(time.perf_counter() - start, 3),
+        }
+        self.last_cycle_stats[cycle_name] = stats
+        return stats
+
+    async def _update_series_bounded(self, exchange: str, symbol: str, timeframe: str) -> bool:
+        """Update one series under the exchange semaphore with a dedicated session"""
+        async with self._get_exchange_semaphore(exchange):
+            if not self.session_factory:
+                return await self._update_symbol_timeframe(symbol, timeframe)
+
+            async with self.session_factory() as session:
+                handler = self.rate_limit_handler.with_session(session)
+                return await self._update_symbol_timeframe(symbol, timeframe, handler)
+
+    def _get_exchange_semaphore(self, exchange: str) -> asyncio.Semaphore:
+        """
+        Get the concurrency limiter for an exchange
+
+        Without a session factory all series share one session, so updates
+        must stay sequential.
+        """
+        if exchange not in self._exchange_semaphores:
+            limit = self.max_concurrent_per_exchange if self.session_factory else 1
+            self._exchange_semaphores[exchange] = asyncio.Semaphore(max(1, limit))
+        return self._exchange_semaphores[exchange]
+
+    async def _update_symbol_timeframe(
+        self,
+        symbol: str,
+        timeframe: str,
+        handler: Optional[RateLimitHandler] = None
+    ) -> bool:
         """
         Update K-line and indicator data for a specific symbol and timeframe
 
         Args:
             symbol: Trading pair symbol
             timeframe: Timeframe
+            handler: Rate limit handler bound to the task's session
+                (defaults to the shared template instance)
 
         Returns:
             True if successful, False otherwise
         """
+        handler = handler or self.rate_limit_handler
+
         try:
-            # Fetch K-line data from API to ensure latest data
-            # 调度器定时更新应该强制从API获取最新数据，而不是使用可能过时的缓存
-            klines, source = await self.rate_limit_handler.get_klines(
+            # Fetch only candles after the last stored one (high-water mark)
+            # 调度器增量拉取：只请求最后一根已存储K线之后的数据，并合并到Redis/数据库
+            klines, source, fetched = await handler.refresh_klines_incremental(
                 exchange=self.default_exchange,
                 symbol=symbol,
                 timeframe=timeframe,
-                limit=200,
-                force_refresh=True  # 强制从API刷新以获取最新数据
+                limit=200
             )
 
             logger.debug(
                 f"Updated {symbol} {timeframe} K-lines from {source} "
-                f"({len(klines)} candles)"
+                f"({fetched} fetched, {len(klines)} candles in window)"
             )
 
-            # Update indicators
-            for indicator_type in self.indicator_types:
-                try:
-                    indicator_data, ind_source = await self.rate_limit_handler.get_indicators(
-                        exchange=self.default_exchange,
-                        symbol=symbol,
-                        timeframe=timeframe,
-                        indicator_type=indicator_type,
-                        force_refresh=True  # Force recalculate
-                    )
-
-                    if indicator_data:
-                        logger.debug(
-                            f"Updated {symbol} {timeframe} {indicator_type} "
-                            f"from {ind_source}"
-                        )
-
-                except Exception as e:
-                    logger.error(
-                        f"Failed to update indicator {indicator_type} "
-                        f"for {symbol} {timeframe}: {e}"
-                    )
+            # Update all indicators from the refreshed window in one pass
+            try:
+                indicators, ind_source = await handler.get_indicator_bundle(
+                    exchange=self.default_exchange,
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    indicator_types=self.indicator_types,
+                    force_refresh=True,  # Force recalculate
+                    ohlcv_data=klines
+                )
+
+                logger.debug(
+                    f"Updated {symbol} {timeframe} indicators "
+                    f"{list(indicators)} from {ind_source}"
+                )
+
+            except Exception as e:
+                logger.error(
+                    f"Failed to update indicators for {symbol} {timeframe}: {e}"
+                )
 
             return True
 
@@ -304,6 +375,8 @@ class MarketDataScheduler:
             "is_running": self.is_running,
             "update_mode": self.update_mode,
             "update_interval_seconds": self.update_interval_seconds,
+            "max_concurrent_per_exchange": self.max_concurrent_per_exchange,
+            "last_cycles": self.last_cycle_stats,
             "job_count": len(jobs),
             "jobs": [
                 {
@@ -7,17 +7,22 @@ import psutil
 import time
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, update, func
 
+from config import settings
 from database.session import SessionLocal
 from models.strategy import Strategy
 from models.signal import Signal
 from core.freqtrade_manager import FreqTradeGatewayManager
 from core.config_manager import config_manager
+from services.data_retention_service import data_retention_service
+from services.strategy_state_store import strategy_state_store
+from services.monitoring_snapshot import monitoring_snapshot
+from services.websocket_service import ws_service
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +63,12 @@ class MonitoringService:
         self.monitoring_tasks["cleanup"] = asyncio.create_task(
             self._cleanup_old_data()
         )
+        self.monitoring_tasks["snapshot"] = asyncio.create_task(
+            self._refresh_snapshot()
+        )
+        self.monitoring_tasks["process_registry"] = asyncio.create_task(
+            self._reconcile_process_registry()
+        )
 
         logger.info("Monitoring service started successfully")
 
@@ -141,47 +152,77 @@ class MonitoringService:
 
             await asyncio.sleep(interval)
 
+    async def handle_process_exit(self, strategy_id: int, pid: Optional[int], returncode: Optional[int]):
+        """
+        策略进程意外退出：立即标记为error并推送状态（不等待下一次轮询）
+
+        Args:
+            strategy_id: 策略ID
+            pid: 退出进程的PID
+            returncode: 退出码
+        """
+        try:
+            async with SessionLocal() as session:
+                result = await session.execute(
+                    update(Strategy)
+                    .where(and_(Strategy.id == strategy_id, Strategy.status == "running"))
+                    .values(status="error")
+                )
+                await session.commit()
+
+            if result.rowcount:
+                strategy_state_store.mark_dirty(strategy_id)
+                logger.error(f"Strategy {strategy_id} process {pid} exited with code {returncode}, updated status to error")
+
+            if strategy_id in self.strategy_metrics:
+                self.strategy_metrics[strategy_id].update({"status": "error", "is_alive": False})
+
+            await ws_service.push_strategy_status(strategy_id, "error", {
+                "reason": "process_exited",
+                "pid": pid,
+                "exit_code": returncode
+            })
+        except Exception as e:
+            logger.error(f"Error handling exit of strategy {strategy_id}: {e}", exc_info=True)
+
     async def _monitor_strategy_status(self):
-        """监控策略状态"""
+        """
+        监控策略指标
+
+        进程存活由退出监听即时处理（handle_process_exit），这里不再逐个策略轮询进程、
+        更新状态；每个周期只查询运行中的策略和一次按策略分组的信号统计。
+        """
         interval = self.config.get("strategy_status_interval", 30)
 
         while self.running:
             try:
                 async with SessionLocal() as session:
-                    # 获取所有运行中的策略
                     result = await session.execute(
-                        select(Strategy).where(Strategy.status == "running")
+                        select(Strategy.id, Strategy.name, Strategy.port, Strategy.process_id)
+                        .where(Strategy.status == "running")
+                    )
+                    running_strategies = result.all()
+
+                    signal_stats = await self._get_recent_signal_stats(
+                        session, [strategy.id for strategy in running_strategies], hours=1
                     )
-                    running_strategies = result.scalars().all()
-
-                    strategy_metrics = {}
-                    for strategy in running_strategies:
-                        # 检查进程是否还在运行
-                        is_alive = self._check_strategy_process(strategy.id)
-
-                        # 获取最近的信号统计
-                        recent_signals = await self._get_recent_signals(
-                            session, strategy.id, hours=1
-                        )
-
-                        strategy_metrics[strategy.id] = {
-                            "name": strategy.name,
-                            "status": "running" if is_alive else "error",
-                            "port": strategy.port,
-                            "process_id": strategy.process_id,
-                            "is_alive": is_alive,
-                            "signals_last_hour": len(recent_signals),
-                            "last_signal_time": recent_signals[0].created_at.isoformat() if recent_signals else None
-                        }
-
-                        # 如果进程已死但数据库状态为运行，更新状态
-                        if not is_alive and strategy.status == "running":
-                            strategy.status = "error"
-                            await session.commit()
-                            logger.error(f"Strategy {strategy.id} process died, updated status to error")
-
-                    self.strategy_metrics = strategy_metrics
-                    logger.debug(f"Strategy metrics updated: {len(strategy_metrics)} strategies")
+
+                strategy_metrics = {}
+                for strategy in running_strategies:
+                    is_alive = strategy.id in self.ft_manager.strategy_processes
+                    count, last_signal_time = signal_stats.get(strategy.id, (0, None))
+                    strategy_metrics[strategy.id] = {
+                        "name": strategy.name,
+                        "status": "running" if is_alive else "error",
+                        "port": strategy.port,
+                        "process_id": strategy.process_id,
+                        "is_alive": is_alive,
+                        "signals_last_hour": count,
+                        "last_signal_time": last_signal_time.isoformat() if last_signal_time else None
+                    }
+
+                self.strategy_metrics = strategy_metrics
+                logger.debug(f"Strategy metrics updated: {len(strategy_metrics)} strategies")
 
             except Exception as e:
                 logger.error(f"Error monitoring strategy status: {e}", exc_info=True)
@@ -232,53 +273,99 @@ class MonitoringService:
 
             await asyncio.sleep(interval)
 
-    async def _cleanup_old_data(self):
-        """清理旧数据"""
-        interval = 3600  # 1小时
+    async def _refresh_snapshot(self):
+        """刷新共享监控快照（广播服务与轮询接口都从快照读取，每个周期只查询一次策略表）"""
+        interval = settings.MONITORING_SNAPSHOT_INTERVAL_SECONDS
 
         while self.running:
             try:
+                monitoring_snapshot.refresh_monitoring(self)
+                monitoring_snapshot.refresh_capacity(self.ft_manager)
                 async with SessionLocal() as session:
-                    # 清理30天前的信号数据
-                    cutoff_date = datetime.now() - timedelta(days=30)
+                    await monitoring_snapshot.refresh_strategies(session)
 
-                    # TODO: 实现数据清理逻辑
-                    # DELETE FROM signals WHERE created_at < cutoff_date
+            except Exception as e:
+                logger.error(f"Error refreshing monitoring snapshot: {e}", exc_info=True)
 
-                    logger.info("Old data cleanup completed")
+            await asyncio.sleep(interval)
 
-            except Exception as e:
-                logger.error(f"Error cleaning up old data: {e}", exc_info=True)
+    async def _reconcile_process_registry(self):
+        """定期用全量进程扫描核对进程表（发现管理器之外启动的进程、清理失效记录）"""
+        interval = settings.PROCESS_REGISTRY_RECONCILE_SECONDS
 
+        while self.running:
             await asyncio.sleep(interval)
+            try:
+                await self.ft_manager.list_freqtrade_processes(force_scan=True)
+                await self._check_unwatched_strategies()
+            except Exception as e:
+                logger.error(f"Error reconciling process registry: {e}", exc_info=True)
+
+    async def _check_unwatched_strategies(self):
+        """
+        兜底核对：状态为运行、但进程不在退出监听中的策略
+
+        被监听的进程退出时会立即上报，这里只检查监听之外的策略（例如进程已不在管理器中），
+        随进程表核对低频执行。
+        """
+        async with SessionLocal() as session:
+            result = await session.execute(
+                select(Strategy.id).where(Strategy.status == "running")
+            )
+            strategy_ids = result.scalars().all()
+
+        exit_watcher = self.ft_manager.exit_watcher
+        for strategy_id in strategy_ids:
+            if exit_watcher.is_watched(strategy_id):
+                continue
+            process = self.ft_manager.strategy_processes.get(strategy_id)
+            if process is None:
+                # 管理器中已没有进程：只标记为error
+                await self.handle_process_exit(strategy_id, None, None)
+            else:
+                returncode = process.poll()
+                if returncode is not None:
+                    # 走与监听到退出相同的流程（释放进程和端口、更新状态、重启）
+                    await exit_watcher.report_exit(strategy_id, process.pid, returncode)
 
-    def _check_strategy_process(self, strategy_id: int) -> bool:
-        """检查策略进程是否存活"""
-        if strategy_id not in self.ft_manager.strategy_processes:
-            return False
+    async def _cleanup_old_data(self):
+        """清理旧数据：维护时间分区并按保留天数删除过期分区/数据"""
+        interval = settings.DATA_RETENTION_INTERVAL_SECONDS
+
+        while self.running:
+            if settings.DATA_RETENTION_ENABLED:
+                try:
+                    async with SessionLocal() as session:
+                        result = await data_retention_service.run_once(session)
+                    logger.info(f"Old data cleanup completed: {result}")
 
-        process = self.ft_manager.strategy_processes[strategy_id]
-        return process.poll() is None
+                except Exception as e:
+                    logger.error(f"Error cleaning up old data: {e}", exc_info=True)
 
-    async def _get_recent_signals(
+            await asyncio.sleep(interval)
+
+    async def _get_recent_signal_stats(
         self,
         session: AsyncSession,
-        strategy_id: int,
+        strategy_ids: List[int],
         hours: int = 1
-    ) -> List[Signal]:
-        """获取最近的信号"""
+    ) -> Dict[int, Tuple[int, Optional[datetime]]]:
+        """获取最近的信号统计（一次分组查询）：{strategy_id: (信号数, 最近信号时间)}"""
+        if not strategy_ids:
+            return {}
+
         cutoff_time = datetime.now() - timedelta(hours=hours)
         result = await session.execute(
-            select(Signal)
+            select(Signal.strategy_id, func.count(Signal.id), func.max(Signal.created_at))
             .where(
                 and_(
-                    Signal.strategy_id == strategy_id,
+                    Signal.strategy_id.in_(strategy_ids),
                     Signal.created_at >= cutoff_time
                 )
             )
-            .order_by(Signal.created_at.desc())
+            .group_by(Signal.strategy_id)
         )
-        return result.scalars().all()
+        return {strategy_id: (count, last_time) for strategy_id, count, last_time in result.all()}
 
     async def _check_system_alerts(self):
         """检查系统告警条件"""
@@ -0,0 +1,206 @@
+"""
+Monitoring Snapshot Store
+Shared monitoring, strategy-count and capacity snapshots for the broadcaster and polling APIs
+"""
+from typing import Dict, List, Any, Optional, Iterable
+from datetime import datetime
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+import logging
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models.strategy import Strategy
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SECTIONS = ("monitoring", "strategies", "capacity")
+
+# Strategy columns of the strategies snapshot
+SNAPSHOT_STRATEGY_COLUMNS = [
+    Strategy.id,
+    Strategy.name,
+    Strategy.status,
+    Strategy.is_active,
+    Strategy.port,
+    Strategy.process_id,
+    Strategy.started_at
+]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches ``etag`` (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+class MonitoringSnapshotStore:
+    """
+    Versioned snapshots of monitoring data
+
+    ``MonitoringService`` refreshes every section on its schedule (one
+    strategy query per interval); the WebSocket broadcaster and the polling
+    APIs read from here. A section's version only increases when its content
+    changes, so ``etag`` lets polling clients get 304 responses.
+
+    On read, ``ensure`` re-derives the in-memory sections (monitoring,
+    capacity) so they are never stale, and re-queries strategies only if
+    they were not refreshed within ``max_age`` seconds (monitoring service
+    not running).
+    """
+
+    def __init__(self, max_age: float = 15):
+        self.max_age = max_age
+        # Part of every ETag, so tags issued before a restart never match
+        self.epoch = uuid.uuid4().hex[:8]
+        self._sections: Dict[str, Dict[str, Any]] = {}
+        self._refreshed_at: Dict[str, float] = {}
+        self._strategies_lock = asyncio.Lock()
+
+        # Statistics
+        self.refreshes = 0
+        self.changes = 0
+        self.strategy_queries = 0
+
+    def update(self, section: str, data: Dict[str, Any]) -> bool:
+        """
+        Store new data for a section
+
+        Returns:
+            True if the content changed (the section version was increased)
+        """
+        digest = hashlib.blake2b(
+            json.dumps(data, sort_keys=True, default=str).encode(), digest_size=8
+        ).hexdigest()
+        self.refreshes += 1
+        self._refreshed_at[section] = time.monotonic()
+
+        entry = self._sections.get(section)
+        if entry is not None and entry["digest"] == digest:
+            return False
+
+        self._sections[section] = {
+            "data": data,
+            "version": entry["version"] + 1 if entry else 1,
+            "digest": digest,
+            "updated_at": datetime.now().isoformat()
+        }
+        self.changes += 1
+        return True
+
+    def get(self, section: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a section
+
+        Returns:
+            {"data", "version", "updated_at"}, or None if it was never refreshed
+        """
+        entry = self._sections.get(section)
+        if entry is None:
+            return None
+        return {"data": entry["data"], "version": entry["version"], "updated_at": entry["updated_at"]}
+
+    def is_stale(self, section: str) -> bool:
+        """Whether a section is missing or older than ``max_age``"""
+        refreshed_at = self._refreshed_at.get(section)
+        return refreshed_at is None or time.monotonic() - refreshed_at > self.max_age
+
+    def etag(self, sections: Iterable[str]) -> str:
+        """ETag covering the current versions of ``sections``"""
+        versions = "-".join(
+            f"{section}.{self._sections[section]['version'] if section in self._sections else 0}"
+            for section in sorted(set(sections))
+        )
+        return f'"{self.epoch}-{versions}"'
+
+    def refresh_monitoring(self, monitoring_service) -> bool:
+        """Refresh system metrics and health from the monitoring service"""
+        health = dict(monitoring_service.get_health_status())
+        # Generated on every call; keeping it would change the version on every refresh
+        health.pop("timestamp", None)
+        return self.update("monitoring", {
+            "system": monitoring_service.get_system_metrics(),
+            "health": health
+        })
+
+    def refresh_capacity(self, ft_manager) -> bool:
+        """Refresh port usage and capacity from the FreqTrade manager"""
+        used_ports = len(ft_manager.strategy_ports)
+        total_ports = ft_manager.max_port - ft_manager.base_port + 1
+        return self.update("capacity", {
+            "used_ports": used_ports,
+            "total_ports": total_ports,
+            "available_ports": total_ports - used_ports,
+            "usage_percent": round(used_ports / total_ports * 100, 2) if total_ports > 0 else 0,
+            "info": ft_manager.get_capacity_info()
+        })
+
+    async def refresh_strategies(self, db: AsyncSession) -> bool:
+        """Refresh strategy counts and running strategies with one query"""
+        result = await db.execute(select(*SNAPSHOT_STRATEGY_COLUMNS).order_by(Strategy.id))
+        rows = result.all()
+        self.strategy_queries += 1
+
+        counts = {"total": len(rows), "running": 0, "stopped": 0, "error": 0}
+        running: List[Dict[str, Any]] = []
+        for row in rows:
+            if row.status in counts:
+                counts[row.status] += 1
+            if row.status == "running":
+                running.append({
+                    "id": row.id,
+                    "name": row.name,
+                    "status": row.status,
+                    "is_active": row.is_active,
+                    "port": row.port,
+                    "process_id": row.process_id,
+                    "started_at": row.started_at.isoformat() if row.started_at else None
+                })
+
+        return self.update("strategies", {**counts, "strategies": running})
+
+    async def ensure(
+        self,
+        sections: Iterable[str],
+        db: Optional[AsyncSession] = None,
+        monitoring_service=None,
+        ft_manager=None
+    ):
+        """Bring ``sections`` up to date before a read (in-memory sources always, strategies when stale)"""
+        for section in sections:
+            try:
+                if section == "monitoring" and monitoring_service is not None:
+                    self.refresh_monitoring(monitoring_service)
+                elif section == "capacity" and ft_manager is not None:
+                    self.refresh_capacity(ft_manager)
+                elif section == "strategies" and db is not None and self.is_stale(section):
+                    # Concurrent requests share one query
+                    async with self._strategies_lock:
+                        if self.is_stale(section):
+                            await self.refresh_strategies(db)
+            except Exception as e:
+                logger.error(f"Failed to refresh {section} snapshot: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get snapshot statistics"""
+        return {
+            "epoch": self.epoch,
+            "max_age": self.max_age,
+            "sections": {
+                section: {"version": entry["version"], "updated_at": entry["updated_at"]}
+                for section, entry in self._sections.items()
+            },
+            "refreshes": self.refreshes,
+            "changes": self.changes,
+            "strategy_queries": self.strategy_queries
+        }
+
+
+# Global monitoring snapshot store instance
+monitoring_snapshot = MonitoringSnapshotStore(max_age=settings.MONITORING_SNAPSHOT_INTERVAL_SECONDS * 3)
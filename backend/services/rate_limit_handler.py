@@ -3,22 +3,33 @@ Rate Limit Handler Service
 Implements three-layer data access: Redis -> PostgreSQL -> CCXT API
 Handles rate limiting gracefully with automatic fallback
 """
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Callable, Awaitable, Set
 from datetime import datetime, timedelta
-import json
+import asyncio
 import ccxt
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from config import settings
 from core.redis_client import RedisClient
+from database.session import SessionLocal
 from models.kline import Kline
 from models.technical_indicator import TechnicalIndicator
+from services.cache_codec import get_cache_codec
 from services.ccxt_manager import CCXTManager
-from services.indicator_calculator import IndicatorCalculator
+from services.local_cache import LocalTTLCache
+from services.indicator_calculator import get_indicator_calculator
+from services.streaming_indicator_engine import StreamingIndicatorEngine
 from services.exchange_failover_manager import ExchangeFailoverManager
 
 logger = logging.getLogger(__name__)
 
+# Kline upsert columns (conflict target matches uix_kline_unique)
+KLINE_CONFLICT_COLUMNS = ["exchange", "symbol", "timeframe", "timestamp"]
+KLINE_VALUE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
 
 class DataSource:
     """Data source enum"""
@@ -27,6 +38,13 @@ class DataSource:
     API = "api"
 
 
+# INDICATOR_BACKEND values
+INDICATOR_BACKENDS = ("streaming", "numpy", "ta")
+
+# Indicator types computed by get_indicator_bundle
+SUPPORTED_INDICATOR_TYPES = ["MA", "MACD", "RSI", "BOLL", "VOL"]
+
+
 class RateLimitHandler:
     """
     Rate limit handler with three-layer data access
@@ -35,19 +53,52 @@ class RateLimitHandler:
     Layer 3: CCXT API (live data, may hit rate limits)
     """
 
+    # Rows per multi-row INSERT (9 params/row, PostgreSQL allows 32767 binds)
+    KLINE_UPSERT_BATCH_SIZE = 1000
+    # Batches at or above this size use the COPY path on PostgreSQL
+    KLINE_COPY_THRESHOLD = 5000
+
     def __init__(
         self,
         db: AsyncSession,
         redis_client: RedisClient,
         ccxt_manager: CCXTManager,
         failover_manager: Optional[ExchangeFailoverManager] = None,
-        cache_ttl: Optional[Dict[str, int]] = None
+        cache_ttl: Optional[Dict[str, int]] = None,
+        indicator_backend: Optional[str] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None
     ):
         self.db = db
+        # Background refreshes open their own session; the caller's may be closed by then
+        self.session_factory = session_factory or SessionLocal
         self.redis = redis_client
         self.ccxt_manager = ccxt_manager
         self.failover_manager = failover_manager
-        self.indicator_calculator = IndicatorCalculator()
+
+        # Indicator backend: "streaming" keeps per-series state, "numpy"/"ta" recompute the window
+        self.indicator_backend = indicator_backend or settings.INDICATOR_BACKEND
+        if self.indicator_backend not in INDICATOR_BACKENDS:
+            raise ValueError(
+                f"Unsupported indicator backend: {self.indicator_backend} "
+                f"(expected one of {', '.join(INDICATOR_BACKENDS)})"
+            )
+        self.indicator_calculator = get_indicator_calculator(
+            "numpy" if self.indicator_backend == "numpy" else "ta",
+            use_numba=settings.INDICATOR_USE_NUMBA
+        )
+        self.indicator_engine = StreamingIndicatorEngine()
+
+        # Redis payload codec (reads accept both JSON and binary payloads)
+        self.cache_codec = get_cache_codec(settings.CACHE_CODEC, settings.CACHE_CODEC_COMPRESS)
+
+        # L0 in-process cache in front of Redis (same keys as Redis)
+        self.local_cache = LocalTTLCache(
+            max_entries=settings.L0_CACHE_MAX_ENTRIES,
+            default_ttl=settings.L0_CACHE_TTL_SECONDS
+        )
+
+        # Last stored candle timestamp (ms) per kline cache key
+        self._high_water_marks: Dict[str, int] = {}
 
         # Default cache TTL by timeframe (in seconds)
         self.cache_ttl = cache_ttl or {
@@ -59,6 +110,52 @@ class RateLimitHandler:
             "1d": 86400
         }
 
+        # Single-flight: one in-flight fill per key, concurrent callers await it
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._flight_stats = {"leaders": 0, "coalesced": 0, "stale_served": 0, "revalidations": 0}
+
+        # Stale-while-revalidate: keep last values for this long past their TTL (0 disables)
+        self.stale_ttl = settings.CACHE_STALE_WHILE_REVALIDATE_SECONDS
+        self._stale_cache = LocalTTLCache(
+            max_entries=settings.L0_CACHE_MAX_ENTRIES if self.stale_ttl > 0 else 0,
+            default_ttl=max(self.cache_ttl.values()) + self.stale_ttl
+        )
+
+    def with_session(self, db: AsyncSession) -> "RateLimitHandler":
+        """
+        Create a handler bound to another database session
+
+        The returned handler shares Redis, CCXT, failover and in-memory
+        series state with this one, so concurrent tasks can each use their
+        own session without losing high-water marks.
+
+        Args:
+            db: Database session owned by the caller
+
+        Returns:
+            RateLimitHandler instance
+        """
+        handler = RateLimitHandler(
+            db,
+            self.redis,
+            self.ccxt_manager,
+            self.failover_manager,
+            self.cache_ttl,
+            self.indicator_backend,
+            self.session_factory
+        )
+        handler.indicator_calculator = self.indicator_calculator
+        handler.indicator_engine = self.indicator_engine
+        handler.cache_codec = self.cache_codec
+        handler.local_cache = self.local_cache
+        handler._high_water_marks = self._high_water_marks
+        handler._inflight = self._inflight
+        handler._background_tasks = self._background_tasks
+        handler._flight_stats = self._flight_stats
+        handler._stale_cache = self._stale_cache
+        return handler
+
     async def get_klines(
         self,
         exchange: str,
@@ -81,9 +178,12 @@ class RateLimitHandler:
             Tuple of (OHLCV data list, data source)
         """
         cache_key = self._build_kline_cache_key(exchange, symbol, timeframe)
+        flight_key = f"{cache_key}:{limit}:{int(force_refresh)}"
+
+        def load(handler: "RateLimitHandler" = self):
+            return handler._load_klines(cache_key, exchange, symbol, timeframe, limit, force_refresh)
 
         # Layer 1: Try Redis cache (if not force refresh)
-        db_data = None
         if not force_refresh:
             cached_data = await self._get_klines_from_redis(cache_key)
             # 检查缓存数据是否充足（至少80%的请求数量）
@@ -96,6 +196,28 @@ class RateLimitHandler:
                     f"got {len(cached_data)} candles, need at least {int(limit * 0.8)}, falling back to database"
                 )
 
+            # Serve the expired copy and refresh it in the background
+            stale_data = self._stale_cache.get(cache_key)
+            if stale_data and len(stale_data) >= limit * 0.8:
+                logger.debug(f"Serving stale K-line data: {exchange} {symbol} {timeframe}")
+                self._revalidate(flight_key, load)
+                return stale_data, DataSource.REDIS
+
+        # Layers 2 and 3 run once per key; concurrent callers share the result
+        return await self._single_flight(flight_key, load)
+
+    async def _load_klines(
+        self,
+        cache_key: str,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        force_refresh: bool
+    ) -> Tuple[List[List], str]:
+        """Load K-line data from the database or the CCXT API and cache it"""
+        db_data = None
+        if not force_refresh:
             # Layer 2: Try PostgreSQL database (only if not force refresh)
             db_data = await self._get_klines_from_database(exchange, symbol, timeframe, limit)
             if db_data and len(db_data) >= limit * 0.8:  # At least 80% of requested data
@@ -165,6 +287,145 @@ class RateLimitHandler:
 
             raise
 
+    async def refresh_klines_incremental(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        limit: int = 200
+    ) -> Tuple[List[List], str, int]:
+        """
+        Refresh K-line data by fetching only candles after the high-water mark
+
+        Falls back to a full refresh when the series has never been stored or
+        when the gap is larger than ``limit`` candles. The delta is upserted to
+        PostgreSQL and merged into the Redis copy.
+
+        Args:
+            exchange: Exchange name
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            limit: Number of candles kept in the cached window
+
+        Returns:
+            Tuple of (merged OHLCV window, data source, number of fetched candles)
+        """
+        high_water_mark = await self.get_high_water_mark(exchange, symbol, timeframe)
+        try:
+            timeframe_ms = self.ccxt_manager.timeframe_to_ms(timeframe)
+        except ValueError:
+            timeframe_ms = None
+        now_ms = int(datetime.now().timestamp() * 1000)
+
+        if (
+            high_water_mark is None
+            or not timeframe_ms
+            or now_ms - high_water_mark > limit * timeframe_ms
+        ):
+            data, source = await self.get_klines(
+                exchange, symbol, timeframe, limit=limit, force_refresh=True
+            )
+            return data, source, len(data)
+
+        cache_key = self._build_kline_cache_key(exchange, symbol, timeframe)
+
+        try:
+            delta = await self.ccxt_manager.fetch_ohlcv_since(
+                exchange_name=exchange,
+                symbol=symbol,
+                timeframe=timeframe,
+                since=high_water_mark,
+                limit=limit
+            )
+
+            if self.failover_manager:
+                await self.failover_manager.mark_exchange_result(exchange, True)
+
+        except Exception as e:
+            logger.warning(f"Incremental fetch failed for {exchange} {symbol} {timeframe}: {e}")
+
+            if self.failover_manager:
+                await self.failover_manager.mark_exchange_result(exchange, False, str(e))
+
+            # Serve what we already have
+            data, source = await self.get_klines(exchange, symbol, timeframe, limit=limit)
+            return data, source, 0
+
+        if delta:
+            await self._store_klines_to_database(exchange, symbol, timeframe, delta)
+
+        cached = await self._get_klines_from_redis(cache_key)
+        if cached:
+            merged = self._merge_klines(cached, delta, limit)
+            source = DataSource.REDIS
+        else:
+            merged = await self._get_klines_from_database(exchange, symbol, timeframe, limit) or []
+            merged = self._merge_klines(merged, delta, limit)
+            source = DataSource.DATABASE
+
+        await self._cache_klines_to_redis(cache_key, merged, timeframe)
+
+        logger.debug(
+            f"Incremental K-line refresh: {exchange} {symbol} {timeframe} "
+            f"({len(delta)} new/updated candles)"
+        )
+        # Nothing new from the exchange: the window is what was already stored
+        return merged, DataSource.API if delta else source, len(delta)
+
+    async def get_high_water_mark(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str
+    ) -> Optional[int]:
+        """
+        Get the timestamp (ms) of the latest stored candle for a series
+
+        Served from memory once known, otherwise loaded from PostgreSQL.
+        """
+        cache_key = self._build_kline_cache_key(exchange, symbol, timeframe)
+        if cache_key in self._high_water_marks:
+            return self._high_water_marks[cache_key]
+
+        try:
+            result = await self.db.execute(
+                select(func.max(Kline.timestamp)).where(
+                    and_(
+                        Kline.exchange == exchange,
+                        Kline.symbol == symbol,
+                        Kline.timeframe == timeframe
+                    )
+                )
+            )
+            latest = result.scalar_one_or_none()
+        except Exception as e:
+            logger.error(f"Database get high-water mark error: {e}")
+            return None
+
+        if latest is None:
+            return None
+
+        high_water_mark = int(latest.timestamp() * 1000)
+        self._high_water_marks[cache_key] = high_water_mark
+        return high_water_mark
+
+    @staticmethod
+    def _merge_klines(existing: List[List], delta: List[List], limit: int) -> List[List]:
+        """
+        Merge newly fetched candles into an existing window
+
+        Candles in ``delta`` replace existing candles with the same timestamp
+        (the last stored candle may have been updated). Returns the latest
+        ``limit`` candles, oldest first.
+        """
+        if not delta:
+            return existing[-limit:]
+
+        first_new = delta[0][0]
+        merged = [c for c in existing if c[0] < first_new]
+        merged.extend(delta)
+        return merged[-limit:]
+
     async def get_indicators(
         self,
         exchange: str,
@@ -187,6 +448,10 @@ class RateLimitHandler:
             Tuple of (indicator data dict, data source)
         """
         cache_key = self._build_indicator_cache_key(exchange, symbol, timeframe, indicator_type)
+        flight_key = f"{cache_key}:{int(force_refresh)}"
+
+        def load(handler: "RateLimitHandler" = self):
+            return handler._load_indicator(cache_key, exchange, symbol, timeframe, indicator_type)
 
         # Layer 1: Try Redis cache
         if not force_refresh:
@@ -195,6 +460,23 @@ class RateLimitHandler:
                 logger.debug(f"Indicator from Redis: {exchange} {symbol} {timeframe} {indicator_type}")
                 return cached_data, DataSource.REDIS
 
+            stale_data = self._stale_cache.get(cache_key)
+            if stale_data:
+                logger.debug(f"Serving stale indicator: {exchange} {symbol} {timeframe} {indicator_type}")
+                self._revalidate(flight_key, load)
+                return dict(stale_data), DataSource.REDIS
+
+        return await self._single_flight(flight_key, load)
+
+    async def _load_indicator(
+        self,
+        cache_key: str,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        indicator_type: str
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Load indicator data from the database or calculate it, and cache it"""
         # Layer 2: Try PostgreSQL database
         db_data = await self._get_indicator_from_database(exchange, symbol, timeframe, indicator_type)
         if db_data:
@@ -207,25 +489,19 @@ class RateLimitHandler:
         try:
             # Get OHLCV data (will use three-layer fallback)
             ohlcv_data, _ = await self.get_klines(exchange, symbol, timeframe, limit=200)
+            if not ohlcv_data:
+                logger.warning(f"No K-lines to calculate indicator: {exchange} {symbol} {timeframe} {indicator_type}")
+                return None, ""
 
             # Calculate indicator
-            if indicator_type == "MA":
-                indicator_data = self.indicator_calculator.calculate_ma(ohlcv_data)
-            elif indicator_type == "MACD":
-                indicator_data = self.indicator_calculator.calculate_macd(ohlcv_data)
-            elif indicator_type == "RSI":
-                indicator_data = self.indicator_calculator.calculate_rsi(ohlcv_data)
-            elif indicator_type == "BOLL":
-                indicator_data = self.indicator_calculator.calculate_bollinger_bands(ohlcv_data)
-            elif indicator_type == "VOL":
-                indicator_data = self.indicator_calculator.calculate_volume(ohlcv_data)
-            else:
-                raise ValueError(f"Unsupported indicator type: {indicator_type}")
+            indicator_data = self._calculate_indicators(
+                exchange, symbol, timeframe, ohlcv_data, [indicator_type]
+            )[indicator_type]
 
             logger.info(f"Calculated indicator: {exchange} {symbol} {timeframe} {indicator_type}")
 
             # Store to database
-            await self._store_indicator_to_database(exchange, symbol, timeframe, indicator_data)
+            await self._store_indicators_to_database(exchange, symbol, timeframe, [indicator_data])
 
             # Cache to Redis
             await self._cache_indicator_to_redis(cache_key, indicator_data, timeframe)
@@ -236,16 +512,222 @@ class RateLimitHandler:
             logger.error(f"Failed to calculate indicator: {e}")
             return None, ""
 
+    async def get_indicator_bundle(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        indicator_types: Optional[List[str]] = None,
+        force_refresh: bool = False,
+        ohlcv_data: Optional[List[List]] = None
+    ) -> Tuple[Dict[str, Dict[str, Any]], str]:
+        """
+        Get several indicators of one series in a single pass
+
+        Cached indicators are read with one MGET. Missing (or all, when
+        ``force_refresh``) indicators are computed from one K-line load and
+        one engine update, then written in one Redis pipeline and one
+        database transaction. An indicator that fails to calculate is left
+        out; if the K-lines cannot be loaded (or are empty) only the cached
+        indicators are returned.
+
+        Args:
+            exchange: Exchange name
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            indicator_types: Indicator types (defaults to all supported)
+            force_refresh: Recalculate instead of reading the cache
+            ohlcv_data: Already loaded OHLCV window (skips the K-line load)
+
+        Returns:
+            Tuple of ({indicator_type: indicator data}, data source)
+
+        Raises:
+            ValueError: If an indicator type is not supported
+        """
+        indicator_types = indicator_types or SUPPORTED_INDICATOR_TYPES
+        unsupported = [t for t in indicator_types if t not in SUPPORTED_INDICATOR_TYPES]
+        if unsupported:
+            raise ValueError(f"Unsupported indicator type: {', '.join(unsupported)}")
+
+        cache_keys = {
+            t: self._build_indicator_cache_key(exchange, symbol, timeframe, t)
+            for t in indicator_types
+        }
+        results: Dict[str, Dict[str, Any]] = {}
+
+        if not force_refresh:
+            results = await self._get_indicators_from_redis_many(cache_keys)
+            if len(results) == len(indicator_types):
+                logger.debug(f"Indicator bundle from Redis: {exchange} {symbol} {timeframe}")
+                return results, DataSource.REDIS
+
+        missing = [t for t in indicator_types if t not in results]
+
+        if ohlcv_data is None:
+            try:
+                ohlcv_data, _ = await self.get_klines(exchange, symbol, timeframe, limit=200)
+            except Exception as e:
+                if not results:
+                    raise
+                logger.warning(f"Failed to load K-lines for indicators {exchange} {symbol} {timeframe}: {e}")
+                return results, DataSource.REDIS
+
+        if not ohlcv_data:
+            # Nothing to calculate from; never store empty indicator rows
+            logger.warning(f"No K-lines to calculate indicators: {exchange} {symbol} {timeframe}")
+            return results, DataSource.REDIS if results else ""
+
+        computed = self._calculate_indicators(exchange, symbol, timeframe, ohlcv_data, missing)
+        if not computed:
+            return results, DataSource.REDIS if results else ""
+
+        await self._store_indicators_to_database(exchange, symbol, timeframe, list(computed.values()))
+        await self._cache_indicators_to_redis_many(
+            {cache_keys[t]: data for t, data in computed.items()},
+            timeframe
+        )
+
+        logger.info(
+            f"Calculated indicator bundle: {exchange} {symbol} {timeframe} "
+            f"{','.join(missing)}"
+        )
+
+        results.update(computed)
+        return results, DataSource.API
+
+    def _calculate_indicators(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        ohlcv_data: List[List],
+        indicator_types: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Calculate indicators with the configured backend
+
+        If calculating several indicators together fails, each one is
+        calculated on its own and the failing ones are left out.
+        """
+        try:
+            return self._calculate_indicator_batch(exchange, symbol, timeframe, ohlcv_data, indicator_types)
+        except Exception as e:
+            if len(indicator_types) == 1:
+                raise
+            logger.warning(f"Indicator batch failed for {exchange} {symbol} {timeframe}, calculating separately: {e}")
+
+        results = {}
+        for indicator_type in indicator_types:
+            try:
+                results.update(
+                    self._calculate_indicator_batch(exchange, symbol, timeframe, ohlcv_data, [indicator_type])
+                )
+            except Exception as e:
+                logger.warning(f"Failed to calculate {indicator_type} indicator for {exchange} {symbol} {timeframe}: {e}")
+        return results
+
+    def _calculate_indicator_batch(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        ohlcv_data: List[List],
+        indicator_types: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        if self.indicator_backend == "streaming":
+            state = self.indicator_engine.update(
+                self._build_kline_cache_key(exchange, symbol, timeframe),
+                ohlcv_data
+            )
+            return {
+                t: self.indicator_engine.build_result(state, ohlcv_data, t)
+                for t in indicator_types
+            }
+        return self.indicator_calculator.calculate_indicators(ohlcv_data, indicator_types)
+
     # Redis operations
+    async def _single_flight(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``load`` once per key; concurrent callers await the same result
+
+        If the leading call is cancelled, waiting callers run ``load`` themselves.
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self._flight_stats["coalesced"] += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                return await load()
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self._flight_stats["leaders"] += 1
+        try:
+            result = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody is waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _revalidate(self, key: str, load: Callable[["RateLimitHandler"], Awaitable[Any]]) -> None:
+        """
+        Refresh a stale entry in the background unless a refresh is already running
+
+        ``load`` is called with a handler bound to a new session, since the
+        caller's request-scoped session may be closed or in use by then.
+        """
+        self._flight_stats["stale_served"] += 1
+        if key in self._inflight:
+            return
+
+        async def refresh():
+            async with self.session_factory() as session:
+                return await load(self.with_session(session))
+
+        self._flight_stats["revalidations"] += 1
+        task = asyncio.create_task(self._single_flight(key, refresh))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_revalidated)
+
+    def _on_revalidated(self, task: asyncio.Task) -> None:
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background cache refresh error: {task.exception()}")
+
+    async def _redis_get(self, cache_key: str):
+        """Read a cache entry (raw bytes when the codec is binary)"""
+        if self.cache_codec.binary:
+            return await self.redis.get_bytes(cache_key)
+        return await self.redis.get(cache_key)
+
     async def _get_klines_from_redis(self, cache_key: str) -> Optional[List[List]]:
-        """Get K-line data from Redis"""
+        """Get K-line data from the L0 cache or Redis"""
+        local = self.local_cache.get(cache_key)
+        if local is not None:
+            return local
+
         try:
             if not self.redis.is_connected():
                 return None
 
-            cached = await self.redis.get(cache_key)
+            cached = await self._redis_get(cache_key)
             if cached:
-                return json.loads(cached)
+                data = self.cache_codec.decode_klines(cached)
+                self.local_cache.set(cache_key, data)
+                return data
             return None
         except Exception as e:
             logger.error(f"Redis get klines error: {e}")
@@ -257,30 +739,35 @@ class RateLimitHandler:
         data: List[List],
         timeframe: str
     ) -> bool:
-        """Cache K-line data to Redis"""
+        """Cache K-line data to Redis (and refresh the L0 copy)"""
+        ttl = self.cache_ttl.get(timeframe, 300)
+        self.local_cache.set(cache_key, data, ttl)
+        self._stale_cache.set(cache_key, data, ttl + self.stale_ttl)
+
         try:
             if not self.redis.is_connected():
                 return False
 
-            ttl = self.cache_ttl.get(timeframe, 300)
-            await self.redis.set(cache_key, json.dumps(data), expire_seconds=ttl)
+            await self.redis.set(cache_key, self.cache_codec.encode_klines(data), expire_seconds=ttl)
             return True
         except Exception as e:
             logger.error(f"Redis cache klines error: {e}")
             return False
 
     async def _get_indicator_from_redis(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        """Get indicator data from Redis"""
+        """Get indicator data from the L0 cache or Redis"""
+        local = self.local_cache.get(cache_key)
+        if local is not None:
+            return dict(local)
+
         try:
             if not self.redis.is_connected():
                 return None
 
-            cached = await self.redis.get(cache_key)
+            cached = await self._redis_get(cache_key)
             if cached:
-                data = json.loads(cached)
-                # 确保兼容性：如果没有values字段，从indicator_values复制
-                if data and 'indicator_values' in data and 'values' not in data:
-                    data['values'] = data['indicator_values']
+                data = self.cache_codec.decode_indicator(cached)
+                self.local_cache.set(cache_key, dict(data))
                 return data
             return None
         except Exception as e:
@@ -293,23 +780,81 @@ class RateLimitHandler:
         data: Dict[str, Any],
         timeframe: str
     ) -> bool:
-        """Cache indicator data to Redis"""
+        """Cache indicator data to Redis (and refresh the L0 copy)"""
+        ttl = self.cache_ttl.get(timeframe, 300)
+        self.local_cache.set(cache_key, dict(data), ttl)
+        self._stale_cache.set(cache_key, dict(data), ttl + self.stale_ttl)
+
         try:
             if not self.redis.is_connected():
                 return False
 
-            ttl = self.cache_ttl.get(timeframe, 300)
-            # Convert datetime to string for JSON serialization
-            data_copy = data.copy()
-            if 'timestamp' in data_copy and isinstance(data_copy['timestamp'], datetime):
-                data_copy['timestamp'] = data_copy['timestamp'].isoformat()
-
-            await self.redis.set(cache_key, json.dumps(data_copy), expire_seconds=ttl)
+            await self.redis.set(cache_key, self.cache_codec.encode_indicator(data), expire_seconds=ttl)
             return True
         except Exception as e:
             logger.error(f"Redis cache indicator error: {e}")
             return False
 
+    async def _get_indicators_from_redis_many(
+        self,
+        cache_keys: Dict[str, str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get several indicators from the L0 cache, then Redis with one MGET (hits only)"""
+        results: Dict[str, Dict[str, Any]] = {}
+        for indicator_type, cache_key in cache_keys.items():
+            local = self.local_cache.get(cache_key)
+            if local is not None:
+                results[indicator_type] = dict(local)
+
+        types = [t for t in cache_keys if t not in results]
+        if not types:
+            return results
+
+        try:
+            if not self.redis.is_connected():
+                return results
+
+            keys = [cache_keys[t] for t in types]
+            if self.cache_codec.binary:
+                values = await self.redis.mget_bytes(keys)
+            else:
+                values = await self.redis.mget(keys)
+
+            for indicator_type, cache_key, cached in zip(types, keys, values):
+                if cached:
+                    data = self.cache_codec.decode_indicator(cached)
+                    self.local_cache.set(cache_key, dict(data))
+                    results[indicator_type] = data
+            return results
+        except Exception as e:
+            logger.error(f"Redis get indicators error: {e}")
+            return results
+
+    async def _cache_indicators_to_redis_many(
+        self,
+        items: Dict[str, Dict[str, Any]],
+        timeframe: str
+    ) -> bool:
+        """Cache several indicators to Redis in one pipeline (and refresh the L0 copies)"""
+        ttl = self.cache_ttl.get(timeframe, 300)
+        for cache_key, data in items.items():
+            self.local_cache.set(cache_key, dict(data), ttl)
+            self._stale_cache.set(cache_key, dict(data), ttl + self.stale_ttl)
+
+        try:
+            if not self.redis.is_connected() or not items:
+                return False
+
+            payloads = {
+                cache_key: self.cache_codec.encode_indicator(data)
+                for cache_key, data in items.items()
+            }
+
+            return await self.redis.set_many(payloads, expire_seconds=ttl)
+        except Exception as e:
+            logger.error(f"Redis cache indicators error: {e}")
+            return False
+
     # Database operations
     async def _get_klines_from_database(
         self,
@@ -355,46 +900,143 @@ class RateLimitHandler:
     ) -> bool:
         """Store K-line data to PostgreSQL"""
         try:
-            for candle in ohlcv_data:
-                timestamp_ms, open_price, high, low, close, volume = candle
-                timestamp = datetime.fromtimestamp(timestamp_ms / 1000)
-
-                # Check if already exists
-                result = await self.db.execute(
-                    select(Kline).where(
-                        and_(
-                            Kline.exchange == exchange,
-                            Kline.symbol == symbol,
-                            Kline.timeframe == timeframe,
-                            Kline.timestamp == timestamp
-                        )
-                    )
-                )
-                existing = result.scalar_one_or_none()
-
-                if not existing:
-                    kline = Kline(
-                        exchange=exchange,
-                        symbol=symbol,
-                        timeframe=timeframe,
-                        timestamp=timestamp,
-                        open=open_price,
-                        high=high,
-                        low=low,
-                        close=close,
-                        volume=volume
-                    )
-                    self.db.add(kline)
-
-            await self.db.commit()
-            logger.debug(f"Stored {len(ohlcv_data)} klines to database")
+            await self.store_klines_bulk(exchange, symbol, timeframe, ohlcv_data)
             return True
-
         except Exception as e:
             logger.error(f"Database store klines error: {e}")
             await self.db.rollback()
             return False
 
+    async def store_klines_bulk(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        ohlcv_data: List[List],
+        use_copy: Optional[bool] = None
+    ) -> int:
+        """
+        Upsert a whole OHLCV batch in one transaction
+
+        Small batches are written with multi-row
+        ``INSERT ... ON CONFLICT (exchange, symbol, timeframe, timestamp) DO UPDATE``
+        statements (chunked to stay below the bind parameter limit). Large
+        backfills on PostgreSQL go through ``COPY`` into a temporary staging
+        table followed by a single ``INSERT ... SELECT ... ON CONFLICT``.
+
+        Args:
+            exchange: Exchange name
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            ohlcv_data: OHLCV data [[timestamp_ms, open, high, low, close, volume], ...]
+            use_copy: Force (True) or disable (False) the COPY path,
+                None selects it automatically for batches >= KLINE_COPY_THRESHOLD
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            Exception: Database errors are propagated, caller handles rollback
+        """
+        if not ohlcv_data:
+            return 0
+
+        rows = self._build_kline_rows(exchange, symbol, timeframe, ohlcv_data)
+        dialect = self.db.bind.dialect.name if self.db.bind is not None else ""
+
+        if use_copy is None:
+            use_copy = len(rows) >= self.KLINE_COPY_THRESHOLD
+        use_copy = use_copy and dialect == "postgresql"
+
+        if use_copy:
+            await self._copy_kline_rows(rows)
+        else:
+            insert_fn = pg_insert if dialect == "postgresql" else sqlite_insert
+            for start in range(0, len(rows), self.KLINE_UPSERT_BATCH_SIZE):
+                chunk = rows[start:start + self.KLINE_UPSERT_BATCH_SIZE]
+                stmt = insert_fn(Kline).values(chunk)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=KLINE_CONFLICT_COLUMNS,
+                    set_={col: getattr(stmt.excluded, col) for col in KLINE_VALUE_COLUMNS}
+                )
+                await self.db.execute(stmt)
+
+        await self.db.commit()
+
+        cache_key = self._build_kline_cache_key(exchange, symbol, timeframe)
+        latest_ms = max(int(candle[0]) for candle in ohlcv_data)
+        if latest_ms > self._high_water_marks.get(cache_key, 0):
+            self._high_water_marks[cache_key] = latest_ms
+
+        # New candles make the in-process copies of this series stale
+        self.invalidate_series(exchange, symbol, timeframe)
+
+        logger.debug(
+            f"Upserted {len(rows)} klines to database "
+            f"({exchange} {symbol} {timeframe}, copy={use_copy})"
+        )
+        return len(rows)
+
+    async def _copy_kline_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Bulk load kline rows via asyncpg COPY into a staging table, then merge
+
+        Args:
+            rows: Kline row dicts as built by _build_kline_rows
+        """
+        columns = KLINE_CONFLICT_COLUMNS + KLINE_VALUE_COLUMNS
+        conn = await self.db.connection()
+        raw_conn = await conn.get_raw_connection()
+        driver_conn = raw_conn.driver_connection
+
+        await driver_conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS klines_staging "
+            "(LIKE klines INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        await driver_conn.copy_records_to_table(
+            "klines_staging",
+            records=[tuple(row[col] for col in columns) for row in rows],
+            columns=columns
+        )
+
+        col_list = ", ".join(columns)
+        update_list = ", ".join(f"{col} = EXCLUDED.{col}" for col in KLINE_VALUE_COLUMNS)
+        await driver_conn.execute(
+            f"INSERT INTO klines ({col_list}) "
+            f"SELECT DISTINCT ON (exchange, symbol, timeframe, timestamp) {col_list} "
+            f"FROM klines_staging "
+            f"ON CONFLICT ON CONSTRAINT uix_kline_unique DO UPDATE SET {update_list}"
+        )
+
+    def _build_kline_rows(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        ohlcv_data: List[List]
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert OHLCV lists to kline row dicts, deduplicated by timestamp
+
+        A single statement may not touch the same conflict key twice, so the
+        last candle wins when the exchange returns duplicates.
+        """
+        rows: Dict[int, Dict[str, Any]] = {}
+        for candle in ohlcv_data:
+            timestamp_ms, open_price, high, low, close, volume = candle[:6]
+            rows[int(timestamp_ms)] = {
+                "exchange": exchange,
+                "symbol": symbol,
+                "timeframe": timeframe,
+                "timestamp": datetime.fromtimestamp(timestamp_ms / 1000),
+                "open": open_price,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume
+            }
+        return list(rows.values())
+
     async def _get_indicator_from_database(
         self,
         exchange: str,
@@ -436,54 +1078,82 @@ class RateLimitHandler:
             logger.error(f"Database get indicator error: {e}")
             return None
 
-    async def _store_indicator_to_database(
+    async def _store_indicators_to_database(
         self,
         exchange: str,
         symbol: str,
         timeframe: str,
-        indicator_data: Dict[str, Any]
+        indicators: List[Dict[str, Any]]
     ) -> bool:
-        """Store indicator data to PostgreSQL"""
-        try:
-            timestamp = indicator_data.get('timestamp')
-            if isinstance(timestamp, str):
-                timestamp = datetime.fromisoformat(timestamp)
+        """
+        Upsert several indicators of one series in a single transaction
 
-            # Check if already exists
-            result = await self.db.execute(
-                select(TechnicalIndicator).where(
-                    and_(
-                        TechnicalIndicator.exchange == exchange,
-                        TechnicalIndicator.symbol == symbol,
-                        TechnicalIndicator.timeframe == timeframe,
-                        TechnicalIndicator.timestamp == timestamp,
-                        TechnicalIndicator.indicator_type == indicator_data['indicator_type']
-                    )
-                )
-            )
-            existing = result.scalar_one_or_none()
-
-            if not existing:
-                indicator = TechnicalIndicator(
-                    exchange=exchange,
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    timestamp=timestamp,
-                    indicator_type=indicator_data['indicator_type'],
-                    indicator_params=indicator_data.get('indicator_params'),
-                    indicator_values=indicator_data['indicator_values']
-                )
-                self.db.add(indicator)
-                await self.db.commit()
-                logger.debug(f"Stored indicator to database: {indicator_data['indicator_type']}")
+        The latest candle may still be open, so an existing row for the same
+        timestamp is updated with the recalculated values.
+        """
+        if not indicators:
+            return True
 
+        try:
+            rows = []
+            for data in indicators:
+                timestamp = data.get('timestamp')
+                if isinstance(timestamp, str):
+                    timestamp = datetime.fromisoformat(timestamp)
+                rows.append({
+                    "exchange": exchange,
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "timestamp": timestamp,
+                    "indicator_type": data['indicator_type'],
+                    "indicator_params": data.get('indicator_params'),
+                    "indicator_values": data['indicator_values']
+                })
+
+            dialect = self.db.bind.dialect.name if self.db.bind is not None else ""
+            insert_fn = pg_insert if dialect == "postgresql" else sqlite_insert
+            stmt = insert_fn(TechnicalIndicator).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["exchange", "symbol", "timeframe", "timestamp", "indicator_type"],
+                set_={
+                    "indicator_params": stmt.excluded.indicator_params,
+                    "indicator_values": stmt.excluded.indicator_values
+                }
+            )
+            await self.db.execute(stmt)
+            await self.db.commit()
+            logger.debug(f"Stored {len(rows)} indicators to database")
             return True
 
         except Exception as e:
-            logger.error(f"Database store indicator error: {e}")
+            logger.error(f"Database store indicators error: {e}")
             await self.db.rollback()
             return False
 
+    def invalidate_series(self, exchange: str, symbol: str, timeframe: str) -> int:
+        """
+        Drop the L0 copies of a series' K-lines and indicators
+
+        Returns:
+            Number of dropped entries
+        """
+        dropped = int(self.local_cache.invalidate(self._build_kline_cache_key(exchange, symbol, timeframe)))
+        dropped += self.local_cache.invalidate_prefix(f"indicator:{exchange}:{symbol}:{timeframe}:")
+        return dropped
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get in-process cache statistics"""
+        return {
+            "l0": self.local_cache.get_stats(),
+            "single_flight": {
+                **self._flight_stats,
+                "in_flight": len(self._inflight),
+                "stale_while_revalidate_seconds": self.stale_ttl
+            },
+            "codec": self.cache_codec.name,
+            "indicator_backend": self.indicator_backend
+        }
+
     # Cache key builders
     def _build_kline_cache_key(self, exchange: str, symbol: str, timeframe: str) -> str:
         """Build Redis cache key for K-line data"""
@@ -0,0 +1,233 @@
+"""
+Signal Event Bus
+Sequenced publish/subscribe for new signals (in-process, optionally fanned out via Redis pub/sub)
+"""
+from typing import Dict, List, Any, Optional, Set, Tuple
+from collections import deque
+import asyncio
+import json
+import uuid
+import logging
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_CHANNEL = "btc_watcher:signals"
+REDIS_SEQUENCE_KEY = "btc_watcher:signals:seq"
+REDIS_EPOCH_KEY = "btc_watcher:signals:epoch"
+
+# Allocate a sequence range and publish in one atomic step so every worker
+# receives batches in sequence order. A missing sequence key (Redis flushed)
+# starts a new epoch so clients drop their old position.
+REDIS_PUBLISH_SCRIPT = """
+local count = tonumber(ARGV[1])
+local epoch = redis.call('GET', KEYS[2])
+if (not epoch) or redis.call('EXISTS', KEYS[1]) == 0 then
+    epoch = ARGV[4]
+    redis.call('SET', KEYS[2], epoch)
+end
+local last_seq = redis.call('INCRBY', KEYS[1], count)
+redis.call('PUBLISH', ARGV[2], '{"epoch":"' .. epoch .. '","first_seq":' .. (last_seq - count + 1) ..
+    ',"signals":' .. ARGV[3] .. '}')
+return last_seq
+"""
+
+
+class SignalEventBus:
+    """
+    Signal event bus with sequence numbers
+
+    Every published signal gets a sequence number (``seq``) that increases by
+    one per signal, so subscribers can detect gaps. Recent events are kept in
+    a ring buffer for ``replay``. With a Redis client, sequence numbers are
+    allocated in Redis and batches are delivered through pub/sub, so all
+    workers see the same sequence; without one, delivery is in-process.
+
+    When Redis fails, the worker switches to a worker-local epoch instead of
+    continuing the shared sequence (other workers keep allocating it, so
+    local numbers would collide): clients see the epoch change and resync.
+    """
+
+    def __init__(self, buffer_size: int = 10000, subscriber_queue_size: int = 1000):
+        self.buffer_size = buffer_size
+        self.subscriber_queue_size = subscriber_queue_size
+        self.epoch = uuid.uuid4().hex[:12]
+        self.last_seq = 0
+        self._local_epoch: Optional[str] = None
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._redis = None
+        self._listener_task: Optional[asyncio.Task] = None
+
+        # Statistics
+        self.published = 0
+        self.delivered_batches = 0
+        self.dropped_batches = 0
+        self.redis_errors = 0
+
+    @property
+    def backend(self) -> str:
+        return "redis" if self._redis is not None else "memory"
+
+    async def start(self, redis=None):
+        """
+        Start the bus; with a Redis client, subscribe to the shared channel
+
+        Args:
+            redis: redis.asyncio client (decode_responses=True), or None for in-process delivery
+        """
+        if redis is None or self._listener_task is not None:
+            return
+
+        try:
+            self.epoch = await redis.get(REDIS_EPOCH_KEY) or self.epoch
+            self.last_seq = int(await redis.get(REDIS_SEQUENCE_KEY) or 0)
+            pubsub = redis.pubsub()
+            await pubsub.subscribe(REDIS_CHANNEL)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.error(f"Failed to start Redis signal bus, using in-process delivery: {e}")
+            return
+
+        self._redis = redis
+        self._listener_task = asyncio.create_task(self._listen(pubsub))
+        logger.info(f"Signal event bus using Redis channel {REDIS_CHANNEL} (epoch={self.epoch})")
+
+    async def stop(self):
+        """Stop the Redis listener (in-process delivery keeps working)"""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        self._redis = None
+
+    async def publish(self, signals: List[Dict[str, Any]]) -> int:
+        """
+        Publish a batch of new signals
+
+        Returns:
+            Sequence number of the last signal in the batch
+        """
+        if not signals:
+            return self.last_seq
+
+        self.published += len(signals)
+        if self._redis is not None:
+            try:
+                return await self._redis.eval(
+                    REDIS_PUBLISH_SCRIPT, 2, REDIS_SEQUENCE_KEY, REDIS_EPOCH_KEY,
+                    len(signals), REDIS_CHANNEL, json.dumps(signals, default=str), uuid.uuid4().hex[:12]
+                )
+            except Exception as e:
+                self.redis_errors += 1
+                logger.error(f"Failed to publish signals to Redis, delivering in-process: {e}")
+                if self.epoch != self._local_epoch:
+                    self._start_local_epoch()
+
+        self._dispatch(self.epoch, self.last_seq + 1, signals)
+        return self.last_seq
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Subscribe to signal batches
+
+        Returns:
+            Queue receiving lists of signals (each with ``seq``) in sequence order
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Remove a subscriber queue"""
+        self._subscribers.discard(queue)
+
+    def replay(self, after_seq: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Get buffered signals with ``seq > after_seq``
+
+        Returns:
+            (signals, complete); complete is False when older signals were
+            already evicted from the buffer and the caller should reload
+        """
+        events = [event for event in self._buffer if event["seq"] > after_seq]
+        oldest = self._buffer[0]["seq"] if self._buffer else self.last_seq + 1
+        return events, after_seq >= oldest - 1
+
+    def _start_local_epoch(self):
+        """Restart numbering under a new worker-local epoch"""
+        self.epoch = self._local_epoch = uuid.uuid4().hex[:12]
+        self.last_seq = 0
+        self._buffer.clear()
+        logger.warning(f"Signal event bus switched to local epoch {self.epoch}")
+
+    def _dispatch(self, epoch: str, first_seq: int, signals: List[Dict[str, Any]]):
+        """Number a batch, buffer it and hand it to every subscriber"""
+        if epoch != self.epoch:
+            # Sequence restarted (Redis reset): older buffered events are no longer comparable
+            self.epoch = epoch
+            self._buffer.clear()
+        events = [dict(signal, seq=first_seq + i) for i, signal in enumerate(signals)]
+        self.last_seq = events[-1]["seq"]
+        self._buffer.extend(events)
+
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(events)
+                self.delivered_batches += 1
+            except asyncio.QueueFull:
+                # The subscriber sees a sequence gap and can replay from the buffer
+                self.dropped_batches += 1
+                logger.warning(f"Signal subscriber queue full, dropped batch {first_seq}-{self.last_seq}")
+
+    async def _listen(self, pubsub):
+        """Dispatch batches received from the Redis channel"""
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    payload = json.loads(message["data"])
+                    self._dispatch(payload["epoch"], payload["first_seq"], payload["signals"])
+                except Exception as e:
+                    logger.error(f"Invalid signal bus message: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.redis_errors += 1
+            logger.error(f"Redis signal bus listener stopped: {e}", exc_info=True)
+            self._redis = None
+            self._listener_task = None
+            self._start_local_epoch()
+        finally:
+            try:
+                await pubsub.unsubscribe(REDIS_CHANNEL)
+                await pubsub.close()
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bus statistics"""
+        return {
+            "backend": self.backend,
+            "epoch": self.epoch,
+            "last_seq": self.last_seq,
+            "buffered": len(self._buffer),
+            "buffer_size": self.buffer_size,
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "delivered_batches": self.delivered_batches,
+            "dropped_batches": self.dropped_batches,
+            "redis_errors": self.redis_errors
+        }
+
+
+# Global signal event bus instance
+signal_event_bus = SignalEventBus(
+    buffer_size=settings.SIGNAL_EVENT_BUFFER_SIZE,
+    subscriber_queue_size=settings.SIGNAL_EVENT_SUBSCRIBER_QUEUE_SIZE
+)
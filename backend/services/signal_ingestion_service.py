@@ -0,0 +1,301 @@
+"""
+Signal Ingestion Service
+Write-behind pipeline for FreqTrade webhook signals: enqueue, batch insert, then push
+"""
+from typing import Dict, List, Any, Optional, Tuple
+from collections import deque
+import asyncio
+import time
+import logging
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from models.signal import Signal
+from services.signal_event_bus import signal_event_bus
+from services.signal_rollup_service import signal_rollup_service
+
+logger = logging.getLogger(__name__)
+
+# Columns written by the batcher; every row carries all of them so one
+# executemany covers the whole batch
+SIGNAL_COLUMNS = [
+    "strategy_id", "pair", "action", "signal_strength", "strength_level",
+    "current_rate", "entry_price", "exit_price", "profit_ratio", "profit_abs",
+    "trade_duration", "indicators", "signal_metadata", "freqtrade_trade_id",
+    "open_date", "close_date"
+]
+
+# First delay between retries of a batch after a transient error (doubles per
+# attempt up to MAX_RETRY_DELAY)
+RETRY_DELAY = 0.1
+MAX_RETRY_DELAY = 5.0
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Errors worth retrying: lost connections, timeouts, database unavailable"""
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(error, (OperationalError, InterfaceError, ConnectionError, asyncio.TimeoutError))
+
+
+class SignalIngestionService:
+    """
+    Write-behind signal batcher
+
+    The webhook validates a signal and calls ``submit``; a background task
+    collects queued signals and flushes them every ``flush_interval_ms`` or
+    ``max_batch_size`` rows with one multi-row INSERT (and the matching
+    rollup upsert), then publishes the whole batch on the signal event bus.
+
+    Signals are acknowledged before they are stored, so a batch failing
+    with a transient error (database unreachable) is retried with capped
+    backoff for as long as the service runs; meanwhile the queue fills up
+    and ``submit`` starts rejecting. Once stopping, ``max_retries`` more
+    attempts are made. Any other error inserts the batch row by row: only
+    the rows that fail on their own are dropped (counted in
+    ``failed_rows``, the latest kept in ``dead_letters``).
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        max_batch_size: int = 500,
+        flush_interval_ms: int = 50,
+        max_queue_size: int = 10000,
+        rollups_enabled: bool = True,
+        max_retries: int = 2
+    ):
+        self.session_factory = session_factory
+        self.rollups_enabled = rollups_enabled
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.max_retries = max_retries
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.is_running = False
+        self._task: Optional[asyncio.Task] = None
+
+        # Statistics
+        self.enqueued = 0
+        self.rejected = 0
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failed_rows = 0
+        self.retries = 0
+        self.row_fallbacks = 0
+        self.dead_letters: deque = deque(maxlen=100)
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._flush_ms: deque = deque(maxlen=1000)
+        self._queue_lag_ms: deque = deque(maxlen=1000)
+
+    async def start(self):
+        """Start the background batcher"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Signal ingestion started (batch={self.max_batch_size}, "
+            f"interval={self.flush_interval * 1000:.0f}ms, queue={self.max_queue_size})"
+        )
+
+    async def stop(self, timeout: float = 10):
+        """Stop the batcher after flushing queued signals"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=timeout)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+                logger.warning(f"Signal ingestion stopped with {self.queue.qsize()} signals unflushed")
+            self._task = None
+        logger.info("Signal ingestion stopped")
+
+    def submit(self, values: Dict[str, Any], strategy_name: Optional[str] = None) -> bool:
+        """
+        Enqueue a validated signal
+
+        Args:
+            values: Signal column values (keys from SIGNAL_COLUMNS)
+            strategy_name: Strategy name included in the published event
+
+        Returns:
+            False when the queue is full (caller should reject the webhook)
+        """
+        try:
+            self.queue.put_nowait((values, strategy_name, time.monotonic()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    async def _run(self):
+        """Collect queued signals into batches and flush them"""
+        while self.is_running or not self.queue.empty():
+            try:
+                batch = await self._collect_batch()
+                if batch:
+                    await self._flush(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep draining: the webhook still acknowledges signals into the queue
+                logger.error(f"Signal batcher iteration failed: {e}", exc_info=True)
+                await asyncio.sleep(self.flush_interval)
+
+    async def _collect_batch(self) -> List[Tuple[Dict[str, Any], Optional[str], float]]:
+        """Wait for the first signal, then gather more until the batch is full or the interval ends"""
+        try:
+            first = await asyncio.wait_for(self.queue.get(), timeout=self.flush_interval)
+        except asyncio.TimeoutError:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.is_running:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> List[Tuple[int, Any]]:
+        """Insert rows (and their rollups) in one transaction, returning (id, created_at) per row"""
+        async with self.session_factory() as session:
+            result = await session.execute(
+                insert(Signal).returning(Signal.id, Signal.created_at, sort_by_parameter_order=True),
+                rows
+            )
+            inserted = result.all()
+            if self.rollups_enabled:
+                await signal_rollup_service.apply(session, [
+                    dict(row, created_at=created_at)
+                    for row, (_, created_at) in zip(rows, inserted)
+                ])
+            await session.commit()
+        return inserted
+
+    async def _insert_with_retry(self, rows: List[Dict[str, Any]]) -> List[Tuple[int, Any]]:
+        """Insert rows, retrying transient errors with capped backoff (at most max_retries times once stopped)"""
+        attempt = 0
+        while True:
+            try:
+                return await self._insert(rows)
+            except Exception as e:
+                if not is_transient_error(e) or (not self.is_running and attempt >= self.max_retries):
+                    raise
+                self.retries += 1
+                delay = min(RETRY_DELAY * 2 ** attempt, MAX_RETRY_DELAY)
+                logger.warning(
+                    f"Transient error flushing {len(rows)} signals (attempt {attempt + 1}), "
+                    f"retrying in {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _insert_row_by_row(
+        self,
+        rows: List[Dict[str, Any]],
+        batch: List[Tuple[Dict[str, Any], Optional[str], float]]
+    ) -> Tuple[List[Dict[str, Any]], List, List[Tuple[int, Any]]]:
+        """Insert rows one at a time so a bad row only drops itself"""
+        self.row_fallbacks += 1
+        kept_rows, kept_batch, inserted = [], [], []
+        for row, item in zip(rows, batch):
+            try:
+                inserted.extend(await self._insert_with_retry([row]))
+            except Exception as e:
+                self.failed_rows += 1
+                self.dead_letters.append({"values": row, "error": str(e), "failed_at": time.time()})
+                logger.error(f"Dropped signal from strategy {row.get('strategy_id')} ({row.get('pair')}): {e}")
+                continue
+            kept_rows.append(row)
+            kept_batch.append(item)
+        return kept_rows, kept_batch, inserted
+
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], Optional[str], float]]):
+        """Insert a batch in one statement and publish it on the signal event bus"""
+        started = time.perf_counter()
+        rows = [{column: values.get(column) for column in SIGNAL_COLUMNS} for values, _, _ in batch]
+
+        try:
+            inserted = await self._insert_with_retry(rows)
+        except Exception as e:
+            if is_transient_error(e):
+                # Only reached while stopping: every row would fail the same way
+                self.failed_rows += len(batch)
+                logger.error(f"Database unavailable while stopping, {len(batch)} signals not stored: {e}")
+                return
+            logger.warning(f"Failed to flush {len(batch)} signals as a batch, inserting row by row: {e}")
+            rows, batch, inserted = await self._insert_row_by_row(rows, batch)
+            if not rows:
+                return
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        now = time.monotonic()
+        self.flushes += 1
+        self.flushed_rows += len(batch)
+        self.last_batch_size = len(batch)
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._flush_ms.append(elapsed_ms)
+        self._queue_lag_ms.extend((now - enqueued_at) * 1000 for _, _, enqueued_at in batch)
+
+        await signal_event_bus.publish([
+            {
+                "id": signal_id,
+                "strategy_id": row["strategy_id"],
+                "strategy_name": strategy_name,
+                "pair": row["pair"],
+                "action": row["action"],
+                "signal_strength": row["signal_strength"],
+                "strength_level": row["strength_level"],
+                "current_rate": row["current_rate"],
+                "profit_ratio": row["profit_ratio"],
+                "created_at": created_at.isoformat() if created_at else None
+            }
+            for (signal_id, created_at), row, (_, strategy_name, _) in zip(inserted, rows, batch)
+        ])
+
+        logger.debug(f"Flushed {len(batch)} signals in {elapsed_ms:.1f}ms")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue and flush statistics"""
+        flush_ms = list(self._flush_ms)
+        queue_lag_ms = list(self._queue_lag_ms)
+        return {
+            "is_running": self.is_running,
+            "queue_depth": self.queue.qsize(),
+            "max_queue_size": self.max_queue_size,
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "failed_rows": self.failed_rows,
+            "retries": self.retries,
+            "row_fallbacks": self.row_fallbacks,
+            "rows_per_flush": round(self.flushed_rows / self.flushes, 2) if self.flushes else 0.0,
+            "last_batch_size": self.last_batch_size,
+            "flush_latency_ms": {
+                "last": round(self.last_flush_ms, 2),
+                "avg": round(sum(flush_ms) / len(flush_ms), 2) if flush_ms else 0.0,
+                "max": round(self.max_flush_ms, 2)
+            },
+            "queue_lag_ms_avg": round(sum(queue_lag_ms) / len(queue_lag_ms), 2) if queue_lag_ms else 0.0
+        }
@@ -0,0 +1,417 @@
+"""
+Signal Rollup Service
+Maintains per-minute/per-hour signal aggregates and answers statistics from them
+"""
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+from datetime import datetime, timedelta, timezone
+import logging
+from sqlalchemy import select, delete, and_, or_, func, literal, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models.signal import Signal
+from models.signal_rollup import SignalRollup, SignalRollupCoverage
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_GRANULARITIES = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1)
+}
+
+# Dimension columns of a rollup row (conflict target matches uix_signal_rollup)
+ROLLUP_DIMENSIONS = ["strategy_id", "pair", "action", "strength_level"]
+ROLLUP_KEY_COLUMNS = ["granularity", "bucket_start"] + ROLLUP_DIMENSIONS
+
+# SQLite stores DateTime as text in this format; backfilled buckets must match it exactly
+SQLITE_BUCKET_FORMATS = {
+    "minute": "%Y-%m-%d %H:%M:00.000000",
+    "hour": "%Y-%m-%d %H:00:00.000000"
+}
+
+
+def truncate_time(value: datetime, granularity: str) -> datetime:
+    """
+    Truncate a timestamp to the start of its minute/hour bucket
+
+    Aware timestamps are bucketed in UTC (and returned in UTC), matching
+    the SQL truncation used by backfills; naive ones are taken as they are.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    if granularity == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(second=0, microsecond=0)
+
+
+def ceil_time(value: datetime, granularity: str) -> datetime:
+    """Round a timestamp up to the next bucket boundary (unchanged if already aligned)"""
+    truncated = truncate_time(value, granularity)
+    if truncated == value:
+        return value
+    return truncated + ROLLUP_GRANULARITIES[granularity]
+
+
+def as_utc(value: datetime) -> datetime:
+    """Aware UTC timestamp (naive values are local time, as from ``datetime.now()``)"""
+    return value.astimezone(timezone.utc)
+
+
+def like(value: datetime, reference: datetime) -> datetime:
+    """Express an aware timestamp in the naive/aware form of ``reference``"""
+    if reference.tzinfo is None:
+        return value.astimezone().replace(tzinfo=None)
+    return value.astimezone(reference.tzinfo)
+
+
+class SignalRollupService:
+    """
+    Signal rollup maintenance and queries
+
+    Rollups are updated incrementally in the same transaction that inserts
+    signals (``apply``); ``backfill`` rebuilds a time range from raw signals
+    and ``check_consistency`` compares the two.
+
+    Rollups are only complete from their coverage watermark on: the first
+    start with rollups enabled sets it to the next whole hour, a backfill
+    reaching it moves it back to the backfill start. Queries read raw
+    signals for anything before it, and for anything older than
+    SIGNAL_ROLLUP_RETENTION_DAYS (the retention job may have pruned it).
+    """
+
+    # Rows per multi-row upsert (8 bind parameters per row)
+    UPSERT_BATCH_SIZE = 1000
+
+    def __init__(self, granularities: Iterable[str] = ("minute", "hour")):
+        self.granularities = list(granularities)
+
+    def build_rollup_rows(self, signals: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Aggregate signals into rollup rows
+
+        Args:
+            signals: Dicts with created_at, strategy_id, pair, action, strength_level, signal_strength
+
+        Returns:
+            One row per (granularity, bucket, dimensions) with signal_count and strength_sum
+        """
+        rows: Dict[Tuple, Dict[str, Any]] = {}
+        for signal in signals:
+            created_at = signal.get("created_at")
+            if created_at is None:
+                continue
+            for granularity in self.granularities:
+                bucket_start = truncate_time(created_at, granularity)
+                key = (granularity, bucket_start) + tuple(signal[d] for d in ROLLUP_DIMENSIONS)
+                row = rows.get(key)
+                if row is None:
+                    row = dict(zip(ROLLUP_KEY_COLUMNS, key), signal_count=0, strength_sum=0.0)
+                    rows[key] = row
+                row["signal_count"] += 1
+                row["strength_sum"] += signal.get("signal_strength") or 0.0
+        return list(rows.values())
+
+    async def apply(self, db: AsyncSession, signals: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add signals to the rollups (caller commits)
+
+        Returns:
+            Number of rollup rows upserted
+        """
+        rows = self.build_rollup_rows(signals)
+        if not rows:
+            return 0
+
+        insert = sqlite_insert if db.bind.dialect.name == "sqlite" else pg_insert
+        for i in range(0, len(rows), self.UPSERT_BATCH_SIZE):
+            stmt = insert(SignalRollup).values(rows[i:i + self.UPSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=ROLLUP_KEY_COLUMNS,
+                set_={
+                    "signal_count": SignalRollup.signal_count + stmt.excluded.signal_count,
+                    "strength_sum": SignalRollup.strength_sum + stmt.excluded.strength_sum,
+                    "updated_at": func.now()
+                }
+            )
+            await db.execute(stmt)
+        return len(rows)
+
+    async def backfill(self, db: AsyncSession, start: datetime, end: datetime) -> Dict[str, int]:
+        """
+        Rebuild rollups of [start, end) from raw signals
+
+        The range is widened to whole hours so every rebuilt bucket is complete.
+
+        Returns:
+            Number of rollup rows written per granularity
+        """
+        start = truncate_time(start, "hour")
+        end = ceil_time(end, "hour")
+        written = {}
+
+        for granularity in self.granularities:
+            await db.execute(
+                delete(SignalRollup).where(and_(
+                    SignalRollup.granularity == granularity,
+                    SignalRollup.bucket_start >= start,
+                    SignalRollup.bucket_start < end
+                ))
+            )
+
+            source = self._raw_aggregate_query(db, granularity, start, end)
+            result = await db.execute(
+                SignalRollup.__table__.insert().from_select(
+                    ROLLUP_KEY_COLUMNS + ["signal_count", "strength_sum"],
+                    source
+                )
+            )
+            written[granularity] = result.rowcount or 0
+
+        # Extend coverage back to the start when the rebuilt range reaches it
+        covered_from = await self.get_coverage(db)
+        if covered_from is not None and as_utc(start) < covered_from <= as_utc(end):
+            await self._set_coverage(db, as_utc(start))
+
+        await db.commit()
+        logger.info(f"Backfilled signal rollups {start} - {end}: {written}")
+        return written
+
+    async def get_coverage(self, db: AsyncSession) -> Optional[datetime]:
+        """Start of the range the rollups are complete for (aware UTC), None if unknown"""
+        covered_from = await db.scalar(
+            select(SignalRollupCoverage.covered_from).where(SignalRollupCoverage.id == 1)
+        )
+        if covered_from is not None and covered_from.tzinfo is None:
+            # SQLite drops the offset; the value was written in UTC
+            covered_from = covered_from.replace(tzinfo=timezone.utc)
+        return covered_from
+
+    async def ensure_coverage(self, db: AsyncSession) -> datetime:
+        """
+        Record where rollup coverage starts if nothing is recorded yet
+
+        Called at startup before any signal is written: rollups are complete
+        from the next whole hour on (earlier history is only covered after a
+        backfill).
+        """
+        covered_from = await self.get_coverage(db)
+        if covered_from is None:
+            covered_from = ceil_time(datetime.now(timezone.utc), "hour")
+            await self._set_coverage(db, covered_from)
+            await db.commit()
+            logger.info(f"Signal rollups cover signals from {covered_from.isoformat()}")
+        return covered_from
+
+    async def reset_coverage(self, db: AsyncSession):
+        """Forget the coverage watermark (rollups are no longer maintained)"""
+        await db.execute(delete(SignalRollupCoverage))
+        await db.commit()
+
+    async def rollup_start(self, db: AsyncSession, start: datetime) -> Optional[datetime]:
+        """
+        First moment at or after ``start`` that may be read from rollups
+
+        Returns:
+            ``start`` or the coverage watermark if later, in the form of
+            ``start`` (naive or aware); None when there is no coverage
+        """
+        covered_from = await self.get_coverage(db)
+        if covered_from is None:
+            return None
+        retention_days = settings.SIGNAL_ROLLUP_RETENTION_DAYS if settings.DATA_RETENTION_ENABLED else 0
+        if retention_days > 0:
+            # Buckets before the retention cutoff may already be deleted
+            pruned_until = ceil_time(datetime.now(timezone.utc) - timedelta(days=retention_days), "hour")
+            covered_from = max(covered_from, pruned_until)
+        if as_utc(start) >= covered_from:
+            return start
+        return like(covered_from, start)
+
+    async def check_consistency(
+        self,
+        db: AsyncSession,
+        start: datetime,
+        end: datetime,
+        granularity: str = "minute",
+        max_report: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Compare rollups of [start, end) against aggregates of raw signals
+
+        Returns:
+            Summary with checked bucket count and the first mismatches
+        """
+        start = truncate_time(start, granularity)
+        end = ceil_time(end, granularity)
+
+        raw = {}
+        for row in (await db.execute(self._raw_aggregate_query(db, granularity, start, end))).all():
+            raw[self._bucket_key(row)] = (row.signal_count, row.strength_sum)
+
+        rollup = {}
+        result = await db.execute(
+            select(
+                SignalRollup.bucket_start,
+                *[getattr(SignalRollup, d) for d in ROLLUP_DIMENSIONS],
+                SignalRollup.signal_count,
+                SignalRollup.strength_sum
+            ).where(and_(
+                SignalRollup.granularity == granularity,
+                SignalRollup.bucket_start >= start,
+                SignalRollup.bucket_start < end
+            ))
+        )
+        for row in result.all():
+            rollup[self._bucket_key(row)] = (row.signal_count, row.strength_sum)
+
+        mismatches = []
+        for key in sorted(set(raw) | set(rollup), key=str):
+            expected = raw.get(key, (0, 0.0))
+            actual = rollup.get(key, (0, 0.0))
+            if expected[0] != actual[0] or abs((expected[1] or 0) - (actual[1] or 0)) > 1e-6:
+                mismatches.append({
+                    "bucket_start": key[0].isoformat(),
+                    **dict(zip(ROLLUP_DIMENSIONS, key[1:])),
+                    "raw_count": expected[0],
+                    "rollup_count": actual[0]
+                })
+
+        return {
+            "granularity": granularity,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "checked_buckets": len(set(raw) | set(rollup)),
+            "mismatch_count": len(mismatches),
+            "mismatches": mismatches[:max_report],
+            "consistent": not mismatches
+        }
+
+    async def summarize(
+        self,
+        db: AsyncSession,
+        start: datetime,
+        strategy_id: Optional[int] = None
+    ) -> List[Tuple[str, str, int, float]]:
+        """
+        Count signals created since ``start`` from the rollups
+
+        Whole hours are read from hourly rollups, the edges from minute
+        rollups, and the partial first minute (or everything before the
+        coverage watermark) from raw signals, so the result matches a scan
+        of ``signals``.
+
+        Returns:
+            Rows of (action, strength_level, signal_count, strength_sum)
+        """
+        rollup_start = await self.rollup_start(db, start)
+        if rollup_start is None:
+            return await self._summarize_rows(db, [self._raw_summary_query(start, None, strategy_id)])
+
+        first_minute = ceil_time(rollup_start, "minute")
+        first_hour = ceil_time(rollup_start, "hour")
+        last_hour = truncate_time(datetime.now(start.tzinfo), "hour")
+
+        if first_hour < last_hour:
+            ranges = or_(
+                and_(
+                    SignalRollup.granularity == "minute",
+                    or_(
+                        and_(SignalRollup.bucket_start >= first_minute, SignalRollup.bucket_start < first_hour),
+                        SignalRollup.bucket_start >= last_hour
+                    )
+                ),
+                and_(
+                    SignalRollup.granularity == "hour",
+                    SignalRollup.bucket_start >= first_hour,
+                    SignalRollup.bucket_start < last_hour
+                )
+            )
+        else:
+            ranges = and_(SignalRollup.granularity == "minute", SignalRollup.bucket_start >= first_minute)
+
+        rollup_query = select(
+            SignalRollup.action,
+            SignalRollup.strength_level,
+            func.sum(SignalRollup.signal_count),
+            func.sum(SignalRollup.strength_sum)
+        ).where(ranges)
+        if strategy_id:
+            rollup_query = rollup_query.where(SignalRollup.strategy_id == strategy_id)
+        rollup_query = rollup_query.group_by(SignalRollup.action, SignalRollup.strength_level)
+
+        raw_query = self._raw_summary_query(start, first_minute, strategy_id)
+        return await self._summarize_rows(db, [rollup_query, raw_query])
+
+    @staticmethod
+    def _raw_summary_query(start: datetime, end: Optional[datetime], strategy_id: Optional[int]):
+        """(action, strength_level, count, strength sum) of raw signals in [start, end)"""
+        conditions = [Signal.created_at >= start]
+        if end is not None:
+            conditions.append(Signal.created_at < end)
+        if strategy_id:
+            conditions.append(Signal.strategy_id == strategy_id)
+        return select(
+            Signal.action,
+            Signal.strength_level,
+            func.count(),
+            func.sum(Signal.signal_strength)
+        ).where(and_(*conditions)).group_by(Signal.action, Signal.strength_level)
+
+    @staticmethod
+    async def _summarize_rows(db: AsyncSession, queries: List) -> List[Tuple[str, str, int, float]]:
+        """Merge (action, strength_level, count, strength sum) rows of several queries"""
+        totals: Dict[Tuple[str, str], List] = {}
+        for query in queries:
+            for action, strength_level, count, strength_sum in (await db.execute(query)).all():
+                entry = totals.setdefault((action, strength_level), [0, 0.0])
+                entry[0] += int(count or 0)
+                entry[1] += float(strength_sum or 0.0)
+
+        return [(action, level, count, strength_sum) for (action, level), (count, strength_sum) in totals.items()]
+
+    def _raw_aggregate_query(self, db: AsyncSession, granularity: str, start: datetime, end: datetime):
+        """GROUP BY bucket and dimensions over raw signals of [start, end)"""
+        bucket = self._sql_truncate(db, Signal.created_at, granularity).label("bucket_start")
+        dimensions = [getattr(Signal, d) for d in ROLLUP_DIMENSIONS]
+        return select(
+            literal(granularity).label("granularity"),
+            bucket,
+            *dimensions,
+            func.count().label("signal_count"),
+            func.coalesce(func.sum(Signal.signal_strength), 0.0).label("strength_sum")
+        ).where(and_(
+            Signal.created_at >= start,
+            Signal.created_at < end
+        )).group_by(bucket, *dimensions)
+
+    @staticmethod
+    def _sql_truncate(db: AsyncSession, column, granularity: str):
+        # Inline the unit/format: a bound parameter would make the SELECT and
+        # GROUP BY expressions differ for PostgreSQL
+        if db.bind.dialect.name == "sqlite":
+            return func.strftime(literal_column(f"'{SQLITE_BUCKET_FORMATS[granularity]}'"), column)
+        # Truncate in UTC whatever the session TimeZone is, like truncate_time
+        utc = literal_column("'UTC'")
+        return func.timezone(utc, func.date_trunc(literal_column(f"'{granularity}'"), func.timezone(utc, column)))
+
+    async def _set_coverage(self, db: AsyncSession, covered_from: datetime):
+        """Upsert the coverage watermark (caller commits)"""
+        insert = sqlite_insert if db.bind.dialect.name == "sqlite" else pg_insert
+        stmt = insert(SignalRollupCoverage).values(id=1, covered_from=covered_from)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=["id"],
+            set_={"covered_from": stmt.excluded.covered_from, "updated_at": func.now()}
+        ))
+
+    @staticmethod
+    def _bucket_key(row) -> Tuple:
+        bucket_start = row.bucket_start
+        if isinstance(bucket_start, str):
+            bucket_start = datetime.fromisoformat(bucket_start)
+        return (bucket_start,) + tuple(getattr(row, d) for d in ROLLUP_DIMENSIONS)
+
+
+# Global signal rollup service instance
+signal_rollup_service = SignalRollupService()
@@ -0,0 +1,120 @@
+"""
+Strategy Metadata Cache
+In-memory strategy metadata (name, exchange, status, signal thresholds) for the webhook hot path
+"""
+from typing import Dict, Any, Optional
+import logging
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.strategy import Strategy
+
+logger = logging.getLogger(__name__)
+
+# Strategy columns kept in the cache
+METADATA_COLUMNS = [
+    Strategy.id,
+    Strategy.name,
+    Strategy.exchange,
+    Strategy.status,
+    Strategy.is_active,
+    Strategy.signal_thresholds
+]
+
+
+class StrategyMetadataCache:
+    """
+    Strategy metadata cache keyed by strategy id
+
+    Loaded in full on startup; the strategy create/update/delete/start/stop
+    handlers invalidate entries, and a miss loads the single row.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self.loaded = False
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.full_loads = 0
+
+    async def load_all(self, db: AsyncSession) -> int:
+        """
+        Load metadata of all strategies
+
+        Returns:
+            Number of cached strategies
+        """
+        result = await db.execute(select(*METADATA_COLUMNS))
+        self._entries = {row.id: self._to_entry(row) for row in result.all()}
+        self.loaded = True
+        self.full_loads += 1
+        logger.info(f"Loaded metadata for {len(self._entries)} strategies")
+        return len(self._entries)
+
+    async def get(self, strategy_id: int, db: AsyncSession) -> Optional[Dict[str, Any]]:
+        """
+        Get strategy metadata, loading the row on a miss
+
+        Returns:
+            Metadata dict, or None if the strategy does not exist
+        """
+        entry = self._entries.get(strategy_id)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        result = await db.execute(select(*METADATA_COLUMNS).where(Strategy.id == strategy_id))
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        entry = self._to_entry(row)
+        self._entries[strategy_id] = entry
+        return entry
+
+    def put(self, strategy: Strategy):
+        """Store metadata from a committed Strategy object"""
+        self._entries[strategy.id] = self._to_entry(strategy)
+
+    def invalidate(self, strategy_id: int):
+        """Drop a strategy; the next lookup reloads it"""
+        if self._entries.pop(strategy_id, None) is not None:
+            self.invalidations += 1
+
+    def clear(self):
+        """Drop all entries"""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self.loaded = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "loaded": self.loaded,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "full_loads": self.full_loads
+        }
+
+    @staticmethod
+    def _to_entry(source) -> Dict[str, Any]:
+        return {
+            "id": source.id,
+            "name": source.name,
+            "exchange": source.exchange,
+            "status": source.status,
+            "is_active": source.is_active,
+            "signal_thresholds": dict(source.signal_thresholds or {})
+        }
+
+
+# Global strategy metadata cache instance
+strategy_metadata_cache = StrategyMetadataCache()
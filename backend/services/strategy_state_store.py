@@ -0,0 +1,186 @@
+"""
+Strategy State Store
+In-memory strategy status for the strategies WebSocket topic (versioned snapshots and deltas)
+"""
+from typing import Dict, Any, Optional, Set
+import time
+import logging
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models.strategy import Strategy
+
+logger = logging.getLogger(__name__)
+
+# Strategy columns pushed on the strategies topic
+STATE_COLUMNS = [
+    Strategy.id,
+    Strategy.name,
+    Strategy.status,
+    Strategy.description,
+    Strategy.strategy_class,
+    Strategy.exchange,
+    Strategy.timeframe,
+    Strategy.is_active,
+    Strategy.port,
+    Strategy.created_at,
+    Strategy.started_at
+]
+
+STATUS_COUNTS = ("running", "stopped", "error")
+
+
+class StrategyStateStore:
+    """
+    Strategy state for the strategies topic
+
+    Rows are loaded in full once (and again every ``full_reload_interval``
+    seconds to pick up changes made outside the API); afterwards only
+    strategies marked dirty by the strategy handlers are re-read. Each
+    ``refresh`` merges the latest monitoring metrics and returns a delta of
+    the strategies whose state changed, tagged with a version that increases
+    by one per delta so clients can detect a missed update.
+    """
+
+    def __init__(self, full_reload_interval: float = 300):
+        self.full_reload_interval = full_reload_interval
+        self.version = 0
+        self.loaded = False
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._metrics: Dict[int, Dict[str, Any]] = {}
+        self._states: Dict[int, Dict[str, Any]] = {}
+        self._dirty: Set[int] = set()
+        self._last_full_load = 0.0
+        self._snapshot: Optional[Dict[str, Any]] = None
+
+        # Statistics
+        self.full_loads = 0
+        self.partial_loads = 0
+        self.deltas = 0
+        self.changed_strategies = 0
+
+    def mark_dirty(self, strategy_id: int):
+        """Re-read a strategy on the next refresh (call after it is created/updated/deleted)"""
+        self._dirty.add(strategy_id)
+
+    async def refresh(
+        self,
+        db: AsyncSession,
+        metrics: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Reload changed strategies, merge metrics and compute the delta
+
+        Args:
+            db: Database session
+            metrics: Monitoring metrics by strategy id (None keeps the previous metrics)
+
+        Returns:
+            Delta since the previous version, or None if nothing changed
+        """
+        full = not self.loaded or time.monotonic() - self._last_full_load >= self.full_reload_interval
+        dirty, self._dirty = self._dirty, set()
+
+        try:
+            if full:
+                result = await db.execute(select(*STATE_COLUMNS))
+                self._rows = {row.id: self._to_row(row) for row in result.all()}
+                self._last_full_load = time.monotonic()
+                self.loaded = True
+                self.full_loads += 1
+            elif dirty:
+                result = await db.execute(select(*STATE_COLUMNS).where(Strategy.id.in_(dirty)))
+                rows = {row.id: self._to_row(row) for row in result.all()}
+                for strategy_id in dirty:
+                    if strategy_id in rows:
+                        self._rows[strategy_id] = rows[strategy_id]
+                    else:
+                        self._rows.pop(strategy_id, None)
+                self.partial_loads += 1
+        except Exception:
+            self._dirty |= dirty
+            raise
+
+        if metrics is not None:
+            self._metrics = metrics
+
+        changed = []
+        for strategy_id, row in self._rows.items():
+            state = dict(row)
+            if strategy_id in self._metrics:
+                state["metrics"] = self._metrics[strategy_id]
+            if self._states.get(strategy_id) != state:
+                self._states[strategy_id] = state
+                changed.append(state)
+
+        removed = [strategy_id for strategy_id in self._states if strategy_id not in self._rows]
+        for strategy_id in removed:
+            del self._states[strategy_id]
+
+        if not changed and not removed:
+            return None
+
+        self.version += 1
+        self.deltas += 1
+        self.changed_strategies += len(changed) + len(removed)
+        self._snapshot = None
+        return {
+            "kind": "delta",
+            "version": self.version,
+            "base_version": self.version - 1,
+            "changed": changed,
+            "removed": removed,
+            **self.get_counts()
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Full state at the current version (cached until the next change)"""
+        if self._snapshot is None:
+            self._snapshot = {
+                "kind": "snapshot",
+                "version": self.version,
+                "strategies": [self._states[strategy_id] for strategy_id in sorted(self._states)],
+                **self.get_counts()
+            }
+        return self._snapshot
+
+    def get_counts(self) -> Dict[str, int]:
+        """Total and per-status strategy counts"""
+        counts = {"total": len(self._states)}
+        for status in STATUS_COUNTS:
+            counts[status] = sum(1 for state in self._states.values() if state["status"] == status)
+        return counts
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics"""
+        return {
+            "loaded": self.loaded,
+            "version": self.version,
+            "strategies": len(self._states),
+            "dirty": len(self._dirty),
+            "full_loads": self.full_loads,
+            "partial_loads": self.partial_loads,
+            "deltas": self.deltas,
+            "changed_strategies": self.changed_strategies
+        }
+
+    @staticmethod
+    def _to_row(row) -> Dict[str, Any]:
+        return {
+            "id": row.id,
+            "name": row.name,
+            "status": row.status,
+            "description": row.description,
+            "strategy_class": row.strategy_class,
+            "exchange": row.exchange,
+            "timeframe": row.timeframe,
+            "is_active": row.is_active,
+            "port": row.port,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "started_at": row.started_at.isoformat() if row.started_at else None
+        }
+
+
+# Global strategy state store instance
+strategy_state_store = StrategyStateStore(full_reload_interval=settings.STRATEGY_STATE_FULL_RELOAD_SECONDS)
@@ -0,0 +1,424 @@
+"""
+Streaming Technical Indicator Engine
+Keeps rolling indicator state per series and updates it in O(1) per new candle
+"""
+from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict, deque
+from datetime import datetime
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+NAN = float("nan")
+
+
+class RollingMean:
+    """Simple moving average over a fixed window (running sum)"""
+
+    # Re-sum the window every N pushes to bound floating point drift
+    RESUM_INTERVAL = 1000
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window: deque = deque()
+        self.total = 0.0
+        self._pushes = 0
+
+    def push(self, value: float) -> float:
+        if len(self.window) == self.period:
+            self.total -= self.window.popleft()
+        self.window.append(value)
+        self.total += value
+
+        self._pushes += 1
+        if self._pushes % self.RESUM_INTERVAL == 0:
+            self.total = sum(self.window)
+        return self.value()
+
+    def replace_last(self, value: float) -> float:
+        self.total += value - self.window[-1]
+        self.window[-1] = value
+        return self.value()
+
+    def value(self) -> float:
+        if len(self.window) < self.period:
+            return NAN
+        return self.total / self.period
+
+
+class RollingMeanStd:
+    """Rolling mean and population standard deviation (sliding Welford update)"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window: deque = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, value: float) -> Tuple[float, float]:
+        if len(self.window) < self.period:
+            self.window.append(value)
+            delta = value - self.mean
+            self.mean += delta / len(self.window)
+            self.m2 += delta * (value - self.mean)
+        else:
+            old = self.window.popleft()
+            self.window.append(value)
+            self._slide(old, value)
+        return self.value()
+
+    def replace_last(self, value: float) -> Tuple[float, float]:
+        old = self.window[-1]
+        self.window[-1] = value
+        if len(self.window) < self.period:
+            # Warm-up phase: window is small, recompute directly
+            n = len(self.window)
+            self.mean = sum(self.window) / n
+            self.m2 = sum((x - self.mean) ** 2 for x in self.window)
+        else:
+            self._slide(old, value)
+        return self.value()
+
+    def _slide(self, old: float, new: float) -> None:
+        old_mean = self.mean
+        self.mean += (new - old) / self.period
+        self.m2 += (new - old) * (new - self.mean + old - old_mean)
+        if self.m2 < 0:
+            self.m2 = 0.0
+
+    def value(self) -> Tuple[float, float]:
+        if len(self.window) < self.period:
+            return NAN, NAN
+        return self.mean, math.sqrt(self.m2 / self.period)
+
+
+class EMA:
+    """
+    Exponential moving average, adjust=False semantics
+
+    Seeded with the first value; outputs are masked until ``min_periods``
+    values have been seen, matching pandas ``ewm(..., adjust=False)``.
+    """
+
+    def __init__(self, alpha: float, min_periods: int):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.count = 0
+        self.state: Optional[float] = None
+        self.prev_state: Optional[float] = None
+
+    def push(self, value: float) -> float:
+        self.prev_state = self.state
+        self.count += 1
+        self.state = self._step(self.prev_state, value)
+        return self.value()
+
+    def replace_last(self, value: float) -> float:
+        self.state = self._step(self.prev_state, value)
+        return self.value()
+
+    def _step(self, prev: Optional[float], value: float) -> float:
+        if prev is None:
+            return value
+        return (1 - self.alpha) * prev + self.alpha * value
+
+    def value(self) -> float:
+        if self.count < self.min_periods:
+            return NAN
+        return self.state
+
+
+class SeriesState:
+    """Rolling indicator state and output history for one series"""
+
+    def __init__(self, params: Dict[str, Any], max_points: int):
+        self.params = params
+        self.last_timestamp: Optional[int] = None
+        self.last_close: Optional[float] = None
+        self.prev_close: Optional[float] = None
+        self.last_volume: Optional[float] = None
+
+        self.ma = {p: RollingMean(p) for p in params["ma_periods"]}
+
+        fast = params["macd_fast"]
+        slow = params["macd_slow"]
+        sign = params["macd_signal"]
+        self.ema_fast = EMA(2 / (fast + 1), fast)
+        self.ema_slow = EMA(2 / (slow + 1), slow)
+        self.macd_signal = EMA(2 / (sign + 1), sign)
+
+        rsi_period = params["rsi_period"]
+        self.rsi_up = EMA(1 / rsi_period, rsi_period)
+        self.rsi_down = EMA(1 / rsi_period, rsi_period)
+
+        self.boll = RollingMeanStd(params["boll_period"])
+        self.volume_ma = RollingMean(20)
+
+        self.outputs: Dict[str, deque] = {
+            name: deque(maxlen=max_points)
+            for name in self._output_names()
+        }
+
+    def _output_names(self) -> List[str]:
+        names = [f"ma{p}" for p in self.params["ma_periods"]]
+        names += ["macd", "signal", "histogram", "rsi", "upper", "middle", "lower", "volume_ma20"]
+        return names
+
+    def push(self, timestamp: int, close: float, volume: float) -> None:
+        """Apply a new closed/open candle"""
+        self.prev_close = self.last_close
+        self._apply(close, volume, replace=False)
+        self.last_timestamp = timestamp
+        self.last_close = close
+        self.last_volume = volume
+
+    def replace_last(self, close: float, volume: float) -> None:
+        """Re-apply the latest candle after it was updated by the exchange"""
+        self._apply(close, volume, replace=True)
+        self.last_close = close
+        self.last_volume = volume
+
+    def _apply(self, close: float, volume: float, replace: bool) -> None:
+        values: Dict[str, float] = {}
+        op = "replace_last" if replace else "push"
+
+        for period, ma in self.ma.items():
+            values[f"ma{period}"] = getattr(ma, op)(close)
+
+        fast = getattr(self.ema_fast, op)(close)
+        slow = getattr(self.ema_slow, op)(close)
+        macd = fast - slow
+        # Signal EMA is seeded with the first defined MACD value
+        signal = NAN if math.isnan(macd) else getattr(self.macd_signal, op)(macd)
+        values["macd"] = macd
+        values["signal"] = signal
+        values["histogram"] = macd - signal
+
+        diff = 0.0 if self.prev_close is None else close - self.prev_close
+        up = getattr(self.rsi_up, op)(diff if diff > 0 else 0.0)
+        down = getattr(self.rsi_down, op)(-diff if diff < 0 else 0.0)
+        if math.isnan(down):
+            rsi = NAN
+        elif down == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - 100 / (1 + up / down)
+        values["rsi"] = rsi
+
+        mean, std = getattr(self.boll, op)(close)
+        dev = self.params["boll_std_dev"]
+        values["middle"] = mean
+        values["upper"] = mean + dev * std
+        values["lower"] = mean - dev * std
+
+        values["volume_ma20"] = getattr(self.volume_ma, op)(volume)
+
+        for name, value in values.items():
+            if replace:
+                self.outputs[name][-1] = value
+            else:
+                self.outputs[name].append(value)
+
+
+class StreamingIndicatorEngine:
+    """
+    Incremental indicator engine
+
+    Maintains per-series rolling state (running sums for MA, EMA state for
+    MACD, Wilder averages for RSI, rolling variance for BOLL) so that a new
+    candle costs O(1) instead of recomputing the whole window. Output format
+    is identical to IndicatorCalculator.
+
+    When a series is built from scratch the results equal the ta-based
+    calculator on the same candles. Once the window slides, the values at
+    the start of the window come from real history instead of warm-up
+    back-filling.
+    """
+
+    def __init__(
+        self,
+        max_points: int = 1000,
+        max_series: int = 1000,
+        ma_periods: List[int] = [5, 10, 20, 30],
+        macd_params: Optional[Dict[str, int]] = None,
+        rsi_period: int = 14,
+        bb_params: Optional[Dict[str, int]] = None
+    ):
+        macd_params = macd_params or {"fast_period": 12, "slow_period": 26, "signal_period": 9}
+        bb_params = bb_params or {"period": 20, "std_dev": 2}
+
+        self.max_points = max_points
+        self.max_series = max_series
+        self.params = {
+            "ma_periods": list(ma_periods),
+            "macd_fast": macd_params["fast_period"],
+            "macd_slow": macd_params["slow_period"],
+            "macd_signal": macd_params["signal_period"],
+            "rsi_period": rsi_period,
+            "boll_period": bb_params["period"],
+            "boll_std_dev": bb_params["std_dev"],
+        }
+        self._series: "OrderedDict[str, SeriesState]" = OrderedDict()
+
+    def update(self, series_key: str, ohlcv_data: List[List]) -> SeriesState:
+        """
+        Bring a series up to date with the given OHLCV window
+
+        Only candles at or after the last seen timestamp are applied. The
+        series is rebuilt from ``ohlcv_data`` when it is unknown or when the
+        window no longer connects to the stored state (gap or rewrite).
+
+        Args:
+            series_key: Series identifier (e.g. kline cache key)
+            ohlcv_data: OHLCV data, oldest first
+
+        Returns:
+            Updated series state
+        """
+        state = self._series.get(series_key)
+
+        if state is None or not ohlcv_data:
+            state = self._rebuild(series_key, ohlcv_data)
+        else:
+            # Walk back to the last candle the state already knows about
+            i = len(ohlcv_data) - 1
+            while i >= 0 and ohlcv_data[i][0] > state.last_timestamp:
+                i -= 1
+
+            if i < 0 or ohlcv_data[i][0] != state.last_timestamp:
+                state = self._rebuild(series_key, ohlcv_data)
+            else:
+                known = ohlcv_data[i]
+                if known[4] != state.last_close or known[5] != state.last_volume:
+                    state.replace_last(float(known[4]), float(known[5]))
+                for candle in ohlcv_data[i + 1:]:
+                    state.push(int(candle[0]), float(candle[4]), float(candle[5]))
+
+        self._series.move_to_end(series_key)
+        return state
+
+    def calculate(
+        self,
+        series_key: str,
+        ohlcv_data: List[List],
+        indicator_type: str
+    ) -> Dict[str, Any]:
+        """
+        Update a series and return one indicator in IndicatorCalculator format
+
+        Args:
+            series_key: Series identifier
+            ohlcv_data: OHLCV data, oldest first
+            indicator_type: MA, MACD, RSI, BOLL or VOL
+
+        Returns:
+            Indicator result dictionary
+
+        Raises:
+            ValueError: If indicator type is not supported
+        """
+        state = self.update(series_key, ohlcv_data)
+        return self.build_result(state, ohlcv_data, indicator_type)
+
+    def build_result(
+        self,
+        state: SeriesState,
+        ohlcv_data: List[List],
+        indicator_type: str
+    ) -> Dict[str, Any]:
+        """Format the latest ``len(ohlcv_data)`` outputs of a series"""
+        n = len(ohlcv_data)
+        if n > len(state.outputs["volume_ma20"]):
+            # More candles than the retained history: recompute from the input so
+            # every output series stays aligned with the candles
+            state = SeriesState(self.params, n)
+            for candle in ohlcv_data:
+                state.push(int(candle[0]), float(candle[4]), float(candle[5]))
+        timestamp = (
+            datetime.fromtimestamp(ohlcv_data[-1][0] / 1000) if ohlcv_data else datetime.now()
+        )
+
+        def tail(name: str) -> List[float]:
+            values = state.outputs[name]
+            return list(values)[-n:] if n else []
+
+        if indicator_type == "MA":
+            values = {f"ma{p}": _bfill(tail(f"ma{p}")) for p in self.params["ma_periods"]}
+            params = {"periods": self.params["ma_periods"]}
+        elif indicator_type == "MACD":
+            values = {
+                "macd": _bfill(tail("macd")),
+                "signal": _bfill(tail("signal")),
+                "histogram": [0.0 if math.isnan(v) else v for v in tail("histogram")]
+            }
+            params = {
+                "fast_period": self.params["macd_fast"],
+                "slow_period": self.params["macd_slow"],
+                "signal_period": self.params["macd_signal"]
+            }
+        elif indicator_type == "RSI":
+            values = {"rsi": _bfill(tail("rsi"))}
+            params = {"period": self.params["rsi_period"]}
+        elif indicator_type == "BOLL":
+            values = {
+                "upper": _bfill(tail("upper")),
+                "middle": _bfill(tail("middle")),
+                "lower": _bfill(tail("lower"))
+            }
+            params = {"period": self.params["boll_period"], "std_dev": self.params["boll_std_dev"]}
+        elif indicator_type == "VOL":
+            volume_ma = state.outputs["volume_ma20"][-1] if n else NAN
+            return {
+                "indicator_type": "VOL",
+                "indicator_params": {},
+                "indicator_values": {
+                    "volume": float(ohlcv_data[-1][5]) if n else None,
+                    "volume_ma20": None if math.isnan(volume_ma) else volume_ma
+                },
+                "timestamp": timestamp
+            }
+        else:
+            raise ValueError(f"Unsupported indicator type: {indicator_type}")
+
+        return {
+            "indicator_type": indicator_type,
+            "indicator_params": params,
+            "indicator_values": values,
+            "values": values,
+            "timestamp": timestamp
+        }
+
+    def invalidate(self, series_key: str) -> None:
+        """Drop the state of a series (next update rebuilds it)"""
+        self._series.pop(series_key, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get engine statistics"""
+        return {
+            "series": len(self._series),
+            "max_series": self.max_series,
+            "max_points": self.max_points
+        }
+
+    def _rebuild(self, series_key: str, ohlcv_data: List[List]) -> SeriesState:
+        state = SeriesState(self.params, self.max_points)
+        for candle in ohlcv_data:
+            state.push(int(candle[0]), float(candle[4]), float(candle[5]))
+
+        self._series[series_key] = state
+        while len(self._series) > self.max_series:
+            self._series.popitem(last=False)
+        return state
+
+
+def _bfill(values: List[float]) -> List[float]:
+    """Back-fill leading NaN values like pandas ``Series.bfill()``"""
+    result = list(values)
+    next_valid = NAN
+    for i in range(len(result) - 1, -1, -1):
+        if math.isnan(result[i]):
+            result[i] = next_valid
+        else:
+            next_valid = result[i]
+    return result
@@ -160,6 +160,7 @@ class SystemConfigService:
             "update_mode": "interval",  # "interval" or "n_periods"
             "update_interval_seconds": 60,  # 每60秒更新一次
             "n_periods": 1,
+            "max_concurrent_per_exchange": 4,  # 每个交易所并发更新任务上限
             "auto_failover": True,
             "rate_limit_fallback": True,
             "auto_start_scheduler": True,  # 自动启动调度器
@@ -247,6 +248,12 @@ class SystemConfigService:
             if config["update_interval_seconds"] <= 0:
                 raise ValueError("update_interval_seconds must be positive")
 
+        # Validate max_concurrent_per_exchange
+        if "max_concurrent_per_exchange" in config:
+            value = config["max_concurrent_per_exchange"]
+            if not isinstance(value, int) or value <= 0:
+                raise ValueError("max_concurrent_per_exchange must be a positive integer")
+
         # Validate cache_config TTL values
         if "cache_config" in config and "ttl" in config["cache_config"]:
             ttl = config["cache_config"]["ttl"]
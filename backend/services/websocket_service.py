@@ -5,13 +5,15 @@ WebSocket Push Service
 功能：
 - 推送新信号到订阅客户端
 - 推送策略状态更新
+- 推送批量启动/停止进度
 - 推送系统监控数据
 - 推送容量信息
 """
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from app.websocket.manager import manager
+from services.signal_event_bus import signal_event_bus
 
 logger = logging.getLogger(__name__)
 
@@ -27,21 +29,23 @@ class WebSocketService:
         Args:
             signal_data: 信号数据
         """
-        try:
-            message = {
-                "type": "data",
-                "topic": "signals",
-                "data": {
-                    "signals": [signal_data]
-                },
-                "timestamp": datetime.now().isoformat()
-            }
+        await WebSocketService.push_new_signals([signal_data])
 
-            await manager.broadcast(message, topic="signals")
-            logger.info(f"Pushed new signal: {signal_data.get('id')} to {len(manager.subscriptions['signals'])} clients")
+    @staticmethod
+    async def push_new_signals(signals: List[Dict[str, Any]]):
+        """
+        批量推送新信号（发布到信号事件总线，由广播服务按序号推送给客户端）
 
+        Args:
+            signals: 信号数据列表
+        """
+        if not signals:
+            return
+
+        try:
+            await signal_event_bus.publish(signals)
         except Exception as e:
-            logger.error(f"Failed to push signal: {e}", exc_info=True)
+            logger.error(f"Failed to push signals: {e}", exc_info=True)
 
     @staticmethod
     async def push_strategy_status(strategy_id: int, status: str, data: Optional[Dict[str, Any]] = None):
@@ -79,6 +83,27 @@ class WebSocketService:
         except Exception as e:
             logger.error(f"Failed to push strategy status: {e}", exc_info=True)
 
+    @staticmethod
+    async def push_bulk_operation_progress(progress: Dict[str, Any]):
+        """
+        推送批量启动/停止/恢复策略的进度
+
+        Args:
+            progress: 进度数据 (operation_id, kind, state, total, completed, succeeded, failed, ...)
+        """
+        try:
+            message = {
+                "type": "event",
+                "event_type": "strategy_bulk_progress",
+                "data": progress,
+                "timestamp": datetime.now().isoformat()
+            }
+
+            await manager.broadcast(message, topic="strategies")
+
+        except Exception as e:
+            logger.error(f"Failed to push bulk operation progress: {e}", exc_info=True)
+
     @staticmethod
     async def push_monitoring_data(monitoring_data: Dict[str, Any]):
         """
@@ -158,6 +158,9 @@ def setup_api_dependencies():
 
     # Create mock manager
     mock_manager = Mock(spec=FreqTradeGatewayManager)
+    mock_manager.strategy_ports = {}
+    mock_manager.base_port = 8081
+    mock_manager.max_port = 9080
     mock_manager.get_capacity_info.return_value = {
         "max_strategies": 1000,
         "running_strategies": 0,
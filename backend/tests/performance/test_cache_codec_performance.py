@@ -0,0 +1,71 @@
+"""
+Cache Codec Performance Tests
+Redis缓存编码性能测试
+
+对比 JSON / 二进制 / 二进制+zlib 三种编码下，200根K线与MA/MACD指标的
+缓存体积以及编码、解码耗时。运行:
+    pytest tests/performance/test_cache_codec_performance.py -s
+"""
+import time
+import random
+import pytest
+
+from services.cache_codec import JsonCacheCodec, BinaryCacheCodec
+from services.numpy_indicator_calculator import NumpyIndicatorCalculator
+
+ITERATIONS = 2000
+
+
+def make_klines(count: int = 200):
+    rng = random.Random(1)
+    price = 45000.0
+    klines = []
+    for i in range(count):
+        price *= 1 + rng.gauss(0, 0.003)
+        klines.append([1_700_000_000_000 + i * 60_000, price, price * 1.001, price * 0.999, price, rng.uniform(1, 100)])
+    return klines
+
+
+def time_us(func, payload):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func(payload)
+    return (time.perf_counter() - start) / ITERATIONS * 1_000_000
+
+
+class TestCacheCodecPerformance:
+    """缓存编码体积与耗时对比"""
+
+    @pytest.mark.slow
+    def test_codec_size_and_speed(self):
+        """测试各编码的体积与编解码耗时"""
+        klines = make_klines()
+        indicators = NumpyIndicatorCalculator(use_numba=False).calculate_indicators(klines, ["MA", "MACD"])
+        codecs = {
+            "json": JsonCacheCodec(),
+            "binary": BinaryCacheCodec(),
+            "binary+zlib": BinaryCacheCodec(compress=True),
+        }
+        sizes = {}
+
+        for label, payload, encode_name, decode_name in [
+            ("klines x200", klines, "encode_klines", "decode_klines"),
+            ("MA indicator", indicators["MA"], "encode_indicator", "decode_indicator"),
+            ("MACD indicator", indicators["MACD"], "encode_indicator", "decode_indicator"),
+        ]:
+            print(f"\n{label}:")
+            for name, codec in codecs.items():
+                encode = getattr(codec, encode_name)
+                decode = getattr(codec, decode_name)
+                encoded = encode(payload)
+                if isinstance(encoded, str):
+                    encoded = encoded.encode()
+                sizes[(label, name)] = len(encoded)
+                print(
+                    f"  {name:<12} {len(encoded):>8,} bytes  "
+                    f"encode {time_us(encode, payload):8.1f}us  "
+                    f"decode {time_us(decode, encoded):8.1f}us"
+                )
+
+        assert sizes[("klines x200", "binary")] < sizes[("klines x200", "json")]
+        assert sizes[("MA indicator", "binary")] < sizes[("MA indicator", "json")]
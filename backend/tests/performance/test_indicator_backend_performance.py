@@ -0,0 +1,90 @@
+"""
+Indicator Backend Performance Tests
+技术指标后端性能测试
+
+对比 ta(pandas) / NumPy / NumPy+numba / 二维批量 四种计算方式在1000个交易对上的
+单序列延迟与每秒可处理序列数。运行:
+    pytest tests/performance/test_indicator_backend_performance.py -s
+"""
+import time
+import statistics
+import numpy as np
+import pytest
+
+from services.indicator_calculator import IndicatorCalculator
+from services.numpy_indicator_calculator import NumpyIndicatorCalculator, NUMBA_AVAILABLE
+
+SYMBOLS = 1000
+CANDLES = 200
+INDICATOR_TYPES = ["MA", "MACD", "RSI", "BOLL", "VOL"]
+
+
+def make_universe(symbols: int = SYMBOLS, candles: int = CANDLES):
+    """生成 symbols x candles 的随机游走行情"""
+    rng = np.random.default_rng(42)
+    close = 100.0 * np.cumprod(1 + rng.normal(0, 0.003, size=(symbols, candles)), axis=1)
+    volume = rng.uniform(1, 100, size=(symbols, candles))
+    timestamps = 1_700_000_000_000 + np.arange(candles) * 60_000
+    ohlcv = [
+        [[int(ts), c, c * 1.001, c * 0.999, c, v] for ts, c, v in zip(timestamps, close[i], volume[i])]
+        for i in range(symbols)
+    ]
+    return ohlcv, close, volume
+
+
+def measure_per_series(calculator, universe):
+    """逐序列计算，返回每个序列的耗时（毫秒）"""
+    latencies = []
+    for ohlcv in universe:
+        start = time.perf_counter()
+        calculator.calculate_indicators(ohlcv, INDICATOR_TYPES)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label, latencies):
+    total = sum(latencies) / 1000
+    print(
+        f"  {label:<18} p50 {statistics.median(latencies):8.3f}ms  "
+        f"p99 {np.percentile(latencies, 99):8.3f}ms  "
+        f"{len(latencies) / total:10,.0f} series/s"
+    )
+
+
+class TestIndicatorBackendPerformance:
+    """指标计算后端性能对比"""
+
+    @pytest.mark.slow
+    def test_backend_throughput(self):
+        """测试1000个交易对的单序列延迟与吞吐量"""
+        universe, close, volume = make_universe()
+
+        print(f"\n技术指标计算性能 ({SYMBOLS} symbols x {CANDLES} candles, {len(INDICATOR_TYPES)} indicators):")
+
+        # ta后端较慢，抽样100个序列
+        ta_latencies = measure_per_series(IndicatorCalculator(), universe[:100])
+        report("ta (pandas)", ta_latencies)
+
+        numpy_latencies = measure_per_series(NumpyIndicatorCalculator(use_numba=False), universe)
+        report("numpy", numpy_latencies)
+
+        if NUMBA_AVAILABLE:
+            numba_calculator = NumpyIndicatorCalculator(use_numba=True)
+            numba_calculator.calculate_batch(close[:1], volume[:1])  # JIT预热
+            report("numpy+numba", measure_per_series(numba_calculator, universe))
+
+        for use_numba in ([False, True] if NUMBA_AVAILABLE else [False]):
+            calculator = NumpyIndicatorCalculator(use_numba=use_numba)
+            calculator.calculate_batch(close[:1], volume[:1])
+            start = time.perf_counter()
+            calculator.calculate_batch(close, volume)
+            elapsed = time.perf_counter() - start
+            label = "batch 2-D" + (" +numba" if use_numba else "")
+            print(
+                f"  {label:<18} total {elapsed * 1000:8.1f}ms  "
+                f"per series {elapsed * 1000 / SYMBOLS:8.4f}ms  "
+                f"{SYMBOLS / elapsed:10,.0f} series/s"
+            )
+
+        assert statistics.median(numpy_latencies) < statistics.median(ta_latencies), \
+            "NumPy后端应快于ta后端"
@@ -0,0 +1,123 @@
+"""
+Strategy Stop Event-Loop Lag Benchmark
+停止策略时的事件循环延迟压测
+
+启动 BENCHMARK_STOP_STRATEGIES 个模拟 FreqTrade 进程（默认50个，收到SIGTERM后
+SHUTDOWN_DELAY 秒才退出），对比旧实现（Popen + 同步 wait）与异步进程管理下
+stop_all_strategies 期间事件循环的最大调度延迟:
+    pytest tests/performance/test_process_lifecycle_performance.py -s
+"""
+import os
+import sys
+import time
+import asyncio
+import subprocess
+import pytest
+
+from core.freqtrade_manager import FreqTradeGatewayManager
+from core.strategy_orchestrator import StrategyBulkOrchestrator
+from core.process_supervisor import ProcessExitWatcher, start_process
+from core.process_registry import ProcessRegistry
+
+STRATEGIES = int(os.getenv("BENCHMARK_STOP_STRATEGIES", 50))
+SHUTDOWN_DELAY = 0.1  # 模拟实例收到SIGTERM后的退出耗时（秒）
+
+FAKE_FREQTRADE = [
+    sys.executable, "-c",
+    "import signal, sys, time\n"
+    f"signal.signal(signal.SIGTERM, lambda *a: (time.sleep({SHUTDOWN_DELAY}), sys.exit(0)))\n"
+    "print('ready', flush=True)\n"
+    "time.sleep(120)"
+]
+
+
+class LoopLagProbe:
+    """每10ms调度一次，记录最大延迟"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.max_lag = max(self.max_lag, time.perf_counter() - started - self.interval)
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._run())
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc):
+        # 让阻塞期间到期的那次调度完成测量
+        await asyncio.sleep(self.interval * 2)
+        self._task.cancel()
+
+
+def make_manager(monkeypatch):
+    def patched_init(self):
+        self.strategy_processes = {}
+        self.strategy_ports = {}
+        self.port_pool = set()
+        self.max_strategies = STRATEGIES
+        self.orchestrator = StrategyBulkOrchestrator()
+        self.exit_watcher = ProcessExitWatcher()
+        self.process_registry = ProcessRegistry()
+
+    monkeypatch.setattr(FreqTradeGatewayManager, "__init__", patched_init)
+    manager = FreqTradeGatewayManager()
+
+    async def no_op(*args, **kwargs):
+        pass
+
+    manager._graceful_stop_via_api = no_op
+    manager._update_gateway_routes = no_op
+    return manager
+
+
+async def blocking_stop_all(processes):
+    """旧实现：在协程中 terminate 后同步 wait"""
+    for process in processes:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+@pytest.mark.asyncio
+async def test_stop_all_event_loop_lag(monkeypatch):
+    """对比同步等待与异步进程管理停止策略时的事件循环延迟"""
+    # 旧实现：subprocess.Popen + process.wait
+    processes = [subprocess.Popen(FAKE_FREQTRADE, stdout=subprocess.PIPE) for _ in range(STRATEGIES)]
+    for process in processes:
+        process.stdout.readline()
+    async with LoopLagProbe() as probe:
+        started = time.perf_counter()
+        await blocking_stop_all(processes)
+        baseline_seconds = time.perf_counter() - started
+    baseline_lag = probe.max_lag
+    for process in processes:
+        process.stdout.close()
+
+    # 新实现：asyncio 子进程 + 并发停止
+    manager = make_manager(monkeypatch)
+    for strategy_id in range(1, STRATEGIES + 1):
+        process = await start_process(FAKE_FREQTRADE, stdout=asyncio.subprocess.PIPE)
+        await process.stdout.readline()
+        manager.strategy_processes[strategy_id] = process
+    async with LoopLagProbe() as probe:
+        started = time.perf_counter()
+        results = await manager.stop_all_strategies()
+        async_seconds = time.perf_counter() - started
+    async_lag = probe.max_lag
+
+    print(f"\nStopping {STRATEGIES} strategies ({SHUTDOWN_DELAY}s shutdown each)")
+    print(f"  blocking wait:   total={baseline_seconds:.2f}s max loop lag={baseline_lag * 1000:.0f}ms")
+    print(f"  async processes: total={async_seconds:.2f}s max loop lag={async_lag * 1000:.0f}ms "
+          f"(concurrency {manager.orchestrator.list_operations()[0]['concurrency']})")
+
+    assert all(results.values()) and len(results) == STRATEGIES
+    assert manager.strategy_processes == {}
+    # 停止期间事件循环保持响应（剩余延迟来自子进程同时退出时争用CPU）
+    assert async_lag < 0.2
+    assert async_lag * 5 < baseline_lag
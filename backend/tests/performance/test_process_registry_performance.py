@@ -0,0 +1,58 @@
+"""
+Process Lookup Benchmark
+按进程表查找与全量进程扫描的耗时对比
+
+主机上额外运行 BENCHMARK_HOST_PROCESSES 个无关进程（默认200个），对比批量启动
+BENCHMARK_REGISTRY_STRATEGIES 个策略（默认50个）时，每个策略清理旧进程的两种查找方式:
+    pytest tests/performance/test_process_registry_performance.py -s
+"""
+import os
+import sys
+import time
+import subprocess
+import pytest
+
+from core.freqtrade_manager import FreqTradeGatewayManager
+from core.process_registry import ProcessRegistry
+
+HOST_PROCESSES = int(os.getenv("BENCHMARK_HOST_PROCESSES", 200))
+STRATEGIES = int(os.getenv("BENCHMARK_REGISTRY_STRATEGIES", 50))
+
+SLEEPER = [sys.executable, "-c", "import time; time.sleep(120)"]
+
+
+@pytest.fixture
+def host_processes():
+    processes = [subprocess.Popen(SLEEPER) for _ in range(HOST_PROCESSES)]
+    yield processes
+    for process in processes:
+        process.kill()
+        process.wait()
+
+
+def test_registry_lookup_vs_full_scan(monkeypatch, host_processes):
+    """对比每个策略启动前按进程表查找与全量扫描的耗时"""
+    monkeypatch.setattr(FreqTradeGatewayManager, "__init__", lambda self: None)
+    manager = FreqTradeGatewayManager()
+
+    registry = ProcessRegistry()
+    for strategy_id, process in enumerate(host_processes[:STRATEGIES], start=1):
+        registry.register(strategy_id, process.pid, None)
+
+    # 旧实现：每个策略启动前扫描一次全部进程
+    started = time.perf_counter()
+    for strategy_id in range(1, STRATEGIES + 1):
+        [p for p in manager.scan_freqtrade_processes() if p["strategy_id"] == strategy_id]
+    scan_seconds = time.perf_counter() - started
+
+    # 新实现：按进程表查找并校验单个PID
+    started = time.perf_counter()
+    found = [registry.lookup(strategy_id) for strategy_id in range(1, STRATEGIES + 1)]
+    lookup_seconds = time.perf_counter() - started
+
+    print(f"\nLooking up {STRATEGIES} strategies with {HOST_PROCESSES} extra host processes")
+    print(f"  full scan per start: total={scan_seconds * 1000:.0f}ms ({scan_seconds / STRATEGIES * 1000:.1f}ms each)")
+    print(f"  registry lookup:     total={lookup_seconds * 1000:.1f}ms ({lookup_seconds / STRATEGIES * 1000:.2f}ms each)")
+
+    assert all(p is not None for p in found)
+    assert lookup_seconds * 10 < scan_seconds
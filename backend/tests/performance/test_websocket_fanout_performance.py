@@ -0,0 +1,129 @@
+"""
+WebSocket Fan-out Benchmark
+WebSocket 广播压测
+
+模拟 BENCHMARK_WS_CLIENTS 个客户端（默认1000，其中 1% 为慢客户端），
+对比逐个 await send_json 的顺序广播与发送队列并发广播的投递延迟 p50/p99
+（从调用 broadcast 到各客户端收到消息）:
+    pytest tests/performance/test_websocket_fanout_performance.py -s
+"""
+import os
+import json
+import time
+import asyncio
+import statistics
+import pytest
+
+from app.websocket.manager import ConnectionManager
+
+CLIENTS = int(os.getenv("BENCHMARK_WS_CLIENTS", 1000))
+SLOW_CLIENTS = max(1, CLIENTS // 100)
+MESSAGES = 20
+FAST_SEND_DELAY = 0.0001   # 正常客户端单次发送耗时（秒）
+SLOW_SEND_DELAY = 0.05     # 慢客户端单次发送耗时（秒）
+
+MESSAGE = {
+    "type": "data",
+    "topic": "signals",
+    "data": {
+        "signals": [
+            {"id": i, "pair": "BTC/USDT", "action": "buy", "signal_strength": 0.85, "strength_level": "strong"}
+            for i in range(20)
+        ]
+    }
+}
+
+
+class SimulatedClient:
+    """模拟客户端：记录每条消息的到达时间"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.arrivals = []
+
+    async def accept(self):
+        pass
+
+    async def _receive(self, payload):
+        await asyncio.sleep(self.delay)
+        self.arrivals.append((payload["seq"], time.perf_counter()))
+
+    async def send_text(self, text: str):
+        await self._receive(json.loads(text))
+
+    async def send_json(self, data: dict):
+        await self._receive(json.loads(json.dumps(data)))
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def make_clients():
+    return {
+        f"client_{i}": SimulatedClient(SLOW_SEND_DELAY if i < SLOW_CLIENTS else FAST_SEND_DELAY)
+        for i in range(CLIENTS)
+    }
+
+
+def latency_report(clients, sent_at, fast_only: bool = True):
+    latencies = [
+        (arrived - sent_at[seq]) * 1000
+        for client in clients.values()
+        if not fast_only or client.delay == FAST_SEND_DELAY
+        for seq, arrived in client.arrivals
+    ]
+    latencies.sort()
+    return {
+        "delivered": len(latencies),
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1]
+    }
+
+
+async def sequential_broadcast(clients, message):
+    """旧实现：逐个 await send_json"""
+    for websocket in clients.values():
+        await websocket.send_json(message)
+
+
+@pytest.mark.asyncio
+async def test_websocket_fanout_latency():
+    """对比顺序广播与发送队列广播的投递延迟"""
+    # 顺序广播
+    baseline_clients = make_clients()
+    sent_at = {}
+    for seq in range(MESSAGES):
+        sent_at[seq] = time.perf_counter()
+        await sequential_broadcast(baseline_clients, dict(MESSAGE, seq=seq))
+    baseline = latency_report(baseline_clients, sent_at)
+
+    # 发送队列广播
+    manager = ConnectionManager()
+    manager.slow_client_policy = "drop_oldest"
+    queued_clients = make_clients()
+    for client_id, websocket in queued_clients.items():
+        await manager.connect(websocket, client_id)
+
+    sent_at = {}
+    broadcast_ms = []
+    for seq in range(MESSAGES):
+        sent_at[seq] = time.perf_counter()
+        await manager.broadcast(dict(MESSAGE, seq=seq))
+        broadcast_ms.append((time.perf_counter() - sent_at[seq]) * 1000)
+        await asyncio.sleep(0.005)
+
+    while any(q.pending for q in manager.send_queues.values()):
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(SLOW_SEND_DELAY)
+    queued = latency_report(queued_clients, sent_at)
+    for client_id in list(manager.send_queues):
+        manager.disconnect(client_id)
+
+    print(f"\n{CLIENTS} clients ({SLOW_CLIENTS} slow), {MESSAGES} messages")
+    print(f"  sequential send_json: p50={baseline['p50_ms']:.1f}ms p99={baseline['p99_ms']:.1f}ms")
+    print(f"  send queues:          p50={queued['p50_ms']:.1f}ms p99={queued['p99_ms']:.1f}ms "
+          f"(broadcast call p50={statistics.median(broadcast_ms):.2f}ms)")
+
+    assert queued["delivered"] == baseline["delivered"] == (CLIENTS - SLOW_CLIENTS) * MESSAGES
+    # 慢客户端不再拖慢正常客户端
+    assert queued["p99_ms"] < baseline["p50_ms"]
@@ -0,0 +1,84 @@
+"""
+缓存编码单元测试
+Cache Codec Unit Tests
+"""
+import json
+import math
+import pytest
+from datetime import datetime
+from services.cache_codec import BinaryCacheCodec, JsonCacheCodec, get_cache_codec
+
+KLINES = [
+    [1_700_000_000_000 + i * 60_000, 45000.5 + i, 45100.0, 44900.25, 45050.0 + i, 12.5 * i]
+    for i in range(200)
+]
+
+INDICATOR = {
+    "indicator_type": "MACD",
+    "indicator_params": {"fast_period": 12, "slow_period": 26, "signal_period": 9},
+    "indicator_values": {
+        "macd": [float("nan")] + [1.5 * i for i in range(199)],
+        "signal": [0.25 * i for i in range(200)],
+        "histogram": [0.0] * 200
+    },
+    "values": None,
+    "timestamp": datetime(2025, 10, 18, 10, 0, 0)
+}
+
+
+class TestBinaryCacheCodec:
+    """二进制编码测试"""
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_klines_roundtrip(self, compress):
+        """测试K线编码往返一致（时间戳保持为int）"""
+        codec = BinaryCacheCodec(compress=compress)
+
+        decoded = codec.decode_klines(codec.encode_klines(KLINES))
+
+        assert decoded == KLINES
+        assert isinstance(decoded[0][0], int)
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_indicator_roundtrip(self, compress):
+        """测试指标编码往返一致"""
+        codec = BinaryCacheCodec(compress=compress)
+
+        decoded = codec.decode_indicator(codec.encode_indicator(INDICATOR))
+
+        assert decoded["indicator_type"] == "MACD"
+        assert decoded["indicator_params"] == INDICATOR["indicator_params"]
+        assert decoded["timestamp"] == "2025-10-18T10:00:00"
+        assert math.isnan(decoded["indicator_values"]["macd"][0])
+        assert decoded["indicator_values"]["signal"] == INDICATOR["indicator_values"]["signal"]
+        assert decoded["values"] is decoded["indicator_values"]
+
+    def test_scalar_indicator_values(self):
+        """测试标量指标值（VOL）保持原样"""
+        codec = BinaryCacheCodec()
+        data = {"indicator_type": "VOL", "indicator_params": {},
+                "indicator_values": {"volume": 12.5, "volume_ma20": None}, "timestamp": "x"}
+
+        decoded = codec.decode_indicator(codec.encode_indicator(data))
+
+        assert decoded["indicator_values"] == {"volume": 12.5, "volume_ma20": None}
+
+    def test_binary_is_smaller_than_json(self):
+        """测试二进制编码体积小于JSON"""
+        assert len(BinaryCacheCodec().encode_klines(KLINES)) < len(JsonCacheCodec().encode_klines(KLINES))
+
+    def test_reads_legacy_json_payloads(self):
+        """测试二进制编码可读取旧JSON缓存，JSON编码可读取二进制缓存"""
+        binary = BinaryCacheCodec()
+        legacy = json.dumps(KLINES).encode()
+
+        assert binary.decode_klines(legacy) == KLINES
+        assert JsonCacheCodec().decode_klines(binary.encode_klines(KLINES)) == KLINES
+
+    def test_empty_klines(self):
+        codec = BinaryCacheCodec()
+        assert codec.decode_klines(codec.encode_klines([])) == []
+
+    def test_factory(self):
+        assert get_cache_codec("binary").binary is True
+        assert get_cache_codec("json").binary is False
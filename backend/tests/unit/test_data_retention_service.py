@@ -0,0 +1,110 @@
+"""
+数据保留服务单元测试
+DataRetentionService Unit Tests
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from config import settings
+from models.signal import Signal
+from services.data_retention_service import DataRetentionService, period_start, next_period
+
+
+@pytest.fixture
+async def db():
+    """内存SQLite会话，预置40天内每天一条信号"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Signal.__table__.create)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    now = datetime.now()
+    async with session_factory() as session:
+        for days in range(40):
+            session.add(Signal(
+                strategy_id=1, pair="BTC/USDT", action="buy", strength_level="strong",
+                signal_strength=0.9, current_rate=1.0,
+                created_at=now - timedelta(days=days, hours=1)
+            ))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+def signals_only() -> DataRetentionService:
+    return DataRetentionService({
+        "signals": {"column": "created_at", "interval": "day", "setting": "SIGNAL_RETENTION_DAYS"}
+    })
+
+
+class TestPartitionPeriods:
+    """分区时间范围计算测试"""
+
+    def test_day_and_month_periods(self):
+        """测试按天/按月计算分区起止"""
+        ts = datetime(2025, 12, 31, 15, 30, tzinfo=timezone.utc)
+        assert period_start(ts, "day") == datetime(2025, 12, 31, tzinfo=timezone.utc)
+        assert next_period(period_start(ts, "day"), "day") == datetime(2026, 1, 1, tzinfo=timezone.utc)
+        assert period_start(ts, "month") == datetime(2025, 12, 1, tzinfo=timezone.utc)
+        assert next_period(period_start(ts, "month"), "month") == datetime(2026, 1, 1, tzinfo=timezone.utc)
+        assert next_period(datetime(2025, 1, 1), "month") == datetime(2025, 2, 1)
+
+
+class TestDataRetentionService:
+    """数据保留测试"""
+
+    @pytest.mark.asyncio
+    async def test_unpartitioned_table_deletes_in_batches(self, db, monkeypatch):
+        """测试未分区表（SQLite）分批删除过期数据"""
+        monkeypatch.setattr(settings, "SIGNAL_RETENTION_DAYS", 30)
+        service = signals_only()
+        service.DELETE_BATCH_SIZE = 3
+
+        result = await service.run_once(db)
+
+        assert result["signals"] == {"mode": "delete", "deleted": 10}
+        assert await db.scalar(select(func.count()).select_from(Signal)) == 30
+        assert service.get_stats()["rows_deleted"] == 10
+
+    @pytest.mark.asyncio
+    async def test_zero_retention_keeps_data(self, db, monkeypatch):
+        """测试保留天数为0时不删除数据"""
+        monkeypatch.setattr(settings, "SIGNAL_RETENTION_DAYS", 0)
+        service = signals_only()
+
+        result = await service.run_once(db)
+
+        assert result["signals"] == {"mode": "delete", "deleted": 0}
+        assert await db.scalar(select(func.count()).select_from(Signal)) == 40
+
+    @pytest.mark.asyncio
+    async def test_partitioned_table_drops_expired_partitions(self, monkeypatch):
+        """测试分区表只删除整个范围都已过期的分区，并预建未来分区"""
+        monkeypatch.setattr(settings, "SIGNAL_RETENTION_DAYS", 30)
+        monkeypatch.setattr(settings, "PARTITION_PREMAKE_COUNT", 2)
+        now = datetime(2025, 3, 15, 12, tzinfo=timezone.utc)
+        service = signals_only()
+        service.is_partitioned = AsyncMock(return_value=True)
+        service.list_partitions = AsyncMock(return_value=[
+            ("signals_default", None),
+            ("signals_p20250212", datetime(2025, 2, 13, tzinfo=timezone.utc)),
+            ("signals_p20250213", datetime(2025, 2, 14, tzinfo=timezone.utc)),
+            ("signals_p20250214", datetime(2025, 2, 15, tzinfo=timezone.utc)),
+        ])
+        db = MagicMock()
+        db.execute = AsyncMock()
+        db.commit = AsyncMock()
+        db.rollback = AsyncMock()
+        db.scalar = AsyncMock(return_value=False)  # 分区均不存在
+
+        result = await service.run_once(db, now=now)
+
+        assert result["signals"]["mode"] == "partitions"
+        # 截止时间为 2025-02-13 12:00，2月13日分区仍含未过期数据
+        assert result["signals"]["dropped"] == ["signals_p20250212"]
+        assert result["signals"]["created"] == ["signals_p20250315", "signals_p20250316", "signals_p20250317"]
+        statements = [str(call.args[0]) for call in db.execute.call_args_list]
+        assert 'DROP TABLE IF EXISTS "signals_p20250212"' in statements
+        assert not any("signals_p20250213" in s for s in statements)
@@ -2,10 +2,17 @@
 FreqTrade管理器单元测试
 FreqTradeGatewayManager Unit Tests
 """
+import sys
+import asyncio
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from pathlib import Path
 from core.freqtrade_manager import FreqTradeGatewayManager
+from core.http_client import PooledHttpClient
+from core.strategy_orchestrator import StrategyBulkOrchestrator
+from core.process_output import ProcessOutputStore
+from core.process_registry import ProcessRegistry
+from core.process_supervisor import ProcessExitWatcher, start_process
 
 
 @pytest.fixture
@@ -31,6 +38,12 @@ def freqtrade_manager(tmp_path, monkeypatch):
         self.strategies_path = strategies_path
         self.logs_path = logs_path
         self.port_pool = set(range(self.base_port, self.max_port + 1))  # 1000 ports
+        self.http_client = PooledHttpClient()
+        self.orchestrator = StrategyBulkOrchestrator()
+        self.process_output = ProcessOutputStore(logs_path=logs_path)
+        self.exit_watcher = ProcessExitWatcher()
+        self.exit_watcher.add_listener(self._on_process_exit)
+        self.process_registry = ProcessRegistry(base_config_path / "processes.json")
 
         # 确保目录存在
         self.base_config_path.mkdir(parents=True, exist_ok=True)
@@ -201,5 +214,67 @@ class TestFreqTradeManagerEdgeCases:
         assert port3 == 8085
 
 
+    @pytest.mark.asyncio
+    async def test_startup_failure_reports_process_output(self, freqtrade_manager):
+        """测试进程启动失败时从输出缓冲读取错误信息"""
+        manager = freqtrade_manager
+        process = await start_process(
+            [sys.executable, "-c", "import sys; sys.stderr.write('ERROR - Invalid exchange config\\n'); sys.exit(2)"],
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT
+        )
+        manager.process_output.attach(5, process.stdout)
+        await process.wait(timeout=10)
+
+        with pytest.raises(Exception, match="code 2.*Invalid exchange config"):
+            await manager._wait_for_api_ready(8086, process, timeout=5, strategy_id=5)
+
+    @pytest.mark.asyncio
+    async def test_process_exit_releases_resources(self, freqtrade_manager):
+        """测试进程意外退出后立即释放进程记录和端口，主动停止不触发通知"""
+        manager = freqtrade_manager
+        manager._update_gateway_routes = AsyncMock()
+        manager._graceful_stop_via_api = AsyncMock()
+        exits = []
+
+        async def on_exit(strategy_id, pid, returncode):
+            exits.append((strategy_id, returncode))
+
+        manager.exit_watcher.add_listener(on_exit)
+
+        for strategy_id in (1, 2):
+            process = await start_process([sys.executable, "-c", "import time; time.sleep(60)"])
+            manager.strategy_processes[strategy_id] = process
+            manager.strategy_ports[strategy_id] = manager.port_pool.pop()
+            manager.exit_watcher.watch(strategy_id, process)
+
+        port = manager.strategy_ports[1]
+        manager.strategy_processes[1].kill()
+        for _ in range(100):
+            if exits:
+                break
+            await asyncio.sleep(0.01)
+
+        assert exits == [(1, -9)]
+        assert 1 not in manager.strategy_processes
+        assert port in manager.port_pool
+
+        assert await manager.stop_strategy(2)
+        await asyncio.sleep(0.05)
+        assert exits == [(1, -9)]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_uses_process_registry(self, freqtrade_manager):
+        """测试启动前清理旧进程按进程表查找，不扫描系统进程"""
+        manager = freqtrade_manager
+        manager.scan_freqtrade_processes = Mock(side_effect=AssertionError("full scan"))
+        old_process = await start_process([sys.executable, "-c", "import time; time.sleep(60)"])
+        manager.process_registry.register(6, old_process.pid, 8087)
+
+        await manager._cleanup_old_strategy_processes(6)
+
+        assert await old_process.wait(timeout=5) is not None
+        assert manager.process_registry.lookup(6) is None
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,61 @@
+"""
+心跳监控自动重启单元测试
+StrategyHeartbeatMonitor Auto Restart Unit Tests
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from models.strategy import Strategy
+from services.heartbeat_monitor_service import StrategyHeartbeatMonitor, HeartbeatStatus
+
+
+@pytest.fixture
+async def monitor(monkeypatch):
+    """策略1运行中、策略2已出错、策略3已停止"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Strategy.__table__.create)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        for strategy_id, status in ((1, "running"), (2, "error"), (3, "stopped")):
+            session.add(Strategy(
+                id=strategy_id, user_id=1, name=f"strategy_{strategy_id}", strategy_class="Sample",
+                exchange="binance", timeframe="1h", pair_whitelist=["BTC/USDT"], signal_thresholds={},
+                status=status
+            ))
+        await session.commit()
+    monkeypatch.setattr("services.heartbeat_monitor_service.SessionLocal", session_factory)
+
+    manager = MagicMock()
+    manager.restart_strategy = AsyncMock(return_value=False)
+    monitor = StrategyHeartbeatMonitor(manager, MagicMock(notify=AsyncMock()))
+    monitor._save_restart_history = AsyncMock()
+    for strategy_id in (1, 2, 3):
+        monitor.heartbeat_status[strategy_id] = HeartbeatStatus(strategy_id, "/tmp/none.log", 300, True)
+    yield monitor
+    await engine.dispose()
+
+
+class TestHeartbeatAutoRestart:
+    """自动重启条件测试"""
+
+    @pytest.mark.asyncio
+    async def test_only_process_exit_restarts_without_running_process(self, monitor):
+        """测试只有进程退出触发的重启允许管理器中已无该进程，心跳超时仍要求进程在运行"""
+        await monitor._attempt_restart(1, monitor.heartbeat_status[1])
+        monitor.strategy_manager.restart_strategy.assert_awaited_once_with(1, require_running=True)
+
+        monitor.strategy_manager.restart_strategy.reset_mock()
+        await monitor.handle_process_exit(2, 4321, 1)
+        monitor.strategy_manager.restart_strategy.assert_awaited_once_with(2, require_running=False)
+
+    @pytest.mark.asyncio
+    async def test_stopped_strategy_not_restarted(self, monitor):
+        """测试数据库状态不是running/error（如用户已停止）时不自动重启"""
+        await monitor.handle_process_exit(3, 4321, 0)
+        await monitor._attempt_restart(3, monitor.heartbeat_status[3])
+        await monitor._attempt_restart(99, monitor.heartbeat_status[1])
+
+        monitor.strategy_manager.restart_strategy.assert_not_awaited()
+        monitor._save_restart_history.assert_not_awaited()
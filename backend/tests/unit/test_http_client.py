@@ -0,0 +1,64 @@
+"""
+共享HTTP连接池单元测试
+PooledHttpClient Unit Tests
+"""
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from core.http_client import PooledHttpClient
+
+
+@pytest.fixture
+async def upstream():
+    """模拟FreqTrade实例API，记录每个请求使用的TCP连接"""
+    peers = []
+
+    async def ping(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.json_response({"status": "pong"})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/ping", ping)
+    server = TestServer(app)
+    await server.start_server()
+    server.peers = peers
+    yield server
+    await server.close()
+
+
+class TestPooledHttpClient:
+    """连接池测试"""
+
+    @pytest.mark.asyncio
+    async def test_requests_reuse_keepalive_connection(self, upstream):
+        """测试同一上游的连续请求复用同一TCP连接"""
+        client = PooledHttpClient(limit=10, limit_per_host=2, keepalive_timeout=30)
+        url = str(upstream.make_url("/api/v1/ping"))
+
+        for _ in range(5):
+            async with client.get(url, timeout=5) as response:
+                assert (await response.json())["status"] == "pong"
+
+        await client.close()
+
+        assert len(set(upstream.peers)) == 1
+        stats = client.get_stats()
+        assert stats["requests"] == 5
+        assert stats["errors"] == 0
+        assert stats["in_flight"] == 0
+        assert stats["pool"]["sessions_created"] == 1
+        assert stats["latency_ms"]["samples"] == 5
+
+    @pytest.mark.asyncio
+    async def test_errors_are_counted(self):
+        """测试连接失败计入错误数且会话可继续使用"""
+        client = PooledHttpClient()
+
+        with pytest.raises(Exception):
+            async with client.get("http://127.0.0.1:1/api/v1/ping", timeout=1):
+                pass
+
+        assert client.get_stats()["errors"] == 1
+        assert client.in_flight == 0
+        await client.close()
+        assert client.get_stats()["pool"]["open"] is False
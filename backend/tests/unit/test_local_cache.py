@@ -0,0 +1,54 @@
+"""
+进程内缓存单元测试
+LocalTTLCache Unit Tests
+"""
+from unittest.mock import patch
+from services.local_cache import LocalTTLCache
+
+
+class TestLocalTTLCache:
+    """L0缓存测试"""
+
+    def test_lru_eviction(self):
+        """测试超过容量时淘汰最久未使用的条目"""
+        cache = LocalTTLCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_entries_expire(self):
+        """测试条目过期，且TTL不超过默认上限"""
+        cache = LocalTTLCache(default_ttl=5)
+        with patch("services.local_cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1, ttl=60)
+        with patch("services.local_cache.time.monotonic", return_value=104.0):
+            assert cache.get("a") == 1
+        with patch("services.local_cache.time.monotonic", return_value=105.0):
+            assert cache.get("a") is None
+
+        stats = cache.get_stats()
+        assert stats["expirations"] == 1
+        assert stats["hits"] == 1
+        assert stats["hit_rate"] == 50.0
+
+    def test_invalidate_prefix(self):
+        """测试按前缀失效"""
+        cache = LocalTTLCache()
+        cache.set("indicator:binance:BTC/USDT:1m:MA", 1)
+        cache.set("indicator:binance:BTC/USDT:1m:RSI", 2)
+        cache.set("indicator:binance:BTC/USDT:5m:MA", 3)
+
+        assert cache.invalidate_prefix("indicator:binance:BTC/USDT:1m:") == 2
+        assert cache.get("indicator:binance:BTC/USDT:5m:MA") == 3
+
+    def test_disabled_when_zero_entries(self):
+        """测试容量为0时不缓存"""
+        cache = LocalTTLCache(max_entries=0)
+        cache.set("a", 1)
+        assert cache.get("a") is None
@@ -0,0 +1,66 @@
+"""
+行情数据调度器单元测试
+MarketDataScheduler Unit Tests
+"""
+import asyncio
+import pytest
+from unittest.mock import Mock, MagicMock
+from services.market_data_scheduler import MarketDataScheduler
+
+
+class TestConcurrentUpdateCycle:
+    """并发更新周期测试"""
+
+    def make_scheduler(self, session_factory=None) -> MarketDataScheduler:
+        scheduler = MarketDataScheduler(Mock(), Mock(), Mock(), session_factory=session_factory)
+        scheduler.symbols = [f"COIN{i}/USDT" for i in range(10)]
+        scheduler.timeframes = ["1m", "5m"]
+        scheduler.max_concurrent_per_exchange = 3
+        return scheduler
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded_per_exchange(self):
+        """测试每个交易所的并发任务数不超过上限"""
+        session_factory = MagicMock()
+        scheduler = self.make_scheduler(session_factory)
+        in_flight = 0
+        peak = 0
+
+        async def fake_update(symbol, timeframe, handler=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return symbol != "COIN0/USDT"
+
+        scheduler._update_symbol_timeframe = fake_update
+        await scheduler._update_all_market_data()
+
+        stats = scheduler.last_cycle_stats["all"]
+        assert peak == 3
+        assert stats["series"] == 20
+        assert stats["failed"] == 2
+        assert stats["wall_time_seconds"] > 0
+        assert session_factory.call_count == 20
+
+    @pytest.mark.asyncio
+    async def test_sequential_without_session_factory(self):
+        """测试没有会话工厂时退化为串行更新"""
+        scheduler = self.make_scheduler()
+        in_flight = 0
+        peak = 0
+
+        async def fake_update(symbol, timeframe, handler=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return True
+
+        scheduler._update_symbol_timeframe = fake_update
+        await scheduler._update_timeframe_data("1m")
+
+        assert peak == 1
+        assert scheduler.last_cycle_stats["1m"]["success"] == 10
@@ -2,12 +2,45 @@
 监控服务单元测试
 MonitoringService Unit Tests
 """
+import asyncio
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from models.strategy import Strategy
+from models.signal import Signal
 from services.monitoring_service import MonitoringService
 
 
+@pytest.fixture
+async def session_factory(monkeypatch):
+    """策略1-4运行中，策略5已停止；策略1有两条最近信号和一条过期信号，策略2有一条最近信号"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Strategy.__table__.create)
+        await conn.run_sync(Signal.__table__.create)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    now = datetime.now()
+    async with factory() as session:
+        for strategy_id in range(1, 6):
+            session.add(Strategy(
+                id=strategy_id, user_id=1, name=f"strategy_{strategy_id}", strategy_class="Sample",
+                exchange="binance", timeframe="1h", pair_whitelist=["BTC/USDT"], signal_thresholds={},
+                status="running" if strategy_id < 5 else "stopped", port=8080 + strategy_id
+            ))
+        for strategy_id, age in ((1, 10), (1, 5), (1, 120), (2, 30)):
+            session.add(Signal(
+                strategy_id=strategy_id, pair="BTC/USDT", action="buy", signal_strength=0.8,
+                strength_level="strong", current_rate=100.0, created_at=now - timedelta(minutes=age)
+            ))
+        await session.commit()
+    monkeypatch.setattr("services.monitoring_service.SessionLocal", factory)
+    yield factory
+    await engine.dispose()
+
+
 class TestMonitoringService:
     """监控服务测试类"""
 
@@ -203,5 +236,74 @@ class TestMonitoringServiceIntegration:
         assert health["disk_healthy"] is False
 
 
+class TestStrategyMonitoring:
+    """策略指标与兜底核对测试"""
+
+    @pytest.mark.asyncio
+    async def test_signal_stats_grouped_by_strategy(self, session_factory):
+        """测试最近信号统计由一次分组查询得到（过期信号不计入）"""
+        service = MonitoringService(Mock())
+
+        async with session_factory() as session:
+            stats = await service._get_recent_signal_stats(session, [1, 2, 3], hours=1)
+
+        assert set(stats) == {1, 2}
+        assert stats[1][0] == 2
+        assert stats[2][0] == 1
+        assert stats[1][1] > stats[2][1]
+
+    @pytest.mark.asyncio
+    async def test_strategy_metrics_without_polling(self, session_factory):
+        """测试策略指标不逐个轮询进程、不修改策略状态"""
+        process = Mock()
+        manager = Mock(strategy_processes={1: process, 2: process})
+        service = MonitoringService(manager)
+        service.running = True
+
+        task = asyncio.create_task(service._monitor_strategy_status())
+        for _ in range(100):
+            if service.strategy_metrics:
+                break
+            await asyncio.sleep(0.01)
+        service.running = False
+        task.cancel()
+
+        metrics = service.strategy_metrics
+        assert set(metrics) == {1, 2, 3, 4}
+        assert metrics[1]["signals_last_hour"] == 2
+        assert metrics[1]["is_alive"] is True
+        assert metrics[3]["signals_last_hour"] == 0
+        assert metrics[3]["last_signal_time"] is None
+        assert metrics[3]["is_alive"] is False
+        process.poll.assert_not_called()
+
+        async with session_factory() as session:
+            strategy = await session.get(Strategy, 3)
+        assert strategy.status == "running"
+
+    @pytest.mark.asyncio
+    async def test_backstop_only_checks_unwatched_strategies(self, session_factory):
+        """测试兜底核对跳过被监听的策略：已退出的进程走退出流程，管理器中没有进程的标记为error"""
+        watched = Mock()
+        exited = Mock(pid=4321)
+        exited.poll.return_value = 1
+        alive = Mock(pid=4322)
+        alive.poll.return_value = None
+        manager = Mock(strategy_processes={1: watched, 2: exited, 4: alive})
+        manager.exit_watcher.is_watched.side_effect = lambda strategy_id: strategy_id == 1
+        manager.exit_watcher.report_exit = AsyncMock()
+        service = MonitoringService(manager)
+
+        with patch("services.monitoring_service.ws_service.push_strategy_status", new=AsyncMock()):
+            await service._check_unwatched_strategies()
+
+        watched.poll.assert_not_called()
+        manager.exit_watcher.report_exit.assert_awaited_once_with(2, 4321, 1)
+        async with session_factory() as session:
+            result = await session.execute(select(Strategy.id, Strategy.status))
+            statuses = dict(result.all())
+        assert statuses == {1: "running", 2: "running", 3: "error", 4: "running", 5: "stopped"}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,163 @@
+"""
+共享监控快照单元测试
+MonitoringSnapshotStore Unit Tests
+"""
+import pytest
+from unittest.mock import Mock
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from models.strategy import Strategy
+from models.signal import Signal
+from services.monitoring_snapshot import MonitoringSnapshotStore, etag_matches
+from api.v1 import realtime
+from database import get_db
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Strategy.__table__.create)
+        await conn.run_sync(Signal.__table__.create)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        for i, status in enumerate(["running", "running", "stopped", "error"], start=1):
+            session.add(Strategy(
+                id=i, user_id=1, name=f"strategy_{i}", strategy_class="Sample", exchange="binance",
+                timeframe="1h", pair_whitelist=["BTC/USDT"], signal_thresholds={}, status=status, port=8080 + i
+            ))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+def make_monitoring(cpu: float = 10.0):
+    monitoring = Mock()
+    monitoring.get_system_metrics.return_value = {"cpu": {"percent": cpu}}
+    monitoring.get_health_status.return_value = {"status": "healthy", "timestamp": "changes-every-call"}
+    return monitoring
+
+
+def make_ft_manager():
+    ft_manager = Mock()
+    ft_manager.strategy_ports = {1: 8081, 2: 8082}
+    ft_manager.base_port = 8081
+    ft_manager.max_port = 9080
+    ft_manager.get_capacity_info.return_value = {"running_strategies": 2, "max_strategies": 1000}
+    return ft_manager
+
+
+class TestMonitoringSnapshotStore:
+    """快照版本与 ETag 测试"""
+
+    def test_version_changes_only_with_content(self):
+        """测试内容不变时版本与 ETag 不变"""
+        store = MonitoringSnapshotStore()
+        assert store.update("capacity", {"used": 1}) is True
+        etag = store.etag(["capacity"])
+
+        assert store.update("capacity", {"used": 1}) is False
+        assert store.get("capacity")["version"] == 1
+        assert store.etag(["capacity"]) == etag
+
+        assert store.update("capacity", {"used": 2}) is True
+        assert store.get("capacity")["version"] == 2
+        assert store.etag(["capacity"]) != etag
+
+    def test_health_timestamp_does_not_change_version(self):
+        """测试健康状态中的生成时间不影响版本"""
+        store = MonitoringSnapshotStore()
+        monitoring = make_monitoring()
+        store.refresh_monitoring(monitoring)
+        store.refresh_monitoring(monitoring)
+
+        assert store.get("monitoring")["version"] == 1
+        assert "timestamp" not in store.get("monitoring")["data"]["health"]
+
+    def test_etag_matches(self):
+        """测试 If-None-Match 匹配"""
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('"x", "abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches(None, '"abc"')
+        assert not etag_matches('"abd"', '"abc"')
+
+    @pytest.mark.asyncio
+    async def test_refresh_strategies_counts(self, db):
+        """测试一次查询得到各状态数量与运行中的策略"""
+        store = MonitoringSnapshotStore()
+        await store.refresh_strategies(db)
+
+        data = store.get("strategies")["data"]
+        assert (data["total"], data["running"], data["stopped"], data["error"]) == (4, 2, 1, 1)
+        assert [s["id"] for s in data["strategies"]] == [1, 2]
+        assert store.strategy_queries == 1
+
+    @pytest.mark.asyncio
+    async def test_ensure_queries_strategies_only_when_stale(self, db):
+        """测试快照未过期时读取不查询数据库"""
+        store = MonitoringSnapshotStore(max_age=60)
+        for _ in range(3):
+            await store.ensure(["strategies"], db=db)
+        assert store.strategy_queries == 1
+
+        store.max_age = 0
+        await store.ensure(["strategies"], db=db)
+        assert store.strategy_queries == 2
+
+
+class TestRealtimeBatchSnapshot:
+    """实时批量接口 ETag 测试"""
+
+    @pytest.fixture
+    async def client(self, db, monkeypatch):
+        store = MonitoringSnapshotStore(max_age=60)
+        monkeypatch.setattr(realtime, "monitoring_snapshot", store)
+        monitoring, ft_manager = make_monitoring(), make_ft_manager()
+
+        async def override_db():
+            yield db
+
+        app = FastAPI()
+        app.include_router(realtime.router, prefix="/api/v1/realtime")
+        app.dependency_overrides[get_db] = override_db
+        app.dependency_overrides[realtime.get_monitoring_service] = lambda: monitoring
+        app.dependency_overrides[realtime.get_freqtrade_manager] = lambda: ft_manager
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            yield client, store, monitoring
+
+    @pytest.mark.asyncio
+    async def test_unchanged_snapshot_returns_304(self, client, db):
+        """测试快照未变化时返回 304，变化后返回新数据"""
+        client, store, monitoring = client
+        url = "/api/v1/realtime/batch?topics=monitoring,strategies,capacity"
+
+        first = await client.get(url)
+        assert first.status_code == 200
+        data = first.json()["data"]
+        assert data["strategies"]["running"] == 2
+        assert data["capacity"]["used_ports"] == 2
+        etag = first.headers["etag"]
+
+        cached = await client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert store.strategy_queries == 1
+
+        monitoring.get_system_metrics.return_value = {"cpu": {"percent": 55.0}}
+        changed = await client.get(url, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.json()["data"]["monitoring"]["system"]["cpu"]["percent"] == 55.0
+        assert changed.headers["etag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_signals_topic_is_not_cached(self, client, db):
+        """测试包含 signals 时不使用 ETag"""
+        client, store, _ = client
+        response = await client.get("/api/v1/realtime/batch?topics=strategies,signals")
+
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        assert response.json()["data"]["signals"]["count"] == 0
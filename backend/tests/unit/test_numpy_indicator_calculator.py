@@ -0,0 +1,59 @@
+"""
+NumPy指标后端单元测试（与ta实现的一致性测试）
+NumpyIndicatorCalculator Parity Tests
+"""
+import numpy as np
+import pytest
+from services.indicator_calculator import IndicatorCalculator, get_indicator_calculator
+from services.numpy_indicator_calculator import NumpyIndicatorCalculator, NUMBA_AVAILABLE
+from tests.unit.test_streaming_indicator_engine import make_candles, assert_values_close
+
+INDICATOR_TYPES = ["MA", "MACD", "RSI", "BOLL", "VOL"]
+NUMBA_MODES = [False, True] if NUMBA_AVAILABLE else [False]
+
+
+class TestNumpyIndicatorParity:
+    """NumPy后端与ta全量计算一致"""
+
+    @pytest.mark.parametrize("use_numba", NUMBA_MODES)
+    @pytest.mark.parametrize("count", [10, 35, 200])
+    def test_matches_ta(self, use_numba, count):
+        """测试各指标结果与ta一致"""
+        candles = make_candles(count)
+        calculator = NumpyIndicatorCalculator(use_numba=use_numba)
+
+        results = calculator.calculate_indicators(candles, INDICATOR_TYPES)
+        expected = IndicatorCalculator().calculate_indicators(candles, INDICATOR_TYPES)
+
+        for indicator_type in INDICATOR_TYPES:
+            assert results[indicator_type]["indicator_params"] == expected[indicator_type]["indicator_params"]
+            assert_values_close(
+                results[indicator_type]["indicator_values"],
+                expected[indicator_type]["indicator_values"]
+            )
+
+    @pytest.mark.parametrize("use_numba", NUMBA_MODES)
+    def test_batch_rows_match_single_series(self, use_numba):
+        """测试二维批量计算与逐个序列计算一致"""
+        series = [make_candles(200, seed=seed) for seed in range(8)]
+        close = np.array([[c[4] for c in candles] for candles in series])
+        calculator = NumpyIndicatorCalculator(use_numba=use_numba)
+
+        batch = calculator.calculate_batch(close)
+
+        for row, candles in enumerate(series):
+            single = calculator.calculate_batch(close[row])
+            for name in ("ma30", "macd", "signal", "rsi", "upper"):
+                np.testing.assert_allclose(batch[name][row], single[name][0], equal_nan=True)
+
+    def test_factory_selects_backend(self):
+        """测试工厂函数按配置选择后端，不支持的后端报错"""
+        assert isinstance(get_indicator_calculator("numpy"), NumpyIndicatorCalculator)
+        assert isinstance(get_indicator_calculator("ta"), IndicatorCalculator)
+        with pytest.raises(ValueError):
+            get_indicator_calculator("pandas")
+
+    def test_rejects_unknown_type(self):
+        """测试不支持的指标类型"""
+        with pytest.raises(ValueError):
+            NumpyIndicatorCalculator().calculate_indicators(make_candles(30), ["KDJ"])
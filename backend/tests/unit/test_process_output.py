@@ -0,0 +1,100 @@
+"""
+进程输出读取单元测试
+Process Output Capture Unit Tests
+"""
+import sys
+import asyncio
+import pytest
+
+from config import settings
+from core.process_output import OutputRingBuffer, ProcessOutputStore
+from core.process_supervisor import start_process
+
+# 向stdout和stderr各写入约2MB后退出；没有读取者时会阻塞在写满的管道上
+CHATTY = [
+    sys.executable, "-c",
+    "import sys\n"
+    "for i in range(20000):\n"
+    "    sys.stdout.write('stdout line %d ' % i + 'x' * 80 + '\\n')\n"
+    "    sys.stderr.write('stderr line %d ' % i + 'y' * 80 + '\\n')\n"
+    "print('done', flush=True)"
+]
+
+
+async def start_chatty():
+    return await start_process(CHATTY, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+
+
+class TestOutputRingBuffer:
+    """环形缓冲上限测试"""
+
+    def test_caps_lines_and_size(self):
+        """测试按行数和总大小淘汰最旧的行"""
+        buffer = OutputRingBuffer(max_lines=3, max_bytes=1000)
+        for i in range(5):
+            buffer.append(f"line {i}")
+        assert buffer.tail() == ["line 2", "line 3", "line 4"]
+        assert buffer.tail(1) == ["line 4"]
+        assert buffer.dropped_lines == 2
+
+        buffer = OutputRingBuffer(max_lines=100, max_bytes=25)
+        for i in range(5):
+            buffer.append("0123456789")
+        assert len(buffer) == 2 and buffer.bytes <= 25
+
+    def test_truncates_long_lines(self):
+        """测试超长行被截断"""
+        buffer = OutputRingBuffer(max_line_bytes=10)
+        buffer.append("a" * 100)
+        assert buffer.tail()[0] == "a" * 10 + "...[truncated]"
+
+
+class TestProcessOutputStore:
+    """子进程输出持续读取测试"""
+
+    @pytest.mark.asyncio
+    async def test_chatty_process_does_not_stall(self):
+        """测试大量输出的进程不会因管道写满而阻塞，内存占用有上限"""
+        store = ProcessOutputStore(mode="buffer", max_lines=100, max_bytes=8192)
+        process = await start_chatty()
+        store.attach(1, process.stdout)
+
+        assert await process.wait(timeout=30) == 0
+        assert await store.wait_closed(1)
+
+        buffer = store.buffers[1]
+        assert buffer.total_lines == 40001
+        assert len(buffer) <= 100 and buffer.bytes <= 8192
+        assert store.tail(1, 1) == ["done"]
+
+    @pytest.mark.asyncio
+    async def test_file_mode_rotates(self, tmp_path, monkeypatch):
+        """测试file模式写入轮转文件"""
+        monkeypatch.setattr(settings, "FREQTRADE_OUTPUT_FILE_MAX_BYTES", 512 * 1024)
+        monkeypatch.setattr(settings, "FREQTRADE_OUTPUT_FILE_BACKUPS", 2)
+        store = ProcessOutputStore(mode="file", logs_path=tmp_path)
+        process = await start_chatty()
+        store.attach(7, process.stdout)
+
+        await process.wait(timeout=30)
+        assert await store.wait_closed(7)
+
+        files = sorted(p.name for p in tmp_path.iterdir())
+        assert files == ["strategy_7.out", "strategy_7.out.1", "strategy_7.out.2"]
+        assert all(p.stat().st_size <= 512 * 1024 for p in tmp_path.iterdir())
+        assert (tmp_path / "strategy_7.out").read_text().endswith("done\n")
+
+    @pytest.mark.asyncio
+    async def test_attach_replaces_previous_output(self):
+        """测试重新启动时替换上一个进程的输出"""
+        store = ProcessOutputStore(mode="buffer")
+        for text in ("first", "second"):
+            process = await start_process(
+                [sys.executable, "-c", f"print('{text}')"], stdout=asyncio.subprocess.PIPE
+            )
+            store.attach(3, process.stdout)
+            await process.wait(timeout=10)
+            await store.wait_closed(3)
+
+        assert store.tail(3) == ["second"]
+        assert store.get_stats()["strategies"] == 1
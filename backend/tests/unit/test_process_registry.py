@@ -0,0 +1,164 @@
+"""
+进程表单元测试
+Process Registry Unit Tests
+"""
+import asyncio
+import sys
+import socket
+import subprocess
+import pytest
+
+from core.process_registry import ProcessRegistry, SAVE_DELAY
+
+SLEEPER = [sys.executable, "-c", "import time; time.sleep(60)"]
+# 在指定端口监听的进程（模拟FreqTrade API）
+LISTENER = [
+    sys.executable, "-c",
+    "import socket, sys, time\n"
+    "s = socket.socket(); s.bind(('127.0.0.1', 0)); s.listen()\n"
+    "print(s.getsockname()[1], flush=True)\n"
+    "time.sleep(60)"
+]
+
+
+@pytest.fixture
+def processes():
+    started = []
+
+    def start(cmd):
+        popen = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+        started.append(popen)
+        return popen
+
+    yield start
+    for popen in started:
+        popen.kill()
+        popen.wait()
+
+
+def scanned(pid, strategy_id, port):
+    """scan_freqtrade_processes 格式的进程信息"""
+    return {"pid": pid, "strategy_id": strategy_id, "config_file": None,
+            "log_file": None, "port": port, "is_healthy": port is not None}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestProcessRegistry:
+    """进程表登记、校验与持久化测试"""
+
+    def test_lookup_validates_pid_and_port(self, processes):
+        """测试按PID和端口校验进程状态"""
+        registry = ProcessRegistry()
+        listener = processes(LISTENER)
+        port = int(listener.stdout.readline())
+        sleeper = processes(SLEEPER)
+
+        assert registry.register(1, listener.pid, port, "/configs/strategy_1.json")
+        assert registry.register(2, sleeper.pid, free_port())
+
+        healthy = registry.lookup(1)
+        assert (healthy["pid"], healthy["port"], healthy["is_healthy"]) == (listener.pid, port, True)
+        assert healthy["config_file"] == "/configs/strategy_1.json"
+        assert registry.lookup(2)["is_healthy"] is False
+        assert registry.lookup(3) is None
+
+    def test_dead_or_reused_pid_dropped(self, processes):
+        """测试进程退出或PID被复用（启动时间不同）时记录失效"""
+        registry = ProcessRegistry()
+        sleeper = processes(SLEEPER)
+        registry.register(1, sleeper.pid, None)
+        registry.register(2, sleeper.pid, None)
+        registry.entries[2]["start_time"] -= 3600
+
+        assert registry.lookup(2) is None
+
+        sleeper.kill()
+        sleeper.wait()
+        assert registry.lookup(1) is None
+        assert registry.entries == {}
+
+    def test_persisted_across_restarts(self, processes, tmp_path):
+        """测试进程表写入磁盘，重启后加载"""
+        path = tmp_path / "processes.json"
+        sleeper = processes(SLEEPER)
+        registry = ProcessRegistry(path, reconcile_interval=600)
+        registry.reconcile([])
+        registry.register(4, sleeper.pid, 8085, "/configs/strategy_4.json", "/logs/strategy_4.log")
+
+        reloaded = ProcessRegistry(path, reconcile_interval=600)
+        assert reloaded.lookup(4)["pid"] == sleeper.pid
+        assert reloaded.lookup(4)["log_file"] == "/logs/strategy_4.log"
+        assert not reloaded.needs_reconcile()
+
+        path.write_text("not json")
+        assert ProcessRegistry(path).entries == {}
+
+    def test_reconcile_merges_scan(self, processes):
+        """测试全量扫描结果合并进进程表（移除已退出的进程），同一策略多个进程时优先健康进程"""
+        registry = ProcessRegistry(reconcile_interval=600)
+        first, second, third = processes(SLEEPER), processes(SLEEPER), processes(SLEEPER)
+        registry.register(1, first.pid, 8081)
+        first.kill()
+        first.wait()
+        assert registry.needs_reconcile()
+
+        stats = registry.reconcile([
+            scanned(second.pid, 2, None),
+            scanned(third.pid, 2, 8082)
+        ])
+
+        assert stats == {"added": 1, "removed": 1, "changed": 0}
+        assert list(registry.entries) == [2]
+        assert registry.entries[2]["pid"] == third.pid
+        assert not registry.needs_reconcile()
+
+    def test_reconcile_keeps_changes_during_scan(self, processes):
+        """测试扫描开始后登记/注销的策略以进程表为准，扫描遗漏但仍存活的进程保留"""
+        registry = ProcessRegistry(reconcile_interval=600)
+        old, new, stopped, unscanned = processes(SLEEPER), processes(SLEEPER), processes(SLEEPER), processes(SLEEPER)
+        registry.register(1, old.pid, 8081)
+        registry.register(2, stopped.pid, 8082)
+        registry.register(3, unscanned.pid, 8083)
+
+        since = registry.generation
+        scan = [scanned(old.pid, 1, 8081), scanned(stopped.pid, 2, 8082)]
+        # 扫描期间：策略1重启为新进程，策略2被停止（进程尚未退出）
+        registry.register(1, new.pid, 8091)
+        registry.unregister(2)
+
+        stats = registry.reconcile(scan, since=since)
+
+        assert stats == {"added": 0, "removed": 0, "changed": 0}
+        assert registry.entries[1]["pid"] == new.pid
+        assert 2 not in registry.entries
+        assert registry.entries[3]["pid"] == unscanned.pid
+
+    @pytest.mark.asyncio
+    async def test_event_loop_saves_debounced(self, processes, tmp_path):
+        """测试事件循环中的批量登记/注销只标记变更，延迟后在线程中合并写入一次"""
+        path = tmp_path / "processes.json"
+        sleeper = processes(SLEEPER)
+        registry = ProcessRegistry(path, reconcile_interval=600)
+
+        for strategy_id in range(1, 51):
+            registry.register(strategy_id, sleeper.pid, 8000 + strategy_id)
+        registry.unregister(50)
+
+        assert registry.saves == 0
+        assert not path.exists()
+
+        await registry.flush()
+        assert registry.saves == 1
+        assert len(ProcessRegistry(path).entries) == 49
+
+        # 没有新变更时不再写入
+        await registry.flush()
+        registry.unregister(49)
+        await asyncio.sleep(SAVE_DELAY + 0.2)
+        assert registry.saves == 2
+        assert len(ProcessRegistry(path).entries) == 48
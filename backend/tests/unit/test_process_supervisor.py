@@ -0,0 +1,169 @@
+"""
+进程管理单元测试
+Process Supervisor Unit Tests
+"""
+import sys
+import time
+import asyncio
+import subprocess
+import pytest
+
+from core.process_supervisor import ExternalProcess, ProcessExitWatcher, start_process, stop_process, stop_pid
+
+SLEEPER = [sys.executable, "-c", "import time; time.sleep(60)"]
+# 忽略SIGTERM的进程，只能被SIGKILL停止
+STUBBORN = [
+    sys.executable, "-c",
+    "import signal, sys, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+    "print('ready', flush=True); time.sleep(60)"
+]
+
+
+class LoopLagProbe:
+    """测量事件循环的最大调度延迟"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.max_lag = max(self.max_lag, time.perf_counter() - started - self.interval)
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._run())
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc):
+        # 让阻塞期间到期的那次调度完成测量
+        await asyncio.sleep(self.interval * 2)
+        self._task.cancel()
+
+
+class TestProcessSupervisor:
+    """异步启动/停止进程测试"""
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self):
+        """测试启动与SIGTERM停止"""
+        process = await start_process(SLEEPER)
+        assert process.poll() is None
+
+        assert await stop_process(process, timeout=5) == -15
+        assert process.poll() == -15
+
+    @pytest.mark.asyncio
+    async def test_kill_after_timeout_without_blocking_loop(self):
+        """测试忽略SIGTERM的进程超时后被SIGKILL，等待期间事件循环不阻塞"""
+        process = await start_process(STUBBORN, stdout=asyncio.subprocess.PIPE)
+        await process.stdout.readline()
+
+        async with LoopLagProbe() as probe:
+            started = time.perf_counter()
+            returncode = await stop_process(process, timeout=0.3)
+            elapsed = time.perf_counter() - started
+
+        assert returncode == -9
+        assert elapsed >= 0.3
+        assert probe.max_lag < 0.1
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout_returns_none(self):
+        """测试等待超时返回None"""
+        process = await start_process(SLEEPER)
+        assert await process.wait(timeout=0.05) is None
+        process.kill()
+        assert await process.wait(timeout=5) == -9
+
+    @pytest.mark.asyncio
+    async def test_external_process(self):
+        """测试按PID停止非本进程启动的进程"""
+        popen = subprocess.Popen(SLEEPER)
+        try:
+            external = ExternalProcess(popen.pid)
+            assert external.poll() is None
+            assert await stop_process(external, timeout=5) is not None
+        finally:
+            popen.wait()
+
+    @pytest.mark.asyncio
+    async def test_stop_missing_pid(self):
+        """测试停止不存在的进程"""
+        popen = subprocess.Popen([sys.executable, "-c", "pass"])
+        popen.wait()
+        assert await stop_pid(popen.pid) is True
+
+
+class TestProcessExitWatcher:
+    """进程退出通知测试"""
+
+    @staticmethod
+    def recorder():
+        events = asyncio.Queue()
+
+        async def listener(strategy_id, pid, returncode):
+            events.put_nowait((strategy_id, pid, returncode, time.perf_counter()))
+
+        return events, listener
+
+    @pytest.mark.asyncio
+    async def test_exit_reported_immediately(self):
+        """测试被监视的进程崩溃后立即通知（无需等待轮询周期）"""
+        watcher = ProcessExitWatcher()
+        events, listener = self.recorder()
+        watcher.add_listener(listener)
+
+        process = await start_process(SLEEPER)
+        watcher.watch(1, process)
+        killed_at = time.perf_counter()
+        process.kill()
+
+        strategy_id, pid, returncode, notified_at = await asyncio.wait_for(events.get(), 5)
+        assert (strategy_id, pid, returncode) == (1, process.pid, -9)
+        assert notified_at - killed_at < 0.1
+        assert not watcher.is_watched(1)
+
+    @pytest.mark.asyncio
+    async def test_unwatch_suppresses_exit(self):
+        """测试取消监视后主动停止不触发通知"""
+        watcher = ProcessExitWatcher()
+        events, listener = self.recorder()
+        watcher.add_listener(listener)
+
+        process = await start_process(SLEEPER)
+        watcher.watch(2, process)
+        watcher.unwatch(2)
+        await stop_process(process, timeout=5)
+        await asyncio.sleep(0.05)
+
+        assert events.empty()
+        assert watcher.exits_reported == 0
+
+    @pytest.mark.asyncio
+    async def test_external_process_exit(self):
+        """测试非本进程启动的进程退出也能立即通知"""
+        watcher = ProcessExitWatcher()
+        events, listener = self.recorder()
+
+        async def failing_listener(*args):
+            raise RuntimeError("listener error")
+
+        watcher.add_listener(failing_listener)
+        watcher.add_listener(listener)
+
+        popen = subprocess.Popen(SLEEPER)
+        try:
+            watcher.watch(3, ExternalProcess(popen.pid))
+            await asyncio.sleep(0.05)
+            killed_at = time.perf_counter()
+            popen.kill()
+
+            strategy_id, pid, _, notified_at = await asyncio.wait_for(events.get(), 5)
+            assert (strategy_id, pid) == (3, popen.pid)
+            assert notified_at - killed_at < 0.1
+        finally:
+            popen.wait()
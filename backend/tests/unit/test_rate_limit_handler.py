@@ -0,0 +1,349 @@
+"""
+三层数据访问服务单元测试
+RateLimitHandler Unit Tests
+"""
+import pytest
+from unittest.mock import Mock, AsyncMock
+from services.rate_limit_handler import RateLimitHandler
+
+
+def make_handler(dialect: str = "postgresql") -> RateLimitHandler:
+    """创建使用Mock依赖的RateLimitHandler"""
+    db = Mock()
+    db.bind.dialect.name = dialect
+    db.execute = AsyncMock()
+    db.commit = AsyncMock()
+    db.rollback = AsyncMock()
+    redis = Mock()
+    redis.is_connected.return_value = False
+    return RateLimitHandler(db, redis, Mock())
+
+
+def make_candles(count: int, start_ms: int = 1_700_000_000_000):
+    return [
+        [start_ms + i * 60_000, 1.0, 2.0, 0.5, 1.5, 10.0]
+        for i in range(count)
+    ]
+
+
+class TestKlineBulkStore:
+    """K线批量写入测试"""
+
+    def test_build_rows_deduplicates_timestamps(self):
+        """测试同一时间戳的K线只保留最后一根"""
+        handler = make_handler()
+        candles = make_candles(3)
+        candles.append([candles[1][0], 9.0, 9.0, 9.0, 9.0, 9.0])
+
+        rows = handler._build_kline_rows("binance", "BTC/USDT", "1m", candles)
+
+        assert len(rows) == 3
+        assert rows[1]["close"] == 9.0
+
+    @pytest.mark.asyncio
+    async def test_upsert_is_chunked_and_committed_once(self):
+        """测试UPSERT按批次分块执行并只提交一次"""
+        handler = make_handler()
+        count = handler.KLINE_UPSERT_BATCH_SIZE * 2 + 1
+
+        written = await handler.store_klines_bulk(
+            "binance", "BTC/USDT", "1m", make_candles(count), use_copy=False
+        )
+
+        assert written == count
+        assert handler.db.execute.await_count == 3
+        handler.db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_is_noop(self):
+        """测试空批次不访问数据库"""
+        handler = make_handler()
+
+        assert await handler.store_klines_bulk("binance", "BTC/USDT", "1m", []) == 0
+        handler.db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_store_failure_rolls_back(self):
+        """测试写入失败时回滚并返回False"""
+        handler = make_handler()
+        handler.db.execute.side_effect = RuntimeError("db down")
+
+        assert await handler._store_klines_to_database(
+            "binance", "BTC/USDT", "1m", make_candles(2)
+        ) is False
+        handler.db.rollback.assert_awaited_once()
+
+
+class TestIncrementalKlineRefresh:
+    """K线增量拉取测试"""
+
+    def test_merge_replaces_overlapping_candles(self):
+        """测试增量数据覆盖重叠的K线并保持窗口长度"""
+        existing = make_candles(5)
+        delta = [[existing[-1][0], 1.0, 3.0, 0.5, 2.5, 20.0]] + make_candles(2, existing[-1][0] + 60_000)
+
+        merged = RateLimitHandler._merge_klines(existing, delta, limit=5)
+
+        assert len(merged) == 5
+        assert merged[-3][4] == 2.5
+        assert [c[0] for c in merged] == sorted(c[0] for c in merged)
+
+    @pytest.mark.asyncio
+    async def test_fetches_since_high_water_mark(self):
+        """测试已有高水位时只拉取增量数据"""
+        from datetime import datetime
+
+        handler = make_handler()
+        handler.ccxt_manager.timeframe_to_ms = Mock(return_value=60_000)
+        now_ms = int(datetime.now().timestamp() * 1000) // 60_000 * 60_000
+        window = make_candles(200, now_ms - 199 * 60_000)
+        handler._high_water_marks["kline:binance:BTC/USDT:1m"] = window[-2][0]
+        handler.ccxt_manager.fetch_ohlcv_since = AsyncMock(return_value=window[-2:])
+        handler._get_klines_from_database = AsyncMock(return_value=window[:-1])
+        handler.get_klines = AsyncMock()
+
+        merged, source, fetched = await handler.refresh_klines_incremental(
+            "binance", "BTC/USDT", "1m", limit=200
+        )
+
+        handler.ccxt_manager.fetch_ohlcv_since.assert_awaited_once()
+        assert handler.ccxt_manager.fetch_ohlcv_since.await_args.kwargs["since"] == window[-2][0]
+        handler.get_klines.assert_not_awaited()
+        assert fetched == 2
+        assert source == "api"
+        assert len(merged) == 200
+        assert merged[-1][0] == window[-1][0]
+
+        # 交易所没有新数据时，来源为已缓存的数据（上一次刷新写入）
+        handler.ccxt_manager.fetch_ohlcv_since = AsyncMock(return_value=[])
+        merged, source, fetched = await handler.refresh_klines_incremental(
+            "binance", "BTC/USDT", "1m", limit=200
+        )
+        assert (source, fetched, len(merged)) == ("redis", 0, 200)
+
+
+class TestIndicatorBundle:
+    """指标批量计算测试"""
+
+    @pytest.mark.asyncio
+    async def test_bundle_loads_klines_once_and_writes_once(self):
+        """测试一次加载K线、一次数据库事务、一次Redis管道写入"""
+        handler = make_handler()
+        handler.redis.is_connected.return_value = True
+        handler.redis.mget_bytes = AsyncMock(return_value=[None] * 5)
+        handler.redis.set_many = AsyncMock(return_value=True)
+        handler.get_klines = AsyncMock(return_value=(make_candles(200), "redis"))
+
+        indicators, source = await handler.get_indicator_bundle("binance", "BTC/USDT", "1m")
+
+        assert set(indicators) == {"MA", "MACD", "RSI", "BOLL", "VOL"}
+        assert source == "api"
+        handler.get_klines.assert_awaited_once()
+        handler.db.execute.assert_awaited_once()
+        handler.db.commit.assert_awaited_once()
+        handler.redis.set_many.assert_awaited_once()
+        assert len(handler.redis.set_many.await_args.args[0]) == 5
+
+    @pytest.mark.asyncio
+    async def test_single_indicator_stored_with_upsert(self):
+        """测试单个指标与批量路径一样通过一条upsert写入（不先查询）"""
+        from sqlalchemy.sql.dml import Insert
+        handler = make_handler()
+        handler._get_indicator_from_database = AsyncMock(return_value=None)
+        handler.get_klines = AsyncMock(return_value=(make_candles(200), "redis"))
+
+        indicator, source = await handler._load_indicator(
+            "indicator:binance:BTC/USDT:1m:RSI", "binance", "BTC/USDT", "1m", "RSI"
+        )
+
+        assert indicator["indicator_type"] == "RSI"
+        assert source == "api"
+        handler.db.execute.assert_awaited_once()
+        assert isinstance(handler.db.execute.await_args.args[0], Insert)
+        handler.db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_bundle_served_from_redis_when_complete(self):
+        """测试缓存齐全时不重新计算（兼容旧JSON格式缓存）"""
+        import json
+        handler = make_handler()
+        handler.redis.is_connected.return_value = True
+        handler.redis.mget_bytes = AsyncMock(return_value=[
+            json.dumps({"indicator_type": t, "indicator_values": {}}).encode() for t in ["MA", "RSI"]
+        ])
+        handler.get_klines = AsyncMock()
+
+        indicators, source = await handler.get_indicator_bundle(
+            "binance", "BTC/USDT", "1m", indicator_types=["MA", "RSI"]
+        )
+
+        assert source == "redis"
+        assert indicators["RSI"]["values"] == {}
+        handler.get_klines.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_bundle_skips_failing_indicator(self):
+        """测试单个指标计算失败时返回其余指标"""
+        handler = make_handler()
+        handler.get_klines = AsyncMock(return_value=(make_candles(200), "redis"))
+        handler.indicator_backend = "ta"
+        calculate = handler.indicator_calculator.calculate_indicators
+
+        def failing_rsi(ohlcv_data, indicator_types):
+            if "RSI" in indicator_types:
+                raise RuntimeError("bad input")
+            return calculate(ohlcv_data, indicator_types)
+
+        handler.indicator_calculator.calculate_indicators = failing_rsi
+
+        indicators, source = await handler.get_indicator_bundle("binance", "BTC/USDT", "1m")
+
+        assert set(indicators) == {"MA", "MACD", "BOLL", "VOL"}
+        assert source == "api"
+
+    @pytest.mark.asyncio
+    async def test_bundle_with_no_klines_stores_nothing(self):
+        """测试没有K线时不写入空指标"""
+        handler = make_handler()
+        handler.get_klines = AsyncMock(return_value=([], "api"))
+
+        indicators, _ = await handler.get_indicator_bundle("binance", "BTC/USDT", "1m")
+
+        assert indicators == {}
+        handler.db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_bundle_rejects_unknown_type(self):
+        """测试不支持的指标类型"""
+        handler = make_handler()
+
+        with pytest.raises(ValueError):
+            await handler.get_indicator_bundle("binance", "BTC/USDT", "1m", indicator_types=["KDJ"])
+
+
+class TestLocalCacheLayer:
+    """进程内L0缓存测试"""
+
+    @pytest.mark.asyncio
+    async def test_klines_served_from_l0_after_redis_hit(self):
+        """测试Redis命中后再次读取不访问Redis"""
+        handler = make_handler()
+        handler.redis.is_connected.return_value = True
+        handler.redis.get_bytes = AsyncMock(
+            return_value=handler.cache_codec.encode_klines(make_candles(3))
+        )
+
+        first, source = await handler.get_klines("binance", "BTC/USDT", "1m", limit=3)
+        second, _ = await handler.get_klines("binance", "BTC/USDT", "1m", limit=3)
+
+        assert source == "redis"
+        assert first == second == make_candles(3)
+        handler.redis.get_bytes.assert_awaited_once()
+        assert handler.get_cache_stats()["l0"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_store_invalidates_series_indicators(self):
+        """测试写入新K线后该序列的L0指标失效"""
+        handler = make_handler()
+        key = handler._build_indicator_cache_key("binance", "BTC/USDT", "1m", "MA")
+        other = handler._build_indicator_cache_key("binance", "ETH/USDT", "1m", "MA")
+        handler.local_cache.set(key, {"indicator_type": "MA"})
+        handler.local_cache.set(other, {"indicator_type": "MA"})
+
+        await handler.store_klines_bulk("binance", "BTC/USDT", "1m", make_candles(5))
+
+        assert handler.local_cache.get(key) is None
+        assert handler.local_cache.get(other) is not None
+
+    @pytest.mark.asyncio
+    async def test_indicator_l0_returns_copy(self):
+        """测试调用方修改返回的指标不影响L0缓存"""
+        handler = make_handler()
+        key = handler._build_indicator_cache_key("binance", "BTC/USDT", "1m", "RSI")
+        await handler._cache_indicator_to_redis(key, {"indicator_type": "RSI", "timestamp": 1}, "1m")
+
+        data = await handler._get_indicator_from_redis(key)
+        data["timestamp"] = "changed"
+
+        assert (await handler._get_indicator_from_redis(key))["timestamp"] == 1
+
+
+class TestSingleFlight:
+    """缓存未命中请求合并测试"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_fetch_once(self):
+        """测试并发未命中只访问一次数据库和API"""
+        import asyncio
+        handler = make_handler()
+        handler._get_klines_from_database = AsyncMock(return_value=[])
+        handler._store_klines_to_database = AsyncMock()
+
+        async def slow_fetch(**kwargs):
+            await asyncio.sleep(0.01)
+            return make_candles(10)
+
+        handler.ccxt_manager.fetch_ohlcv = AsyncMock(side_effect=slow_fetch)
+
+        results = await asyncio.gather(*[
+            handler.get_klines("binance", "BTC/USDT", "1m", limit=10) for _ in range(5)
+        ])
+
+        assert all(data == make_candles(10) and source == "api" for data, source in results)
+        handler.ccxt_manager.fetch_ohlcv.assert_awaited_once()
+        handler._get_klines_from_database.assert_awaited_once()
+        assert handler._flight_stats["coalesced"] == 4
+        assert handler._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_failure_is_shared_and_not_cached(self):
+        """测试失败结果传递给所有等待者且不被缓存"""
+        import asyncio
+        handler = make_handler()
+        handler._get_klines_from_database = AsyncMock(return_value=[])
+
+        async def failing_fetch(**kwargs):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("exchange down")
+
+        handler.ccxt_manager.fetch_ohlcv = AsyncMock(side_effect=failing_fetch)
+
+        results = await asyncio.gather(*[
+            handler.get_klines("binance", "BTC/USDT", "1m", limit=10) for _ in range(3)
+        ], return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        handler.ccxt_manager.fetch_ohlcv.assert_awaited_once()
+        assert handler._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(self, monkeypatch):
+        """测试过期数据在后台刷新期间继续返回，后台刷新使用新的数据库session"""
+        import asyncio
+        from contextlib import asynccontextmanager
+        handler = make_handler()
+        handler.stale_ttl = 60
+        handler._stale_cache.max_entries = 10
+        handler._stale_cache.set(handler._build_kline_cache_key("binance", "BTC/USDT", "1m"), make_candles(10))
+
+        refresh_session = Mock()
+        sessions = []
+
+        @asynccontextmanager
+        async def session_factory():
+            yield refresh_session
+
+        async def load_klines(self, *args):
+            sessions.append(self.db)
+            return make_candles(10, start_ms=0), "api"
+
+        handler.session_factory = session_factory
+        monkeypatch.setattr(RateLimitHandler, "_load_klines", load_klines)
+
+        data, source = await handler.get_klines("binance", "BTC/USDT", "1m", limit=10)
+        await asyncio.gather(*handler._background_tasks)
+
+        assert data == make_candles(10)
+        assert source == "redis"
+        assert sessions == [refresh_session]
+        assert handler._flight_stats["stale_served"] == 1
@@ -0,0 +1,135 @@
+"""
+信号事件总线单元测试
+SignalEventBus Unit Tests
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from services.signal_event_bus import SignalEventBus, REDIS_CHANNEL
+from app.websocket.monitoring_broadcaster import MonitoringBroadcaster
+
+
+def make_signals(start: int, count: int) -> list:
+    return [{"id": i, "pair": "BTC/USDT", "action": "buy"} for i in range(start, start + count)]
+
+
+class TestSignalEventBus:
+    """信号事件总线测试"""
+
+    @pytest.mark.asyncio
+    async def test_sequence_numbers_and_fan_out(self):
+        """测试每条信号分配连续序号，每个订阅者收到每批一次"""
+        bus = SignalEventBus()
+        first, second = bus.subscribe(), bus.subscribe()
+
+        assert await bus.publish(make_signals(1, 3)) == 3
+        assert await bus.publish(make_signals(4, 2)) == 5
+
+        for queue in (first, second):
+            batches = [queue.get_nowait(), queue.get_nowait()]
+            assert [[s["seq"] for s in batch] for batch in batches] == [[1, 2, 3], [4, 5]]
+            assert queue.empty()
+
+        bus.unsubscribe(second)
+        await bus.publish(make_signals(6, 1))
+        assert second.empty()
+        assert first.get_nowait()[0]["seq"] == 6
+
+    @pytest.mark.asyncio
+    async def test_replay(self):
+        """测试按序号补发，缓冲区不足时标记不完整"""
+        bus = SignalEventBus(buffer_size=5)
+        await bus.publish(make_signals(1, 4))
+
+        events, complete = bus.replay(2)
+        assert [e["seq"] for e in events] == [3, 4]
+        assert complete
+
+        await bus.publish(make_signals(5, 4))  # 缓冲区只保留 4-8
+        events, complete = bus.replay(1)
+        assert [e["seq"] for e in events] == [4, 5, 6, 7, 8]
+        assert not complete
+        assert bus.replay(3)[1]
+
+    @pytest.mark.asyncio
+    async def test_full_subscriber_queue_drops_batch(self):
+        """测试订阅者积压时丢弃批次并计数（客户端据序号缺失补发）"""
+        bus = SignalEventBus(subscriber_queue_size=1)
+        queue = bus.subscribe()
+
+        await bus.publish(make_signals(1, 1))
+        await bus.publish(make_signals(2, 1))
+
+        assert queue.qsize() == 1
+        assert bus.get_stats()["dropped_batches"] == 1
+        assert [e["seq"] for e in bus.replay(1)[0]] == [2]
+
+    @pytest.mark.asyncio
+    async def test_redis_publish_and_listen(self):
+        """测试Redis模式通过脚本分配序号发布，监听到的消息按载荷序号分发"""
+        bus = SignalEventBus()
+        pubsub = MagicMock()
+        pubsub.subscribe = AsyncMock()
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=["epoch1", "41"])
+        redis.pubsub = MagicMock(return_value=pubsub)
+        redis.eval = AsyncMock(return_value=43)
+
+        with patch("asyncio.create_task") as create_task:
+            await bus.start(redis)
+            create_task.call_args.args[0].close()
+        assert bus.backend == "redis"
+        assert bus.last_seq == 41
+        pubsub.subscribe.assert_awaited_once_with(REDIS_CHANNEL)
+
+        queue = bus.subscribe()
+        assert await bus.publish(make_signals(1, 2)) == 43
+        assert queue.empty()  # 由Redis消息统一分发，发布方不直接分发
+        assert json.loads(redis.eval.call_args.args[6]) == make_signals(1, 2)
+
+        bus._dispatch("epoch1", 42, make_signals(1, 2))
+        assert [e["seq"] for e in queue.get_nowait()] == [42, 43]
+
+        # 序号重置（新纪元）时清空旧缓冲区
+        bus._dispatch("epoch2", 1, make_signals(3, 1))
+        assert bus.epoch == "epoch2"
+        assert [e["seq"] for e in bus.replay(0)[0]] == [1]
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_switches_to_local_epoch(self):
+        """测试Redis发布失败时改用本地纪元重新编号（不与其他worker的共享序号冲突）"""
+        bus = SignalEventBus()
+        bus._redis = MagicMock()
+        bus._redis.eval = AsyncMock(side_effect=ConnectionError("redis down"))
+        bus._dispatch("shared", 41, make_signals(1, 2))
+        queue = bus.subscribe()
+
+        assert await bus.publish(make_signals(3, 2)) == 2
+        local_epoch = bus.epoch
+        assert local_epoch != "shared"
+        assert [e["seq"] for e in queue.get_nowait()] == [1, 2]
+        assert [e["seq"] for e in bus.replay(0)[0]] == [1, 2]
+
+        # 连续失败时在同一本地纪元内继续编号
+        assert await bus.publish(make_signals(5, 1)) == 3
+        assert bus.epoch == local_epoch
+
+        # Redis恢复后按共享纪元分发，下一次失败开启新的本地纪元
+        bus._dispatch("shared", 44, make_signals(6, 1))
+        assert bus.epoch == "shared"
+        await bus.publish(make_signals(7, 1))
+        assert bus.epoch not in ("shared", local_epoch)
+        assert bus.last_seq == 1
+
+    def test_signals_message(self):
+        """测试推送消息携带纪元和序号范围"""
+        events = [dict(s, seq=10 + i) for i, s in enumerate(make_signals(1, 3))]
+        message = MonitoringBroadcaster.build_signals_message(events, replay=True, complete=False)
+
+        assert message["topic"] == "signals"
+        assert message["data"]["first_seq"] == 10
+        assert message["data"]["last_seq"] == 12
+        assert message["data"]["count"] == 3
+        assert message["data"]["replay"] is True
+        assert message["data"]["complete"] is False
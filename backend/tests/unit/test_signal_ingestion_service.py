@@ -0,0 +1,194 @@
+"""
+信号写入管道单元测试
+SignalIngestionService Unit Tests
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from models.signal import Signal
+from models.signal_rollup import SignalRollup
+from services.signal_ingestion_service import SignalIngestionService
+
+
+@pytest.fixture
+async def session_factory():
+    """基于内存SQLite的会话工厂"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Signal.__table__.create)
+        await conn.run_sync(SignalRollup.__table__.create)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+def make_signal(i: int) -> dict:
+    return {
+        "strategy_id": 1,
+        "pair": "BTC/USDT",
+        "action": "buy" if i % 2 else "sell",
+        "signal_strength": 0.9,
+        "strength_level": "strong",
+        "current_rate": 100.0 + i,
+        "signal_metadata": {"seq": i}
+    }
+
+
+class TestSignalIngestion:
+    """写后批量入库测试"""
+
+    @pytest.mark.asyncio
+    async def test_signals_are_batched_and_pushed(self, session_factory):
+        """测试信号按批写入并一次推送整批"""
+        service = SignalIngestionService(session_factory, max_batch_size=50, flush_interval_ms=20)
+
+        with patch("services.signal_ingestion_service.signal_event_bus.publish", new=AsyncMock()) as push:
+            await service.start()
+            for i in range(120):
+                assert service.submit(make_signal(i), "Test")
+            await service.stop()
+
+        async with session_factory() as session:
+            count = await session.scalar(select(func.count()).select_from(Signal))
+            rates = (await session.execute(select(Signal.current_rate).order_by(Signal.id))).scalars().all()
+
+        stats = service.get_stats()
+        assert count == 120
+        assert rates == [100.0 + i for i in range(120)]
+        assert stats["flushes"] == 3
+        assert stats["rows_per_flush"] == 40.0
+        assert stats["queue_depth"] == 0
+        pushed = [s for call in push.await_args_list for s in call.args[0]]
+        assert [s["current_rate"] for s in pushed] == rates
+        assert all(s["id"] and s["strategy_name"] == "Test" for s in pushed)
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects(self, session_factory):
+        """测试队列满时拒绝新信号（背压）"""
+        service = SignalIngestionService(session_factory, max_queue_size=2)
+
+        assert service.submit(make_signal(0))
+        assert service.submit(make_signal(1))
+        assert not service.submit(make_signal(2))
+        assert service.get_stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_failure_is_counted(self):
+        """测试写库失败时记录失败行数且批处理继续运行"""
+        def broken_factory():
+            raise RuntimeError("database down")
+
+        service = SignalIngestionService(broken_factory, flush_interval_ms=10)
+        await service.start()
+        service.submit(make_signal(0))
+        await asyncio.sleep(0.05)
+        assert service.is_running
+        await service.stop()
+
+        assert service.get_stats()["failed_rows"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batcher_survives_unexpected_errors(self, session_factory):
+        """测试某一批处理出现意外异常（如推送失败）后批处理任务继续运行"""
+        service = SignalIngestionService(session_factory, flush_interval_ms=10)
+        publish = AsyncMock(side_effect=[RuntimeError("bus down"), None])
+
+        with patch("services.signal_ingestion_service.signal_event_bus.publish", new=publish):
+            await service.start()
+            service.submit(make_signal(0))
+            await asyncio.sleep(0.1)
+            service.submit(make_signal(1))
+            await asyncio.sleep(0.1)
+            assert not service._task.done()
+            await service.stop()
+
+        assert publish.await_count == 2
+        assert service.get_stats()["flushed_rows"] == 2
+
+    @pytest.mark.asyncio
+    async def test_bad_row_only_drops_itself(self, session_factory):
+        """测试批量写入失败时逐行写入，只丢弃坏行"""
+        service = SignalIngestionService(session_factory, max_batch_size=10, flush_interval_ms=10)
+        bad = dict(make_signal(5), pair=None)
+
+        with patch("services.signal_ingestion_service.signal_event_bus.publish", new=AsyncMock()) as push:
+            await service._flush([(make_signal(i) if i != 5 else bad, "Test", 0.0) for i in range(10)])
+
+        async with session_factory() as session:
+            rates = (await session.execute(select(Signal.current_rate).order_by(Signal.id))).scalars().all()
+
+        stats = service.get_stats()
+        assert rates == [100.0 + i for i in range(10) if i != 5]
+        assert (stats["failed_rows"], stats["flushed_rows"], stats["row_fallbacks"]) == (1, 9, 1)
+        assert service.dead_letters[0]["values"]["current_rate"] == 105.0
+        assert [s["current_rate"] for s in push.await_args.args[0]] == rates
+
+    @pytest.mark.asyncio
+    async def test_transient_error_is_retried(self, session_factory, monkeypatch):
+        """测试瞬时数据库错误时重试整批"""
+        from sqlalchemy.exc import OperationalError
+        monkeypatch.setattr("services.signal_ingestion_service.RETRY_DELAY", 0.001)
+        failures = [OperationalError("INSERT", {}, Exception("connection reset"))]
+
+        def flaky_factory():
+            if failures:
+                raise failures.pop()
+            return session_factory()
+
+        service = SignalIngestionService(flaky_factory)
+        with patch("services.signal_ingestion_service.signal_event_bus.publish", new=AsyncMock()):
+            await service._flush([(make_signal(i), "Test", 0.0) for i in range(3)])
+
+        stats = service.get_stats()
+        assert (stats["retries"], stats["flushed_rows"], stats["failed_rows"], stats["row_fallbacks"]) == (1, 3, 0, 0)
+
+    @pytest.mark.asyncio
+    async def test_outage_keeps_batch_while_running(self, session_factory, monkeypatch):
+        """测试数据库持续不可用时运行中的批处理一直重试，不逐行拆分也不丢弃"""
+        from sqlalchemy.exc import OperationalError
+        monkeypatch.setattr("services.signal_ingestion_service.RETRY_DELAY", 0.001)
+        failures = [OperationalError("INSERT", {}, Exception("connection refused")) for _ in range(6)]
+
+        def outage_factory():
+            if failures:
+                raise failures.pop()
+            return session_factory()
+
+        service = SignalIngestionService(outage_factory, max_retries=2)
+        service.is_running = True
+        with patch("services.signal_ingestion_service.signal_event_bus.publish", new=AsyncMock()):
+            await service._flush([(make_signal(i), "Test", 0.0) for i in range(3)])
+
+        stats = service.get_stats()
+        assert (stats["retries"], stats["flushed_rows"], stats["failed_rows"], stats["row_fallbacks"]) == (6, 3, 0, 0)
+        assert not service.dead_letters
+
+
+class TestWebhookValidation:
+    """Webhook信号入队前校验测试"""
+
+    def test_rejects_missing_required_fields(self):
+        """测试缺少pair/current_rate或格式错误时拒绝"""
+        from api.v1.signals import _parse_signal_strength, _validate_signal_data
+
+        valid = {"pair": "BTC/USDT", "action": "buy", "current_rate": 45000.0, "open_date": "2025-01-01T00:00:00"}
+        _validate_signal_data(valid)
+        _validate_signal_data(dict(valid, current_rate="45000.5"))
+        assert _parse_signal_strength({"indicators": {"signal_strength": "0.9"}}) == 0.9
+        assert _parse_signal_strength({}) == 0.5
+
+        for invalid in (
+            dict(valid, pair=None),
+            dict(valid, pair="X" * 21),
+            {k: v for k, v in valid.items() if k != "current_rate"},
+            dict(valid, current_rate="n/a"),
+            dict(valid, open_date="yesterday"),
+        ):
+            with pytest.raises(ValueError):
+                _validate_signal_data(invalid)
+        with pytest.raises(ValueError):
+            _parse_signal_strength(None)
+        with pytest.raises(ValueError):
+            _parse_signal_strength({"indicators": {"signal_strength": "strong"}})
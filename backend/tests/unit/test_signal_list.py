@@ -0,0 +1,104 @@
+"""
+信号列表分页单元测试
+Signal List Keyset Pagination Unit Tests
+"""
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from config import settings
+from models.signal import Signal
+from api.v1.signals import list_signals
+
+
+@pytest.fixture
+async def db():
+    """内存SQLite会话，预置25条信号（部分信号创建时间相同）"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Signal.__table__.create)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    base = datetime.now() - timedelta(hours=1)
+    async with session_factory() as session:
+        for i in range(25):
+            session.add(Signal(
+                strategy_id=1 + i % 2, pair="BTC/USDT", action="buy", strength_level="strong",
+                signal_strength=0.9, current_rate=1.0, indicators={"rsi": 30},
+                # 每3条共用一个时间戳，验证 id 作为次级排序键
+                created_at=base + timedelta(seconds=i // 3)
+            ))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+async def fetch(db, **kwargs):
+    params = dict(skip=0, limit=10, cursor=None, total_mode="estimate", strategy_id=None,
+                  pair=None, action=None, strength_level=None, hours=None)
+    params.update(kwargs)
+    return await list_signals(db=db, **params)
+
+
+class TestSignalList:
+    """信号列表分页测试"""
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_cover_all_rows_once(self, db):
+        """测试游标翻页不重复、不遗漏，顺序为 (created_at, id) 倒序"""
+        ids, cursor, pages = [], None, 0
+        while True:
+            page = await fetch(db, cursor=cursor)
+            ids.extend(s["id"] for s in page["signals"])
+            pages += 1
+            if not page["has_more"]:
+                assert page["next_cursor"] is None
+                break
+            cursor = page["next_cursor"]
+
+        assert pages == 3
+        assert ids == list(range(25, 0, -1))
+
+    @pytest.mark.asyncio
+    async def test_cursor_matches_offset(self, db):
+        """测试游标分页与偏移分页结果一致"""
+        first = await fetch(db, limit=7)
+        by_cursor = await fetch(db, limit=7, cursor=first["next_cursor"])
+        by_offset = await fetch(db, limit=7, skip=7)
+        assert [s["id"] for s in by_cursor["signals"]] == [s["id"] for s in by_offset["signals"]]
+
+    @pytest.mark.asyncio
+    async def test_cursor_with_filter(self, db):
+        """测试游标分页叠加过滤条件"""
+        first = await fetch(db, strategy_id=2, limit=5, total_mode="exact")
+        second = await fetch(db, strategy_id=2, limit=5, cursor=first["next_cursor"])
+        ids = [s["id"] for s in first["signals"] + second["signals"]]
+        assert ids == list(range(24, 0, -2))[:10]
+        assert first["total"] == 12
+        assert first["total_is_estimate"] is False
+
+    @pytest.mark.asyncio
+    async def test_total_modes(self, db, monkeypatch):
+        """测试总数统计模式：精确、估算（上限截断）、不统计"""
+        assert (await fetch(db, total_mode="exact"))["total"] == 25
+        assert (await fetch(db, total_mode="none"))["total"] is None
+
+        estimate = await fetch(db)
+        assert estimate["total"] == 25
+        assert estimate["total_is_estimate"] is False
+
+        monkeypatch.setattr(settings, "SIGNAL_LIST_COUNT_CAP", 10)
+        capped = await fetch(db)
+        assert capped["total"] == 10
+        assert capped["total_is_estimate"] is True
+
+    @pytest.mark.asyncio
+    async def test_invalid_parameters(self, db):
+        """测试非法游标和统计模式返回400"""
+        with pytest.raises(HTTPException) as exc_info:
+            await fetch(db, cursor="not-a-cursor")
+        assert exc_info.value.status_code == 400
+
+        with pytest.raises(HTTPException) as exc_info:
+            await fetch(db, total_mode="all")
+        assert exc_info.value.status_code == 400
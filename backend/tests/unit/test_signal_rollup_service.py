@@ -0,0 +1,123 @@
+"""
+信号汇总表单元测试
+SignalRollupService Unit Tests
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from models.signal import Signal
+from models.signal_rollup import SignalRollup, SignalRollupCoverage
+from services.signal_rollup_service import SignalRollupService, truncate_time, ceil_time
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Signal.__table__.create)
+        await conn.run_sync(SignalRollup.__table__.create)
+        await conn.run_sync(SignalRollupCoverage.__table__.create)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
+
+
+async def insert_signals(db, service, base: datetime, count: int):
+    """插入信号并增量维护汇总表"""
+    values = []
+    for i in range(count):
+        value = {
+            "strategy_id": i % 3, "pair": "BTC/USDT" if i % 2 else "ETH/USDT",
+            "action": "buy", "strength_level": "strong" if i % 4 else "weak",
+            "signal_strength": 0.5 + i / 1000, "current_rate": 1.0,
+            "created_at": base + timedelta(seconds=37 * i)
+        }
+        db.add(Signal(**value))
+        values.append(value)
+    await service.apply(db, values)
+    await db.commit()
+
+
+class TestSignalRollupService:
+    """汇总表维护测试"""
+
+    def test_time_helpers(self):
+        """测试时间桶取整"""
+        ts = datetime(2025, 1, 1, 10, 17, 42, 5)
+        assert truncate_time(ts, "minute") == datetime(2025, 1, 1, 10, 17)
+        assert truncate_time(ts, "hour") == datetime(2025, 1, 1, 10)
+        assert ceil_time(ts, "hour") == datetime(2025, 1, 1, 11)
+        assert ceil_time(datetime(2025, 1, 1, 11), "hour") == datetime(2025, 1, 1, 11)
+
+    def test_aware_times_bucketed_in_utc(self):
+        """测试带时区的时间按UTC取整（与回填的SQL取整一致）"""
+        ist = timezone(timedelta(hours=5, minutes=30))
+        ts = datetime(2025, 1, 1, 10, 17, 42, tzinfo=ist)
+        assert truncate_time(ts, "hour") == datetime(2025, 1, 1, 4, 0, tzinfo=timezone.utc)
+        assert truncate_time(ts, "hour").tzinfo == timezone.utc
+        assert ceil_time(ts, "hour") == datetime(2025, 1, 1, 5, 0, tzinfo=timezone.utc)
+
+    def test_build_rollup_rows(self):
+        """测试同一时间桶同一维度合并计数"""
+        service = SignalRollupService()
+        base = {"strategy_id": 1, "pair": "BTC/USDT", "action": "buy", "strength_level": "strong"}
+        rows = service.build_rollup_rows([
+            dict(base, signal_strength=0.8, created_at=datetime(2025, 1, 1, 10, 0, 5)),
+            dict(base, signal_strength=0.9, created_at=datetime(2025, 1, 1, 10, 0, 50)),
+            dict(base, signal_strength=0.7, created_at=datetime(2025, 1, 1, 10, 1, 0)),
+        ])
+
+        minute = [r for r in rows if r["granularity"] == "minute"]
+        hour = [r for r in rows if r["granularity"] == "hour"]
+        assert [r["signal_count"] for r in minute] == [2, 1]
+        assert hour[0]["signal_count"] == 3
+        assert hour[0]["strength_sum"] == pytest.approx(2.4)
+
+    @pytest.mark.asyncio
+    async def test_incremental_matches_raw(self, db):
+        """测试增量维护（含重复写入同一时间桶）与原始表一致"""
+        service = SignalRollupService()
+        base = datetime(2025, 1, 1, 10, 0, 0)
+        await insert_signals(db, service, base, 100)
+        await insert_signals(db, service, base + timedelta(minutes=5), 100)
+
+        for granularity in ("minute", "hour"):
+            report = await service.check_consistency(db, base, base + timedelta(hours=3), granularity)
+            assert report["consistent"], report["mismatches"]
+            assert report["checked_buckets"] > 0
+
+    @pytest.mark.asyncio
+    async def test_checker_detects_drift_and_backfill_repairs(self, db):
+        """测试一致性检查发现偏差，回填后恢复一致"""
+        service = SignalRollupService()
+        base = datetime(2025, 1, 1, 10, 0, 0)
+        await insert_signals(db, service, base, 50)
+
+        await db.execute(update(SignalRollup).values(signal_count=SignalRollup.signal_count + 1))
+        await db.commit()
+        report = await service.check_consistency(db, base, base + timedelta(hours=1), "minute")
+        assert not report["consistent"]
+
+        written = await service.backfill(db, base, base + timedelta(hours=1))
+        assert written["hour"] > 0
+        for granularity in ("minute", "hour"):
+            report = await service.check_consistency(db, base, base + timedelta(hours=1), granularity)
+            assert report["consistent"], report["mismatches"]
+
+    @pytest.mark.asyncio
+    async def test_backfill_extends_coverage(self, db):
+        """测试回填到覆盖起点时，覆盖起点前移到回填起点；不相接的回填不改变覆盖起点"""
+        service = SignalRollupService()
+        assert await service.get_coverage(db) is None
+        covered_from = await service.ensure_coverage(db)
+        assert covered_from == ceil_time(datetime.now(timezone.utc), "hour")
+        assert await service.ensure_coverage(db) == covered_from
+
+        await service.backfill(db, covered_from - timedelta(hours=10), covered_from - timedelta(hours=5))
+        assert await service.get_coverage(db) == covered_from
+
+        await service.backfill(db, covered_from - timedelta(hours=5, minutes=30), covered_from)
+        assert await service.get_coverage(db) == covered_from - timedelta(hours=6)
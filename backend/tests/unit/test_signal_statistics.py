@@ -0,0 +1,137 @@
+"""
+信号统计接口单元测试
+Signal Statistics Endpoint Unit Tests
+"""
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from models.signal import Signal
+from config import settings
+from models.signal_rollup import SignalRollup, SignalRollupCoverage
+from services.data_retention_service import DataRetentionService, RETENTION_TABLES
+from services.signal_rollup_service import signal_rollup_service
+from api.v1.signals import get_signals_statistics, get_signals_trend
+
+
+@pytest.fixture
+async def db():
+    """内存SQLite会话，预置不同时间、货币对、策略的信号"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Signal.__table__.create)
+        await conn.run_sync(SignalRollup.__table__.create)
+        await conn.run_sync(SignalRollupCoverage.__table__.create)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    now = datetime.now()
+    samples = [
+        # (分钟前, 策略, 货币对, 动作, 强度等级, 强度)
+        (10, 1, "BTC/USDT", "buy", "strong", 0.9),
+        (20, 1, "BTC/USDT", "sell", "medium", 0.7),
+        (30, 2, "ETH/USDT", "buy", "weak", 0.5),
+        (150, 2, "BTC/USDT", "buy", "strong", 0.8),
+        (200, 1, "ETH/USDT", "hold", "ignore", 0.1),
+        (60 * 30, 1, "BTC/USDT", "buy", "strong", 0.9),  # 超出24小时窗口
+    ]
+    async with session_factory() as session:
+        for minutes, strategy_id, pair, action, level, strength in samples:
+            session.add(Signal(
+                strategy_id=strategy_id, pair=pair, action=action, strength_level=level,
+                signal_strength=strength, current_rate=1.0,
+                created_at=now - timedelta(minutes=minutes)
+            ))
+        await session.commit()
+        await signal_rollup_service.ensure_coverage(session)
+        await signal_rollup_service.backfill(session, now - timedelta(days=2), now)
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture(params=[True, False], ids=["rollups", "raw"])
+def use_rollups(request):
+    """汇总表与原始表两种读取方式结果应一致"""
+    return request.param
+
+
+class TestSignalStatistics:
+    """SQL聚合统计测试"""
+
+    @pytest.mark.asyncio
+    async def test_summary(self, db, use_rollups):
+        """测试汇总统计"""
+        stats = await get_signals_statistics(strategy_id=None, hours=24, use_rollups=use_rollups, db=db)
+
+        assert stats["total_signals"] == 5
+        assert stats["buy_signals"] == 3
+        assert stats["sell_signals"] == 1
+        assert (stats["strong_signals"], stats["medium_signals"], stats["weak_signals"]) == (2, 1, 1)
+        assert stats["average_strength"] == 0.6
+
+    @pytest.mark.asyncio
+    async def test_summary_empty_window(self, db, use_rollups):
+        """测试无信号时返回0"""
+        stats = await get_signals_statistics(strategy_id=99, hours=24, use_rollups=use_rollups, db=db)
+
+        assert stats["total_signals"] == 0
+        assert stats["average_strength"] == 0
+
+    @pytest.mark.asyncio
+    async def test_trend_buckets(self, db, use_rollups):
+        """测试按小时分桶，空桶补0"""
+        trend = await get_signals_trend(hours=24, group_by="all", strategy_id=None, max_series=20, use_rollups=use_rollups, db=db)
+
+        points = trend["data_points"]
+        assert len(points) == 25
+        assert sum(p["total_signals"] for p in points) == 5
+        assert sum(p["strong_signals"] for p in points) == 2
+        assert points[-2]["total_signals"] == 3
+        assert "series" not in trend
+
+    @pytest.mark.asyncio
+    async def test_trend_group_by_pair(self, db, use_rollups):
+        """测试按货币对拆分序列"""
+        trend = await get_signals_trend(hours=24, group_by="pair", strategy_id=None, max_series=20, use_rollups=use_rollups, db=db)
+
+        series = {s["key"]: s["data_points"] for s in trend["series"]}
+        assert list(series) == ["BTC/USDT", "ETH/USDT"]
+        assert sum(p["total_signals"] for p in series["BTC/USDT"]) == 3
+        assert sum(p["weak_signals"] for p in series["ETH/USDT"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_trend_group_by_strategy(self, db, use_rollups):
+        """测试按策略拆分序列"""
+        trend = await get_signals_trend(hours=24, group_by="strategy", strategy_id=None, max_series=1, use_rollups=use_rollups, db=db)
+
+        assert trend["total_series"] == 2
+        assert len(trend["series"]) == 1
+        assert trend["series"][0]["key"] == 1
+
+    @pytest.mark.asyncio
+    async def test_history_before_coverage_read_from_raw(self, db):
+        """测试未回填的历史（覆盖起点之前）读取原始信号，结果与原始表一致"""
+        await db.execute(delete(SignalRollup))
+        await signal_rollup_service.reset_coverage(db)
+        covered_from = await signal_rollup_service.ensure_coverage(db)
+        assert covered_from > datetime.now().astimezone()
+
+        stats = await get_signals_statistics(strategy_id=None, hours=24, use_rollups=True, db=db)
+        assert stats["total_signals"] == 5
+        assert stats["average_strength"] == 0.6
+
+        trend = await get_signals_trend(hours=72, group_by="pair", strategy_id=None, max_series=20, use_rollups=True, db=db)
+        assert sum(p["total_signals"] for p in trend["data_points"]) == 6
+        assert {s["key"] for s in trend["series"]} == {"BTC/USDT", "ETH/USDT"}
+
+    @pytest.mark.asyncio
+    async def test_pruned_rollups_read_from_raw(self, db, monkeypatch):
+        """测试汇总表超出保留天数被清理后，更早的时间段读取原始信号"""
+        monkeypatch.setattr(settings, "SIGNAL_ROLLUP_RETENTION_DAYS", 1)
+        retention = DataRetentionService({"signal_rollups": RETENTION_TABLES["signal_rollups"]})
+        result = await retention.run_once(db)
+        assert result["signal_rollups"]["deleted"] > 0
+
+        trend = await get_signals_trend(hours=72, group_by="all", strategy_id=None, max_series=20, use_rollups=True, db=db)
+        assert sum(p["total_signals"] for p in trend["data_points"]) == 6
+        stats = await get_signals_statistics(strategy_id=None, hours=48, use_rollups=True, db=db)
+        assert stats["total_signals"] == 6
@@ -0,0 +1,69 @@
+"""
+策略元数据缓存单元测试
+StrategyMetadataCache Unit Tests
+"""
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from models.strategy import Strategy
+from services.strategy_metadata_cache import StrategyMetadataCache
+
+
+@pytest.fixture
+async def db():
+    """内存SQLite会话，预置两个策略"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Strategy.__table__.create)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        for i in (1, 2):
+            session.add(Strategy(
+                id=i, user_id=1, name=f"S{i}", strategy_class="Demo", exchange="binance",
+                timeframe="1h", pair_whitelist=["BTC/USDT"], signal_thresholds={"strong": 0.9}
+            ))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+class TestStrategyMetadataCache:
+    """策略元数据缓存测试"""
+
+    @pytest.mark.asyncio
+    async def test_hits_after_load_need_no_queries(self, db):
+        """测试全量加载后命中不访问数据库"""
+        cache = StrategyMetadataCache()
+        assert await cache.load_all(db) == 2
+
+        await db.close()
+        entry = await cache.get(2, None)
+
+        assert entry["name"] == "S2"
+        assert entry["signal_thresholds"] == {"strong": 0.9}
+        assert cache.get_stats()["hit_rate"] == 100.0
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads_row(self, db):
+        """测试失效后重新加载最新数据"""
+        cache = StrategyMetadataCache()
+        await cache.load_all(db)
+
+        strategy = await db.get(Strategy, 1)
+        strategy.signal_thresholds = {"strong": 0.7}
+        await db.commit()
+        cache.invalidate(1)
+
+        entry = await cache.get(1, db)
+        stats = cache.get_stats()
+        assert entry["signal_thresholds"] == {"strong": 0.7}
+        assert stats["misses"] == 1
+        assert stats["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_strategy(self, db):
+        """测试不存在的策略返回None且不缓存"""
+        cache = StrategyMetadataCache()
+
+        assert await cache.get(99, db) is None
+        assert cache.get_stats()["entries"] == 0
@@ -0,0 +1,191 @@
+"""
+批量策略编排单元测试
+StrategyBulkOrchestrator Unit Tests
+"""
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from config import settings
+from models.strategy import Strategy
+from core import strategy_orchestrator
+from core.strategy_orchestrator import StrategyBulkOrchestrator, interleave_by_exchange
+from core.freqtrade_manager import FreqTradeGatewayManager
+from core.process_supervisor import ProcessExitWatcher
+
+
+@pytest.fixture(autouse=True)
+def fast_waves(monkeypatch):
+    """不分波等待、不检查资源余量"""
+    monkeypatch.setattr(settings, "STRATEGY_START_WAVE_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(StrategyBulkOrchestrator, "RETRY_DELAY", 0)
+    monkeypatch.setattr(StrategyBulkOrchestrator, "_wait_for_headroom", AsyncMock())
+
+
+def make_items(count: int, exchanges=("binance",)):
+    return [
+        {"id": i, "name": f"strategy_{i}", "exchange": exchanges[i % len(exchanges)]}
+        for i in range(1, count + 1)
+    ]
+
+
+class ConcurrencyProbe:
+    """记录同时执行的最大数量"""
+
+    def __init__(self, delay: float = 0.01, fail_ids=()):
+        self.delay = delay
+        self.fail_ids = set(fail_ids)
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+
+    async def __call__(self, item):
+        self.calls.append(item["id"])
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        if item["id"] in self.fail_ids:
+            raise RuntimeError("API not ready")
+        return True
+
+
+class TestStrategyBulkOrchestrator:
+    """有界并发、分波启动与结果汇总测试"""
+
+    def test_interleave_by_exchange(self):
+        """测试按交易所轮流排列"""
+        items = make_items(3, ("binance",)) + [
+            {"id": 10, "exchange": "okx"}, {"id": 11, "exchange": "okx"}, {"id": 20, "exchange": "bybit"}
+        ]
+        ordered = [item["id"] for item in interleave_by_exchange(items)]
+        assert ordered == [1, 10, 20, 2, 11, 3]
+
+    def test_concurrency_limited_by_memory(self, monkeypatch):
+        """测试并发数取上限、CPU、可用内存的最小值"""
+        monkeypatch.setattr(strategy_orchestrator.psutil, "cpu_count", lambda: 64)
+        memory = type("Memory", (), {"available": 900 * 1024 * 1024})()
+        monkeypatch.setattr(strategy_orchestrator.psutil, "virtual_memory", lambda: memory)
+
+        assert StrategyBulkOrchestrator().compute_concurrency() == 900 // settings.STRATEGY_START_MEMORY_MB
+
+        memory.available = 0
+        assert StrategyBulkOrchestrator().compute_concurrency() == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """测试同时执行的操作数不超过并发上限"""
+        probe = ConcurrencyProbe()
+        summary = await StrategyBulkOrchestrator().run("start", make_items(20), probe, concurrency=4)
+
+        assert probe.peak == 4
+        assert summary["succeeded"] == 20
+        assert summary["completed"] == summary["total"] == 20
+
+    @pytest.mark.asyncio
+    async def test_retries_and_summary(self):
+        """测试失败重试与每个策略的结果"""
+        probe = ConcurrencyProbe(delay=0, fail_ids={2})
+        summary = await StrategyBulkOrchestrator().run("start", make_items(3), probe, max_retries=3, concurrency=2)
+
+        assert probe.calls.count(2) == 3
+        assert (summary["succeeded"], summary["failed"]) == (2, 1)
+        failed = summary["results"][1]
+        assert (failed["strategy_id"], failed["status"], failed["attempts"]) == (2, "failed", 3)
+        assert summary["failure_reasons"] == {"API not ready": 1}
+
+    @pytest.mark.asyncio
+    async def test_progress_reported_and_operation_kept(self):
+        """测试进度回调与后台提交的操作可查询"""
+        progress = []
+
+        async def callback(data):
+            progress.append(data)
+
+        orchestrator = StrategyBulkOrchestrator(progress_callback=callback)
+        operation_id = orchestrator.submit("stop", make_items(5), ConcurrencyProbe(delay=0), stagger=False)
+        assert orchestrator.get_operation(operation_id)["state"] == "running"
+
+        await asyncio.gather(*orchestrator._tasks)
+
+        assert progress[-1]["state"] == "completed"
+        assert progress[-1]["completed"] == 5
+        assert "results" not in progress[-1]
+        assert len(orchestrator.get_operation(operation_id)["results"]) == 5
+
+
+class TestParallelRecovery:
+    """策略恢复并发测试"""
+
+    @pytest.fixture
+    async def session_factory(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Strategy.__table__.create)
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as session:
+            for i in range(1, 13):
+                session.add(Strategy(
+                    id=i, user_id=1, name=f"strategy_{i}", strategy_class="Sample",
+                    exchange=("binance", "okx")[i % 2], timeframe="1h",
+                    pair_whitelist=["BTC/USDT"], signal_thresholds={}, status="running"
+                ))
+            await session.commit()
+        yield factory
+        await engine.dispose()
+
+    @pytest.fixture
+    def manager(self, monkeypatch, session_factory):
+        def patched_init(self):
+            self.strategy_processes = {}
+            self.strategy_ports = {}
+            self.orchestrator = StrategyBulkOrchestrator()
+            self.exit_watcher = ProcessExitWatcher()
+
+        monkeypatch.setattr(FreqTradeGatewayManager, "__init__", patched_init)
+        monkeypatch.setattr("database.session.SessionLocal", session_factory)
+        manager = FreqTradeGatewayManager()
+        return manager
+
+    async def _recover(self, manager, session_factory, concurrency, fail_ids=()):
+        starts = []
+
+        async def fake_create(strategy_config, db=None):
+            starts.append(strategy_config["id"])
+            await asyncio.sleep(0.05)  # 等待API就绪
+            return strategy_config["id"] not in fail_ids
+
+        manager.create_strategy = fake_create
+        with patch.object(settings, "STRATEGY_BULK_MAX_CONCURRENCY", concurrency), \
+                patch.object(settings, "STRATEGY_BULK_STARTS_PER_CPU", concurrency), \
+                patch.object(settings, "STRATEGY_START_MEMORY_MB", 1):
+            async with session_factory() as db:
+                started = time.monotonic()
+                results = await manager.recover_running_strategies(db, max_retries=2)
+                return results, time.monotonic() - started, starts
+
+    @pytest.mark.asyncio
+    async def test_recovery_time_scales_with_concurrency(self, manager, session_factory):
+        """测试恢复耗时随并发数下降"""
+        _, sequential, _ = await self._recover(manager, session_factory, concurrency=1)
+        results, parallel, _ = await self._recover(manager, session_factory, concurrency=6)
+
+        assert results["recovered"] == 12
+        assert parallel * 3 < sequential
+
+    @pytest.mark.asyncio
+    async def test_failed_strategies_reset_to_stopped(self, manager, session_factory):
+        """测试恢复失败的策略重置为stopped，结果格式保持兼容"""
+        results, _, starts = await self._recover(manager, session_factory, concurrency=4, fail_ids={3, 7})
+
+        assert (results["total_found"], results["recovered"], results["failed"], results["reset"]) == (12, 10, 2, 2)
+        assert starts.count(3) == 2
+        failed = [d for d in results["details"] if d["status"] == "failed_and_reset"]
+        assert sorted(d["strategy_id"] for d in failed) == [3, 7]
+
+        async with session_factory() as db:
+            stopped = (await db.execute(select(Strategy.id).where(Strategy.status == "stopped"))).scalars().all()
+        assert sorted(stopped) == [3, 7]
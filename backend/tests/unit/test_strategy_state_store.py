@@ -0,0 +1,141 @@
+"""
+策略状态表单元测试
+StrategyStateStore Unit Tests
+"""
+import pytest
+from sqlalchemy import update, delete, select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from models.strategy import Strategy
+from services.strategy_state_store import StrategyStateStore
+from app.websocket.monitoring_broadcaster import MonitoringBroadcaster
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Strategy.__table__.create)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        for i in range(1, 6):
+            session.add(Strategy(
+                id=i, user_id=1, name=f"strategy_{i}", strategy_class="Sample", exchange="binance",
+                timeframe="1h", pair_whitelist=["BTC/USDT"], signal_thresholds={},
+                status="running" if i <= 2 else "stopped"
+            ))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+class CountingSession:
+    """记录执行的查询次数"""
+
+    def __init__(self, session):
+        self.session = session
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return await self.session.execute(statement)
+
+
+class TestStrategyStateStore:
+    """策略状态快照与增量测试"""
+
+    @pytest.mark.asyncio
+    async def test_initial_load_and_snapshot(self, db):
+        """测试首次加载生成快照"""
+        store = StrategyStateStore()
+        delta = await store.refresh(db, {1: {"is_alive": True}})
+
+        assert store.version == 1
+        assert len(delta["changed"]) == 5
+        snapshot = store.snapshot()
+        assert snapshot["kind"] == "snapshot"
+        assert [s["id"] for s in snapshot["strategies"]] == [1, 2, 3, 4, 5]
+        assert snapshot["strategies"][0]["metrics"] == {"is_alive": True}
+        assert (snapshot["total"], snapshot["running"], snapshot["stopped"]) == (5, 2, 3)
+
+    @pytest.mark.asyncio
+    async def test_unchanged_tick_sends_nothing_and_skips_db(self, db):
+        """测试无变化时不产生增量，也不查询数据库"""
+        store = StrategyStateStore()
+        await store.refresh(db, {})
+
+        counting = CountingSession(db)
+        assert await store.refresh(counting, {}) is None
+        assert counting.queries == 0
+        assert store.version == 1
+
+    @pytest.mark.asyncio
+    async def test_delta_contains_only_changed_strategies(self, db):
+        """测试增量只包含状态或指标变化的策略"""
+        store = StrategyStateStore()
+        await store.refresh(db, {})
+
+        await db.execute(update(Strategy).where(Strategy.id == 3).values(status="running"))
+        await db.execute(update(Strategy).where(Strategy.id == 4).values(status="error"))
+        await db.commit()
+        store.mark_dirty(3)
+
+        counting = CountingSession(db)
+        delta = await store.refresh(counting, {2: {"signals_last_hour": 7}})
+
+        assert counting.queries == 1
+        assert delta["kind"] == "delta"
+        assert (delta["base_version"], delta["version"]) == (1, 2)
+        # 策略4未标记变更，等待下一次全量加载
+        assert sorted(s["id"] for s in delta["changed"]) == [2, 3]
+        assert delta["running"] == 3
+        assert store.snapshot()["version"] == 2
+
+    @pytest.mark.asyncio
+    async def test_deleted_strategy_is_removed(self, db):
+        """测试删除的策略出现在 removed 中"""
+        store = StrategyStateStore()
+        await store.refresh(db, {})
+
+        await db.execute(delete(Strategy).where(Strategy.id == 5))
+        await db.commit()
+        store.mark_dirty(5)
+        delta = await store.refresh(db, {})
+
+        assert delta["changed"] == []
+        assert delta["removed"] == [5]
+        assert delta["total"] == 4
+
+    @pytest.mark.asyncio
+    async def test_full_reload_picks_up_unmarked_changes(self, db):
+        """测试全量重新加载发现未标记的变更"""
+        store = StrategyStateStore(full_reload_interval=0)
+        await store.refresh(db, {})
+
+        await db.execute(update(Strategy).where(Strategy.id == 4).values(name="renamed"))
+        await db.commit()
+        delta = await store.refresh(db, {})
+
+        assert [s["name"] for s in delta["changed"]] == ["renamed"]
+
+    @pytest.mark.asyncio
+    async def test_delta_is_smaller_than_full_snapshot(self, db):
+        """测试单个策略变化时增量消息远小于全量消息"""
+        async with db.begin_nested():
+            for i in range(6, 1000):
+                db.add(Strategy(
+                    id=i, user_id=1, name=f"strategy_{i}", strategy_class="Sample", exchange="binance",
+                    timeframe="1h", pair_whitelist=["BTC/USDT"], signal_thresholds={}, status="stopped"
+                ))
+        await db.commit()
+        assert await db.scalar(select(func.count()).select_from(Strategy)) == 999
+
+        store = StrategyStateStore()
+        await store.refresh(db, {})
+        snapshot_size = len(str(MonitoringBroadcaster.build_strategies_message(store.snapshot())))
+
+        delta = await store.refresh(db, {10: {"signals_last_hour": 1}})
+        delta_size = len(str(MonitoringBroadcaster.build_strategies_message(delta)))
+
+        assert len(delta["changed"]) == 1
+        assert delta_size * 100 < snapshot_size
@@ -0,0 +1,125 @@
+"""
+流式指标引擎单元测试（与ta实现的一致性测试）
+StreamingIndicatorEngine Parity Tests
+"""
+import math
+import random
+import pytest
+from services.indicator_calculator import IndicatorCalculator
+from services.streaming_indicator_engine import StreamingIndicatorEngine
+
+INDICATOR_TYPES = ["MA", "MACD", "RSI", "BOLL", "VOL"]
+
+
+def make_candles(count: int, seed: int = 42, start_ms: int = 1_700_000_000_000):
+    """生成随机游走K线"""
+    rng = random.Random(seed)
+    price = 45000.0
+    candles = []
+    for i in range(count):
+        price *= 1 + rng.gauss(0, 0.003)
+        candles.append([start_ms + i * 60_000, price, price * 1.001, price * 0.999, price, rng.uniform(1, 100)])
+    return candles
+
+
+def assert_values_close(actual, expected):
+    """逐项比较指标值（NaN视为相等）"""
+    if isinstance(expected, dict):
+        assert set(actual) == set(expected)
+        for key in expected:
+            assert_values_close(actual[key], expected[key])
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            assert_values_close(a, e)
+    elif expected is None or (isinstance(expected, float) and math.isnan(expected)):
+        assert actual is None or math.isnan(actual)
+    else:
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9)
+
+
+def calculate_with_ta(candles, indicator_type):
+    calculator = IndicatorCalculator()
+    return {
+        "MA": calculator.calculate_ma,
+        "MACD": calculator.calculate_macd,
+        "RSI": calculator.calculate_rsi,
+        "BOLL": calculator.calculate_bollinger_bands,
+        "VOL": calculator.calculate_volume,
+    }[indicator_type](candles)
+
+
+class TestStreamingIndicatorParity:
+    """流式计算结果与ta全量计算一致"""
+
+    @pytest.mark.parametrize("indicator_type", INDICATOR_TYPES)
+    @pytest.mark.parametrize("count", [10, 35, 200])
+    def test_full_build_matches_ta(self, indicator_type, count):
+        """测试从零构建时与ta结果一致（含预热期bfill）"""
+        candles = make_candles(count)
+        engine = StreamingIndicatorEngine()
+
+        result = engine.calculate("series", candles, indicator_type)
+        expected = calculate_with_ta(candles, indicator_type)
+
+        assert result["indicator_type"] == expected["indicator_type"]
+        assert result["indicator_params"] == expected["indicator_params"]
+        assert result["timestamp"] == expected["timestamp"]
+        assert_values_close(result["indicator_values"], expected["indicator_values"])
+
+    @pytest.mark.parametrize("indicator_type", INDICATOR_TYPES)
+    def test_window_longer_than_history_stays_aligned(self, indicator_type):
+        """测试K线数超过保留的历史长度时，输出仍与K线一一对齐"""
+        candles = make_candles(120, seed=3)
+        engine = StreamingIndicatorEngine(max_points=50)
+
+        result = engine.calculate("series", candles, indicator_type)
+        assert_values_close(result["indicator_values"], calculate_with_ta(candles, indicator_type)["indicator_values"])
+
+    @pytest.mark.parametrize("indicator_type", INDICATOR_TYPES)
+    def test_candle_by_candle_matches_ta(self, indicator_type):
+        """测试逐根追加（含未收盘K线反复更新）与ta全量计算一致"""
+        candles = make_candles(120, seed=7)
+        engine = StreamingIndicatorEngine()
+
+        for i in range(1, len(candles) + 1):
+            window = [list(c) for c in candles[:i]]
+            # 模拟未收盘K线：先推送一个临时收盘价，再推送最终值
+            provisional = [list(c) for c in window]
+            provisional[-1][4] *= 1.01
+            provisional[-1][5] += 5
+            engine.update("series", provisional)
+            result = engine.calculate("series", window, indicator_type)
+
+        expected = calculate_with_ta(candles, indicator_type)
+        assert_values_close(result["indicator_values"], expected["indicator_values"])
+
+    def test_incremental_update_only_applies_new_candles(self):
+        """测试增量更新只追加新K线"""
+        candles = make_candles(201)
+        engine = StreamingIndicatorEngine()
+        engine.update("series", candles[:200])
+
+        state = engine.update("series", candles[1:201])
+
+        assert state.last_timestamp == candles[-1][0]
+        assert len(state.outputs["rsi"]) == 201
+
+    def test_gap_triggers_rebuild(self):
+        """测试数据断档时重建状态"""
+        candles = make_candles(300)
+        engine = StreamingIndicatorEngine()
+        engine.update("series", candles[:100])
+
+        state = engine.update("series", candles[150:])
+
+        assert len(state.outputs["ma5"]) == 150
+
+    def test_series_count_is_bounded(self):
+        """测试序列数量上限（LRU淘汰）"""
+        engine = StreamingIndicatorEngine(max_series=2)
+        candles = make_candles(30)
+        for key in ["a", "b", "c"]:
+            engine.update(key, candles)
+
+        assert engine.get_stats()["series"] == 2
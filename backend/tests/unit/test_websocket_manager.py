@@ -0,0 +1,166 @@
+"""
+WebSocket连接管理器单元测试
+ConnectionManager Fan-out Unit Tests
+"""
+import asyncio
+import json
+import pytest
+from unittest.mock import patch
+
+from app.websocket import manager as manager_module
+from app.websocket.manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """模拟WebSocket连接，可设置发送延迟或发送失败"""
+
+    def __init__(self, delay: float = 0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.received = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("client gone")
+        self.received.append(json.loads(text))
+
+    async def close(self, code: int = 1000):
+        self.closed = True
+
+
+_managers = []
+
+
+@pytest.fixture(autouse=True)
+async def close_managers():
+    """测试结束后断开所有连接，停止写任务"""
+    yield
+    while _managers:
+        manager = _managers.pop()
+        for client_id in list(manager.send_queues):
+            manager.disconnect(client_id)
+        await asyncio.sleep(0)
+
+
+async def make_manager(policy: str = "coalesce", queue_size: int = 256, **clients) -> ConnectionManager:
+    manager = ConnectionManager()
+    _managers.append(manager)
+    manager.slow_client_policy = policy
+    manager.queue_size = queue_size
+    for client_id, websocket in clients.items():
+        await manager.connect(websocket, client_id)
+    return manager
+
+
+async def drain(manager: ConnectionManager, in_flight: float = 0.1, timeout: float = 1.0):
+    """等待所有发送队列清空，并等待最后一条消息发送完成"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while any(q.pending for q in manager.send_queues.values()):
+        if asyncio.get_running_loop().time() > deadline:
+            break
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(in_flight)
+
+
+class TestConnectionManagerFanout:
+    """并发广播测试"""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_serializes_once_and_delivers_to_topic(self):
+        """测试广播只序列化一次，仅发送给订阅者"""
+        a, b, c = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        manager = await make_manager(a=a, b=b, c=c)
+        manager.subscribe("a", "signals")
+        manager.subscribe("b", "signals")
+
+        with patch.object(manager_module, "serialize_message", wraps=manager_module.serialize_message) as serialize:
+            await manager.broadcast({"type": "data", "topic": "signals", "data": {"n": 1}}, topic="signals")
+        await drain(manager)
+
+        assert serialize.call_count == 1
+        assert a.received == b.received == [{"type": "data", "topic": "signals", "data": {"n": 1}}]
+        assert c.received == []
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_others(self):
+        """测试慢客户端不影响其他客户端的接收"""
+        slow, fast = FakeWebSocket(delay=0.5), FakeWebSocket()
+        manager = await make_manager(slow=slow, fast=fast)
+
+        await asyncio.wait_for(manager.broadcast({"n": 1}), timeout=0.05)
+        await asyncio.sleep(0.05)
+
+        assert fast.received == [{"n": 1}]
+        assert slow.received == []
+
+    @pytest.mark.asyncio
+    async def test_coalesce_keeps_latest_snapshot(self):
+        """测试 coalesce 策略：快照主题只保留最新一条，信号主题逐条保留"""
+        slow = FakeWebSocket(delay=0.05)
+        manager = await make_manager(policy="coalesce", slow=slow)
+        for topic in ("monitoring", "signals"):
+            manager.subscribe("slow", topic)
+
+        await manager.broadcast({"topic": "signals", "n": 0}, topic="signals")
+        await asyncio.sleep(0)  # 写任务取走第一条并开始发送
+        for n in range(1, 4):
+            await manager.broadcast({"topic": "monitoring", "n": n}, topic="monitoring")
+            await manager.broadcast({"topic": "signals", "n": n}, topic="signals")
+        await drain(manager)
+
+        monitoring = [m["n"] for m in slow.received if m["topic"] == "monitoring"]
+        signals = [m["n"] for m in slow.received if m["topic"] == "signals"]
+        assert monitoring == [3]
+        assert signals == [0, 1, 2, 3]
+        assert manager.get_fanout_stats()["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_when_queue_full(self):
+        """测试 drop_oldest 策略：积压超限时丢弃最旧消息"""
+        slow = FakeWebSocket(delay=0.05)
+        manager = await make_manager(policy="drop_oldest", queue_size=2, slow=slow)
+
+        await manager.broadcast({"n": 0})
+        await asyncio.sleep(0)
+        for n in range(1, 5):
+            await manager.broadcast({"n": n})
+        await drain(manager)
+
+        assert [m["n"] for m in slow.received] == [0, 3, 4]
+        assert manager.get_fanout_stats()["dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_closes_slow_client(self):
+        """测试 disconnect 策略：积压超限时断开慢客户端"""
+        slow, fast = FakeWebSocket(delay=1), FakeWebSocket()
+        manager = await make_manager(policy="disconnect", queue_size=2, slow=slow, fast=fast)
+
+        for n in range(4):
+            await manager.broadcast({"n": n})
+            await asyncio.sleep(0.01)  # 快客户端的写任务及时发送
+        await drain(manager)
+
+        assert "slow" not in manager.active_connections
+        assert slow.closed
+        assert [m["n"] for m in fast.received] == [0, 1, 2, 3]
+        assert manager.get_fanout_stats()["slow_client_disconnects"] == 1
+
+    @pytest.mark.asyncio
+    async def test_send_failure_disconnects_client(self):
+        """测试发送失败的客户端被移除"""
+        broken = FakeWebSocket(fail=True)
+        manager = await make_manager(broken=broken)
+        manager.subscribe("broken", "signals")
+
+        await manager.broadcast({"n": 1}, topic="signals")
+        await asyncio.sleep(0.01)
+
+        assert "broken" not in manager.active_connections
+        assert "broken" not in manager.subscriptions["signals"]
+        assert "broken" not in manager.send_queues
@@ -24,6 +24,7 @@ class RealtimeDataAdapter {
     this.isConnected = false
     this.wsRetryCount = 0
     this.lastSignalId = 0
+    this.batchEtags = {}  // {topics: ETag}，轮询时用于 If-None-Match
 
     // 回调函数 - 改为数组支持多个监听器
     this.callbacks = {
@@ -268,7 +269,25 @@ class RealtimeDataAdapter {
         params.last_signal_id = this.lastSignalId
       }
 
-      const response = await axios.get('/api/v1/realtime/batch', { params })
+      // 不含 signals 的请求带上次的 ETag，数据未变化时服务端返回 304
+      const etagKey = params.topics
+      const headers = {}
+      if (!topics.includes('signals') && this.batchEtags[etagKey]) {
+        headers['If-None-Match'] = this.batchEtags[etagKey]
+      }
+
+      const response = await axios.get('/api/v1/realtime/batch', {
+        params,
+        headers,
+        validateStatus: status => (status >= 200 && status < 300) || status === 304
+      })
+
+      if (response.status === 304) {
+        return
+      }
+      if (response.headers.etag) {
+        this.batchEtags[etagKey] = response.headers.etag
+      }
 
       if (response.data.success) {
         const data = response.data.data
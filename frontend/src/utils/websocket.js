@@ -25,6 +25,16 @@ class WebSocketClient {
     // 订阅的主题
     this.subscribedTopics = new Set()
 
+    // 信号序号跟踪（检测推送缺失并请求补发）
+    this.signalEpoch = null
+    this.lastSignalSeq = 0
+    this.signalReplayPending = false
+
+    // 策略状态（快照 + 版本化增量，版本不连续时请求 resync）
+    this.strategiesVersion = null
+    this.strategiesById = new Map()
+    this.strategiesResyncPending = false
+
     // 事件监听器
     this.listeners = {
       open: [],
@@ -208,10 +218,20 @@ class WebSocketClient {
         this.subscribedTopics.forEach(topic => {
           this.send({ type: 'subscribe', topic })
         })
+
+        // 重连后补发断线期间的信号
+        if (this.subscribedTopics.has('signals') && this.lastSignalSeq > 0) {
+          this.requestSignalReplay()
+        }
         break
 
       case 'subscribed':
         console.log(`Subscribed to ${message.topic}`)
+        if (message.topic === 'signals' && message.epoch !== this.signalEpoch) {
+          // 首次订阅或服务端序号重置：从当前序号开始跟踪
+          this.signalEpoch = message.epoch
+          this.lastSignalSeq = message.last_seq || 0
+        }
         break
 
       case 'unsubscribed':
@@ -219,7 +239,14 @@ class WebSocketClient {
         break
 
       case 'data':
-        // 数据推送
+        // 数据推送（信号按序号去重，缺失时请求补发）
+        if (message.topic === 'signals' && !this.trackSignalSequence(message)) {
+          break
+        }
+        // 策略增量合并为完整列表后再交给上层
+        if (message.topic === 'strategies' && !this.applyStrategiesMessage(message)) {
+          break
+        }
         this.emit('data', message)
         break
 
@@ -248,6 +275,122 @@ class WebSocketClient {
     }
   }
 
+  /**
+   * 跟踪信号序号
+   * @param {object} message - signals 主题的数据消息
+   * @returns {boolean} 是否有需要交给上层处理的新信号
+   */
+  trackSignalSequence(message) {
+    const data = message.data || {}
+    const signals = data.signals || []
+
+    if (data.replay) {
+      this.signalReplayPending = false
+    }
+    if (data.epoch && data.epoch !== this.signalEpoch) {
+      // 服务端序号重置，旧序号不再可比
+      this.signalEpoch = data.epoch
+      this.lastSignalSeq = 0
+    }
+    if (signals.length === 0 || signals[0].seq === undefined) {
+      return signals.length > 0
+    }
+
+    // 丢弃已收到的信号
+    const fresh = signals.filter(s => s.seq > this.lastSignalSeq)
+    if (fresh.length === 0) {
+      return false
+    }
+
+    // 序号不连续（批次之前或批次内部）：只处理连续的部分，其余请求补发（补发内容包含缺失之后的信号）
+    let accepted = fresh
+    if (!data.replay) {
+      const firstSeq = this.lastSignalSeq > 0 ? this.lastSignalSeq + 1 : fresh[0].seq
+      const contiguous = fresh.findIndex((s, i) => s.seq !== firstSeq + i)
+      if (contiguous !== -1) {
+        const missingFrom = contiguous > 0 ? fresh[contiguous - 1].seq + 1 : firstSeq
+        console.warn(`[WebSocket] Signal gap detected: ${missingFrom}-${fresh[contiguous].seq - 1}`)
+        accepted = fresh.slice(0, contiguous)
+        if (accepted.length > 0) {
+          this.lastSignalSeq = accepted[accepted.length - 1].seq
+        }
+        this.requestSignalReplay()
+        if (accepted.length === 0) {
+          return false
+        }
+      }
+    }
+
+    this.lastSignalSeq = accepted[accepted.length - 1].seq
+    message.data = { ...data, signals: accepted, count: accepted.length }
+    return true
+  }
+
+  /**
+   * 请求补发 lastSignalSeq 之后的信号
+   */
+  requestSignalReplay() {
+    if (this.signalReplayPending) {
+      return
+    }
+    this.signalReplayPending = this.send({
+      type: 'replay',
+      topic: 'signals',
+      epoch: this.signalEpoch,
+      after_seq: this.lastSignalSeq
+    })
+  }
+
+  /**
+   * 合并策略状态快照/增量
+   * @param {object} message - strategies 主题的数据消息
+   * @returns {boolean} 是否有需要交给上层处理的策略列表
+   */
+  applyStrategiesMessage(message) {
+    const data = message.data || {}
+
+    if (data.kind === 'snapshot') {
+      this.strategiesResyncPending = false
+      this.strategiesVersion = data.version
+      this.strategiesById = new Map(data.strategies.map(s => [s.id, s]))
+      return true
+    }
+    if (data.kind !== 'delta') {
+      return true
+    }
+
+    if (data.version <= this.strategiesVersion) {
+      return false
+    }
+    if (data.base_version !== this.strategiesVersion) {
+      // 缺少中间版本：丢弃本次增量，请求完整快照
+      console.warn(`[WebSocket] Strategies version gap: have ${this.strategiesVersion}, got ${data.base_version}`)
+      this.requestStrategiesResync()
+      return false
+    }
+
+    data.changed.forEach(s => this.strategiesById.set(s.id, s))
+    data.removed.forEach(id => this.strategiesById.delete(id))
+    this.strategiesVersion = data.version
+
+    const { changed, removed, ...counts } = data
+    message.data = {
+      ...counts,
+      strategies: [...this.strategiesById.values()].sort((a, b) => a.id - b.id)
+    }
+    return true
+  }
+
+  /**
+   * 请求策略状态完整快照
+   */
+  requestStrategiesResync() {
+    if (this.strategiesResyncPending) {
+      return
+    }
+    this.strategiesResyncPending = this.send({ type: 'resync', topic: 'strategies' })
+  }
+
   /**
    * 发送pong响应
    */
@@ -97,9 +97,12 @@ CREATE INDEX idx_strategies_status ON strategies(status);
 CREATE INDEX idx_strategies_active ON strategies(is_active);
 CREATE INDEX idx_strategies_port ON strategies(port);
 
--- Signals table (with partitioning support)
+-- Signals table (partitioned by day on created_at)
+-- Partitions (signals_pYYYYMMDD) are created ahead of time and dropped after
+-- SIGNAL_RETENTION_DAYS by the backend's DataRetentionService.
+-- The primary key must include the partition key.
 CREATE TABLE IF NOT EXISTS signals (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     strategy_id INTEGER NOT NULL REFERENCES strategies(id) ON DELETE CASCADE,
     pair VARCHAR(20) NOT NULL,
     action VARCHAR(10) NOT NULL,
@@ -112,28 +115,93 @@ CREATE TABLE IF NOT EXISTS signals (
     profit_abs FLOAT,
     trade_duration INTEGER,
     indicators JSONB,
-    metadata JSONB,
+    signal_metadata JSONB,
     notes TEXT,
     freqtrade_trade_id INTEGER,
     open_date TIMESTAMP WITH TIME ZONE,
     close_date TIMESTAMP WITH TIME ZONE,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE
-);
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS signals_default PARTITION OF signals DEFAULT;
 
 CREATE INDEX idx_signals_strategy ON signals(strategy_id);
 CREATE INDEX idx_signals_pair ON signals(pair);
 CREATE INDEX idx_signals_action ON signals(action);
 CREATE INDEX idx_signals_strength_level ON signals(strength_level);
 CREATE INDEX idx_signals_created_at ON signals(created_at DESC);
+CREATE INDEX idx_signals_created_id ON signals(created_at, id);
 CREATE INDEX idx_signals_strategy_pair_created ON signals(strategy_id, pair, created_at DESC);
 CREATE INDEX idx_signals_pair_action_created ON signals(pair, action, created_at DESC);
 CREATE INDEX idx_signals_strength_created ON signals(strength_level, created_at DESC);
 
+-- K-line table (partitioned by month on timestamp, retention KLINE_RETENTION_DAYS)
+CREATE TABLE IF NOT EXISTS klines (
+    id BIGSERIAL,
+    exchange VARCHAR(20) NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    timeframe VARCHAR(10) NOT NULL,
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    open FLOAT NOT NULL,
+    high FLOAT NOT NULL,
+    low FLOAT NOT NULL,
+    close FLOAT NOT NULL,
+    volume FLOAT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, timestamp),
+    CONSTRAINT uix_kline_unique UNIQUE (exchange, symbol, timeframe, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+CREATE TABLE IF NOT EXISTS klines_default PARTITION OF klines DEFAULT;
+
+CREATE INDEX idx_kline_exchange_symbol_timeframe_time ON klines(exchange, symbol, timeframe, timestamp);
+CREATE INDEX idx_klines_timestamp ON klines(timestamp);
+
+-- Technical indicators table (partitioned by month on timestamp, retention INDICATOR_RETENTION_DAYS)
+CREATE TABLE IF NOT EXISTS technical_indicators (
+    id BIGSERIAL,
+    exchange VARCHAR(20) NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    timeframe VARCHAR(10) NOT NULL,
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    indicator_type VARCHAR(20) NOT NULL,
+    indicator_params JSONB,
+    indicator_values JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, timestamp),
+    CONSTRAINT uix_indicator_unique UNIQUE (exchange, symbol, timeframe, timestamp, indicator_type)
+) PARTITION BY RANGE (timestamp);
+
+CREATE TABLE IF NOT EXISTS technical_indicators_default PARTITION OF technical_indicators DEFAULT;
+
+CREATE INDEX idx_indicator_exchange_symbol_timeframe_time ON technical_indicators(exchange, symbol, timeframe, timestamp);
+CREATE INDEX idx_indicator_type_time ON technical_indicators(indicator_type, timestamp);
+
+-- Strategy heartbeat history (partitioned by day on heartbeat_time, retention HEARTBEAT_HISTORY_RETENTION_DAYS)
+CREATE TABLE IF NOT EXISTS strategy_heartbeat_history (
+    id SERIAL,
+    strategy_id INTEGER NOT NULL REFERENCES strategies(id) ON DELETE CASCADE,
+    heartbeat_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    pid INTEGER,
+    version VARCHAR(50),
+    state VARCHAR(20),
+    is_timeout BOOLEAN NOT NULL DEFAULT FALSE,
+    time_since_last_heartbeat_seconds INTEGER,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, heartbeat_time)
+) PARTITION BY RANGE (heartbeat_time);
+
+CREATE TABLE IF NOT EXISTS strategy_heartbeat_history_default PARTITION OF strategy_heartbeat_history DEFAULT;
+
+CREATE INDEX idx_heartbeat_history_strategy ON strategy_heartbeat_history(strategy_id);
+CREATE INDEX idx_heartbeat_history_time ON strategy_heartbeat_history(heartbeat_time);
+
 -- Notifications table
 CREATE TABLE IF NOT EXISTS notifications (
     id SERIAL PRIMARY KEY,
-    signal_id INTEGER NOT NULL REFERENCES signals(id) ON DELETE CASCADE,
+    signal_id INTEGER NOT NULL,  -- signals is partitioned, so no FK (its key is (id, created_at))
     user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     notification_type VARCHAR(20) NOT NULL,
     priority VARCHAR(10) NOT NULL,
@@ -238,5 +306,6 @@ SELECT
 FROM pg_tables
 WHERE schemaname = 'public' AND tablename IN (
     'users', 'proxies', 'strategies', 'signals',
+    'klines', 'technical_indicators', 'strategy_heartbeat_history',
     'notifications', 'capacity_history', 'system_logs'
 );
@@ -0,0 +1,228 @@
+-- Migration 001: time-range partitioning for signals, klines, technical_indicators
+-- and strategy_heartbeat_history
+--
+-- Converts existing (unpartitioned) tables into tables partitioned by time range so
+-- the backend's DataRetentionService can drop whole expired partitions instead of
+-- deleting rows. Each table is rebuilt in one transaction:
+--   1. rename the old table (and its indexes/constraints) to *_legacy
+--   2. create the partitioned table, a DEFAULT partition and one partition per
+--      day/month from the oldest row through PARTITION_PREMAKE_COUNT periods ahead
+--   3. copy rows, advance the id sequence, drop the legacy table
+--
+-- Partition names and bounds match DataRetentionService (UTC, <table>_pYYYYMMDD for
+-- daily and <table>_pYYYYMM for monthly partitions). Tables that are already
+-- partitioned are skipped, so the script can be re-run safely.
+--
+-- The copy holds an exclusive lock on each table; stop the backend first:
+--     psql "$DATABASE_URL" -f sql/migrations/001_partition_time_series.sql
+
+SET TIME ZONE 'UTC';
+
+-- Create partitions of `parent` covering [from_ts, to_ts), one per `step` ('day' or 'month')
+CREATE OR REPLACE FUNCTION create_time_partitions(parent text, from_ts timestamptz, to_ts timestamptz, step text)
+RETURNS integer AS $$
+DECLARE
+    period_start timestamptz := date_trunc(step, from_ts);
+    period_end timestamptz;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    WHILE period_start < to_ts LOOP
+        period_end := period_start + ('1 ' || step)::interval;
+        partition_name := parent || '_p' || to_char(period_start, CASE step WHEN 'month' THEN 'YYYYMM' ELSE 'YYYYMMDD' END);
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, period_start, period_end
+            );
+            created := created + 1;
+        END IF;
+        period_start := period_end;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rename `tbl` to <tbl>_legacy; returns false if it is missing or already partitioned
+CREATE OR REPLACE FUNCTION rename_to_legacy(tbl text)
+RETURNS boolean AS $$
+DECLARE
+    idx record;
+BEGIN
+    IF to_regclass(tbl) IS NULL THEN
+        RAISE NOTICE 'Table % does not exist, skipping', tbl;
+        RETURN false;
+    END IF;
+    IF (SELECT relkind FROM pg_class WHERE oid = to_regclass(tbl)) = 'p' THEN
+        RAISE NOTICE 'Table % is already partitioned, skipping', tbl;
+        RETURN false;
+    END IF;
+
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', tbl, tbl || '_legacy');
+    -- Free index/constraint names for the new table (renaming a constraint's index renames the constraint)
+    FOR idx IN SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = tbl || '_legacy' LOOP
+        EXECUTE format('ALTER INDEX %I RENAME TO %I', idx.indexname, left(idx.indexname, 56) || '_legacy');
+    END LOOP;
+    RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Copy <tbl>_legacy into the partitioned `tbl`, advance the id sequence and drop the legacy table
+CREATE OR REPLACE FUNCTION copy_from_legacy(tbl text, partition_column text, step text, premake integer)
+RETURNS bigint AS $$
+DECLARE
+    oldest timestamptz;
+    columns text;
+    copied bigint;
+BEGIN
+    EXECUTE format('SELECT min(%I) FROM %I', partition_column, tbl || '_legacy') INTO oldest;
+    PERFORM create_time_partitions(
+        tbl,
+        coalesce(oldest, now()),
+        date_trunc(step, now()) + ((premake + 1) || ' ' || step)::interval,
+        step
+    );
+
+    SELECT string_agg(quote_ident(a.attname), ', ' ORDER BY a.attnum) INTO columns
+    FROM pg_attribute a
+    WHERE a.attrelid = to_regclass(tbl) AND a.attnum > 0 AND NOT a.attisdropped
+      AND EXISTS (
+          SELECT 1 FROM pg_attribute l
+          WHERE l.attrelid = to_regclass(tbl || '_legacy') AND l.attname = a.attname AND NOT l.attisdropped
+      );
+
+    EXECUTE format('INSERT INTO %I (%s) SELECT %s FROM %I', tbl, columns, columns, tbl || '_legacy');
+    GET DIAGNOSTICS copied = ROW_COUNT;
+
+    EXECUTE format(
+        'SELECT setval(pg_get_serial_sequence(%L, ''id''), coalesce((SELECT max(id) FROM %I), 0) + 1, false)',
+        tbl, tbl
+    );
+    -- CASCADE drops foreign keys that referenced the legacy table (e.g. notifications.signal_id)
+    EXECUTE format('DROP TABLE %I CASCADE', tbl || '_legacy');
+    RAISE NOTICE 'Partitioned %: % rows copied', tbl, copied;
+    RETURN copied;
+END;
+$$ LANGUAGE plpgsql;
+
+-- signals: daily partitions on created_at
+BEGIN;
+DO $$
+BEGIN
+    IF rename_to_legacy('signals') THEN
+        UPDATE signals_legacy SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL;
+        CREATE TABLE signals (
+            id SERIAL,
+            strategy_id INTEGER NOT NULL REFERENCES strategies(id) ON DELETE CASCADE,
+            pair VARCHAR(20) NOT NULL,
+            action VARCHAR(10) NOT NULL,
+            signal_strength FLOAT NOT NULL,
+            strength_level VARCHAR(10) NOT NULL,
+            current_rate FLOAT NOT NULL,
+            entry_price FLOAT,
+            exit_price FLOAT,
+            profit_ratio FLOAT,
+            profit_abs FLOAT,
+            trade_duration INTEGER,
+            indicators JSON,
+            signal_metadata JSON,
+            notes TEXT,
+            freqtrade_trade_id INTEGER,
+            open_date TIMESTAMP WITH TIME ZONE,
+            close_date TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP WITH TIME ZONE,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at);
+        CREATE TABLE signals_default PARTITION OF signals DEFAULT;
+        CREATE INDEX ix_signals_strategy_id ON signals(strategy_id);
+        CREATE INDEX ix_signals_pair ON signals(pair);
+        CREATE INDEX ix_signals_created_at ON signals(created_at);
+        CREATE INDEX idx_strategy_pair_created ON signals(strategy_id, pair, created_at);
+        CREATE INDEX idx_pair_action_created ON signals(pair, action, created_at);
+        CREATE INDEX idx_strength_created ON signals(strength_level, created_at);
+        CREATE INDEX idx_created_id ON signals(created_at, id);
+        PERFORM copy_from_legacy('signals', 'created_at', 'day', 3);
+    END IF;
+END $$;
+COMMIT;
+
+-- klines: monthly partitions on timestamp
+BEGIN;
+DO $$
+BEGIN
+    IF rename_to_legacy('klines') THEN
+        CREATE TABLE klines (
+            id BIGSERIAL,
+            exchange VARCHAR(20) NOT NULL,
+            symbol VARCHAR(20) NOT NULL,
+            timeframe VARCHAR(10) NOT NULL,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+            open FLOAT NOT NULL,
+            high FLOAT NOT NULL,
+            low FLOAT NOT NULL,
+            close FLOAT NOT NULL,
+            volume FLOAT NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, timestamp),
+            CONSTRAINT uix_kline_unique UNIQUE (exchange, symbol, timeframe, timestamp)
+        ) PARTITION BY RANGE (timestamp);
+        CREATE TABLE klines_default PARTITION OF klines DEFAULT;
+        CREATE INDEX idx_kline_exchange_symbol_timeframe_time ON klines(exchange, symbol, timeframe, timestamp);
+        CREATE INDEX ix_klines_timestamp ON klines(timestamp);
+        PERFORM copy_from_legacy('klines', 'timestamp', 'month', 3);
+    END IF;
+END $$;
+COMMIT;
+
+-- technical_indicators: monthly partitions on timestamp
+BEGIN;
+DO $$
+BEGIN
+    IF rename_to_legacy('technical_indicators') THEN
+        CREATE TABLE technical_indicators (
+            id BIGSERIAL,
+            exchange VARCHAR(20) NOT NULL,
+            symbol VARCHAR(20) NOT NULL,
+            timeframe VARCHAR(10) NOT NULL,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+            indicator_type VARCHAR(20) NOT NULL,
+            indicator_params JSONB,
+            indicator_values JSONB NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, timestamp),
+            CONSTRAINT uix_indicator_unique UNIQUE (exchange, symbol, timeframe, timestamp, indicator_type)
+        ) PARTITION BY RANGE (timestamp);
+        CREATE TABLE technical_indicators_default PARTITION OF technical_indicators DEFAULT;
+        CREATE INDEX idx_indicator_exchange_symbol_timeframe_time
+            ON technical_indicators(exchange, symbol, timeframe, timestamp);
+        CREATE INDEX idx_indicator_type_time ON technical_indicators(indicator_type, timestamp);
+        PERFORM copy_from_legacy('technical_indicators', 'timestamp', 'month', 3);
+    END IF;
+END $$;
+COMMIT;
+
+-- strategy_heartbeat_history: daily partitions on heartbeat_time
+BEGIN;
+DO $$
+BEGIN
+    IF rename_to_legacy('strategy_heartbeat_history') THEN
+        CREATE TABLE strategy_heartbeat_history (
+            id SERIAL,
+            strategy_id INTEGER NOT NULL REFERENCES strategies(id) ON DELETE CASCADE,
+            heartbeat_time TIMESTAMP WITH TIME ZONE NOT NULL,
+            pid INTEGER,
+            version VARCHAR(50),
+            state VARCHAR(20),
+            is_timeout BOOLEAN NOT NULL DEFAULT FALSE,
+            time_since_last_heartbeat_seconds INTEGER,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, heartbeat_time)
+        ) PARTITION BY RANGE (heartbeat_time);
+        CREATE TABLE strategy_heartbeat_history_default PARTITION OF strategy_heartbeat_history DEFAULT;
+        CREATE INDEX ix_strategy_heartbeat_history_strategy_id ON strategy_heartbeat_history(strategy_id);
+        CREATE INDEX ix_strategy_heartbeat_history_heartbeat_time ON strategy_heartbeat_history(heartbeat_time);
+        PERFORM copy_from_legacy('strategy_heartbeat_history', 'heartbeat_time', 'day', 3);
+    END IF;
+END $$;
+COMMIT;